@@ -0,0 +1,35 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from saleor.search.vectors import prepare_user_search_vector, update_search_vectors
+
+
+def populate_search_vectors(apps, schema_editor):
+    User = apps.get_model("account", "User")
+    update_search_vectors(
+        User.objects.select_related("default_billing_address"),
+        prepare_user_search_vector,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("account", "0034_service_account_token")]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="user_search_vector_gin"
+            ),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
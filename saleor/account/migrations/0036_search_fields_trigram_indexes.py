@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from saleor.core.db.operations import create_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0035_user_search_vector"),
+        # The trigram extension is enabled by the product app
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        create_trigram_indexes("account_user", ["email", "first_name", "last_name"]),
+        create_trigram_indexes(
+            "account_address", ["first_name", "last_name", "city", "country"]
+        ),
+    ]
@@ -8,6 +8,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models import Q, Value
 from django.forms.models import model_to_dict
@@ -20,6 +22,7 @@ from versatileimagefield.fields import VersatileImageField
 
 from ..core.models import ModelWithMetadata
 from ..core.utils.json_serializer import CustomJsonEncoder
+from ..search.vectors import prepare_order_search_vector, prepare_user_search_vector
 from . import CustomerEvents
 from .validators import validate_possible_number
 
@@ -68,6 +71,17 @@ class Address(models.Model):
     class Meta:
         ordering = ("pk",)
 
+    def save(self, *args, **kwargs):
+        # Names of default addresses are a part of customers' search vectors
+        updating = not self._state.adding
+        super().save(*args, **kwargs)
+        if updating:
+            users = User.objects.filter(
+                Q(default_billing_address=self) | Q(default_shipping_address=self)
+            )
+            for user in users:
+                user.update_search_vector()
+
     @property
     def full_name(self):
         return "%s %s" % (self.first_name, self.last_name)
@@ -132,6 +146,16 @@ class UserManager(BaseUserManager):
         return self.get_queryset().filter(is_staff=True)
 
 
+# Changes of these fields are reflected in the search vectors
+USER_SEARCH_FIELDS = {
+    "email",
+    "first_name",
+    "last_name",
+    "default_billing_address",
+    "default_shipping_address",
+}
+
+
 class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=256, blank=True)
@@ -150,12 +174,14 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
         Address, related_name="+", null=True, blank=True, on_delete=models.SET_NULL
     )
     avatar = VersatileImageField(upload_to="user-avatars", blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
 
     USERNAME_FIELD = "email"
 
     objects = UserManager()
 
     class Meta:
+        indexes = [GinIndex(fields=["search_vector"], name="user_search_vector_gin")]
         permissions = (
             (
                 "manage_users",
@@ -168,6 +194,19 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
             ),
         )
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or USER_SEARCH_FIELDS & set(update_fields):
+            self.update_search_vector()
+
+    def update_search_vector(self):
+        """Update search vectors of the user and of the user's orders."""
+        User.objects.filter(pk=self.pk).update(
+            search_vector=prepare_user_search_vector(self)
+        )
+        self.orders.update(search_vector=prepare_order_search_vector(self))
+
     def get_full_name(self):
         if self.first_name or self.last_name:
             return ("%s %s" % (self.first_name, self.last_name)).strip()
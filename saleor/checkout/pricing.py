@@ -0,0 +1,143 @@
+"""Calculating all the prices of a checkout at once."""
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from django.db.models import prefetch_related_objects
+from django.utils.functional import cached_property
+from prices import Money, TaxedMoney
+
+from ..core.taxes import quantize_price, zero_money, zero_taxed_money
+from ..extensions.manager import ExtensionsManager, get_extensions_manager
+from .models import Checkout, CheckoutLine
+
+if TYPE_CHECKING:
+    from ..discount import DiscountInfo
+
+# Relations used to calculate prices of the lines, fetched once for all of them
+CHECKOUT_PRICING_PREFETCH = [
+    "lines__variant__product__product_type",
+    "lines__variant__product__collections",
+]
+
+
+class CheckoutPricing:
+    """Prices of a checkout, each calculated once.
+
+    Lines of the checkout and the objects their prices depend on are fetched
+    once, so the totals and the lines share them rather than querying them
+    again. Values are calculated by the extensions manager when first used and
+    reused later; the pricing goes stale if the checkout is changed afterwards.
+
+    Unless a plugin calculates the subtotal or the total, they are summed from
+    the prices of the lines instead of pricing all the lines again.
+    """
+
+    def __init__(
+        self,
+        checkout: Checkout,
+        discounts: Optional[Iterable["DiscountInfo"]] = None,
+        manager: Optional[ExtensionsManager] = None,
+    ):
+        self.checkout = checkout
+        self.discounts = list(discounts or [])
+        self.manager = manager or get_extensions_manager()
+        prefetch_related_objects([checkout], *CHECKOUT_PRICING_PREFETCH)
+
+    @cached_property
+    def lines(self) -> List[CheckoutLine]:
+        return list(self.checkout)
+
+    @cached_property
+    def line_totals(self) -> Dict[int, TaxedMoney]:
+        return {
+            line.pk: self.manager.calculate_checkout_line_total(line, self.discounts)
+            for line in self.lines
+        }
+
+    def get_line_total(self, line: CheckoutLine) -> TaxedMoney:
+        """Return the total price of a line of the checkout."""
+        total = self.line_totals.get(line.pk)
+        if total is None:
+            total = self.manager.calculate_checkout_line_total(line, self.discounts)
+        return total
+
+    @cached_property
+    def _untaxed_subtotal(self) -> Money:
+        """Return the sum of line totals before taxes, as `Checkout.get_subtotal`."""
+        if self.manager.plugins_implement("calculate_checkout_line_total"):
+            totals = [line.get_total(self.discounts) for line in self.lines]
+        else:
+            # Line totals of the manager are not taxed then
+            totals = [total.net for total in self.line_totals.values()]
+        return sum(totals, zero_money(self.checkout.currency))
+
+    @cached_property
+    def subtotal(self) -> TaxedMoney:
+        if self.manager.plugins_implement("calculate_checkout_subtotal"):
+            return self.manager.calculate_checkout_subtotal(
+                self.checkout, self.discounts
+            )
+        subtotal = self._untaxed_subtotal
+        return quantize_price(
+            TaxedMoney(net=subtotal, gross=subtotal), subtotal.currency
+        )
+
+    @cached_property
+    def shipping_price(self) -> TaxedMoney:
+        return self.manager.calculate_checkout_shipping(self.checkout, self.discounts)
+
+    @property
+    def discount(self) -> Money:
+        return self.checkout.discount
+
+    @cached_property
+    def total(self) -> TaxedMoney:
+        """Return the total of the checkout before paying with gift cards."""
+        if self.manager.plugins_implement("calculate_checkout_total"):
+            return self.manager.calculate_checkout_total(self.checkout, self.discounts)
+        # The same as `Checkout.get_total`
+        total = (
+            self._untaxed_subtotal
+            + self.checkout.get_shipping_price()
+            - self.checkout.discount
+        )
+        total = max(total, zero_money(total.currency))
+        return quantize_price(TaxedMoney(net=total, gross=total), total.currency)
+
+    @cached_property
+    def gift_cards_balance(self) -> Money:
+        return self.checkout.get_total_gift_cards_balance()
+
+    @cached_property
+    def total_price(self) -> TaxedMoney:
+        """Return the total left to pay after using the gift cards."""
+        total = self.total - self.gift_cards_balance
+        return max(total, zero_taxed_money(total.currency))
+
+
+def get_checkout_pricing(request, checkout: Checkout) -> CheckoutPricing:
+    """Return prices of the checkout, calculated once per request.
+
+    Prices are reused only for the same checkout instance, so a checkout
+    fetched again after it was changed within the request is priced anew.
+    """
+    if not hasattr(request, "checkout_pricing"):
+        request.checkout_pricing = {}
+    pricing = request.checkout_pricing.get(checkout.pk)
+    if pricing is None or pricing.checkout is not checkout:
+        pricing = CheckoutPricing(
+            checkout, request.discounts, getattr(request, "extensions", None)
+        )
+        request.checkout_pricing[checkout.pk] = pricing
+    return pricing
+
+
+def get_checkout_line_total(request, line: CheckoutLine) -> TaxedMoney:
+    """Return the total price of the line, reusing prices of its checkout.
+
+    Lines whose checkout was not fetched along with them are priced alone
+    rather than fetching the checkout of each line.
+    """
+    if CheckoutLine.checkout.is_cached(line):
+        return get_checkout_pricing(request, line.checkout).get_line_total(line)
+    manager = getattr(request, "extensions", None) or get_extensions_manager()
+    return manager.calculate_checkout_line_total(line, request.discounts)
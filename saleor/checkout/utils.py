@@ -18,7 +18,7 @@ from ..account.models import Address, User
 from ..account.utils import store_user_address
 from ..checkout.error_codes import CheckoutErrorCode
 from ..core.exceptions import InsufficientStock
-from ..core.taxes import quantize_price, zero_taxed_money
+from ..core.taxes import quantize_price
 from ..core.utils import to_local_currency
 from ..core.utils.promo_code import (
     InvalidPromoCode,
@@ -52,6 +52,7 @@ from .forms import (
     BillingAddressChoiceForm,
 )
 from .models import Checkout, CheckoutLine
+from .pricing import CheckoutPricing
 
 COOKIE_NAME = "checkout"
 
@@ -658,14 +659,11 @@ def change_shipping_address_in_checkout(checkout, address):
 
 def get_checkout_context(checkout, discounts, currency=None, shipping_range=None):
     """Retrieve the data shared between views in checkout process."""
-    manager = get_extensions_manager()
-    checkout_total = (
-        manager.calculate_checkout_total(checkout=checkout, discounts=discounts)
-        - checkout.get_total_gift_cards_balance()
-    )
-    checkout_total = max(checkout_total, zero_taxed_money(checkout_total.currency))
-    checkout_subtotal = manager.calculate_checkout_subtotal(checkout, discounts)
-    shipping_price = manager.calculate_checkout_shipping(checkout, discounts)
+    pricing = CheckoutPricing(checkout, discounts)
+    manager = pricing.manager
+    checkout_total = pricing.total_price
+    checkout_subtotal = pricing.subtotal
+    shipping_price = pricing.shipping_price
 
     shipping_required = checkout.is_shipping_required()
     total_with_shipping = TaxedMoneyRange(
@@ -677,8 +675,7 @@ def get_checkout_context(checkout, discounts, currency=None, shipping_range=None
         "checkout": checkout,
         "checkout_are_taxes_handled": manager.taxes_are_enabled(),
         "checkout_lines": [
-            (line, manager.calculate_checkout_line_total(line, discounts))
-            for line in checkout
+            (line, pricing.get_line_total(line)) for line in pricing.lines
         ],
         "checkout_shipping_price": shipping_price,
         "checkout_subtotal": checkout_subtotal,
@@ -777,13 +774,14 @@ def recalculate_checkout_discount(checkout, discounts):
     """
     voucher = get_voucher_for_checkout(checkout)
     if voucher is not None:
+        # Lines fetched for the pricing are shared with the voucher validation
+        pricing = CheckoutPricing(checkout, discounts)
         try:
             discount = get_voucher_discount_for_checkout(voucher, checkout, discounts)
         except NotApplicable:
             remove_voucher_from_checkout(checkout)
         else:
-            manager = get_extensions_manager()
-            subtotal = manager.calculate_checkout_subtotal(checkout, discounts).gross
+            subtotal = pricing.subtotal.gross
             checkout.discount = (
                 min(discount, subtotal)
                 if voucher.type != VoucherType.SHIPPING
@@ -897,13 +895,17 @@ def remove_voucher_from_checkout(checkout: Checkout):
 
 
 def get_valid_shipping_methods_for_checkout(
-    checkout: Checkout, discounts, country_code=None
+    checkout: Checkout, discounts, country_code=None, subtotal=None
 ):
-    manager = get_extensions_manager()
+    """Return shipping methods applicable to the checkout.
+
+    Pass already calculated `subtotal` of the checkout to avoid calculating it.
+    """
+    if subtotal is None:
+        manager = get_extensions_manager()
+        subtotal = manager.calculate_checkout_subtotal(checkout, discounts)
     return ShippingMethod.objects.applicable_shipping_methods_for_instance(
-        checkout,
-        price=manager.calculate_checkout_subtotal(checkout, discounts).gross,
-        country_code=country_code,
+        checkout, price=subtotal.gross, country_code=country_code
     )
 
 
@@ -1030,9 +1032,13 @@ def validate_gift_cards(checkout: Checkout):
         raise NotApplicable(msg)
 
 
-def create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLine:
+def create_line_for_order(
+    checkout_line: "CheckoutLine", discounts, total_line_price=None
+) -> OrderLine:
     """Create a line for the given order.
 
+    Pass already calculated `total_line_price` to avoid calculating it again.
+
     :raises InsufficientStock: when there is not enough items in stock for this variant.
     """
 
@@ -1053,8 +1059,11 @@ def create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLine
     if translated_variant_name == variant_name:
         translated_variant_name = ""
 
-    manager = get_extensions_manager()
-    total_line_price = manager.calculate_checkout_line_total(checkout_line, discounts)
+    if total_line_price is None:
+        manager = get_extensions_manager()
+        total_line_price = manager.calculate_checkout_line_total(
+            checkout_line, discounts
+        )
     unit_price = quantize_price(
         total_line_price / checkout_line.quantity, total_line_price.currency
     )
@@ -1081,14 +1090,9 @@ def prepare_order_data(*, checkout: Checkout, tracking_code: str, discounts) ->
     """
     order_data = {}
 
-    manager = get_extensions_manager()
-    total = (
-        manager.calculate_checkout_total(checkout=checkout, discounts=discounts)
-        - checkout.get_total_gift_cards_balance()
-    )
-    total = max(total, zero_taxed_money(total.currency))
-
-    shipping_total = manager.calculate_checkout_shipping(checkout, discounts)
+    pricing = CheckoutPricing(checkout, discounts)
+    total = pricing.total_price
+    shipping_total = pricing.shipping_price
     order_data.update(_process_shipping_data_for_order(checkout, shipping_total))
     order_data.update(_process_user_data_for_order(checkout))
     order_data.update(
@@ -1100,8 +1104,12 @@ def prepare_order_data(*, checkout: Checkout, tracking_code: str, discounts) ->
     )
 
     order_data["lines"] = [
-        create_line_for_order(checkout_line=line, discounts=discounts)
-        for line in checkout
+        create_line_for_order(
+            checkout_line=line,
+            discounts=discounts,
+            total_line_price=pricing.get_line_total(line),
+        )
+        for line in pricing.lines
     ]
 
     # validate checkout gift cards
@@ -1112,12 +1120,10 @@ def prepare_order_data(*, checkout: Checkout, tracking_code: str, discounts) ->
 
     # assign gift cards to the order
     order_data["total_price_left"] = (
-        manager.calculate_checkout_subtotal(checkout, discounts)
-        + shipping_total
-        - checkout.discount
+        pricing.subtotal + shipping_total - checkout.discount
     ).gross
 
-    manager.preprocess_order_creation(checkout, discounts)
+    pricing.manager.preprocess_order_creation(checkout, discounts)
     return order_data
 
 
@@ -1182,14 +1188,7 @@ def is_fully_paid(checkout: Checkout, discounts):
     """
     payments = [payment for payment in checkout.payments.all() if payment.is_active]
     total_paid = sum([p.total for p in payments])
-    manager = get_extensions_manager()
-    checkout_total = (
-        manager.calculate_checkout_total(checkout=checkout, discounts=discounts)
-        - checkout.get_total_gift_cards_balance()
-    )
-    checkout_total = max(
-        checkout_total, zero_taxed_money(checkout_total.currency)
-    ).gross
+    checkout_total = CheckoutPricing(checkout, discounts).total_price.gross
     return total_paid >= checkout_total.amount
 
 
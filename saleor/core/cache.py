@@ -0,0 +1,30 @@
+import uuid
+
+from django.core.cache import cache
+
+
+def get_cache_version(key: str) -> str:
+    """Return the version of the data cached under the key.
+
+    Processes compare it with the version of the data they hold, so the data
+    is invalidated everywhere at once by `bump_cache_version`.
+    """
+    return cache.get_or_set(key, lambda: uuid.uuid4().hex, None)
+
+
+def bump_cache_version(key: str) -> None:
+    """Mark the data cached under the key as outdated in all the processes."""
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def schedule_once(key: str, timeout: int, task, args=(), countdown=None) -> bool:
+    """Schedule the Celery task unless it is already scheduled under the key.
+
+    The task deletes the key once it starts or finishes; the key expires after
+    `timeout` seconds in case the task never runs. Return whether the task was
+    scheduled.
+    """
+    if cache.add(key, True, timeout):
+        task.apply_async(args, countdown=countdown)
+        return True
+    return False
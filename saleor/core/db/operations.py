@@ -0,0 +1,22 @@
+from typing import Iterable
+
+from django.db import migrations
+
+TRIGRAM_INDEX_NAME = "%(table)s_%(column)s_trgm"
+
+
+def create_trigram_indexes(table: str, columns: Iterable[str]) -> migrations.RunSQL:
+    """Return an operation creating `pg_trgm` GIN indexes on the table columns.
+
+    The indexes are built on `UPPER(column)`, the expression Django compares
+    in the `icontains` lookups, so the lookups can be served by the indexes.
+    """
+    sql, reverse_sql = [], []
+    for column in columns:
+        name = TRIGRAM_INDEX_NAME % {"table": table, "column": column}
+        sql.append(
+            'CREATE INDEX IF NOT EXISTS "%s" ON "%s" '
+            'USING gin (UPPER("%s"::text) gin_trgm_ops);' % (name, table, column)
+        )
+        reverse_sql.append('DROP INDEX IF EXISTS "%s";' % name)
+    return migrations.RunSQL(sql, reverse_sql)
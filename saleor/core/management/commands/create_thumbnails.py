@@ -1,32 +1,78 @@
-import logging
+import os
 
 from django.core.management.base import BaseCommand
-from versatileimagefield.image_warmer import VersatileImageFieldWarmer
 
-from ....product.models import ProductImage
-
-logger = logging.getLogger(__name__)
+from ...tasks import schedule_thumbnails_warming
+from ...thumbnails import THUMBNAIL_SOURCES, warm_all_thumbnails
 
 
 class Command(BaseCommand):
-    help = "Generate thumbnails for all images"
+    help = (
+        "Generate missing thumbnails for all images. Thumbnails generated "
+        "before are skipped, so an interrupted run can be started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            action="append",
+            dest="sources",
+            choices=sorted(THUMBNAIL_SOURCES),
+            help="Generate thumbnails only of these images (default: all)",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            dest="processes",
+            default=os.cpu_count(),
+            help="Number of processes generating thumbnails",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            dest="chunk_size",
+            default=100,
+            help="Number of images processed at once",
+        )
+        parser.add_argument(
+            "--celery",
+            action="store_true",
+            dest="celery",
+            default=False,
+            help="Schedule generation of thumbnails in Celery workers",
+        )
 
     def handle(self, *args, **options):
-        self.warm_products()
-
-    def warm_products(self):
-        self.stdout.write("Products thumbnails generation:")
-        warmer = VersatileImageFieldWarmer(
-            instance_or_queryset=ProductImage.objects.all(),
-            rendition_key_set="products",
-            image_attr="image",
-            verbose=True,
+        for source_name in options["sources"] or list(THUMBNAIL_SOURCES):
+            if options["celery"]:
+                self.schedule(source_name, options["chunk_size"])
+            else:
+                self.warm(source_name, options["processes"], options["chunk_size"])
+
+    def schedule(self, source_name, chunk_size):
+        chunks = schedule_thumbnails_warming(source_name, chunk_size)
+        self.stdout.write(
+            "Scheduled %d chunks of %s thumbnails generation" % (chunks, source_name)
+        )
+
+    def warm(self, source_name, processes, chunk_size):
+        self.stdout.write("Generating %s thumbnails:" % source_name)
+        totals = warm_all_thumbnails(
+            source_name, processes, chunk_size, progress=self.write_progress
+        )
+        self.stdout.write("Done: %s" % self.format_totals(totals))
+        if totals["failed"]:
+            self.stderr.write(
+                "Failed to generate %d thumbnails, see the logs for details"
+                % totals["failed"]
+            )
+
+    def write_progress(self, totals):
+        self.stdout.write("  %s" % self.format_totals(totals))
+
+    @staticmethod
+    def format_totals(totals):
+        return (
+            "%(images)d images in %(seconds).1fs (%(images_per_second).1f/s), "
+            "%(created)d thumbnails created, %(failed)d failed" % totals
         )
-        num_created, failed_to_create = warmer.warm()
-        self.log_failed_images(failed_to_create)
-
-    def log_failed_images(self, failed_to_create):
-        if failed_to_create:
-            self.stderr.write("Failed to generate thumbnails:")
-            for patch in failed_to_create:
-                self.stderr.write(patch)
@@ -1,3 +1,4 @@
+import copy
 import logging
 import random
 import re
@@ -8,14 +9,15 @@ from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language, ugettext_lazy as _
 from django_countries.fields import Country
 
-from ..discount.utils import fetch_discounts
+from ..discount.utils import fetch_active_discounts
 from ..extensions.manager import get_extensions_manager
+from ..graphql.api import schema
 from ..graphql.views import GraphQLView
+from ..site.patch_sites import refresh_site_cache
 from . import analytics
 from .exceptions import ReadOnlyException
 from .utils import get_client_ip, get_country_by_ip, get_currency_for_country
@@ -49,21 +51,26 @@ def discounts(get_response):
     """Assign active discounts to `request.discounts`."""
 
     def middleware(request):
-        request.discounts = SimpleLazyObject(lambda: fetch_discounts(timezone.now()))
+        request.discounts = SimpleLazyObject(fetch_active_discounts)
         return get_response(request)
 
     return middleware
 
 
 def country(get_response):
-    """Detect the user's country and assign it to `request.country`."""
+    """Detect the user's country and assign it to `request.country`.
 
-    def middleware(request):
+    The country is detected when first used, so requests that never use it
+    do not look up the IP address.
+    """
+
+    def _get_country(request):
         client_ip = get_client_ip(request)
-        if client_ip:
-            request.country = get_country_by_ip(client_ip)
-        if not request.country:
-            request.country = Country(settings.DEFAULT_COUNTRY)
+        country = get_country_by_ip(client_ip) if client_ip else None
+        return country or Country(settings.DEFAULT_COUNTRY)
+
+    def middleware(request):
+        request.country = SimpleLazyObject(lambda: _get_country(request))
         return get_response(request)
 
     return middleware
@@ -72,30 +79,38 @@ def country(get_response):
 def currency(get_response):
     """Take a country and assign a matching currency to `request.currency`."""
 
-    def middleware(request):
+    def _get_currency(request):
         if hasattr(request, "country") and request.country is not None:
-            request.currency = get_currency_for_country(request.country)
-        else:
-            request.currency = settings.DEFAULT_CURRENCY
+            return get_currency_for_country(request.country)
+        return settings.DEFAULT_CURRENCY
+
+    def middleware(request):
+        # Computed when first used, so the country is not detected before it
+        # is needed
+        request.currency = SimpleLazyObject(lambda: _get_currency(request))
         return get_response(request)
 
     return middleware
 
 
 def site(get_response):
-    """Clear the Sites cache and assign the current site to `request.site`.
+    """Refresh the Sites cache and assign the current site to `request.site`.
 
     By default django.contrib.sites caches Site instances at the module
     level. This leads to problems when updating Site instances, as it's
     required to restart all application servers in order to invalidate
-    the cache. Using this middleware solves this problem.
+    the cache. Using this middleware solves this problem, cached sites are
+    dropped as soon as a site or its settings are changed by any process.
+
+    Each request gets its own copy of the cached site, so changes made to it
+    but never saved do not leak into other requests.
     """
 
     def _get_site():
-        Site.objects.clear_cache()
-        return Site.objects.get_current()
+        return copy.deepcopy(Site.objects.get_current())
 
     def middleware(request):
+        refresh_site_cache()
         request.site = SimpleLazyObject(_get_site)
         return get_response(request)
 
@@ -191,13 +206,16 @@ class ReadOnlyMiddleware:
         return is_post and any(self._is_url_blocked(request_url))
 
     def _is_graphql_request_blocked(self, request):
-
+        # Documents parsed here are stored in the shared document cache and
+        # reused by the API view when the request is executed.
+        view = GraphQLView(schema=schema)
         body = GraphQLView.parse_body(request)
         if not isinstance(body, list):
             body = [body]
         for data in body:
             query, _, _ = GraphQLView.get_graphql_params(request, data)
-            document, _ = GraphQLView().parse_query(query)
+            query_hash = GraphQLView.get_persisted_query_hash(data)
+            document, _ = view.parse_query(query, query_hash)
             if not document:
                 return False
 
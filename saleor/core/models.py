@@ -1,6 +1,6 @@
 import datetime
 
-from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields import ArrayField, JSONField
 from django.db import models
 from django.db.models import F, Max, Q
 
@@ -102,3 +102,19 @@ class ModelWithMetadata(models.Model):
 
     def clear_stored_meta_for_client(self, namespace: str, client: str):
         self.meta.get(namespace, {}).pop(client, None)
+
+
+class WarmedImage(models.Model):
+    """Thumbnails created for an image by warming them in bulk.
+
+    Warming skips the renditions recorded here, as long as the image of the
+    object is still the one they were created from.
+    """
+
+    source = models.CharField(max_length=32)
+    object_id = models.PositiveIntegerField()
+    image = models.CharField(max_length=255)
+    renditions = ArrayField(models.CharField(max_length=64), default=list)
+
+    class Meta:
+        unique_together = (("source", "object_id"),)
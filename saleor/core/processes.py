@@ -0,0 +1,30 @@
+from typing import Callable, Iterable, Iterator
+
+from billiard import Pool
+from django.db import connections
+
+
+def map_in_processes(
+    func: Callable, iterable: Iterable, processes: int, ordered: bool = True
+) -> Iterator:
+    """Yield the results of calling the function with each item of the iterable.
+
+    The items are processed by a pool of processes, or by the current process
+    if only one is used. With `ordered` false the results are yielded as soon
+    as they are ready. Billiard is used, as unlike multiprocessing it can
+    start the pool in a Celery worker.
+    """
+    if processes <= 1:
+        yield from map(func, iterable)
+        return
+    # Workers must not share the connection inherited from this process
+    connections.close_all()
+    pool = Pool(processes)
+    try:
+        if ordered:
+            yield from pool.imap(func, iterable)
+        else:
+            yield from pool.imap_unordered(func, iterable)
+    finally:
+        pool.close()
+        pool.join()
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage, get_storage_class
 from storages.backends.gcloud import GoogleCloudStorage
 from storages.backends.s3boto3 import S3Boto3Storage
 
@@ -14,3 +15,33 @@ class GCSMediaStorage(GoogleCloudStorage):
     def __init__(self, *args, **kwargs):
         self.bucket_name = settings.GS_MEDIA_BUCKET_NAME
         super().__init__(*args, **kwargs)
+
+
+class PrivateFileSystemStorage(FileSystemStorage):
+    """Store files outside of the media root, so they are not served publicly."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("location", settings.PRIVATE_MEDIA_ROOT)
+        kwargs.setdefault("base_url", None)
+        super().__init__(*args, **kwargs)
+
+
+class S3PrivateStorage(S3Boto3Storage):
+    def __init__(self, *args, **kwargs):
+        self.bucket_name = settings.AWS_PRIVATE_BUCKET_NAME
+        self.default_acl = "private"
+        self.querystring_auth = True
+        self.custom_domain = None
+        super().__init__(*args, **kwargs)
+
+
+class GCSPrivateStorage(GoogleCloudStorage):
+    def __init__(self, *args, **kwargs):
+        self.bucket_name = settings.GS_PRIVATE_BUCKET_NAME
+        self.default_acl = "private"
+        super().__init__(*args, **kwargs)
+
+
+def get_private_storage():
+    """Return the storage of files which must not be publicly available."""
+    return get_storage_class(settings.PRIVATE_FILE_STORAGE)()
@@ -0,0 +1,32 @@
+import logging
+import time
+
+from ..celeryconf import app
+from .thumbnails import iter_chunks, warm_thumbnails
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_thumbnails_warming(source_name: str, chunk_size: int) -> int:
+    """Warm thumbnails of all the images of the source in Celery workers.
+
+    Return the number of scheduled chunks.
+    """
+    chunks = 0
+    for pks in iter_chunks(source_name, chunk_size):
+        warm_thumbnails_task.delay(source_name, pks)
+        chunks += 1
+    return chunks
+
+
+@app.task
+def warm_thumbnails_task(source_name, pks):
+    start = time.monotonic()
+    stats = warm_thumbnails(source_name, pks)
+    seconds = time.monotonic() - start
+    stats["images_per_second"] = stats["images"] / seconds if seconds else 0.0
+    logger.info(
+        "Warmed thumbnails of %(images)d images (%(images_per_second).1f/s): "
+        "created %(created)d, failed %(failed)d.",
+        stats,
+    )
@@ -0,0 +1,195 @@
+"""Warming thumbnails of all the images in bulk.
+
+Images are processed in chunks, either by a pool of processes or by Celery
+workers. Renditions created for every image are recorded, so warming again
+creates only the missing ones, e.g. of a newly added size.
+"""
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Set
+
+from django.apps import apps
+from versatileimagefield.settings import cache as rendition_cache
+
+from .models import WarmedImage
+from .processes import map_in_processes
+from .utils.thumbnails import get_rendition, get_renditions
+
+logger = logging.getLogger(__name__)
+
+# Number of threads checking in parallel whether renditions of a chunk exist
+STORAGE_CHECK_THREADS = 16
+
+
+class ThumbnailSource(NamedTuple):
+    model: str
+    image_attr: str
+    rendition_key_set: str
+
+
+THUMBNAIL_SOURCES = {
+    "products": ThumbnailSource("product.ProductImage", "image", "products"),
+    "categories": ThumbnailSource(
+        "product.Category", "background_image", "background_images"
+    ),
+    "collections": ThumbnailSource(
+        "product.Collection", "background_image", "background_images"
+    ),
+    "user_avatars": ThumbnailSource("account.User", "avatar", "user_avatars"),
+}
+
+
+def get_existing_paths(storage, paths: Iterable[str]) -> Set[str]:
+    """Return the paths which exist in the storage.
+
+    Storages check a single path at a time, so the checks of a whole chunk are
+    made in parallel rather than waiting for each request in turn.
+    """
+    paths = list(paths)
+    if not paths:
+        return set()
+    with ThreadPoolExecutor(STORAGE_CHECK_THREADS) as executor:
+        exist = executor.map(storage.exists, paths)
+        return {path for path, path_exists in zip(paths, exist) if path_exists}
+
+
+def get_image_queryset(source_name: str):
+    source = THUMBNAIL_SOURCES[source_name]
+    model = apps.get_model(source.model)
+    return (
+        model.objects.exclude(**{"%s__isnull" % source.image_attr: True})
+        .exclude(**{source.image_attr: ""})
+        .order_by("pk")
+    )
+
+
+def iter_chunks(source_name: str, chunk_size: int) -> Iterator[List[int]]:
+    """Yield primary keys of the objects with images, in chunks."""
+    queryset = get_image_queryset(source_name).values_list("pk", flat=True)
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def _record_renditions(source_name, warmed, records):
+    to_create, to_update = [], []
+    for pk, (image, renditions) in warmed.items():
+        record = records.get(pk)
+        if record is None:
+            to_create.append(
+                WarmedImage(
+                    source=source_name,
+                    object_id=pk,
+                    image=image,
+                    renditions=sorted(renditions),
+                )
+            )
+        elif record.image != image or set(record.renditions) != renditions:
+            record.image = image
+            record.renditions = sorted(renditions)
+            to_update.append(record)
+    WarmedImage.objects.bulk_create(to_create, ignore_conflicts=True)
+    WarmedImage.objects.bulk_update(to_update, ["image", "renditions"])
+
+
+def warm_thumbnails(source_name: str, pks: Iterable[int]) -> Dict[str, int]:
+    """Create the missing thumbnails of the objects' images.
+
+    Renditions already recorded for an image are skipped without touching the
+    storage. The others are created unless they exist in the storage already.
+    Return the number of processed images, created and failed renditions.
+    """
+    source = THUMBNAIL_SOURCES[source_name]
+    renditions = get_renditions(source.rendition_key_set)
+    instances = get_image_queryset(source_name).filter(pk__in=pks)
+    records = {
+        record.object_id: record
+        for record in WarmedImage.objects.filter(source=source_name, object_id__in=pks)
+    }
+    stats = {"images": 0, "created": 0, "failed": 0}
+    warmed = {}
+    missing = []
+    for instance in instances.only("pk", source.image_attr):
+        image_file = getattr(instance, source.image_attr)
+        stats["images"] += 1
+        record = records.get(instance.pk)
+        done = set()
+        if record is not None and record.image == image_file.name:
+            done.update(record.renditions)
+        warmed[instance.pk] = (image_file.name, done)
+        image_file.create_on_demand = False
+        for rendition in renditions:
+            if rendition not in done:
+                sized_image = get_rendition(image_file, rendition)
+                missing.append((instance.pk, image_file, rendition, sized_image))
+
+    if missing:
+        storage = missing[0][1].storage
+        paths = [sized_image.name for *_, sized_image in missing]
+        existing = get_existing_paths(storage, paths)
+        # Renditions are not created if cached as existing, which is outdated
+        rendition_cache.delete_many(
+            [
+                sized_image.url
+                for *_, sized_image in missing
+                if sized_image.name not in existing
+            ]
+        )
+        for pk, image_file, rendition, sized_image in missing:
+            path = sized_image.name
+            if path not in existing:
+                image_file.create_on_demand = True
+                try:
+                    get_rendition(image_file, rendition)
+                except Exception:
+                    logger.exception("Failed to create thumbnail %s", path)
+                    stats["failed"] += 1
+                    continue
+                stats["created"] += 1
+            warmed[pk][1].add(rendition)
+    _record_renditions(source_name, warmed, records)
+    return stats
+
+
+def _warm_chunk(args):
+    return warm_thumbnails(*args)
+
+
+def _get_totals(totals: Counter, start: float) -> Dict[str, float]:
+    seconds = time.monotonic() - start
+    images = totals["images"]
+    return {
+        "images": images,
+        "created": totals["created"],
+        "failed": totals["failed"],
+        "seconds": seconds,
+        "images_per_second": images / seconds if seconds else 0.0,
+    }
+
+
+def warm_all_thumbnails(
+    source_name: str,
+    processes: int,
+    chunk_size: int,
+    progress: Callable[[Dict[str, float]], None] = None,
+) -> Dict[str, float]:
+    """Create the missing thumbnails of all the images using a process pool.
+
+    With a single process the chunks are warmed in the current one. Call
+    `progress` with the totals so far each time a chunk is done. Return the
+    totals, including the time taken and the images per second.
+    """
+    chunks = [(source_name, pks) for pks in iter_chunks(source_name, chunk_size)]
+    totals: Counter = Counter()
+    start = time.monotonic()
+    for stats in map_in_processes(_warm_chunk, chunks, processes, ordered=False):
+        totals.update(stats)
+        if progress is not None:
+            progress(_get_totals(totals, start))
+    return _get_totals(totals, start)
@@ -1,9 +1,11 @@
 import decimal
 import logging
 import socket
+from functools import lru_cache
 from json import JSONEncoder
 from urllib.parse import urljoin
 
+import maxminddb
 from babel.numbers import get_territory_currencies
 from django import forms
 from django.conf import settings
@@ -23,10 +25,19 @@ from versatileimagefield.image_warmer import VersatileImageFieldWarmer
 
 from ...celeryconf import app
 from ...core.i18n import COUNTRY_CODE_CHOICES
+from .thumbnails import create_webp_thumbnails
 
-georeader = geolite2.reader()
 logger = logging.getLogger(__name__)
 
+# Memory-mapped modes share pages of the database between the processes
+GEOIP_READER_MODES = {
+    "auto": maxminddb.MODE_AUTO,
+    "mmap_ext": maxminddb.MODE_MMAP_EXT,
+    "mmap": maxminddb.MODE_MMAP,
+    "file": maxminddb.MODE_FILE,
+    "memory": maxminddb.MODE_MEMORY,
+}
+
 
 class CategoryChoiceField(forms.ModelChoiceField):
     def label_from_instance(self, obj):
@@ -86,12 +97,31 @@ def get_client_ip(request):
     return request.META.get("REMOTE_ADDR", None)
 
 
-def get_country_by_ip(ip_address):
-    geo_data = georeader.get(ip_address)
+@lru_cache(maxsize=None)
+def get_geo_reader():
+    """Return the reader of the GeoLite2 database, opened on the first lookup.
+
+    The database is opened in the mode set by `GEOIP_READER_MODE`.
+    """
+    return maxminddb.open_database(
+        geolite2.filename, GEOIP_READER_MODES[settings.GEOIP_READER_MODE]
+    )
+
+
+@lru_cache(maxsize=settings.GEOIP_CACHE_SIZE)
+def get_country_code_by_ip(ip_address):
+    geo_data = get_geo_reader().get(ip_address)
     if geo_data and "country" in geo_data and "iso_code" in geo_data["country"]:
         country_iso_code = geo_data["country"]["iso_code"]
         if country_iso_code in countries:
-            return Country(country_iso_code)
+            return country_iso_code
+    return None
+
+
+def get_country_by_ip(ip_address):
+    country_code = get_country_code_by_ip(ip_address)
+    if country_code:
+        return Country(country_code)
     return None
 
 
@@ -175,6 +205,10 @@ def create_thumbnails(pk, model, size_set, image_attr=None):
     )
     logger.info("Creating thumbnails for  %s", pk)
     num_created, failed_to_create = warmer.warm()
+    if settings.WEBP_THUMBNAILS:
+        num_webp_created, failed_webp = create_webp_thumbnails(image_instance, size_set)
+        num_created += num_webp_created
+        failed_to_create += failed_webp
     if num_created:
         logger.info("Created %d thumbnails", num_created)
     if failed_to_create:
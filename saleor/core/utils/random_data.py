@@ -24,7 +24,7 @@ from ...checkout import AddressType
 from ...core.weight import zero_weight
 from ...discount import DiscountValueType, VoucherType
 from ...discount.models import Sale, Voucher
-from ...discount.utils import fetch_discounts
+from ...discount.utils import fetch_discounts, invalidate_active_discounts
 from ...extensions.manager import get_extensions_manager
 from ...giftcard.models import GiftCard
 from ...menu.models import Menu
@@ -55,6 +55,10 @@ from ...product.thumbnails import (
     create_collection_background_image_thumbnails,
     create_product_thumbnails,
 )
+from ...product.utils.attributes import (
+    update_assigned_product_attributes_sort_keys,
+    update_products_attribute_value_ids,
+)
 from ...shipping.models import ShippingMethod, ShippingMethodType, ShippingZone
 
 fake = Factory.create()
@@ -306,6 +310,8 @@ def create_products_by_schema(placeholder_dir, create_images):
     assign_attributes_to_variants(
         variant_attributes=types["product.assignedvariantattribute"]
     )
+    update_products_attribute_value_ids(Product.objects.values_list("pk", flat=True))
+    update_assigned_product_attributes_sort_keys(AssignedProductAttribute.objects.all())
     create_collections(
         data=types["product.collection"], placeholder_dir=placeholder_dir
     )
@@ -534,6 +540,7 @@ def create_orders(how_many=10):
 def create_product_sales(how_many=5):
     for dummy in range(how_many):
         sale = create_fake_sale()
+        invalidate_active_discounts()
         update_products_minimal_variant_prices_of_discount_task.delay(sale.pk)
         yield "Sale: %s" % (sale,)
 
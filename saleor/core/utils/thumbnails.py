@@ -0,0 +1,106 @@
+import logging
+from io import BytesIO
+from typing import List, NamedTuple, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.translation import pgettext_lazy
+from PIL import Image
+from versatileimagefield.settings import (
+    VERSATILEIMAGEFIELD_CACHE_LENGTH,
+    cache as rendition_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailFormat:
+    WEBP = "webp"
+
+    CHOICES = [(WEBP, pgettext_lazy("Thumbnail image format", "WebP"))]
+
+
+class Thumbnail(NamedTuple):
+    name: str
+    url: str
+
+
+def get_renditions(rendition_key_set: str) -> List[str]:
+    """Return renditions of the key set, e.g. `thumbnail__540x540`.
+
+    With WebP thumbnails enabled, each size has also a WebP rendition,
+    e.g. `thumbnail__540x540__webp`.
+    """
+    key_set = settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS[rendition_key_set]
+    renditions = {rendition for _, rendition in key_set}
+    if settings.WEBP_THUMBNAILS:
+        renditions.update(
+            ["%s__%s" % (rendition, ThumbnailFormat.WEBP) for rendition in renditions]
+        )
+    return sorted(renditions)
+
+
+def get_rendition(image_file, rendition: str):
+    """Return the rendition of the image, creating it if created on demand."""
+    sizer, size, *image_format = rendition.split("__")
+    thumbnail = getattr(image_file, sizer)[size]
+    if image_format == [ThumbnailFormat.WEBP]:
+        return get_webp_thumbnail(thumbnail, image_file.create_on_demand)
+    return thumbnail
+
+
+def get_webp_path(path: str) -> str:
+    """Return the path of the WebP version of the thumbnail.
+
+    The source extension is kept, so thumbnails of `image.jpg` and `image.png`
+    don't overwrite each other's WebP version.
+    """
+    return "%s.%s" % (path, ThumbnailFormat.WEBP)
+
+
+def create_webp_thumbnail(storage, thumbnail_path: str, path: str):
+    """Save the thumbnail in the WebP format under the given path."""
+    with storage.open(thumbnail_path) as thumbnail_file:
+        image = Image.open(thumbnail_file)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "P") and "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    content = BytesIO()
+    image.save(content, format="WEBP", quality=settings.WEBP_THUMBNAIL_QUALITY)
+    storage.save(path, ContentFile(content.getvalue()))
+
+
+def get_webp_thumbnail(thumbnail, create_on_demand: bool) -> Thumbnail:
+    """Return the WebP version of the thumbnail.
+
+    It is converted from the thumbnail, so it shares its size and orientation.
+    """
+    storage = thumbnail.storage
+    path = get_webp_path(thumbnail.name)
+    url = storage.url(path)
+    if create_on_demand and not rendition_cache.get(url):
+        if not storage.exists(path):
+            create_webp_thumbnail(storage, thumbnail.name, path)
+        rendition_cache.set(url, 1, VERSATILEIMAGEFIELD_CACHE_LENGTH)
+    return Thumbnail(name=path, url=url)
+
+
+def create_webp_thumbnails(image_file, rendition_key_set: str) -> Tuple[int, List]:
+    """Create the missing WebP thumbnails of the image.
+
+    Return the number of thumbnails and the renditions which failed.
+    """
+    image_file.create_on_demand = True
+    num_created, failed_to_create = 0, []
+    for rendition in get_renditions(rendition_key_set):
+        if not rendition.endswith("__%s" % ThumbnailFormat.WEBP):
+            continue
+        try:
+            get_rendition(image_file, rendition)
+        except Exception:
+            logger.exception("Failed to create thumbnail %s", rendition)
+            failed_to_create.append(rendition)
+        else:
+            num_created += 1
+    return num_created, failed_to_create
@@ -10,6 +10,7 @@ from ...core.taxes import zero_money
 from ...core.utils.promo_code import generate_promo_code
 from ...discount import DiscountValueType
 from ...discount.models import Sale, Voucher
+from ...discount.utils import invalidate_active_discounts
 from ...product.models import Category, Product
 from ...product.tasks import update_products_minimal_variant_prices_of_discount_task
 from ..forms import AjaxSelect2MultipleChoiceField, MoneyModelForm
@@ -84,6 +85,7 @@ class SaleForm(forms.ModelForm):
 
     def save(self, commit=True):
         instance = super().save(commit=commit)
+        invalidate_active_discounts()
         update_products_minimal_variant_prices_of_discount_task.delay(instance.pk)
         return instance
 
@@ -11,6 +11,7 @@ from django.utils.translation import pgettext_lazy
 from ...core.utils import get_paginator_items
 from ...discount import VoucherType
 from ...discount.models import Sale, Voucher
+from ...discount.utils import invalidate_active_discounts
 from ..views import staff_member_required
 from . import forms
 from .filters import SaleFilter, VoucherFilter
@@ -81,6 +82,7 @@ def sale_delete(request, pk):
     instance = get_object_or_404(Sale, pk=pk)
     if request.method == "POST":
         instance.delete()
+        invalidate_active_discounts()
         msg = pgettext_lazy("Sale (discount) message", "Removed sale %s") % (
             instance.name,
         )
@@ -0,0 +1,11 @@
+from django.utils.translation import pgettext_lazy
+
+
+class OrderBulkAction:
+    """Represents types of order bulk actions handled in dashboard."""
+
+    PACKING_SLIPS = "packing-slips"
+
+    CHOICES = [
+        (PACKING_SLIPS, pgettext_lazy("order bulk action", "Print packing slips"))
+    ]
@@ -15,7 +15,7 @@ from ...core.taxes import zero_taxed_money
 from ...discount.models import Voucher
 from ...discount.utils import decrease_voucher_usage, increase_voucher_usage
 from ...extensions.manager import get_extensions_manager
-from ...order import OrderStatus, events
+from ...order import FulfillmentStatus, OrderStatus, events
 from ...order.actions import (
     cancel_fulfillment,
     cancel_order,
@@ -36,6 +36,7 @@ from ...product.utils import allocate_stock, deallocate_stock
 from ...shipping.models import ShippingMethod
 from ..forms import AjaxSelect2ChoiceField
 from ..widgets import PhonePrefixWidget
+from . import OrderBulkAction
 from .utils import remove_customer_from_order, update_order_with_user_addresses
 
 
@@ -528,6 +529,42 @@ class CancelFulfillmentForm(forms.Form):
         cancel_fulfillment(self.fulfillment, user, self.cleaned_data.get("restock"))
 
 
+class PackingSlipsBulkForm(forms.Form):
+    """Select fulfillments whose packing slips are archived together.
+
+    Fulfillments are selected directly or by their orders, e.g. in the order list.
+    """
+
+    action = forms.ChoiceField(choices=OrderBulkAction.CHOICES, required=False)
+    fulfillments = forms.ModelMultipleChoiceField(
+        queryset=Fulfillment.objects.filter(status=FulfillmentStatus.FULFILLED),
+        required=False,
+    )
+    orders = forms.ModelMultipleChoiceField(
+        queryset=Order.objects.confirmed(), required=False
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("fulfillments") and not cleaned_data.get("orders"):
+            raise forms.ValidationError(
+                pgettext_lazy(
+                    "Packing slips bulk form error", "No fulfillments were selected."
+                )
+            )
+        return cleaned_data
+
+    def get_fulfillment_pks(self):
+        fulfillments = self.cleaned_data["fulfillments"]
+        orders = self.cleaned_data["orders"]
+        fulfillments_of_orders = Fulfillment.objects.filter(
+            order__in=orders, status=FulfillmentStatus.FULFILLED
+        )
+        pks = set(fulfillments.values_list("pk", flat=True))
+        pks.update(fulfillments_of_orders.values_list("pk", flat=True))
+        return sorted(pks)
+
+
 class FulfillmentTrackingNumberForm(forms.ModelForm):
     """Update tracking number in fulfillment group."""
 
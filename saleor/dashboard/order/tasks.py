@@ -0,0 +1,87 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ...celeryconf import app
+from ...core.cache import schedule_once
+from .utils import (
+    create_packing_slips_archive,
+    delete_old_pdfs,
+    get_packing_slips_archive_path,
+    store_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+PDF_SCHEDULED_CACHE_KEY = "pdf-scheduled-%s"
+# Time after which creation of a PDF is scheduled again even if the previously
+# scheduled task did not finish
+PDF_SCHEDULED_TIMEOUT = 5 * 60
+
+PACKING_SLIPS_ARCHIVE_CACHE_KEY = "packing-slips-archive-%s"
+# Time after which an archive which is still not created is considered failed,
+# e.g. if the worker creating it was killed
+PACKING_SLIPS_ARCHIVE_TIMEOUT = 60 * 60
+
+
+class ArchiveJobStatus:
+    PENDING = "pending"
+    FAILED = "failed"
+
+
+def schedule_pdf_creation(path, rendered_template, absolute_url):
+    """Schedule creation of the PDF unless it is already scheduled."""
+    schedule_once(
+        PDF_SCHEDULED_CACHE_KEY % path,
+        PDF_SCHEDULED_TIMEOUT,
+        create_pdf_task,
+        (path, rendered_template, absolute_url),
+    )
+
+
+@app.task
+def create_pdf_task(path, rendered_template, absolute_url):
+    try:
+        store_pdf(path, rendered_template, absolute_url)
+    finally:
+        cache.delete(PDF_SCHEDULED_CACHE_KEY % path)
+
+
+def schedule_packing_slips_archive_creation(job_id, fulfillment_pks, absolute_url):
+    cache.set(
+        PACKING_SLIPS_ARCHIVE_CACHE_KEY % job_id,
+        ArchiveJobStatus.PENDING,
+        PACKING_SLIPS_ARCHIVE_TIMEOUT,
+    )
+    create_packing_slips_archive_task.delay(job_id, fulfillment_pks, absolute_url)
+
+
+def get_packing_slips_archive_status(job_id):
+    """Return the status of the job, or None if it is unknown or timed out."""
+    return cache.get(PACKING_SLIPS_ARCHIVE_CACHE_KEY % job_id)
+
+
+@app.task
+def create_packing_slips_archive_task(job_id, fulfillment_pks, absolute_url):
+    try:
+        create_packing_slips_archive(
+            get_packing_slips_archive_path(job_id),
+            fulfillment_pks,
+            absolute_url,
+            settings.PDF_RENDERING_PROCESSES,
+        )
+    except Exception:
+        cache.set(
+            PACKING_SLIPS_ARCHIVE_CACHE_KEY % job_id,
+            ArchiveJobStatus.FAILED,
+            PACKING_SLIPS_ARCHIVE_TIMEOUT,
+        )
+        raise
+
+
+@app.task
+def delete_old_pdfs_task():
+    deleted = delete_old_pdfs(settings.PDF_RETENTION)
+    if deleted:
+        logger.info("Deleted %d old PDFs.", deleted)
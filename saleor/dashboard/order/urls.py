@@ -109,6 +109,16 @@ urlpatterns = [
         name="fulfillment-packing-slips",
     ),
     url(r"^(?P<order_pk>\d+)/invoice/$", views.order_invoice, name="order-invoice"),
+    url(
+        r"^fulfillments/packing-slips/$",
+        views.fulfillments_packing_slips_bulk,
+        name="fulfillments-packing-slips-bulk",
+    ),
+    url(
+        r"^fulfillments/packing-slips/(?P<job_id>[0-9a-f]{32})/$",
+        views.fulfillments_packing_slips_archive,
+        name="fulfillments-packing-slips-archive",
+    ),
     url(
         r"^(?P<order_pk>\d+)/mark-as-paid/$",
         views.mark_order_as_paid,
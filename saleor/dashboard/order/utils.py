@@ -1,17 +1,31 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from typing import Iterable, Tuple
+
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.files import File
+from django.core.files.base import ContentFile
 from django.template.loader import get_template
+from django.utils import timezone
 from django.utils.translation import pgettext
 
 from ...checkout import AddressType
+from ...core.processes import map_in_processes
+from ...core.storages import get_private_storage
 from ...core.taxes import zero_money
 from ...discount import VoucherType
 from ...discount.models import NotApplicable
 from ...discount.utils import get_products_voucher_discount, validate_voucher_in_order
+from ...order.models import Fulfillment
 
 INVOICE_TEMPLATE = "dashboard/order/pdf/invoice.html"
 PACKING_SLIP_TEMPLATE = "dashboard/order/pdf/packing_slip.html"
+PDF_STORAGE_DIRECTORY = "pdf"
 
 
 def get_statics_absolute_url(request):
@@ -31,22 +45,102 @@ def _create_pdf(rendered_template, absolute_url):
     return pdf_file
 
 
-def create_invoice_pdf(order, absolute_url):
+def render_invoice(order):
     ctx = {"order": order, "site": Site.objects.get_current()}
-    rendered_template = get_template(INVOICE_TEMPLATE).render(ctx)
-    pdf_file = _create_pdf(rendered_template, absolute_url)
-    return pdf_file, order
+    return get_template(INVOICE_TEMPLATE).render(ctx)
 
 
-def create_packing_slip_pdf(order, fulfillment, absolute_url):
+def render_packing_slip(order, fulfillment):
     ctx = {
         "order": order,
         "fulfillment": fulfillment,
         "site": Site.objects.get_current(),
     }
-    rendered_template = get_template(PACKING_SLIP_TEMPLATE).render(ctx)
-    pdf_file = _create_pdf(rendered_template, absolute_url)
-    return pdf_file, order
+    return get_template(PACKING_SLIP_TEMPLATE).render(ctx)
+
+
+def get_pdf_path(name, rendered_template, absolute_url):
+    """Return the storage path of a PDF, versioned by its content.
+
+    The stored PDF is reused until the rendered document changes.
+    """
+    content = (absolute_url + rendered_template).encode()
+    version = hashlib.sha256(content).hexdigest()
+    return "%s/%s-%s.pdf" % (PDF_STORAGE_DIRECTORY, name, version)
+
+
+def store_pdf(path, rendered_template, absolute_url):
+    """Create the PDF and save it in the storage unless it is stored already."""
+    storage = get_private_storage()
+    if not storage.exists(path):
+        pdf_file = _create_pdf(rendered_template, absolute_url)
+        storage.save(path, ContentFile(pdf_file))
+
+
+def get_packing_slips_archive_path(job_id):
+    return "%s/packing-slips-%s.zip" % (PDF_STORAGE_DIRECTORY, job_id)
+
+
+def _store_packing_slip(args: Tuple[int, str]) -> Tuple[str, str]:
+    fulfillment_pk, absolute_url = args
+    fulfillment = (
+        Fulfillment.objects.select_related(
+            "order__user", "order__shipping_address", "order__billing_address"
+        )
+        .prefetch_related("lines__order_line")
+        .get(pk=fulfillment_pk)
+    )
+    rendered_template = render_packing_slip(fulfillment.order, fulfillment)
+    path = get_pdf_path(
+        "packing-slip-%s" % fulfillment.pk, rendered_template, absolute_url
+    )
+    store_pdf(path, rendered_template, absolute_url)
+    name = "packing-slip-%s-%s.pdf" % (fulfillment.order_id, fulfillment.pk)
+    return path, name
+
+
+def create_packing_slips_archive(
+    path, fulfillment_pks: Iterable[int], absolute_url, processes
+):
+    """Save an archive of packing slips of the fulfillments in the storage.
+
+    The slips are created in parallel by a pool of processes. Each one is
+    stored separately too, so it is reused by later downloads and archives.
+    """
+    pks = Fulfillment.objects.filter(pk__in=fulfillment_pks).values_list(
+        "pk", flat=True
+    )
+    args = [(pk, absolute_url) for pk in pks.order_by("order_id", "pk")]
+    slips = list(map_in_processes(_store_packing_slip, args, processes))
+    storage = get_private_storage()
+    with tempfile.TemporaryFile() as archive_file:
+        # PDFs are compressed already
+        with zipfile.ZipFile(archive_file, "w", zipfile.ZIP_STORED) as archive:
+            for slip_path, name in slips:
+                with storage.open(slip_path) as slip_file:
+                    archive.writestr(name, slip_file.read())
+        archive_file.seek(0)
+        storage.save(path, File(archive_file))
+
+
+def delete_old_pdfs(retention: timedelta) -> int:
+    """Delete PDFs and archives stored for longer than the retention period.
+
+    Invoices and packing slips are created again when they are requested.
+    """
+    storage = get_private_storage()
+    try:
+        _, names = storage.listdir(PDF_STORAGE_DIRECTORY)
+    except FileNotFoundError:
+        return 0
+    created_before = timezone.now() - retention
+    deleted = 0
+    for name in names:
+        path = os.path.join(PDF_STORAGE_DIRECTORY, name)
+        if storage.get_modified_time(path) < created_before:
+            storage.delete(path)
+            deleted += 1
+    return deleted
 
 
 def update_order_with_user_addresses(order):
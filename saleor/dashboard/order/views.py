@@ -1,10 +1,12 @@
+import uuid
+
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
 from django.db import transaction
 from django.db.models import F, Q
 from django.forms import modelformset_factory
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.context_processors import csrf
 from django.template.response import TemplateResponse
@@ -13,6 +15,7 @@ from django.views.decorators.http import require_POST
 from django_prices.templatetags import prices
 
 from ...core.exceptions import InsufficientStock
+from ...core.storages import get_private_storage
 from ...core.utils import get_paginator_items
 from ...order import OrderStatus, events
 from ...order.actions import (
@@ -52,13 +55,22 @@ from .forms import (
     OrderRemoveShippingForm,
     OrderRemoveVoucherForm,
     OrderShippingForm,
+    PackingSlipsBulkForm,
     RefundPaymentForm,
     VoidPaymentForm,
 )
+from .tasks import (
+    ArchiveJobStatus,
+    get_packing_slips_archive_status,
+    schedule_packing_slips_archive_creation,
+    schedule_pdf_creation,
+)
 from .utils import (
-    create_invoice_pdf,
-    create_packing_slip_pdf,
+    get_packing_slips_archive_path,
+    get_pdf_path,
     get_statics_absolute_url,
+    render_invoice,
+    render_packing_slip,
     save_address_in_order,
 )
 
@@ -72,6 +84,7 @@ def order_list(request):
         order_filter.qs, settings.DASHBOARD_PAGINATE_BY, request.GET.get("page")
     )
     ctx = {
+        "bulk_action_form": PackingSlipsBulkForm(),
         "orders": orders,
         "filter_set": order_filter,
         "is_empty": not order_filter.queryset.exists(),
@@ -547,11 +560,13 @@ def order_invoice(request, order_pk):
     )
     order = get_object_or_404(orders, pk=order_pk)
     absolute_url = get_statics_absolute_url(request)
-    pdf_file, order = create_invoice_pdf(order, absolute_url)
-    response = HttpResponse(pdf_file, content_type="application/pdf")
-    name = "invoice-%s.pdf" % order.id
-    response["Content-Disposition"] = "filename=%s" % name
-    return response
+    rendered_template = render_invoice(order)
+    path = get_pdf_path("invoice-%s" % order.pk, rendered_template, absolute_url)
+    if not get_private_storage().exists(path):
+        schedule_pdf_creation(path, rendered_template, absolute_url)
+    return _stored_file_response(
+        request, path, "invoice-%s.pdf" % order.id, "application/pdf"
+    )
 
 
 @staff_member_required
@@ -584,9 +599,57 @@ def fulfillment_packing_slips(request, order_pk, fulfillment_pk):
     fulfillments = order.fulfillments.prefetch_related("lines", "lines__order_line")
     fulfillment = get_object_or_404(fulfillments, pk=fulfillment_pk)
     absolute_url = get_statics_absolute_url(request)
-    pdf_file, order = create_packing_slip_pdf(order, fulfillment, absolute_url)
-    response = HttpResponse(pdf_file, content_type="application/pdf")
-    name = "packing-slip-%s.pdf" % (order.id,)
+    rendered_template = render_packing_slip(order, fulfillment)
+    path = get_pdf_path(
+        "packing-slip-%s" % fulfillment.pk, rendered_template, absolute_url
+    )
+    if not get_private_storage().exists(path):
+        schedule_pdf_creation(path, rendered_template, absolute_url)
+    return _stored_file_response(
+        request, path, "packing-slip-%s.pdf" % (order.id,), "application/pdf"
+    )
+
+
+@staff_member_required
+@permission_required("order.manage_orders")
+@require_POST
+def fulfillments_packing_slips_bulk(request):
+    """Schedule creation of an archive of packing slips of many fulfillments."""
+    form = PackingSlipsBulkForm(request.POST)
+    if not form.is_valid():
+        msg = pgettext_lazy(
+            "Dashboard message", "Select fulfilled orders to print packing slips"
+        )
+        messages.error(request, msg)
+        return redirect("dashboard:orders")
+    job_id = uuid.uuid4().hex
+    schedule_packing_slips_archive_creation(
+        job_id, form.get_fulfillment_pks(), get_statics_absolute_url(request)
+    )
+    return redirect("dashboard:fulfillments-packing-slips-archive", job_id=job_id)
+
+
+@staff_member_required
+@permission_required("order.manage_orders")
+def fulfillments_packing_slips_archive(request, job_id):
+    path = get_packing_slips_archive_path(job_id)
+    is_pending = get_packing_slips_archive_status(job_id) == ArchiveJobStatus.PENDING
+    if not is_pending and not get_private_storage().exists(path):
+        # The job failed, timed out or its archive was already deleted
+        return TemplateResponse(
+            request, "dashboard/order/pdf/failed.html", {}, status=500
+        )
+    return _stored_file_response(request, path, "packing-slips.zip", "application/zip")
+
+
+def _stored_file_response(request, path, name, content_type):
+    """Return the file stored under the path or a page waiting for it."""
+    storage = get_private_storage()
+    if not storage.exists(path):
+        return TemplateResponse(
+            request, "dashboard/order/pdf/pending.html", {}, status=202
+        )
+    response = FileResponse(storage.open(path), content_type=content_type)
     response["Content-Disposition"] = "filename=%s" % name
     return response
 
@@ -17,7 +17,10 @@ from ...product.models import (
     ProductType,
     ProductVariant,
 )
-from ...product.tasks import update_product_minimal_variant_price_task
+from ...product.tasks import (
+    update_product_minimal_variant_price_task,
+    update_products_attribute_value_ids_task,
+)
 from ...product.utils.availability import get_product_availability
 from ...product.utils.costs import get_margin_for_variant, get_product_costs_data
 from ..views import staff_member_required
@@ -282,6 +285,9 @@ def product_type_edit(request, pk):
     form = forms.ProductTypeForm(request.POST or None, instance=product_type)
     if form.is_valid():
         product_type = form.save()
+        if {"product_attributes", "variant_attributes"} & set(form.changed_data):
+            product_ids = list(product_type.products.values_list("pk", flat=True))
+            update_products_attribute_value_ids_task.delay(product_ids)
         msg = pgettext_lazy("Dashboard message", "Updated product type %s") % (
             product_type,
         )
@@ -386,6 +392,7 @@ def variant_delete(request, product_pk, variant_pk):
     if request.method == "POST":
         variant.delete()
         update_product_minimal_variant_price_task.delay(variant.product_id)
+        update_products_attribute_value_ids_task.delay([variant.product_id])
         msg = pgettext_lazy("Dashboard message", "Removed variant %s") % (variant.name,)
         messages.success(request, msg)
         return redirect("dashboard:product-details", pk=product.pk)
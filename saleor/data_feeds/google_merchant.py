@@ -1,22 +1,43 @@
 import csv
+import datetime
 import gzip
-from typing import Iterable
+import logging
+import resource
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.contrib.syndication.views import add_domain
+from django.core.cache import cache
 from django.core.files.storage import default_storage
+from django.db.models import F, Prefetch, Q
 from django.utils import timezone
 from django.utils.encoding import smart_text
 
 from ..core.taxes import zero_money
 from ..discount import DiscountInfo
-from ..discount.utils import fetch_discounts
-from ..product.models import Attribute, AttributeValue, Category, ProductVariant
+from ..discount.utils import fetch_active_discounts
+from ..product.models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    Category,
+    ProductVariant,
+)
+
+logger = logging.getLogger(__name__)
 
 CATEGORY_SEPARATOR = " > "
 
 FILE_PATH = "google-feed.csv.gz"
+DELTA_FILE_PATH = "google-feed-delta.csv.gz"
+FEED_LAST_RUN_CACHE_KEY = "google-feed-last-run-%s-of-%s"
+
+# Number of variants fetched from the database at once
+FEED_CHUNK_SIZE = 1000
+
+# Attributes checked in turn for the brand of an item
+BRAND_ATTRIBUTE_SLUGS = ["brand", "publisher"]
 
 ATTRIBUTES = [
     "id",
@@ -41,23 +62,74 @@ ATTRIBUTES = [
 ]
 
 
-def get_feed_file_url():
-    return default_storage.url(FILE_PATH)
+def get_feed_file_url(delta=False, shard=0, shards=1):
+    return default_storage.url(get_feed_file_path(delta, shard, shards))
+
+
+def get_feed_file_path(delta=False, shard=0, shards=1):
+    """Return the storage path of the feed or of one of its shards."""
+    path = DELTA_FILE_PATH if delta else FILE_PATH
+    if shards > 1:
+        name, extension = path.split(".", 1)
+        path = "%s-%d-of-%d.%s" % (name, shard + 1, shards, extension)
+    return path
+
+
+def _get_brand_attributes_prefetch(lookup, queryset):
+    queryset = (
+        queryset.filter(assignment__attribute__slug__in=BRAND_ATTRIBUTE_SLUGS)
+        .select_related("assignment__attribute")
+        .prefetch_related("values")
+    )
+    return Prefetch(lookup, queryset=queryset, to_attr="brand_attributes")
 
 
 def get_feed_items():
     items = ProductVariant.objects.all()
-    items = items.select_related("product")
+    items = items.select_related("product__category")
     items = items.prefetch_related(
         "images",
-        "product__category",
         "product__images",
-        "product__product_type__product_attributes",
-        "product__product_type__variant_attributes",
+        "product__collections",
+        _get_brand_attributes_prefetch(
+            "attributes", AssignedVariantAttribute.objects.all()
+        ),
+        _get_brand_attributes_prefetch(
+            "product__attributes", AssignedProductAttribute.objects.all()
+        ),
     )
     return items
 
 
+def get_feed_items_chunks(
+    chunk_size=FEED_CHUNK_SIZE, shard=0, shards=1, changed_since=None
+) -> Iterator[List[ProductVariant]]:
+    """Yield the variants of the feed in chunks.
+
+    Each chunk is fetched along with its related objects on its own, so memory
+    used does not grow with the size of the catalog. Variants are split into
+    `shards` by their primary keys. With `changed_since` only the variants
+    saved after that time, or of products saved after that time, are yielded.
+    """
+    variants = ProductVariant.objects.order_by("pk")
+    if shards > 1:
+        variants = variants.annotate(feed_shard=F("pk") % shards).filter(
+            feed_shard=shard
+        )
+    if changed_since is not None:
+        variants = variants.filter(
+            Q(updated_at__gt=changed_since) | Q(product__updated_at__gt=changed_since)
+        )
+    variants = variants.values_list("pk", flat=True)
+    last_pk = 0
+    while True:
+        pks = list(variants.filter(pk__gt=last_pk)[:chunk_size])
+        if not pks:
+            return
+        yield list(get_feed_items().filter(pk__in=pks).order_by("pk"))
+        last_pk = pks[-1]
+
+
 def item_id(item: ProductVariant):
     return item.sku
 
@@ -92,32 +164,29 @@ def item_condition(item: ProductVariant):
     return "new"
 
 
-def item_brand(item: ProductVariant, attributes_dict, attribute_values_dict):
+def _get_brand(assigned_attributes, slug):
+    for assigned_attribute in assigned_attributes:
+        if assigned_attribute.attribute.slug == slug:
+            values = assigned_attribute.values.all()
+            if values:
+                return smart_text(values[0])
+    return None
+
+
+def item_brand(item: ProductVariant):
     """Return an item brand.
 
     This field is required.
     Read more:
     https://support.google.com/merchants/answer/6324351?hl=en&ref_topic=6324338
     """
-    brand = None
-    brand_attribute_pk = attributes_dict.get("brand")
-    publisher_attribute_pk = attributes_dict.get("publisher")
-
-    if brand_attribute_pk:
-        brand = item.attributes.get(str(brand_attribute_pk))
-        if brand is None:
-            brand = item.product.attributes.get(str(brand_attribute_pk))
-
-    if brand is None and publisher_attribute_pk is not None:
-        brand = item.attributes.get(str(publisher_attribute_pk))
+    for slug in BRAND_ATTRIBUTE_SLUGS:
+        brand = _get_brand(item.brand_attributes, slug)
         if brand is None:
-            brand = item.product.attributes.get(str(publisher_attribute_pk))
-
-    if brand:
-        brand_name = attribute_values_dict.get(brand[0])
-        if brand_name is not None:
-            return brand_name
-    return brand
+            brand = _get_brand(item.product.brand_attributes, slug)
+        if brand is not None:
+            return brand
+    return None
 
 
 def item_tax(item: ProductVariant, discounts: Iterable[DiscountInfo]):
@@ -182,8 +251,6 @@ def item_attributes(
     category_paths,
     current_site,
     discounts: Iterable[DiscountInfo],
-    attributes_dict,
-    attribute_values_dict,
 ):
     product_data = {
         "id": item_id(item),
@@ -211,44 +278,80 @@ def item_attributes(
     if tax:
         product_data["tax"] = tax
 
-    brand = item_brand(item, attributes_dict, attribute_values_dict)
+    brand = item_brand(item)
     if brand:
         product_data["brand"] = brand
 
     return product_data
 
 
-def write_feed(file_obj):
-    """Write feed contents info provided file object."""
+def get_peak_memory() -> int:
+    """Return the peak memory used by the process so far, in kilobytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def write_feed(
+    file_obj,
+    chunk_size=FEED_CHUNK_SIZE,
+    shard=0,
+    shards=1,
+    changed_since: Optional[datetime.datetime] = None,
+) -> Dict[str, float]:
+    """Write feed contents info provided file object.
+
+    Variants are written in chunks, see `get_feed_items_chunks`. Return the
+    number of written rows, the rows per second and the peak memory used.
+    """
+    start = time.monotonic()
     writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
     writer.writeheader()
     categories = Category.objects.all()
-    discounts = fetch_discounts(timezone.now())
-    attributes_dict = {a.slug: a.pk for a in Attribute.objects.all()}
-    attribute_values_dict = {
-        smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
-    }
+    discounts = fetch_active_discounts()
     category_paths = {}
     current_site = Site.objects.get_current()
-    for item in get_feed_items():
-        item_data = item_attributes(
-            item,
-            categories,
-            category_paths,
-            current_site,
-            discounts,
-            attributes_dict,
-            attribute_values_dict,
+    rows = 0
+    chunks = get_feed_items_chunks(chunk_size, shard, shards, changed_since)
+    for items in chunks:
+        writer.writerows(
+            item_attributes(item, categories, category_paths, current_site, discounts)
+            for item in items
         )
-        writer.writerow(item_data)
+        rows += len(items)
+    seconds = time.monotonic() - start
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+        "peak_memory_kb": get_peak_memory(),
+    }
 
 
-def update_feed(file_path=FILE_PATH):
+def update_feed(
+    file_path=None, chunk_size=FEED_CHUNK_SIZE, shard=0, shards=1, delta=False
+):
     """Save updated feed into path provided as argument.
 
-    Default path is defined in module as FILE_PATH.
+    Default path is defined in module as FILE_PATH, or DELTA_FILE_PATH for
+    the delta feed, and numbered for each of the `shards`. The feed is
+    compressed while it is written to the storage.
+
+    The delta feed contains only the variants changed since the previous run
+    for the same shard, or all of them if the time of that run is unknown.
+    Changes of prices caused by sales starting or ending are left to the full
+    feed.
     """
+    if file_path is None:
+        file_path = get_feed_file_path(delta, shard, shards)
+    last_run_key = FEED_LAST_RUN_CACHE_KEY % (shard, shards)
+    changed_since = cache.get(last_run_key) if delta else None
+    started_at = timezone.now()
     with default_storage.open(file_path, "wb") as output_file:
-        output = gzip.open(output_file, "wt")
-        write_feed(output)
-        output.close()
+        with gzip.open(output_file, "wt") as output:
+            stats = write_feed(output, chunk_size, shard, shards, changed_since)
+    cache.set(last_run_key, started_at, None)
+    logger.info(
+        "Wrote %(rows)d rows of the Google Merchant feed in %(seconds).1fs "
+        "(%(rows_per_second).1f/s), peak memory %(peak_memory_kb)d kB.",
+        stats,
+    )
+    return stats
@@ -1,10 +1,90 @@
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.urls import reverse
 
-from ...google_merchant import update_feed
+from ...google_merchant import FEED_CHUNK_SIZE, update_feed
+from ...tasks import update_feed_task
+
+
+def get_feed_url(shard, shards, delta):
+    """Return the path Merchant Center fetches the shard of the feed from."""
+    if shards > 1:
+        name = "google-feed-delta-shard" if delta else "google-feed-shard"
+        kwargs = {"shard": shard + 1, "shards": shards}
+        return reverse("data_feeds:%s" % name, kwargs=kwargs)
+    return reverse(
+        "data_feeds:google-feed-delta" if delta else "data_feeds:google-feed"
+    )
 
 
 class Command(BaseCommand):
-    help = "Update Google merchant feed"
+    help = (
+        "Update Google merchant feed. Merchant Center fetches it from "
+        "/feeds/google/, or with --delta from /feeds/google/delta/. A feed split "
+        "into --shards is fetched as separate feeds, one per shard, from "
+        "/feeds/google/<shard>-of-<shards>/ (or /feeds/google/delta/<shard>-of-"
+        "<shards>/), counting shards from 1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            dest="delta",
+            default=False,
+            help="Write only variants changed since the previous run",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            dest="shards",
+            default=1,
+            help="Number of files the feed is split into",
+        )
+        parser.add_argument(
+            "--shard",
+            type=int,
+            dest="shard",
+            default=None,
+            help="Write only this shard of the feed, counting from 0",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            dest="chunk_size",
+            default=FEED_CHUNK_SIZE,
+            help="Number of variants fetched from the database at once",
+        )
+        parser.add_argument(
+            "--celery",
+            action="store_true",
+            dest="celery",
+            default=False,
+            help="Schedule writing of each shard in Celery workers",
+        )
 
     def handle(self, *args, **options):
-        update_feed()
+        shards = options["shards"]
+        shard = options["shard"]
+        if shard is not None and not 0 <= shard < shards:
+            raise CommandError("Shard must be between 0 and %d" % (shards - 1))
+        selected_shards = range(shards) if shard is None else [shard]
+        for shard in selected_shards:
+            kwargs = {
+                "shard": shard,
+                "shards": shards,
+                "delta": options["delta"],
+                "chunk_size": options["chunk_size"],
+            }
+            if options["celery"]:
+                update_feed_task.delay(**kwargs)
+                self.stdout.write("Scheduled shard %d of %d" % (shard + 1, shards))
+            else:
+                stats = update_feed(**kwargs)
+                self.stdout.write(
+                    "Shard %d of %d: " % (shard + 1, shards)
+                    + "%(rows)d rows in %(seconds).1fs (%(rows_per_second).1f/s), "
+                    "peak memory %(peak_memory_kb)d kB" % stats
+                )
+            self.stdout.write(
+                "Feed URL: %s" % get_feed_url(shard, shards, options["delta"])
+            )
@@ -0,0 +1,7 @@
+from ..celeryconf import app
+from .google_merchant import FEED_CHUNK_SIZE, update_feed
+
+
+@app.task
+def update_feed_task(shard=0, shards=1, delta=False, chunk_size=FEED_CHUNK_SIZE):
+    update_feed(chunk_size=chunk_size, shard=shard, shards=shards, delta=delta)
@@ -1,12 +1,21 @@
 from django.conf.urls import url
-from django.views.generic.base import RedirectView
 
-from .google_merchant import get_feed_file_url
+from . import views
 
 urlpatterns = [
+    url(r"google/$", views.google_feed, name="google-feed"),
     url(
-        r"google/$",
-        RedirectView.as_view(get_redirect_url=get_feed_file_url, permanent=True),
-        name="google-feed",
-    )
+        r"google/(?P<shard>\d+)-of-(?P<shards>\d+)/$",
+        views.google_feed,
+        name="google-feed-shard",
+    ),
+    url(
+        r"google/delta/$", views.google_feed, {"delta": True}, name="google-feed-delta",
+    ),
+    url(
+        r"google/delta/(?P<shard>\d+)-of-(?P<shards>\d+)/$",
+        views.google_feed,
+        {"delta": True},
+        name="google-feed-delta-shard",
+    ),
 ]
@@ -0,0 +1,18 @@
+from django.http import Http404
+from django.shortcuts import redirect
+
+from .google_merchant import get_feed_file_url
+
+
+def google_feed(request, delta=False, shard=None, shards=None):
+    """Redirect to the stored feed, or to one of its shards numbered from 1.
+
+    Each shard of a sharded feed is fetched from its own URL, e.g.
+    `google/2-of-4/`.
+    """
+    if shards is None:
+        return redirect(get_feed_file_url(delta), permanent=True)
+    shard, shards = int(shard), int(shards)
+    if not 1 <= shard <= shards:
+        raise Http404("No such shard of the feed.")
+    return redirect(get_feed_file_url(delta, shard - 1, shards), permanent=True)
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from saleor.core.db.operations import create_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discount", "0018_auto_20190827_0315"),
+        # The trigram extension is enabled by the product app
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        create_trigram_indexes("discount_voucher", ["name", "code"]),
+        create_trigram_indexes("discount_sale", ["name", "type"]),
+    ]
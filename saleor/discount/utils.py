@@ -1,16 +1,22 @@
 import datetime
 from collections import defaultdict
-from typing import Iterable
+from typing import Iterable, List, Optional, Set, Tuple
 
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Min
 from django.utils import timezone
 from django.utils.translation import pgettext
 
+from ..core.cache import bump_cache_version, get_cache_version
 from ..core.taxes import zero_money
 from ..extensions.manager import get_extensions_manager
 from . import DiscountInfo
 from .models import NotApplicable, Sale, VoucherCustomer
 
+ACTIVE_DISCOUNTS_CACHE_KEY = "active-discounts"
+DISCOUNTS_VERSION_CACHE_KEY = "active-discounts-version"
+
 
 def increase_voucher_usage(voucher):
     """Increase voucher uses by 1."""
@@ -60,9 +66,23 @@ def get_product_discount_on_sale(product, product_collections, discount: Discoun
     )
 
 
-def get_product_discounts(product, discounts: Iterable[DiscountInfo]):
-    """Return discount values for all discounts applicable to a product."""
-    product_collections = set(product.collections.all().values_list("pk", flat=True))
+def get_product_discounts(
+    product, discounts: Iterable[DiscountInfo], collections: Iterable = None
+):
+    """Return discount values for all discounts applicable to a product.
+
+    Pass already fetched `collections` of the product to avoid querying them.
+    """
+    if collections is None and "collections" in getattr(
+        product, "_prefetched_objects_cache", {}
+    ):
+        collections = product.collections.all()
+    if collections is None:
+        product_collections = set(
+            product.collections.all().values_list("pk", flat=True)
+        )
+    else:
+        product_collections = {collection.pk for collection in collections}
     for discount in discounts:
         try:
             yield get_product_discount_on_sale(product, product_collections, discount)
@@ -70,10 +90,12 @@ def get_product_discounts(product, discounts: Iterable[DiscountInfo]):
             pass
 
 
-def calculate_discounted_price(product, price, discounts: Iterable[DiscountInfo]):
+def calculate_discounted_price(
+    product, price, discounts: Iterable[DiscountInfo], collections: Iterable = None
+):
     """Return minimum product's price of all prices with discounts applied."""
     if discounts:
-        discounts = list(get_product_discounts(product, discounts))
+        discounts = list(get_product_discounts(product, discounts, collections))
         if discounts:
             price = min(discount(price) for discount in discounts)
     return price
@@ -148,6 +170,21 @@ def _fetch_products(sale_pks):
     return product_map
 
 
+def fetch_sales_catalogues(sale_pks: Iterable[int]) -> Tuple[Set, Set, Set]:
+    """Return ids of products, categories and collections discounted by sales.
+
+    Categories include all descendants of the categories assigned to the sales.
+    """
+    product_ids, category_ids, collection_ids = set(), set(), set()
+    for ids in _fetch_products(sale_pks).values():
+        product_ids.update(ids)
+    for ids in _fetch_categories(sale_pks).values():
+        category_ids.update(ids)
+    for ids in _fetch_collections(sale_pks).values():
+        collection_ids.update(ids)
+    return product_ids, category_ids, collection_ids
+
+
 def fetch_discounts(date: datetime.date):
     sales = list(Sale.objects.active(date))
     pks = {s.pk for s in sales}
@@ -166,5 +203,56 @@ def fetch_discounts(date: datetime.date):
     ]
 
 
-def fetch_active_discounts():
-    return fetch_discounts(timezone.now())
+def get_next_sale_boundary(
+    sales: Iterable[Sale], date: datetime.datetime
+) -> Optional[datetime.datetime]:
+    """Return the nearest moment after which the set of active sales changes."""
+    boundaries = [sale.end_date for sale in sales if sale.end_date]
+    next_start = Sale.objects.filter(start_date__gt=date).aggregate(
+        start_date=Min("start_date")
+    )["start_date"]
+    if next_start:
+        boundaries.append(next_start)
+    return min(boundaries) if boundaries else None
+
+
+def get_discounts_cache_version() -> str:
+    return get_cache_version(DISCOUNTS_VERSION_CACHE_KEY)
+
+
+def invalidate_active_discounts():
+    """Mark the cached active discounts as outdated.
+
+    Call it whenever a sale or its products, categories or collections change.
+    """
+    bump_cache_version(DISCOUNTS_VERSION_CACHE_KEY)
+
+
+def fetch_active_discounts() -> List[DiscountInfo]:
+    """Return discounts of currently active sales.
+
+    The discounts are computed once and shared by all workers through the cache.
+    The snapshot is valid until the version of discounts is changed by
+    `invalidate_active_discounts` or until any sale starts or ends.
+    """
+    now = timezone.now()
+    cached = cache.get_many([ACTIVE_DISCOUNTS_CACHE_KEY, DISCOUNTS_VERSION_CACHE_KEY])
+    snapshot = cached.get(ACTIVE_DISCOUNTS_CACHE_KEY)
+    version = cached.get(DISCOUNTS_VERSION_CACHE_KEY)
+    if snapshot and version and snapshot["version"] == version:
+        valid_until = snapshot["valid_until"]
+        if valid_until is None or now <= valid_until:
+            return snapshot["discounts"]
+
+    if version is None:
+        version = get_discounts_cache_version()
+    discounts = fetch_discounts(now)
+    valid_until = get_next_sale_boundary([d.sale for d in discounts], now)
+    timeout = settings.DISCOUNTS_CACHE_TIMEOUT
+    if valid_until is not None:
+        # Sales ending at `end_date` are still active at that very moment
+        seconds_left = (valid_until - now).total_seconds()
+        timeout = max(min(timeout, int(seconds_left) + 1), 1)
+    snapshot = {"version": version, "valid_until": valid_until, "discounts": discounts}
+    cache.set(ACTIVE_DISCOUNTS_CACHE_KEY, snapshot, timeout)
+    return discounts
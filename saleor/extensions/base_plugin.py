@@ -7,6 +7,7 @@ from django_countries.fields import Country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from . import ConfigurationTypeField
+from .manager import invalidate_extensions_managers
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -31,6 +32,7 @@ class BasePlugin:
 
     def __init__(self, *args, **kwargs):
         self._cached_config = None
+        self._config_fetched = False
         self.active = None
 
     def __str__(self):
@@ -38,8 +40,11 @@ class BasePlugin:
 
     def _initialize_plugin_configuration(self):
         """Initialize plugin by fetching configuration from internal cache or DB."""
-        plugin_config_qs = PluginConfiguration.objects.filter(name=self.PLUGIN_NAME)
-        plugin_config = self._cached_config or plugin_config_qs.first()
+        plugin_config = self._cached_config
+        if plugin_config is None and not self._config_fetched:
+            plugin_config_qs = PluginConfiguration.objects.filter(name=self.PLUGIN_NAME)
+            plugin_config = plugin_config_qs.first()
+            self._config_fetched = True
 
         if plugin_config:
             self._cached_config = plugin_config
@@ -356,6 +361,7 @@ class BasePlugin:
             plugin_configuration.active = cleaned_data["active"]
         cls.validate_plugin_configuration(plugin_configuration)
         plugin_configuration.save()
+        invalidate_extensions_managers()
         if plugin_configuration.configuration:
             # Let's add a translated descriptions and labels
             cls._append_config_structure(plugin_configuration.configuration)
@@ -1,11 +1,13 @@
+import threading
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from django.conf import settings
 from django.utils.module_loading import import_string
 from django_countries.fields import Country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
+from ..core.cache import bump_cache_version, get_cache_version
 from ..core.payments import PaymentInterface
 from ..core.taxes import TaxType, quantize_price
 from .models import PluginConfiguration
@@ -19,6 +21,12 @@ if TYPE_CHECKING:
     from ..payment.interface import PaymentData, TokenConfig
 
 
+EXTENSIONS_CACHE_VERSION_KEY = "extensions-manager-version"
+
+_managers: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, "ExtensionsManager"]] = {}
+_managers_lock = threading.Lock()
+
+
 class ExtensionsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
@@ -26,6 +34,7 @@ class ExtensionsManager(PaymentInterface):
 
     def __init__(self, plugins: List[str]):
         self.plugins = []
+        self._plugin_configurations = {}
         for plugin_path in plugins:
             plugin_class = import_string(plugin_path)
             self.plugins.append(plugin_class())
@@ -64,6 +73,20 @@ class ExtensionsManager(PaymentInterface):
             return previous_value
         return returned_value
 
+    def plugins_implement(self, method_name: str) -> bool:
+        """Return whether any of the plugins has its own implementation of the method.
+
+        Otherwise the manager returns the default value of the method.
+        """
+        # The base plugin module imports the manager
+        from .base_plugin import BasePlugin
+
+        base_method = getattr(BasePlugin, method_name)
+        return any(
+            getattr(type(plugin), method_name, base_method) is not base_method
+            for plugin in self.plugins
+        )
+
     def change_user_address(
         self, address: "Address", address_type: Optional[str], user: Optional["User"]
     ) -> "Address":
@@ -365,6 +388,7 @@ class ExtensionsManager(PaymentInterface):
         plugin_configuration = PluginConfiguration.objects.get(name=plugin_name)
         for plugin in self.plugins:
             if plugin.PLUGIN_NAME == plugin_name:
+                # Saving the configuration invalidates the cached managers.
                 return plugin.save_plugin_configuration(
                     plugin_configuration, cleaned_data
                 )
@@ -376,9 +400,14 @@ class ExtensionsManager(PaymentInterface):
 
     def get_plugin_configuration(self, plugin_name) -> Optional["PluginConfiguration"]:
         plugin = self.get_plugin(plugin_name)
-        if plugin is not None:
+        if plugin is None:
+            return None
+        if plugin_name not in self._plugin_configurations:
             plugin_configurations_qs = PluginConfiguration.objects.all()
-            return plugin.get_plugin_configuration(plugin_configurations_qs)
+            self._plugin_configurations[plugin_name] = plugin.get_plugin_configuration(
+                plugin_configurations_qs
+            )
+        return self._plugin_configurations[plugin_name]
 
     def get_plugin_configurations(self) -> List["PluginConfiguration"]:
         plugin_configuration_ids = []
@@ -391,12 +420,39 @@ class ExtensionsManager(PaymentInterface):
         return PluginConfiguration.objects.filter(pk__in=plugin_configuration_ids)
 
 
+def get_extensions_cache_version() -> str:
+    return get_cache_version(EXTENSIONS_CACHE_VERSION_KEY)
+
+
+def invalidate_extensions_managers():
+    """Force all worker processes to rebuild their extensions managers.
+
+    Managers are cached per process together with plugin configurations. A new
+    version stored in the shared cache makes every process drop its managers
+    before they are used again.
+    """
+    bump_cache_version(EXTENSIONS_CACHE_VERSION_KEY)
+    with _managers_lock:
+        _managers.clear()
+
+
 def get_extensions_manager(
     manager_path: str = None, plugins: List[str] = None
 ) -> ExtensionsManager:
+    """Return the extensions manager shared by the current process.
+
+    The manager is rebuilt when the configuration of plugins changes, see
+    `invalidate_extensions_managers`.
+    """
     if not manager_path:
         manager_path = settings.EXTENSIONS_MANAGER
     if plugins is None:
         plugins = settings.PLUGINS
-    manager = import_string(manager_path)
-    return manager(plugins)
+    key = (manager_path, tuple(plugins))
+    version = get_extensions_cache_version()
+    with _managers_lock:
+        cached_version, manager = _managers.get(key, (None, None))
+        if manager is None or cached_version != version:
+            manager = import_string(manager_path)(plugins)
+            _managers[key] = (version, manager)
+    return manager
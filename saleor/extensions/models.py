@@ -1,5 +1,6 @@
 from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import pgettext_lazy
 
 from saleor.core.utils.json_serializer import CustomJsonEncoder
@@ -20,3 +21,22 @@ class PluginConfiguration(models.Model):
 
     def __str__(self):
         return f"Configuration of {self.name}, active: {self.active}"
+
+
+def invalidate_cached_tax_rates(**_kwargs):
+    """Make all processes drop the tax rates cached by their plugins.
+
+    Tax rates are saved by the `get_vat_rates` command, which may run in a
+    separate process, e.g. a cron job.
+    """
+    from .manager import invalidate_extensions_managers
+
+    invalidate_extensions_managers()
+
+
+for signal in (post_save, post_delete):
+    signal.connect(
+        invalidate_cached_tax_rates,
+        sender="django_prices_vatlayer.VAT",
+        dispatch_uid="invalidate_cached_tax_rates",
+    )
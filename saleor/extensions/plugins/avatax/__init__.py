@@ -1,7 +1,10 @@
+import hashlib
 import json
 import logging
 from dataclasses import dataclass
 from datetime import date
+from decimal import Decimal
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from urllib.parse import urljoin
 
@@ -26,6 +29,18 @@ CACHE_KEY = "avatax_request_id_"
 TAX_CODES_CACHE_KEY = "avatax_tax_codes_cache_key"
 TIMEOUT = 10  # API HTTP Requests Timeout
 
+# Tax rates of the previous responses, used to estimate taxes of checkouts
+# when Avatax is not available
+TAX_RATES_CACHE_KEY = "avatax_tax_rate_{}"
+TAX_RATES_CACHE_TIME = 60 * 60 * 24 * 7  # 7 days
+
+# Avatax is not called for CIRCUIT_BREAKER_COOLDOWN seconds once
+# CIRCUIT_BREAKER_THRESHOLD requests in a row failed or timed out
+CIRCUIT_BREAKER_FAILURES_CACHE_KEY = "avatax_circuit_breaker_failures"
+CIRCUIT_BREAKER_OPEN_CACHE_KEY = "avatax_circuit_breaker_open"
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 30
+
 # Common carrier code used to identify the line as a shipping service
 COMMON_CARRIER_CODE = "FR020100"
 
@@ -42,6 +57,10 @@ class AvataxConfiguration:
     autocommit: bool = False
 
 
+class AvataxUnavailableError(Exception):
+    """Avatax could not be reached or failed with a server error."""
+
+
 class TransactionType:
     INVOICE = "SalesInvoice"
     ORDER = "SalesOrder"
@@ -69,28 +88,91 @@ def get_api_url(use_sandbox=True) -> str:
     return "https://rest.avatax.com/api/v2/"
 
 
-def api_post_request(
-    url: str, data: Dict[str, Any], config: AvataxConfiguration
-) -> Dict[str, Any]:
+@lru_cache(maxsize=None)
+def get_session() -> requests.Session:
+    """Return the session which keeps connections to Avatax alive."""
+    return requests.Session()
+
+
+def is_circuit_open() -> bool:
+    return cache.get(CIRCUIT_BREAKER_OPEN_CACHE_KEY, False)
+
+
+def _record_failure():
+    cache.add(CIRCUIT_BREAKER_FAILURES_CACHE_KEY, 0, CIRCUIT_BREAKER_COOLDOWN)
     try:
-        auth = HTTPBasicAuth(config.username_or_account, config.password_or_license)
-        response = requests.post(url, auth=auth, data=json.dumps(data), timeout=TIMEOUT)
-        logger.debug("Hit to Avatax to calculate taxes %s", url)
-    except requests.exceptions.RequestException:
-        logger.warning("Fetching taxes failed %s", url)
-        return {}
-    return response.json()
+        failures = cache.incr(CIRCUIT_BREAKER_FAILURES_CACHE_KEY)
+    except ValueError:
+        # The counter expired in the meantime
+        failures = 1
+    if failures >= CIRCUIT_BREAKER_THRESHOLD:
+        logger.warning(
+            "Avatax requests failed %d times in a row, skipping them for %ds",
+            failures,
+            CIRCUIT_BREAKER_COOLDOWN,
+        )
+        cache.set(CIRCUIT_BREAKER_OPEN_CACHE_KEY, True, CIRCUIT_BREAKER_COOLDOWN)
+        cache.delete(CIRCUIT_BREAKER_FAILURES_CACHE_KEY)
 
 
-def api_get_request(url: str, config: AvataxConfiguration):
+def _record_success():
+    cache.delete(CIRCUIT_BREAKER_FAILURES_CACHE_KEY)
+
+
+def _api_request(
+    method: str,
+    url: str,
+    config: AvataxConfiguration,
+    raise_unavailable: bool = False,
+    **kwargs,
+):
+    """Send the request to Avatax and return the response data.
+
+    When Avatax is unavailable an empty response is returned, unless
+    `raise_unavailable` is set. Then `AvataxUnavailableError` is raised and the
+    request is sent even if the circuit breaker is open, as the caller retries
+    it later rather than giving up.
+    """
+    if not raise_unavailable and is_circuit_open():
+        logger.warning("Avatax is unavailable, skipping request to %s", url)
+        return {}
+    auth = HTTPBasicAuth(config.username_or_account, config.password_or_license)
     try:
-        auth = HTTPBasicAuth(config.username_or_account, config.password_or_license)
-        response = requests.get(url, auth=auth, timeout=TIMEOUT)
-        logger.debug("[GET] Hit to %s", url)
-    except requests.exceptions.RequestException:
+        response = get_session().request(
+            method, url, auth=auth, timeout=TIMEOUT, **kwargs
+        )
+        logger.debug("[%s] Hit to %s", method, url)
+        response_data = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
         logger.warning("Failed to fetch data from %s", url)
+        _record_failure()
+        if raise_unavailable:
+            raise AvataxUnavailableError(str(e))
         return {}
-    return response.json()
+    if response.status_code >= 500:
+        _record_failure()
+        if raise_unavailable:
+            raise AvataxUnavailableError(
+                "Avatax responded with status %d" % response.status_code
+            )
+    else:
+        _record_success()
+    return response_data
+
+
+def api_post_request(
+    url: str,
+    data: Dict[str, Any],
+    config: AvataxConfiguration,
+    raise_unavailable: bool = False,
+) -> Dict[str, Any]:
+    return _api_request(
+        "POST", url, config, raise_unavailable=raise_unavailable, data=json.dumps(data)
+    )
+
+
+def api_get_request(url: str, config: AvataxConfiguration):
+    return _api_request("GET", url, config)
 
 
 def _validate_adddress_details(
@@ -130,45 +212,26 @@ def _validate_checkout(checkout: "Checkout") -> bool:
     )
 
 
-def _retrieve_from_cache(token):
-    taxes_cache_key = CACHE_KEY + token
-    cached_data = cache.get(taxes_cache_key)
-    return cached_data
-
-
-def checkout_needs_new_fetch(data, checkout_token: str) -> bool:
-    """Check if avatax's checkout response is cached or not.
+def get_data_fingerprint(data: Dict[str, Dict]) -> str:
+    """Return a fingerprint of the content of the request data.
 
-    We store the response from avatax for checkout object for given time. If object
-    doesn't exist in cache or something has changed, then we fetch data from avatax.
+    Codes of sales orders are left out, as these transactions are only
+    estimates not recorded by Avatax; checkouts of the same content share them.
     """
+    transaction = dict(data["createTransactionModel"])
+    if transaction["type"] == TransactionType.ORDER:
+        transaction.pop("code", None)
+    content = json.dumps(transaction, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
 
-    cached_checkout = _retrieve_from_cache(checkout_token)
 
-    if not cached_checkout:
-        return True
-
-    cached_request_data, cached_response = cached_checkout
-    if data != cached_request_data:
-        return True
-    return False
-
-
-def taxes_need_new_fetch(data: Dict[str, Any], taxes_token: str) -> bool:
+def taxes_need_new_fetch(data: Dict[str, Any]) -> bool:
     """Check if Avatax's taxes data need to be refetched.
 
-    The response from Avatax is stored in a cache. If an object doesn't exist in cache
-    or something has changed, taxes need to be refetched.
+    Responses from Avatax are stored in the cache by the fingerprints of
+    the request data, so they need to be refetched only if something changed.
     """
-    cached_data = _retrieve_from_cache(taxes_token)
-
-    if not cached_data:
-        return True
-
-    cached_request_data, _ = cached_data
-    if data != cached_request_data:
-        return True
-    return False
+    return cache.get(CACHE_KEY + get_data_fingerprint(data)) is None
 
 
 def append_line_to_data(
@@ -352,6 +415,66 @@ def generate_request_data_from_checkout(
     return data
 
 
+def _get_tax_rate_cache_key(ship_to: Dict[str, str], tax_code: str) -> str:
+    location = [ship_to.get(field) or "" for field in ("country", "region")]
+    location.append(ship_to.get("postalCode") or "")
+    key = "|".join([str(value) for value in location] + [tax_code])
+    return TAX_RATES_CACHE_KEY.format(hashlib.md5(key.encode()).hexdigest())
+
+
+def cache_tax_rates(data: Dict[str, Dict], response: Dict[str, Any]):
+    """Store tax rates of the lines of the response by tax codes and addresses."""
+    ship_to = data["createTransactionModel"]["addresses"]["shipTo"]
+    rates = {}
+    for line in response.get("lines", []):
+        line_amount = Decimal(str(line.get("lineAmount", 0)))
+        if line_amount and line.get("taxCode"):
+            key = _get_tax_rate_cache_key(ship_to, line["taxCode"])
+            rates[key] = Decimal(str(line.get("tax", 0))) / line_amount
+    cache.set_many(rates, TAX_RATES_CACHE_TIME)
+
+
+def get_response_from_cached_rates(data: Dict[str, Dict]) -> Dict[str, Any]:
+    """Estimate taxes of the request data with rates of the previous responses.
+
+    Return an empty response if a rate of any of the lines is not known.
+    """
+    transaction = data["createTransactionModel"]
+    ship_to = transaction["addresses"]["shipTo"]
+    keys = [
+        _get_tax_rate_cache_key(ship_to, line["taxCode"])
+        for line in transaction["lines"]
+    ]
+    rates = cache.get_many(keys)
+    if len(rates) < len(set(keys)):
+        return {}
+
+    lines = []
+    total_net = total_tax = Decimal(0)
+    for line, key in zip(transaction["lines"], keys):
+        rate = rates[key]
+        net = Decimal(line["amount"])
+        if line["taxIncluded"]:
+            net /= 1 + rate
+        tax = net * rate
+        lines.append(
+            {
+                "itemCode": line["itemCode"],
+                "taxCode": line["taxCode"],
+                "lineAmount": str(net),
+                "tax": str(tax),
+            }
+        )
+        total_net += net
+        total_tax += tax
+    return {
+        "currencyCode": transaction["currencyCode"],
+        "totalAmount": str(total_net),
+        "totalTax": str(total_tax),
+        "lines": lines,
+    }
+
+
 def _fetch_new_taxes_data(
     data: Dict[str, Dict], data_cache_key: str, config: AvataxConfiguration
 ):
@@ -360,37 +483,45 @@ def _fetch_new_taxes_data(
     )
     response = api_post_request(transaction_url, data, config)
     if response and "error" not in response:
-        cache.set(data_cache_key, (data, response), CACHE_TIME)
-    else:
+        cache.set(data_cache_key, response, CACHE_TIME)
+        cache_tax_rates(data, response)
+    elif response:
         # cache failed response to limit hits to avatax.
-        cache.set(data_cache_key, (data, response), 10)
+        cache.set(data_cache_key, response, 10)
     return response
 
 
 def get_cached_response_or_fetch(
-    data: Dict[str, Dict],
-    token_in_cache: str,
-    config: AvataxConfiguration,
-    force_refresh: bool = False,
+    data: Dict[str, Dict], config: AvataxConfiguration, force_refresh: bool = False
 ):
     """Try to find response in cache.
 
-    Return cached response if requests data are the same. Fetch new data in other cases.
+    Return the cached response of the same request data. Fetch new data in other
+    cases.
     """
-    data_cache_key = CACHE_KEY + token_in_cache
-    if taxes_need_new_fetch(data, token_in_cache) or force_refresh:
+    data_cache_key = CACHE_KEY + get_data_fingerprint(data)
+    response = None if force_refresh else cache.get(data_cache_key)
+    if response is None:
         response = _fetch_new_taxes_data(data, data_cache_key, config)
-    else:
-        _, response = cache.get(data_cache_key)
-
     return response
 
 
 def get_checkout_tax_data(
     checkout: "Checkout", discounts, config: AvataxConfiguration
 ) -> Dict[str, Any]:
+    """Return taxes of the checkout.
+
+    Responses are memoized on the checkout instance for the duration of
+    the request, so calculating its lines, subtotal and total fetches them once.
+    If Avatax is not available, taxes are estimated with the cached tax rates.
+    """
     data = generate_request_data_from_checkout(checkout, config, discounts=discounts)
-    return get_cached_response_or_fetch(data, str(checkout.token), config)
+    fingerprint = get_data_fingerprint(data)
+    responses = checkout.__dict__.setdefault("_avatax_responses", {})
+    if fingerprint not in responses:
+        response = get_cached_response_or_fetch(data, config)
+        responses[fingerprint] = response or get_response_from_cached_rates(data)
+    return responses[fingerprint]
 
 
 def get_order_tax_data(
@@ -411,9 +542,7 @@ def get_order_tax_data(
         config=config,
         currency=order.total.currency,
     )
-    response = get_cached_response_or_fetch(
-        data, "order_%s" % order.token, config, force_refresh
-    )
+    response = get_cached_response_or_fetch(data, config, force_refresh)
     return response
 
 
@@ -1,7 +1,47 @@
+import logging
+from typing import Optional
+
 from ....celeryconf import app
-from . import api_post_request
+from ...manager import get_extensions_manager
+from . import (
+    CIRCUIT_BREAKER_COOLDOWN,
+    AvataxConfiguration,
+    AvataxUnavailableError,
+    api_post_request,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transactions of orders are retried, first after the cooldown of the circuit
+# breaker and then after twice as long each time
+TRANSACTION_MAX_RETRIES = 10
+
+
+def get_plugin_config() -> Optional[AvataxConfiguration]:
+    """Return the configuration of the Avatax plugin used by this process.
+
+    Credentials are read by the worker, so they are not sent to the broker.
+    """
+    # The plugin module imports the tasks
+    from .plugin import AvataxPlugin
+
+    plugin = get_extensions_manager().get_plugin(AvataxPlugin.PLUGIN_NAME)
+    if plugin is None:
+        return None
+    plugin._initialize_plugin_configuration()
+    return plugin.config
 
 
-@app.task
+@app.task(
+    autoretry_for=(AvataxUnavailableError,),
+    retry_backoff=CIRCUIT_BREAKER_COOLDOWN,
+    max_retries=TRANSACTION_MAX_RETRIES,
+)
 def api_post_request_task(transaction_url, data):
-    api_post_request(transaction_url, data)
+    config = get_plugin_config()
+    if config is None:
+        logger.error(
+            "Avatax plugin is not enabled, skipping request to %s", transaction_url
+        )
+        return
+    api_post_request(transaction_url, data, config, raise_unavailable=True)
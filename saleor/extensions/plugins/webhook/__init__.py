@@ -16,9 +16,11 @@ def create_webhook_headers(
     body: Optional[str] = None,
     secret_key: Optional[str] = None,
     encoding: str = "utf-8",
+    domain: Optional[str] = None,
 ):
     signature_prefix = "sha1="
-    domain = Site.objects.get_current().domain
+    if domain is None:
+        domain = Site.objects.get_current().domain
     headers = {"X-Saleor-Event": event_name, "X-Saleor-Domain": domain}
     if secret_key and body:
         saleor_hmac_sha256 = signature_prefix + create_hmac_signature(
@@ -0,0 +1,261 @@
+"""Delivering webhook payloads to the targets in batches."""
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from ....site.models import Site
+from ....webhook import WebhookDeliveryStatus
+from ....webhook.models import (
+    Webhook,
+    WebhookDelivery,
+    WebhookDeliveryAttempt,
+    WebhookPayload,
+)
+from . import create_webhook_headers
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_TIMEOUT = 10
+
+# Delays of retries double with every failed attempt up to the maximal one
+WEBHOOK_RETRY_DELAY = 60
+WEBHOOK_MAX_RETRY_DELAY = 600
+
+# Time after which a worker stops sending a batch, so that workers take turns
+# in using the concurrency slots of a host
+DELIVERY_TIME_LIMIT = 60
+CONCURRENCY_SLOT_CACHE_KEY = "webhook-concurrency-slot-{origin}-{slot}"
+# A slot is released by itself if the worker holding it dies
+CONCURRENCY_SLOT_TIMEOUT = DELIVERY_TIME_LIMIT + 2 * WEBHOOK_TIMEOUT
+# Claimed deliveries are not due again until their lease expires, so they are
+# sent by another worker if the one which claimed them dies
+DELIVERY_LEASE = timedelta(seconds=CONCURRENCY_SLOT_TIMEOUT)
+
+_sessions: Dict[str, requests.Session] = {}
+
+
+def get_target_origin(target_url: str) -> str:
+    url = urlsplit(target_url)
+    return "%s://%s" % (url.scheme, url.netloc)
+
+
+def get_session(origin: str) -> requests.Session:
+    """Return the HTTP session the worker process uses for the origin.
+
+    Sessions keep the connections to the hosts alive between deliveries.
+    """
+    session = _sessions.get(origin)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=settings.WEBHOOK_TARGET_CONCURRENCY
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sessions[origin] = session
+    return session
+
+
+def acquire_concurrency_slot(origin: str) -> Optional[str]:
+    """Return the cache key of a free delivery slot of the origin, if any.
+
+    The number of slots limits the number of workers sending payloads to
+    the same host at once; the slot has to be released with `cache.delete`.
+    """
+    for slot in range(settings.WEBHOOK_TARGET_CONCURRENCY):
+        key = CONCURRENCY_SLOT_CACHE_KEY.format(origin=origin, slot=slot)
+        if cache.add(key, True, CONCURRENCY_SLOT_TIMEOUT):
+            return key
+    return None
+
+
+def enqueue_deliveries(
+    webhook_ids: Iterable[int], event_type: str, data: str
+) -> List[WebhookDelivery]:
+    payload = WebhookPayload.objects.create(event_type=event_type, payload=data)
+    return WebhookDelivery.objects.bulk_create(
+        [
+            WebhookDelivery(webhook_id=webhook_id, payload=payload)
+            for webhook_id in webhook_ids
+        ]
+    )
+
+
+def get_retry_delay(attempt_count: int) -> timedelta:
+    delay = WEBHOOK_RETRY_DELAY * 2 ** (attempt_count - 1)
+    return timedelta(seconds=min(delay, WEBHOOK_MAX_RETRY_DELAY))
+
+
+def _send_payload(
+    session: requests.Session, webhook: Webhook, delivery: WebhookDelivery, domain
+) -> Tuple[WebhookDeliveryAttempt, bool]:
+    payload = delivery.payload
+    headers = create_webhook_headers(
+        payload.event_type, payload.payload, webhook.secret_key, domain=domain
+    )
+    attempt = WebhookDeliveryAttempt(delivery=delivery)
+    start = time.monotonic()
+    try:
+        response = session.post(
+            webhook.target_url,
+            data=payload.payload,
+            headers=headers,
+            timeout=WEBHOOK_TIMEOUT,
+        )
+        attempt.response_status_code = response.status_code
+        response.raise_for_status()
+    except RequestException as e:
+        attempt.error = str(e)
+        success = False
+    else:
+        success = True
+    attempt.duration = timedelta(seconds=time.monotonic() - start)
+    return attempt, success
+
+
+def _mark_failed(delivery: WebhookDelivery):
+    if delivery.attempt_count >= settings.WEBHOOK_MAX_ATTEMPTS:
+        delivery.status = WebhookDeliveryStatus.DEAD
+        logger.warning(
+            "[Webhook ID:%s] Delivery %s failed %d times and will not be retried.",
+            delivery.webhook_id,
+            delivery.pk,
+            delivery.attempt_count,
+        )
+    else:
+        delivery.next_attempt = timezone.now() + get_retry_delay(delivery.attempt_count)
+
+
+def claim_due_deliveries(webhook: Webhook, batch_size: int) -> List[WebhookDelivery]:
+    """Lease the due deliveries of the webhook to the current worker.
+
+    Deliveries locked by another worker are skipped. The rows are locked only
+    while they are claimed, not while their payloads are sent.
+    """
+    with transaction.atomic():
+        deliveries = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                webhook=webhook,
+                status=WebhookDeliveryStatus.PENDING,
+                next_attempt__lte=timezone.now(),
+            )
+            .select_related("payload")[:batch_size]
+        )
+        WebhookDelivery.objects.filter(
+            pk__in=[delivery.pk for delivery in deliveries]
+        ).update(next_attempt=timezone.now() + DELIVERY_LEASE)
+    return deliveries
+
+
+def deliver_pending_payloads(webhook: Webhook, batch_size: int) -> Dict[str, int]:
+    """Send the due payloads of the webhook one after another.
+
+    Deliveries are claimed first, then sent outside of a transaction, and
+    their results are saved at the end. After a failed attempt the rest of the
+    batch is left for later, as the target is likely down; deliveries left
+    unsent are counted as `left` and released. The pending deliveries of the
+    webhook are not due before the failed one is retried, so payloads keep
+    their order.
+    """
+    stats = {"delivered": 0, "failed": 0, "dead": 0, "left": 0}
+    session = get_session(get_target_origin(webhook.target_url))
+    domain = Site.objects.get_current().domain
+    start = time.monotonic()
+    deliveries = claim_due_deliveries(webhook, batch_size)
+    attempts = []
+    failed_delivery = None
+    for delivery in deliveries:
+        if time.monotonic() - start > DELIVERY_TIME_LIMIT:
+            break
+        attempt, success = _send_payload(session, webhook, delivery, domain)
+        attempts.append(attempt)
+        delivery.attempt_count += 1
+        if success:
+            delivery.status = WebhookDeliveryStatus.SUCCESS
+            stats["delivered"] += 1
+            continue
+        _mark_failed(delivery)
+        if delivery.status == WebhookDeliveryStatus.DEAD:
+            stats["dead"] += 1
+        else:
+            stats["failed"] += 1
+            failed_delivery = delivery
+        break
+    # Deliveries left unsent get back the time of their attempt from before
+    # the lease, unless they have to wait for the retry of a failed one
+    if failed_delivery:
+        retry_at = failed_delivery.next_attempt
+        sent_count = len(attempts)
+        for delivery in deliveries[sent_count:]:
+            delivery.next_attempt = max(delivery.next_attempt, retry_at)
+    with transaction.atomic():
+        WebhookDeliveryAttempt.objects.bulk_create(attempts)
+        WebhookDelivery.objects.bulk_update(
+            deliveries, ["status", "attempt_count", "next_attempt"]
+        )
+        if failed_delivery:
+            WebhookDelivery.objects.filter(
+                webhook=webhook,
+                status=WebhookDeliveryStatus.PENDING,
+                pk__gt=failed_delivery.pk,
+                next_attempt__lt=retry_at,
+            ).update(next_attempt=retry_at)
+    stats["left"] = len(deliveries) - len(attempts)
+    return stats
+
+
+def get_webhooks_with_due_deliveries() -> List[int]:
+    return list(
+        WebhookDelivery.objects.filter(
+            status=WebhookDeliveryStatus.PENDING,
+            next_attempt__lte=timezone.now(),
+            webhook__is_active=True,
+            webhook__service_account__is_active=True,
+        )
+        .order_by()
+        .values_list("webhook_id", flat=True)
+        .distinct()
+    )
+
+
+def delete_old_deliveries(retention: timedelta) -> int:
+    """Delete successful deliveries older than the retention period.
+
+    Dead deliveries are kept until they are requeued or deleted by hand.
+    """
+    created_before = timezone.now() - retention
+    _, deleted = WebhookDelivery.objects.filter(
+        status=WebhookDeliveryStatus.SUCCESS, created__lt=created_before
+    ).delete()
+    WebhookPayload.objects.filter(
+        created__lt=created_before, deliveries__isnull=True
+    ).delete()
+    return deleted.get(WebhookDelivery._meta.label, 0)
+
+
+def requeue_dead_deliveries(queryset) -> List[int]:
+    """Give dead deliveries another series of attempts.
+
+    Return IDs of the webhooks the deliveries should be scheduled for.
+    """
+    queryset = queryset.filter(status=WebhookDeliveryStatus.DEAD)
+    webhook_ids = list(
+        queryset.order_by().values_list("webhook_id", flat=True).distinct()
+    )
+    queryset.update(
+        status=WebhookDeliveryStatus.PENDING,
+        attempt_count=0,
+        next_attempt=timezone.now(),
+    )
+    return webhook_ids
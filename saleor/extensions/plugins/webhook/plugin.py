@@ -1,20 +1,32 @@
 from typing import TYPE_CHECKING, Any
 
+from django.db import transaction
+
 from ....webhook import WebhookEventType
-from ....webhook.payloads import (
-    generate_customer_payload,
-    generate_order_payload,
-    generate_product_payload,
-)
+from ....webhook.subscriptions import is_event_subscribed
 from ...base_plugin import BasePlugin
-from .tasks import trigger_webhooks_for_event
+from .tasks import trigger_webhooks_for_object
 
 if TYPE_CHECKING:
+    from django.db.models import Model
     from ....order.models import Order
     from ....account.models import User
     from ....product.models import Product
 
 
+def trigger_webhooks(event_type: str, instance: "Model"):
+    """Trigger webhooks of the event once the object is saved in the database.
+
+    Events without subscribers are skipped; payloads are generated by workers.
+    """
+    if not is_event_subscribed(event_type):
+        return
+    object_id = instance.pk
+    transaction.on_commit(
+        lambda: trigger_webhooks_for_object.delay(event_type, object_id)
+    )
+
+
 class WebhookPlugin(BasePlugin):
     PLUGIN_NAME = "Webhooks"
 
@@ -26,53 +38,43 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CREATED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_CREATED, order)
 
     def order_fully_paid(self, order: "Order", previous_value: Any) -> Any:
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULLY_PAID, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_FULLY_PAID, order)
 
     def order_updated(self, order: "Order", previous_value: Any) -> Any:
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_UPDATED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_UPDATED, order)
 
     def order_cancelled(self, order: "Order", previous_value: Any) -> Any:
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CANCELLED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_CANCELLED, order)
 
     def order_fulfilled(self, order: "Order", previous_value: Any) -> Any:
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULFILLED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_FULFILLED, order)
 
     def customer_created(self, customer: "User", previous_value: Any) -> Any:
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-
-        customer_data = generate_customer_payload(customer)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CUSTOMER_CREATED, customer_data
-        )
+        trigger_webhooks(WebhookEventType.CUSTOMER_CREATED, customer)
 
     def product_created(self, product: "Product", previous_value: Any) -> Any:
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_CREATED, product_data)
+        trigger_webhooks(WebhookEventType.PRODUCT_CREATED, product)
 
     @classmethod
     def _get_default_configuration(cls):
@@ -1,20 +1,49 @@
 import logging
 
-import requests
-from requests.exceptions import RequestException
+from django.conf import settings
+from django.core.cache import cache
 
 from ....celeryconf import app
+from ....core.cache import schedule_once
 from ....webhook import WebhookEventType
 from ....webhook.models import Webhook
-from . import create_webhook_headers
+from ....webhook.payloads import generate_event_payload
+from .delivery import (
+    acquire_concurrency_slot,
+    delete_old_deliveries,
+    deliver_pending_payloads,
+    enqueue_deliveries,
+    get_target_origin,
+    get_webhooks_with_due_deliveries,
+)
 
 logger = logging.getLogger(__name__)
 
-WEBHOOK_TIMEOUT = 10
+DELIVERIES_SCHEDULED_CACHE_KEY = "webhook-deliveries-scheduled-{webhook_id}"
+# Time after which deliveries are scheduled again even if the previously
+# scheduled task did not start
+DELIVERIES_SCHEDULED_TIMEOUT = 60
+# Delay of the next try of a task which found all the slots of its host taken
+CONCURRENCY_SLOT_RETRY_DELAY = 5
 
 
-@app.task
-def trigger_webhooks_for_event(event_type, data):
+def schedule_webhook_deliveries(webhook_ids, countdown=None):
+    """Schedule sending of pending payloads of the webhooks.
+
+    A task is scheduled only for the webhooks which do not have one scheduled
+    already; payloads queued before it starts are sent together.
+    """
+    for webhook_id in webhook_ids:
+        schedule_once(
+            DELIVERIES_SCHEDULED_CACHE_KEY.format(webhook_id=webhook_id),
+            DELIVERIES_SCHEDULED_TIMEOUT,
+            deliver_webhook_payloads,
+            (webhook_id,),
+            countdown=countdown,
+        )
+
+
+def get_webhook_ids_for_event(event_type):
     permissions = {}
     required_permission = WebhookEventType.PERMISSIONS[event_type]
     if required_permission:
@@ -28,27 +57,71 @@ def trigger_webhooks_for_event(event_type, data):
         events__event_type__in=[event_type, WebhookEventType.ANY],
         **permissions,
     )
-    webhooks = webhooks.select_related("service_account").prefetch_related(
-        "service_account__permissions__content_type"
-    )
+    return set(webhooks.values_list("pk", flat=True))
+
+
+@app.task
+def trigger_webhooks_for_event(event_type, data):
+    webhook_ids = get_webhook_ids_for_event(event_type)
+    if webhook_ids:
+        enqueue_deliveries(webhook_ids, event_type, data)
+        schedule_webhook_deliveries(webhook_ids)
 
-    for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+
+@app.task
+def trigger_webhooks_for_object(event_type, object_id):
+    """Send payload of the event of the object to the subscribed webhooks.
+
+    The payload is generated only if any webhook receives it.
+    """
+    webhook_ids = get_webhook_ids_for_event(event_type)
+    if not webhook_ids:
+        return
+    data = generate_event_payload(event_type, object_id)
+    if data is None:
+        logger.warning(
+            "Object %s of the %s event does not exist.", object_id, event_type
         )
+        return
+    enqueue_deliveries(webhook_ids, event_type, data)
+    schedule_webhook_deliveries(webhook_ids)
 
 
-@app.task(
-    autoretry_for=(RequestException,),
-    retry_backoff=60,
-    retry_kwargs={"max_retries": 15},
-)
-def send_webhook_request(webhook_id, target_url, secret, event_type, data):
-    headers = create_webhook_headers(event_type, data, secret)
-    response = requests.post(
-        target_url, data=data, headers=headers, timeout=WEBHOOK_TIMEOUT
-    )
-    response.raise_for_status()
+@app.task
+def deliver_webhook_payloads(webhook_id):
+    cache.delete(DELIVERIES_SCHEDULED_CACHE_KEY.format(webhook_id=webhook_id))
+    webhook = Webhook.objects.filter(
+        pk=webhook_id, is_active=True, service_account__is_active=True
+    ).first()
+    if webhook is None:
+        return
+
+    slot = acquire_concurrency_slot(get_target_origin(webhook.target_url))
+    if slot is None:
+        schedule_webhook_deliveries(
+            [webhook_id], countdown=CONCURRENCY_SLOT_RETRY_DELAY
+        )
+        return
+    batch_size = settings.WEBHOOK_DELIVERY_BATCH_SIZE
+    try:
+        stats = deliver_pending_payloads(webhook, batch_size)
+    finally:
+        cache.delete(slot)
+
     logger.debug(
-        f"[Webhook ID:{webhook_id}] Payload sent to {target_url} for event {event_type}"
+        f"[Webhook ID:{webhook_id}] Payloads sent to {webhook.target_url}: "
+        f"{stats['delivered']} delivered, {stats['failed']} failed, "
+        f"{stats['dead']} dead"
     )
+    has_failed = stats["failed"] or stats["dead"]
+    if not has_failed and (stats["left"] or stats["delivered"] == batch_size):
+        # More payloads might be waiting
+        schedule_webhook_deliveries([webhook_id])
+
+
+@app.task
+def retry_webhook_deliveries_task():
+    schedule_webhook_deliveries(get_webhooks_with_due_deliveries())
+    deleted = delete_old_deliveries(settings.WEBHOOK_DELIVERIES_RETENTION)
+    if deleted:
+        logger.info("Deleted %d old webhook deliveries.", deleted)
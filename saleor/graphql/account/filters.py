@@ -2,6 +2,7 @@ import django_filters
 from django.db.models import Count, Sum
 
 from ...account.models import ServiceAccount, User
+from ...order.models import Order
 from ..core.filters import EnumFilter, ObjectTypeFilter
 from ..core.types.common import DateRangeInput, IntRangeInput, PriceRangeInput
 from ..utils import filter_by_query_param
@@ -38,11 +39,16 @@ def filter_number_of_orders(qs, _, value):
 
 
 def filter_placed_orders(qs, _, value):
+    # Orders are matched in a subquery, a join would repeat users having more
+    # than one matching order.
     gte, lte = value.get("gte"), value.get("lte")
+    orders = Order.objects.all()
     if gte:
-        qs = qs.filter(orders__created__date__gte=gte)
+        orders = orders.filter(created__date__gte=gte)
     if lte:
-        qs = qs.filter(orders__created__date__lte=lte)
+        orders = orders.filter(created__date__lte=lte)
+    if gte or lte:
+        qs = qs.filter(pk__in=orders.values("user_id"))
     return qs
 
 
@@ -30,7 +30,6 @@ def resolve_customers(info, query):
         queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
     )
     qs = qs.order_by("email")
-    qs = qs.distinct()
     return gql_optimizer.query(qs, info)
 
 
@@ -40,7 +39,6 @@ def resolve_staff_users(info, query):
         queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
     )
     qs = qs.order_by("email")
-    qs = qs.distinct()
     return gql_optimizer.query(qs, info)
 
 
@@ -106,6 +106,7 @@ class AccountQueries(graphene.ObjectType):
         filter=CustomerFilterInput(description="Filtering options for customers."),
         description="List of the shop's customers.",
         query=graphene.String(description=DESCRIPTIONS["user"]),
+        keyset_pagination=True,
     )
     me = graphene.Field(User, description="Return the currently authenticated user.")
     staff_users = FilterInputConnectionField(
@@ -113,6 +114,7 @@ class AccountQueries(graphene.ObjectType):
         filter=StaffUserInput(description="Filtering options for staff users."),
         description="List of the shop's staff users.",
         query=graphene.String(description=DESCRIPTIONS["user"]),
+        keyset_pagination=True,
     )
     service_accounts = FilterInputConnectionField(
         ServiceAccount,
@@ -2,8 +2,9 @@ import graphene
 import graphene_django_optimizer as gql_optimizer
 
 from ...checkout import models
+from ...checkout.pricing import get_checkout_line_total, get_checkout_pricing
 from ...checkout.utils import get_valid_shipping_methods_for_checkout
-from ...core.taxes import display_gross_prices, zero_taxed_money
+from ...core.taxes import display_gross_prices
 from ...extensions.manager import get_extensions_manager
 from ..core.connection import CountableDjangoObjectType
 from ..core.resolvers import resolve_meta, resolve_private_meta
@@ -55,9 +56,7 @@ class CheckoutLine(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(self, info):
-        return info.context.extensions.calculate_checkout_line_total(
-            checkout_line=self, discounts=info.context.discounts
-        )
+        return get_checkout_line_total(info.context, self)
 
     @staticmethod
     def resolve_requires_shipping(root: models.CheckoutLine, *_args):
@@ -145,39 +144,30 @@ class Checkout(MetadataObjectType, CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(root: models.Checkout, info):
-        taxed_total = (
-            info.context.extensions.calculate_checkout_total(
-                checkout=root, discounts=info.context.discounts
-            )
-            - root.get_total_gift_cards_balance()
-        )
-        return max(taxed_total, zero_taxed_money())
+        return get_checkout_pricing(info.context, root).total_price
 
     @staticmethod
     def resolve_subtotal_price(root: models.Checkout, info):
-        return info.context.extensions.calculate_checkout_subtotal(
-            checkout=root, discounts=info.context.discounts
-        )
+        return get_checkout_pricing(info.context, root).subtotal
 
     @staticmethod
     def resolve_shipping_price(root: models.Checkout, info):
-        return info.context.extensions.calculate_checkout_shipping(
-            checkout=root, discounts=info.context.discounts
-        )
+        return get_checkout_pricing(info.context, root).shipping_price
 
     @staticmethod
-    def resolve_lines(root: models.Checkout, *_args):
-        return root.lines.prefetch_related("variant")
+    def resolve_lines(root: models.Checkout, info):
+        return get_checkout_pricing(info.context, root).lines
 
     @staticmethod
     def resolve_available_shipping_methods(root: models.Checkout, info):
+        pricing = get_checkout_pricing(info.context, root)
         available = get_valid_shipping_methods_for_checkout(
-            root, info.context.discounts
+            root, info.context.discounts, subtotal=pricing.subtotal
         )
         if available is None:
             return []
 
-        manager = get_extensions_manager()
+        manager = pricing.manager
         display_gross = display_gross_prices()
         for shipping_method in available:
             taxed_price = manager.apply_taxes_to_shipping(
@@ -42,6 +42,10 @@ class CountableConnection(NonNullConnection):
 
     @staticmethod
     def resolve_total_count(root, *_args, **_kwargs):
+        if root.length is None:
+            # Connections paginated with keyset pagination don't count their
+            # items upfront.
+            root.length = root.iterable.count()
         return root.length
 
 
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from typing import Iterable, List, TypeVar
+
+from django.db.models import F, Model, QuerySet
+from promise import Promise
+from promise.dataloader import DataLoader as BaseLoader
+
+K = TypeVar("K")
+R = TypeVar("R")
+
+
+class DataLoader(BaseLoader):
+    """Base class of data loaders cached for the time of a single request.
+
+    Loaders are stored on the request (`info.context`) under `context_key`, so
+    all resolvers executed for the same request share the loaded objects and
+    their loads are batched into a single query.
+    """
+
+    context_key = None
+    context = None
+
+    def __new__(cls, context):
+        key = cls.context_key
+        if key is None:
+            raise TypeError("Data loader %r does not define a context key" % (cls,))
+        if not hasattr(context, "dataloaders"):
+            context.dataloaders = {}
+        if key not in context.dataloaders:
+            context.dataloaders[key] = super().__new__(cls)
+        loader = context.dataloaders[key]
+        assert isinstance(loader, cls)
+        return loader
+
+    def __init__(self, context):
+        if self.context != context:
+            self.context = context
+            super().__init__()
+
+    def batch_load_fn(self, keys: Iterable[K]) -> Promise:
+        results = self.batch_load(keys)
+        if not Promise.is_thenable(results):
+            return Promise.resolve(results)
+        return results
+
+    def batch_load(self, keys: Iterable[K]) -> List[R]:
+        raise NotImplementedError()
+
+
+class ObjectByIdLoader(DataLoader):
+    """Load model instances by their primary keys."""
+
+    model = None
+
+    def get_queryset(self) -> QuerySet:
+        return self.model.objects.all()
+
+    def batch_load(self, keys: Iterable[int]) -> List[Model]:
+        objects = self.get_queryset().in_bulk(keys)
+        return [objects.get(key) for key in keys]
+
+
+class ObjectsByRelatedIdLoader(DataLoader):
+    """Load lists of model instances grouped by the id of a related object.
+
+    `related_field` is a lookup, relative to the queryset of `get_queryset`,
+    pointing to the id of the object the instances are grouped by. It can span
+    relationships, e.g. `collectionproduct__product_id`.
+    """
+
+    model = None
+    related_field = None
+
+    def get_queryset(self) -> QuerySet:
+        return self.model.objects.all()
+
+    def batch_load(self, keys: Iterable[int]) -> List[List[Model]]:
+        lookup = {"%s__in" % self.related_field: keys}
+        queryset = self.get_queryset().filter(**lookup)
+        if "__" in self.related_field:
+            queryset = queryset.annotate(_related_id=F(self.related_field))
+            related_id_attr = "_related_id"
+        else:
+            related_id_attr = self.related_field
+
+        objects_map = defaultdict(list)
+        for obj in queryset:
+            objects_map[getattr(obj, related_id_attr)].append(obj)
+        return [objects_map[key] for key in keys]
@@ -4,6 +4,7 @@ from ...account import error_codes as account_error_codes
 from ...checkout import error_codes as checkout_error_codes
 from ...core import error_codes as shop_error_codes
 from ...core.permissions import MODELS_PERMISSIONS
+from ...core.utils.thumbnails import ThumbnailFormat
 from ...core.weight import WeightUnits
 from ...extensions import error_codes as extensions_error_codes
 from ...extensions.plugins.vatlayer import TaxRateType as CoreTaxRateType
@@ -71,6 +72,9 @@ WeightUnitsEnum = graphene.Enum(
 )
 
 
+ThumbnailFormatEnum = to_enum(ThumbnailFormat)
+
+
 AccountErrorCode = graphene.Enum.from_enum(account_error_codes.AccountErrorCode)
 CheckoutErrorCode = graphene.Enum.from_enum(checkout_error_codes.CheckoutErrorCode)
 ExtensionsErrorCode = graphene.Enum.from_enum(
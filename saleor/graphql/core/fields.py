@@ -10,6 +10,7 @@ from graphene_django.fields import DjangoConnectionField
 from graphql_relay.connection.arrayconnection import connection_from_list_slice
 from promise import Promise
 
+from .pagination import connection_from_queryset_keyset, get_keyset_ordering
 from .types.common import Weight
 from .types.money import Money, TaxedMoney
 
@@ -61,7 +62,60 @@ def convert_field_measurements(*_args):
     return graphene.Field(Weight)
 
 
+def validate_pagination_args(info, args, max_limit, enforce_first_or_last):
+    first = args.get("first")
+    last = args.get("last")
+
+    # Disable `enforce_first_or_last` if not querying for `edges`.
+    values = [field.name.value for field in info.field_asts[0].selection_set.selections]
+    if "edges" not in values:
+        enforce_first_or_last = False
+
+    if enforce_first_or_last:
+        assert first or last, (
+            "You must provide a `first` or `last` value to properly "
+            "paginate the `{}` connection."
+        ).format(info.field_name)
+
+    if max_limit:
+        if first:
+            assert first <= max_limit, (
+                "Requesting {} records on the `{}` connection exceeds the "
+                "`first` limit of {} records."
+            ).format(first, info.field_name, max_limit)
+            args["first"] = min(first, max_limit)
+
+        if last:
+            assert last <= max_limit, (
+                "Requesting {} records on the `{}` connection exceeds the "
+                "`last` limit of {} records."
+            ).format(last, info.field_name, max_limit)
+            args["last"] = min(last, max_limit)
+
+
+def resolve_keyset_connection(connection, args, iterable):
+    """Paginate a queryset with keyset pagination if its ordering allows it.
+
+    Return None if the iterable can't be paginated that way and the offset
+    pagination should be used instead.
+    """
+    if not isinstance(iterable, QuerySet):
+        return None
+    ordering = get_keyset_ordering(iterable)
+    if not ordering:
+        return None
+    connection = connection_from_queryset_keyset(iterable, args, ordering, connection)
+    connection.iterable = iterable
+    # Total count is computed only when it's selected in the query.
+    connection.length = None
+    return connection
+
+
 class PrefetchingConnectionField(BaseDjangoConnectionField):
+    def __init__(self, *args, **kwargs):
+        self.keyset_pagination = kwargs.pop("keyset_pagination", False)
+        super().__init__(*args, **kwargs)
+
     @classmethod
     def connection_resolver(
         cls,
@@ -70,34 +124,39 @@ class PrefetchingConnectionField(BaseDjangoConnectionField):
         default_manager,
         max_limit,
         enforce_first_or_last,
+        keyset_pagination,
         root,
         info,
         **args,
     ):
+        validate_pagination_args(info, args, max_limit, enforce_first_or_last)
 
-        # Disable `enforce_first_or_last` if not querying for `edges`.
-        values = [
-            field.name.value for field in info.field_asts[0].selection_set.selections
-        ]
-        if "edges" not in values:
-            enforce_first_or_last = False
-
-        return super().connection_resolver(
-            resolver,
+        iterable = resolver(root, info, **args)
+        queryset = cls.resolve_queryset(connection, default_manager, info, args)
+        on_resolve = partial(
+            cls.resolve_connection,
             connection,
-            default_manager,
-            max_limit,
-            enforce_first_or_last,
-            root,
-            info,
-            **args,
+            queryset,
+            args,
+            keyset_pagination=keyset_pagination,
         )
 
+        if Promise.is_thenable(iterable):
+            return Promise.resolve(iterable).then(on_resolve)
+        return on_resolve(iterable)
+
     @classmethod
-    def resolve_connection(cls, connection, default_manager, args, iterable):
+    def resolve_connection(
+        cls, connection, default_manager, args, iterable, keyset_pagination=False
+    ):
         if iterable is None:
             iterable = default_manager
 
+        if keyset_pagination:
+            keyset_connection = resolve_keyset_connection(connection, args, iterable)
+            if keyset_connection is not None:
+                return keyset_connection
+
         if isinstance(iterable, QuerySet):
             _len = iterable.count()
         else:
@@ -117,10 +176,14 @@ class PrefetchingConnectionField(BaseDjangoConnectionField):
         connection.length = _len
         return connection
 
+    def get_resolver(self, parent_resolver):
+        return partial(super().get_resolver(parent_resolver), self.keyset_pagination)
+
 
 class FilterInputConnectionField(BaseDjangoConnectionField):
     def __init__(self, *args, **kwargs):
         self.filter_field_name = kwargs.pop("filter_field_name", "filter")
+        self.keyset_pagination = kwargs.pop("keyset_pagination", False)
         self.filter_input = kwargs.get(self.filter_field_name)
         self.filterset_class = None
         if self.filter_input:
@@ -137,45 +200,22 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
         enforce_first_or_last,
         filterset_class,
         filters_name,
+        keyset_pagination,
         root,
         info,
         **args,
     ):
-
-        # Disable `enforce_first_or_last` if not querying for `edges`.
-        values = [
-            field.name.value for field in info.field_asts[0].selection_set.selections
-        ]
-        if "edges" not in values:
-            enforce_first_or_last = False
-
-        first = args.get("first")
-        last = args.get("last")
-
-        if enforce_first_or_last:
-            assert first or last, (
-                "You must provide a `first` or `last` value to properly "
-                "paginate the `{}` connection."
-            ).format(info.field_name)
-
-        if max_limit:
-            if first:
-                assert first <= max_limit, (
-                    "Requesting {} records on the `{}` connection exceeds the "
-                    "`first` limit of {} records."
-                ).format(first, info.field_name, max_limit)
-                args["first"] = min(first, max_limit)
-
-            if last:
-                assert last <= max_limit, (
-                    "Requesting {} records on the `{}` connection exceeds the "
-                    "`last` limit of {} records."
-                ).format(last, info.field_name, max_limit)
-                args["last"] = min(last, max_limit)
+        validate_pagination_args(info, args, max_limit, enforce_first_or_last)
 
         iterable = resolver(root, info, **args)
 
-        on_resolve = partial(cls.resolve_connection, connection, default_manager, args)
+        on_resolve = partial(
+            cls.resolve_connection,
+            connection,
+            default_manager,
+            args,
+            keyset_pagination=keyset_pagination,
+        )
 
         filter_input = args.get(filters_name)
         if filter_input and filterset_class:
@@ -187,9 +227,20 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
             return Promise.resolve(iterable).then(on_resolve)
         return on_resolve(iterable)
 
+    @classmethod
+    def resolve_connection(
+        cls, connection, default_manager, args, iterable, keyset_pagination=False
+    ):
+        if keyset_pagination:
+            keyset_connection = resolve_keyset_connection(connection, args, iterable)
+            if keyset_connection is not None:
+                return keyset_connection
+        return super().resolve_connection(connection, default_manager, args, iterable)
+
     def get_resolver(self, parent_resolver):
         return partial(
             super().get_resolver(parent_resolver),
             self.filterset_class,
             self.filter_field_name,
+            self.keyset_pagination,
         )
@@ -0,0 +1,184 @@
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from graphene.relay import PageInfo
+from graphql.error import GraphQLError
+
+KEYSET_VALUE_PREFIX = "keyset_value_"
+PK_ORDERING_FIELDS = {"pk", "id"}
+
+
+def get_keyset_ordering(queryset: QuerySet) -> Optional[List[Tuple[str, bool]]]:
+    """Return the ordering of a queryset as a list of `(lookup, descending)` pairs.
+
+    The primary key is appended as the last ordering field to make the order
+    total. Returns None when the ordering cannot be used for keyset pagination,
+    e.g. it uses expressions, `extra()` or random ordering.
+    """
+    query = queryset.query
+    if query.extra_order_by:
+        return None
+    ordering = query.order_by or (
+        queryset.model._meta.ordering if query.default_ordering else []
+    )
+
+    keyset_ordering = []
+    for field in ordering:
+        if not isinstance(field, str) or field == "?":
+            return None
+        descending = field.startswith("-")
+        lookup = field.lstrip("-")
+        if not _is_valid_keyset_lookup(queryset, lookup):
+            return None
+        keyset_ordering.append((lookup, descending))
+
+    if not any(lookup in PK_ORDERING_FIELDS for lookup, _ in keyset_ordering):
+        keyset_ordering.append(("pk", False))
+
+    if not query.standard_ordering:
+        keyset_ordering = [(lookup, not desc) for lookup, desc in keyset_ordering]
+    return keyset_ordering
+
+
+def _is_valid_keyset_lookup(queryset: QuerySet, lookup: str) -> bool:
+    if lookup in queryset.query.annotations or lookup in PK_ORDERING_FIELDS:
+        return True
+    if LOOKUP_SEP in lookup:
+        return True
+    try:
+        field = queryset.model._meta.get_field(lookup)
+    except FieldDoesNotExist:
+        return False
+    # Ordering by a relation uses the ordering of the related model
+    return not field.is_relation
+
+
+def encode_cursor(values: list) -> str:
+    data = json.dumps(values, cls=DjangoJSONEncoder)
+    return base64.b64encode(data.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str, ordering: list) -> list:
+    try:
+        values = json.loads(base64.b64decode(cursor.encode("utf-8")))
+    except (TypeError, ValueError):
+        raise GraphQLError(f"Received cursor ({cursor}) is invalid.")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise GraphQLError(f"Received cursor ({cursor}) is invalid.")
+    return values
+
+
+def _get_seek_filter(ordering: list, values: list, after: bool) -> Q:
+    """Return a filter selecting rows placed after (or before) the given values.
+
+    It is an equivalent of `WHERE (field_1, field_2, pk) > (v_1, v_2, v_pk)` that
+    respects the direction of every field and PostgreSQL's placement of NULLs,
+    which are sorted as larger than any other value.
+    """
+    seek_filter = Q(pk__in=[])
+    equal_filter = Q()
+    for (lookup, descending), value in zip(ordering, values):
+        ascending = descending != after
+        if value is None:
+            equal = Q(**{f"{lookup}__isnull": True})
+            if ascending:
+                field_filter = Q(pk__in=[])
+            else:
+                field_filter = Q(**{f"{lookup}__isnull": False})
+        else:
+            equal = Q(**{lookup: value})
+            if ascending:
+                field_filter = Q(**{f"{lookup}__gt": value}) | Q(
+                    **{f"{lookup}__isnull": True}
+                )
+            else:
+                field_filter = Q(**{f"{lookup}__lt": value})
+        seek_filter |= equal_filter & field_filter
+        equal_filter &= equal
+    return seek_filter
+
+
+def connection_from_queryset_keyset(
+    queryset: QuerySet, args: dict, ordering: list, connection_type
+):
+    """Return a page of the queryset using keyset (seek) pagination.
+
+    Cursors encode the values of the ordering fields and the primary key of the
+    node, so pages are fetched with an indexed seek instead of an OFFSET scan.
+    The total count of nodes is not computed here; it is resolved lazily by
+    the connection only when it is requested.
+    """
+    first = args.get("first")
+    last = args.get("last")
+    after = args.get("after")
+    before = args.get("before")
+
+    if not queryset.query.standard_ordering:
+        # The ordering already accounts for the reversal, applying it on top of
+        # a reversed query would flip the directions once more.
+        queryset = queryset.reverse()
+    annotations = {
+        f"{KEYSET_VALUE_PREFIX}{index}": F(lookup)
+        for index, (lookup, _) in enumerate(ordering)
+    }
+    page_qs = queryset.annotate(**annotations)
+    if after:
+        values = decode_cursor(after, ordering)
+        page_qs = page_qs.filter(_get_seek_filter(ordering, values, after=True))
+    if before:
+        values = decode_cursor(before, ordering)
+        page_qs = page_qs.filter(_get_seek_filter(ordering, values, after=False))
+
+    order_by = [
+        f"{'-' if descending else ''}{KEYSET_VALUE_PREFIX}{index}"
+        for index, (_, descending) in enumerate(ordering)
+    ]
+    reversed_order_by = [
+        field[1:] if field.startswith("-") else f"-{field}" for field in order_by
+    ]
+
+    has_previous_page = bool(after)
+    has_next_page = bool(before)
+    if last and not first:
+        nodes = list(page_qs.order_by(*reversed_order_by)[: last + 1])
+        has_previous_page = len(nodes) > last
+        nodes = nodes[:last][::-1]
+    else:
+        page_qs = page_qs.order_by(*order_by)
+        if first:
+            nodes = list(page_qs[: first + 1])
+            has_next_page = len(nodes) > first
+            nodes = nodes[:first]
+        else:
+            nodes = list(page_qs)
+        if last and len(nodes) > last:
+            has_previous_page = True
+            nodes = nodes[-last:]
+
+    edge_type = connection_type.Edge
+    edges = [
+        edge_type(
+            node=node,
+            cursor=encode_cursor(
+                [
+                    getattr(node, f"{KEYSET_VALUE_PREFIX}{index}")
+                    for index in range(len(ordering))
+                ]
+            ),
+        )
+        for node in nodes
+    ]
+    return connection_type(
+        edges=edges,
+        page_info=PageInfo(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_previous_page=has_previous_page,
+            has_next_page=has_next_page,
+        ),
+    )
@@ -1,6 +1,7 @@
 import graphene
 
 from ...discount import models
+from ...discount.utils import invalidate_active_discounts
 from ..core.mutations import ModelBulkDeleteMutation
 
 
@@ -15,6 +16,11 @@ class SaleBulkDelete(ModelBulkDeleteMutation):
         model = models.Sale
         permissions = ("discount.manage_discounts",)
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_active_discounts()
+
 
 class VoucherBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
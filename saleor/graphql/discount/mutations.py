@@ -6,6 +6,7 @@ from ...core.utils.promo_code import (
     is_available_promo_code,
 )
 from ...discount import models
+from ...discount.utils import invalidate_active_discounts
 from ...product.tasks import (
     update_products_minimal_variant_prices_of_catalogues_task,
     update_products_minimal_variant_prices_of_discount_task,
@@ -251,6 +252,7 @@ class SaleInput(graphene.InputObjectType):
 class SaleUpdateMinimalVariantPriceMixin:
     @classmethod
     def success_response(cls, instance):
+        invalidate_active_discounts()
         # Update the "minimal_variant_prices" of the associated, discounted
         # products (including collections and categories).
         update_products_minimal_variant_prices_of_discount_task.delay(instance.pk)
@@ -319,6 +321,7 @@ class SaleAddCatalogues(SaleBaseCatalogueMutation):
             info, data.get("id"), only_type=Sale, field="sale_id"
         )
         cls.add_catalogues_to_node(sale, data.get("input"))
+        invalidate_active_discounts()
         return SaleAddCatalogues(sale=sale)
 
 
@@ -333,4 +336,5 @@ class SaleRemoveCatalogues(SaleBaseCatalogueMutation):
             info, data.get("id"), only_type=Sale, field="sale_id"
         )
         cls.remove_catalogues_from_node(sale, data.get("input"))
+        invalidate_active_discounts()
         return SaleRemoveCatalogues(sale=sale)
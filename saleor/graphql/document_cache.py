@@ -0,0 +1,125 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument
+
+PERSISTED_QUERY_CACHE_KEY = "graphql-persisted-query:{}"
+
+
+class PersistedQueryNotFound(Exception):
+    def __init__(self, msg="PersistedQueryNotFound"):
+        super().__init__(msg)
+
+
+class PersistedQueryNotSupported(Exception):
+    def __init__(self, msg="PersistedQueryNotSupported"):
+        super().__init__(msg)
+
+
+class PersistedQueryHashMismatch(Exception):
+    def __init__(self, msg="Provided sha256 hash does not match the query."):
+        super().__init__(msg)
+
+
+def get_query_hash(query: str) -> str:
+    """Return the hash used by clients to identify a persisted query."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class DocumentCache:
+    """Bounded, per-process LRU cache of parsed and validated GraphQL documents.
+
+    Entries are keyed by the sha256 of the query text and a fingerprint of the
+    schema, so the same query parsed against a different schema never collides.
+    Hit and miss counters are kept per worker process and exposed by `stats()`.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._documents = OrderedDict()
+        self._schema_fingerprints = {}
+        self._lock = threading.Lock()
+
+    def get_schema_fingerprint(self, schema) -> str:
+        schema_id = id(schema)
+        fingerprint = self._schema_fingerprints.get(schema_id)
+        if fingerprint is None:
+            fingerprint = hashlib.sha256(str(schema).encode("utf-8")).hexdigest()
+            self._schema_fingerprints[schema_id] = fingerprint
+        return fingerprint
+
+    def get_key(self, schema, query_hash: str) -> str:
+        return f"{self.get_schema_fingerprint(schema)}:{query_hash}"
+
+    def get(self, schema, query_hash: str) -> Optional[GraphQLDocument]:
+        if not self.max_size:
+            return None
+        key = self.get_key(schema, query_hash)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def set(self, schema, query_hash: str, document: GraphQLDocument):
+        if not self.max_size:
+            return
+        key = self.get_key(schema, query_hash)
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "max_size": self.max_size,
+        }
+
+
+document_cache = DocumentCache(settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+def get_persisted_query_hash(extensions) -> Optional[str]:
+    """Return the sha256 hash of an automatic persisted query, if provided."""
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    return persisted_query.get("sha256Hash") or None
+
+
+def get_persisted_query(query_hash: str) -> str:
+    """Return the query text registered for a persisted query hash."""
+    query = cache.get(PERSISTED_QUERY_CACHE_KEY.format(query_hash))
+    if query is None:
+        raise PersistedQueryNotFound()
+    return query
+
+
+def store_persisted_query(query_hash: str, query: str):
+    """Register the query text so subsequent requests can send only its hash."""
+    cache.set(
+        PERSISTED_QUERY_CACHE_KEY.format(query_hash),
+        query,
+        settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT,
+    )
@@ -1,11 +1,11 @@
 import graphene
 import graphene_django_optimizer as gql_optimizer
 
-from ...order import OrderStatus, models
+from ...order import models
 from ...order.events import OrderEvents
 from ...order.models import OrderEvent
-from ...order.utils import sum_order_totals
-from ..utils import filter_by_period, filter_by_query_param
+from ...order.reports import get_sales_total
+from ..utils import filter_by_period, filter_by_query_param, reporting_period_to_date
 from .enums import OrderStatusFilter
 from .types import Order
 
@@ -40,9 +40,7 @@ def resolve_draft_orders(info, created, query):
 
 
 def resolve_orders_total(_info, period):
-    qs = models.Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
-    qs = filter_by_period(qs, period, "created")
-    return sum_order_totals(qs)
+    return get_sales_total(reporting_period_to_date(period))
 
 
 def resolve_order(info, order_id):
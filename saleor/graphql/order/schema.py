@@ -87,6 +87,7 @@ class OrderQueries(graphene.ObjectType):
             OrderStatusFilter, description="Filter order by status."
         ),
         description="List of orders.",
+        keyset_pagination=True,
     )
     draft_orders = FilterInputConnectionField(
         Order,
@@ -96,6 +97,7 @@ class OrderQueries(graphene.ObjectType):
             ReportingPeriod, description="Filter draft orders from a selected timespan."
         ),
         description="List of draft orders.",
+        keyset_pagination=True,
     )
     orders_total = graphene.Field(
         TaxedMoney,
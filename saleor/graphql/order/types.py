@@ -11,6 +11,7 @@ from ...order.utils import get_valid_shipping_methods_for_order
 from ...product.templatetags.product_images import get_product_image_thumbnail
 from ..account.types import User
 from ..core.connection import CountableDjangoObjectType
+from ..core.enums import ThumbnailFormatEnum
 from ..core.resolvers import resolve_meta, resolve_private_meta
 from ..core.types.common import Image
 from ..core.types.meta import MetadataObjectType
@@ -203,6 +204,13 @@ class OrderLine(CountableDjangoObjectType):
         Image,
         description="The main thumbnail for the ordered product.",
         size=graphene.Argument(graphene.Int, description="Size of thumbnail."),
+        format=graphene.Argument(
+            ThumbnailFormatEnum,
+            description=(
+                "The format of the thumbnail. The original format is used if the "
+                "given one is not available."
+            ),
+        ),
     )
     unit_price = graphene.Field(
         TaxedMoney, description="Price of the single item in the order line."
@@ -242,12 +250,14 @@ class OrderLine(CountableDjangoObjectType):
     @gql_optimizer.resolver_hints(
         prefetch_related=["variant__images", "variant__product__images"]
     )
-    def resolve_thumbnail(root: models.OrderLine, info, *, size=255):
+    def resolve_thumbnail(root: models.OrderLine, info, *, size=255, format=None):
         if not root.variant_id:
             return None
         image = root.variant.get_first_image()
         if image:
-            url = get_product_image_thumbnail(image, size, method="thumbnail")
+            url = get_product_image_thumbnail(
+                image, size, method="thumbnail", image_format=format
+            )
             alt = image.alt
             return Image(alt=alt, url=info.context.build_absolute_uri(url))
         return None
@@ -2,7 +2,7 @@ import graphene
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
-from ...core.taxes import zero_taxed_money
+from ...checkout.pricing import get_checkout_pricing
 from ...core.utils import get_client_ip
 from ...payment import PaymentError, gateway, models
 from ...payment.error_codes import PaymentErrorCode
@@ -84,13 +84,7 @@ class CheckoutPaymentCreate(BaseMutation, I18nMixin):
                 }
             )
 
-        checkout_total = (
-            info.context.extensions.calculate_checkout_total(
-                checkout, discounts=info.context.discounts
-            )
-            - checkout.get_total_gift_cards_balance()
-        )
-        checkout_total = max(checkout_total, zero_taxed_money(checkout_total.currency))
+        checkout_total = get_checkout_pricing(info.context, checkout).total_price
         amount = data.get("amount", checkout_total.gross.amount)
         if amount < checkout_total.gross.amount:
             raise ValidationError(
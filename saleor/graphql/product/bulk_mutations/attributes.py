@@ -1,6 +1,10 @@
 import graphene
 
 from ....product import models
+from ....product.utils.attributes import (
+    invalidate_attribute_values_map,
+    update_assigned_product_attributes_sort_keys,
+)
 from ...core.mutations import ModelBulkDeleteMutation
 from ...core.types.common import ProductError
 
@@ -18,6 +22,11 @@ class AttributeBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        queryset.delete()
+        invalidate_attribute_values_map()
+
 
 class AttributeValueBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
@@ -33,3 +42,16 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
         permissions = ("product.manage_products",)
         error_type_class = ProductError
         error_type_field = "product_errors"
+
+    @classmethod
+    def bulk_action(cls, queryset):
+        assignments_ids = list(
+            models.AssignedProductAttribute.objects.filter(
+                values__in=queryset
+            ).values_list("pk", flat=True)
+        )
+        queryset.delete()
+        invalidate_attribute_values_map()
+        update_assigned_product_attributes_sort_keys(
+            models.AssignedProductAttribute.objects.filter(pk__in=assignments_ids)
+        )
@@ -6,7 +6,10 @@ from django.db import transaction
 
 from ....product import models
 from ....product.error_codes import ProductErrorCode
-from ....product.tasks import update_product_minimal_variant_price_task
+from ....product.tasks import (
+    update_product_minimal_variant_price_task,
+    update_products_attribute_value_ids_task,
+)
 from ....product.utils import delete_categories
 from ....product.utils.attributes import generate_name_for_variant
 from ...core.mutations import (
@@ -293,6 +296,12 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductError
         error_type_field = "product_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        product_ids = list(queryset.values_list("product_id", flat=True).distinct())
+        queryset.delete()
+        update_products_attribute_value_ids_task.delay(product_ids)
+
 
 class ProductTypeBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
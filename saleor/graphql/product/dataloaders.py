@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+from ...order.reports import get_variants_revenue
+from ...product.models import (
+    Category,
+    Collection,
+    Product,
+    ProductImage,
+    ProductVariant,
+)
+from ..core.dataloaders import DataLoader, ObjectByIdLoader, ObjectsByRelatedIdLoader
+
+
+class CategoryByIdLoader(ObjectByIdLoader):
+    context_key = "category_by_id"
+    model = Category
+
+
+class CollectionByIdLoader(ObjectByIdLoader):
+    context_key = "collection_by_id"
+    model = Collection
+
+
+class ProductByIdLoader(ObjectByIdLoader):
+    context_key = "product_by_id"
+    model = Product
+
+
+class ProductVariantByIdLoader(ObjectByIdLoader):
+    context_key = "productvariant_by_id"
+    model = ProductVariant
+
+
+class ProductImageByIdLoader(ObjectByIdLoader):
+    context_key = "productimage_by_id"
+    model = ProductImage
+
+
+class ProductVariantsByProductIdLoader(ObjectsByRelatedIdLoader):
+    context_key = "productvariants_by_product"
+    model = ProductVariant
+    related_field = "product_id"
+
+    def get_queryset(self):
+        return self.model.objects.order_by("pk")
+
+
+class ImagesByProductIdLoader(ObjectsByRelatedIdLoader):
+    context_key = "images_by_product"
+    model = ProductImage
+    related_field = "product_id"
+
+
+class ImagesByProductVariantIdLoader(ObjectsByRelatedIdLoader):
+    context_key = "images_by_productvariant"
+    model = ProductImage
+    related_field = "variant_images__variant_id"
+
+
+class CollectionsByProductIdLoader(ObjectsByRelatedIdLoader):
+    context_key = "collections_by_product"
+    model = Collection
+    related_field = "collectionproduct__product_id"
+
+
+class RevenueByProductVariantIdAndStartDateLoader(DataLoader):
+    """Load revenue of variants by pairs of variant IDs and reporting dates."""
+
+    context_key = "revenue_by_productvariant_and_start_date"
+
+    def batch_load(self, keys):
+        variant_ids_by_date = defaultdict(set)
+        for variant_id, start_date in keys:
+            variant_ids_by_date[start_date].add(variant_id)
+        revenues = {
+            start_date: get_variants_revenue(variant_ids, start_date)
+            for start_date, variant_ids in variant_ids_by_date.items()
+        }
+        return [revenues[start_date][variant_id] for variant_id, start_date in keys]
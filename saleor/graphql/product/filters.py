@@ -9,6 +9,7 @@ from ...product.filters import (
     filter_products_by_attributes_values,
 )
 from ...product.models import Attribute, Category, Collection, Product, ProductType
+from ...product.utils.attributes import get_attribute_values_map
 from ...search.backends import picker
 from ..core.filters import EnumFilter, ListObjectTypeFilter, ObjectTypeFilter
 from ..core.types import FilterInputObjectType
@@ -37,22 +38,19 @@ def filter_fields_containing_value(*search_fields: str):
 
 
 def _clean_product_attributes_filter_input(filter_value) -> T_PRODUCT_FILTER_QUERIES:
-    attributes = Attribute.objects.prefetch_related("values")
-    attributes_map = {attribute.slug: attribute.pk for attribute in attributes}
-    values_map = {
-        attr.slug: {value.slug: value.pk for value in attr.values.all()}
-        for attr in attributes
-    }
+    attributes_map = get_attribute_values_map(
+        attr_name for attr_name, _ in filter_value
+    )
     queries = defaultdict(list)
 
     # Convert attribute:value pairs into a dictionary where
     # attributes are keys and values are grouped in lists
     for attr_name, val_slug in filter_value:
-        if attr_name not in attributes_map:
+        attribute = attributes_map[attr_name]
+        if attribute is None:
             raise ValueError("Unknown attribute name: %r" % (attr_name,))
-        attr_pk = attributes_map[attr_name]
-        attr_val_pk = values_map[attr_name].get(val_slug)
-        queries[attr_pk].append(attr_val_pk)
+        attr_val_pk = attribute["values"].get(val_slug)
+        queries[attribute["pk"]].append(attr_val_pk)
 
     return queries
 
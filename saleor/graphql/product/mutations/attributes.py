@@ -8,6 +8,8 @@ from django.template.defaultfilters import slugify
 
 from ....product import AttributeInputType, models
 from ....product.error_codes import ProductErrorCode
+from ....product.tasks import update_products_attribute_value_ids_task
+from ....product.utils.attributes import update_assigned_product_attributes_sort_keys
 from ...core.mutations import (
     BaseMutation,
     ClearMetaBaseMutation,
@@ -500,6 +502,10 @@ class AttributeUnassign(BaseMutation):
         cls.save_field_values(product_type, "product_attributes", attribute_pks)
         cls.save_field_values(product_type, "variant_attributes", attribute_pks)
 
+        # Values of the unassigned attributes were removed from the products
+        product_ids = list(product_type.products.values_list("pk", flat=True))
+        update_products_attribute_value_ids_task.delay(product_ids)
+
         return cls(product_type=product_type)
 
 
@@ -810,5 +816,10 @@ class AttributeReorderValues(BaseMutation):
 
         with transaction.atomic():
             perform_reordering(values_m2m, operations)
+            update_assigned_product_attributes_sort_keys(
+                models.AssignedProductAttribute.objects.filter(
+                    assignment__attribute=attribute
+                )
+            )
         attribute.refresh_from_db(fields=["values"])
         return AttributeReorderValues(attribute=attribute)
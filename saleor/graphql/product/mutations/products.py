@@ -14,6 +14,7 @@ from ....product import models
 from ....product.error_codes import ProductErrorCode
 from ....product.tasks import (
     update_product_minimal_variant_price_task,
+    update_products_attribute_value_ids_task,
     update_products_minimal_variant_prices_of_catalogues_task,
     update_variants_names,
 )
@@ -1213,6 +1214,7 @@ class ProductVariantDelete(ModelDeleteMutation):
     def success_response(cls, instance):
         # Update the "minimal_variant_prices" of the parent product
         update_product_minimal_variant_price_task.delay(instance.product_id)
+        update_products_attribute_value_ids_task.delay([instance.product_id])
         return super().success_response(instance)
 
 
@@ -1,16 +1,26 @@
+from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
 import graphene_django_optimizer as gql_optimizer
+from django.conf import settings
 from django.db.models import Sum
 from graphql import GraphQLError
 from graphql_relay import from_global_id
 
-from ...order import OrderStatus
+from ...order.reports import get_sales_date
 from ...product import models
+from ...product.utils.facets import ProductFacetsCounts, get_product_facets_counts
 from ...search.backends import picker
-from ..utils import filter_by_period, filter_by_query_param, get_database_id, get_nodes
+from ..utils import (
+    filter_by_query_param,
+    get_database_id,
+    get_nodes,
+    reporting_period_to_date,
+)
 from .enums import AttributeSortField, OrderDirection
 from .filters import (
+    ProductFilter,
+    _clean_product_attributes_filter_input,
     filter_attributes_by_product_types,
     filter_products_by_attributes,
     filter_products_by_categories,
@@ -30,6 +40,10 @@ CATEGORY_SEARCH_FIELDS = ("name", "slug", "description", "parent__name")
 COLLECTION_SEARCH_FIELDS = ("name", "slug")
 ATTRIBUTES_SEARCH_FIELDS = ("name", "slug")
 
+DEFAULT_PRICE_RANGE_SIZE = 50
+# Filters of products that can be applied by the search backend counting facets
+SEARCH_BACKEND_FACETS_FILTERS = {"search", "attributes", "categories", "minimal_price"}
+
 
 def resolve_attributes(
     info,
@@ -70,7 +84,6 @@ def resolve_categories(info, query, level=None):
         qs = qs.filter(level=level)
     qs = filter_by_query_param(qs, query, CATEGORY_SEARCH_FIELDS)
     qs = qs.order_by("name")
-    qs = qs.distinct()
     return gql_optimizer.query(qs, info)
 
 
@@ -161,6 +174,50 @@ def resolve_products(
     return gql_optimizer.query(qs, info)
 
 
+def _get_search_backend_facets_counts(facets_backend, filter_input, size):
+    filters = {}
+    if filter_input.get("attributes"):
+        filters["attribute_values"] = _clean_product_attributes_filter_input(
+            [(value["slug"], value["value"]) for value in filter_input["attributes"]]
+        )
+    if filter_input.get("categories"):
+        categories = get_nodes(filter_input["categories"], "Category", models.Category)
+        filters["category_ids"] = {
+            category.pk
+            for tree in categories
+            for category in tree.get_descendants(include_self=True)
+        }
+    minimal_price = filter_input.get("minimal_price") or {}
+    filters["minimal_price_gte"] = minimal_price.get("gte")
+    filters["minimal_price_lte"] = minimal_price.get("lte")
+    return facets_backend(filter_input["search"], size, **filters)
+
+
+def resolve_product_facets(
+    info, filter=None, price_range_size=DEFAULT_PRICE_RANGE_SIZE, **_kwargs
+) -> ProductFacetsCounts:
+    if not price_range_size or price_range_size < 0:
+        raise GraphQLError("Price range size must be greater than 0.")
+    size = Decimal(str(price_range_size))
+    user = info.context.user
+    filter_input = dict(filter or {})
+
+    # Searching storefront products, the search backend can count the facets by
+    # itself; it applies the same publication rules as `visible_to_user`.
+    facets_backend = picker.pick_facets_backend()
+    if (
+        facets_backend
+        and filter_input.get("search")
+        and set(filter_input) <= SEARCH_BACKEND_FACETS_FILTERS
+        and not models.Product.objects.user_has_access_to_all(user)
+    ):
+        return _get_search_backend_facets_counts(facets_backend, filter_input, size)
+
+    qs = models.Product.objects.visible_to_user(user)
+    qs = ProductFilter(data=filter_input, queryset=qs, request=info.context).qs
+    return get_product_facets_counts(qs, size)
+
+
 def resolve_product_types(info, query):
     qs = models.ProductType.objects.all()
     qs = filter_by_query_param(qs, query, PRODUCT_TYPE_SEARCH_FIELDS)
@@ -181,17 +238,15 @@ def resolve_product_variants(info, ids=None):
 
 
 def resolve_report_product_sales(period):
-    qs = models.ProductVariant.objects.prefetch_related(
-        "product", "product__images", "order_lines__order"
-    ).all()
+    qs = models.ProductVariant.objects.prefetch_related("product", "product__images")
 
-    # exclude draft and canceled orders
-    exclude_status = [OrderStatus.DRAFT, OrderStatus.CANCELED]
-    qs = qs.exclude(order_lines__order__status__in=exclude_status)
-
-    # filter by period
-    qs = filter_by_period(qs, period, "order_lines__order__created")
+    # daily sales include only placed orders which were not canceled
+    start_date = get_sales_date(reporting_period_to_date(period))
+    qs = qs.filter(
+        daily_sales__date__gte=start_date,
+        daily_sales__currency=settings.DEFAULT_CURRENCY,
+    )
 
-    qs = qs.annotate(quantity_ordered=Sum("order_lines__quantity"))
-    qs = qs.filter(quantity_ordered__isnull=False)
-    return qs.order_by("-quantity_ordered")
+    qs = qs.annotate(quantity_ordered=Sum("daily_sales__quantity"))
+    qs = qs.filter(quantity_ordered__gt=0)
+    return qs.order_by("-quantity_ordered", "pk")
@@ -101,10 +101,12 @@ from .mutations.products import (
     VariantImageUnassign,
 )
 from .resolvers import (
+    DEFAULT_PRICE_RANGE_SIZE,
     resolve_attributes,
     resolve_categories,
     resolve_collections,
     resolve_digital_contents,
+    resolve_product_facets,
     resolve_product_types,
     resolve_product_variants,
     resolve_products,
@@ -122,6 +124,7 @@ from .types import (
     ProductVariant,
 )
 from .types.attributes import AttributeSortingInput
+from .types.facets import ProductFacets
 
 
 class ProductQueries(graphene.ObjectType):
@@ -234,6 +237,20 @@ class ProductQueries(graphene.ObjectType):
         ),
         query=graphene.String(description=DESCRIPTIONS["product"]),
         description="List of the shop's products.",
+        keyset_pagination=True,
+    )
+    product_facets = graphene.Field(
+        ProductFacets,
+        filter=ProductFilterInput(description="Filtering options for products."),
+        price_range_size=graphene.Argument(
+            graphene.Float,
+            default_value=DEFAULT_PRICE_RANGE_SIZE,
+            description="Size of ranges products are grouped by their price into.",
+        ),
+        description=(
+            "Numbers of the shop's products per attribute value, category and "
+            "price range."
+        ),
     )
     product_type = graphene.Field(
         ProductType,
@@ -304,6 +321,9 @@ class ProductQueries(graphene.ObjectType):
     def resolve_products(self, info, **kwargs):
         return resolve_products(info, **kwargs)
 
+    def resolve_product_facets(self, info, **kwargs):
+        return resolve_product_facets(info, **kwargs)
+
     def resolve_product_type(self, info, id):
         return graphene.Node.get_node_from_global_id(info, id, ProductType)
 
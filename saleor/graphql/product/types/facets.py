@@ -0,0 +1,104 @@
+import graphene
+
+from ....product import models
+from ....product.utils.facets import ProductFacetsCounts
+from .attributes import Attribute, AttributeValue
+from .products import Category
+
+
+class AttributeValueFacet(graphene.ObjectType):
+    attribute = graphene.Field(
+        Attribute, required=True, description="Attribute of the value."
+    )
+    value = graphene.Field(AttributeValue, required=True, description="Value.")
+    count = graphene.Int(
+        required=True, description="Number of products with the value assigned."
+    )
+
+    class Meta:
+        description = "Number of products having a given attribute value."
+
+
+class CategoryFacet(graphene.ObjectType):
+    category = graphene.Field(Category, required=True, description="Category.")
+    count = graphene.Int(
+        required=True, description="Number of products in the category."
+    )
+
+    class Meta:
+        description = "Number of products in a given category."
+
+
+class PriceRangeFacet(graphene.ObjectType):
+    gte = graphene.Float(required=True, description="Price greater or equal to.")
+    lt = graphene.Float(required=True, description="Price less than.")
+    count = graphene.Int(
+        required=True, description="Number of products in the price range."
+    )
+
+    class Meta:
+        description = "Number of products with minimal price in a given range."
+
+
+class ProductFacets(graphene.ObjectType):
+    total_count = graphene.Int(
+        required=True, description="Number of products matching the filter."
+    )
+    attributes = graphene.List(
+        graphene.NonNull(AttributeValueFacet),
+        required=True,
+        description="Numbers of products per attribute value.",
+    )
+    categories = graphene.List(
+        graphene.NonNull(CategoryFacet),
+        required=True,
+        description="Numbers of products per category.",
+    )
+    price_ranges = graphene.List(
+        graphene.NonNull(PriceRangeFacet),
+        required=True,
+        description="Numbers of products per range of minimal price.",
+    )
+
+    class Meta:
+        description = "Numbers of products matching the filter grouped by facets."
+
+    @staticmethod
+    def resolve_attributes(root: ProductFacetsCounts, info):
+        attributes = models.Attribute.objects.get_visible_to_user(info.context.user)
+        values = (
+            models.AttributeValue.objects.filter(
+                pk__in=list(root.attribute_values), attribute__in=attributes
+            )
+            .select_related("attribute")
+            .order_by(
+                "attribute__storefront_search_position",
+                "attribute__slug",
+                "sort_order",
+                "pk",
+            )
+        )
+        return [
+            AttributeValueFacet(
+                attribute=value.attribute,
+                value=value,
+                count=root.attribute_values[value.pk],
+            )
+            for value in values
+        ]
+
+    @staticmethod
+    def resolve_categories(root: ProductFacetsCounts, _info):
+        categories = models.Category.objects.filter(pk__in=list(root.categories))
+        return [
+            CategoryFacet(category=category, count=root.categories[category.pk])
+            for category in categories.order_by("tree_id", "lft")
+        ]
+
+    @staticmethod
+    def resolve_price_ranges(root: ProductFacetsCounts, _info):
+        size = root.price_range_size
+        return [
+            PriceRangeFacet(gte=index * size, lt=(index + 1) * size, count=count)
+            for index, count in sorted(root.price_ranges.items())
+        ]
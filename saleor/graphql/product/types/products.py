@@ -7,20 +7,20 @@ from django.db.models import Prefetch
 from graphene import relay
 from graphene_federation import key
 from graphql.error import GraphQLError
+from promise import Promise
 
 from ....product import models
 from ....product.templatetags.product_images import (
     get_product_image_thumbnail,
     get_thumbnail,
 )
-from ....product.utils import calculate_revenue_for_variant
 from ....product.utils.availability import (
     get_product_availability,
     get_variant_availability,
 )
 from ....product.utils.costs import get_margin_for_variant, get_product_costs_data
 from ...core.connection import CountableDjangoObjectType
-from ...core.enums import ReportingPeriod, TaxRateType
+from ...core.enums import ReportingPeriod, TaxRateType, ThumbnailFormatEnum
 from ...core.fields import FilterInputConnectionField, PrefetchingConnectionField
 from ...core.resolvers import resolve_meta, resolve_private_meta
 from ...core.types import (
@@ -42,6 +42,15 @@ from ...translations.types import (
     ProductVariantTranslation,
 )
 from ...utils import get_database_id, reporting_period_to_date
+from ..dataloaders import (
+    CategoryByIdLoader,
+    CollectionsByProductIdLoader,
+    ImagesByProductIdLoader,
+    ImagesByProductVariantIdLoader,
+    ProductByIdLoader,
+    ProductVariantsByProductIdLoader,
+    RevenueByProductVariantIdAndStartDateLoader,
+)
 from ..enums import OrderDirection, ProductOrderField
 from ..filters import AttributeFilterInput
 from ..resolvers import resolve_attributes
@@ -270,11 +279,8 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
             "optimizations suitable for such calculations."
         ),
     )
-    images = gql_optimizer.field(
-        graphene.List(
-            lambda: ProductImage, description="List of images for the product variant."
-        ),
-        model_field="images",
+    images = graphene.List(
+        lambda: ProductImage, description="List of images for the product variant."
     )
     translation = graphene.Field(
         ProductVariantTranslation,
@@ -347,19 +353,29 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
         )
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=("product",), only=["price_override_amount", "currency"]
-    )
+    def resolve_product(root: models.ProductVariant, info):
+        return ProductByIdLoader(info.context).load(root.product_id)
+
+    @staticmethod
     def resolve_pricing(root: models.ProductVariant, info):
         context = info.context
-        availability = get_variant_availability(
-            root,
-            context.discounts,
-            context.country,
-            context.currency,
-            extensions=context.extensions,
-        )
-        return VariantPricingInfo(**availability._asdict())
+
+        def calculate_pricing_info(product_and_collections):
+            product, collections = product_and_collections
+            availability = get_variant_availability(
+                root,
+                context.discounts,
+                context.country,
+                context.currency,
+                extensions=context.extensions,
+                product=product,
+                collections=collections,
+            )
+            return VariantPricingInfo(**availability._asdict())
+
+        product = ProductByIdLoader(context).load(root.product_id)
+        collections = CollectionsByProductIdLoader(context).load(root.product_id)
+        return Promise.all([product, collections]).then(calculate_pricing_info)
 
     resolve_availability = resolve_pricing
 
@@ -391,13 +407,15 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
 
     @staticmethod
     @permission_required(["order.manage_orders", "product.manage_products"])
-    def resolve_revenue(root: models.ProductVariant, *_args, period):
+    def resolve_revenue(root: models.ProductVariant, info, *_args, period):
         start_date = reporting_period_to_date(period)
-        return calculate_revenue_for_variant(root, start_date)
+        return RevenueByProductVariantIdAndStartDateLoader(info.context).load(
+            (root.pk, start_date)
+        )
 
     @staticmethod
-    def resolve_images(root: models.ProductVariant, *_args):
-        return root.images.all()
+    def resolve_images(root: models.ProductVariant, info):
+        return ImagesByProductVariantIdLoader(info.context).load(root.id)
 
     @classmethod
     def get_node(cls, info, id):
@@ -431,6 +449,13 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         Image,
         description="The main thumbnail for a product.",
         size=graphene.Argument(graphene.Int, description="Size of thumbnail."),
+        format=graphene.Argument(
+            ThumbnailFormatEnum,
+            description=(
+                "The format of the thumbnail. The original format is used if the "
+                "given one is not available."
+            ),
+        ),
     )
     availability = graphene.Field(
         ProductPricingInfo,
@@ -479,21 +504,14 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         id=graphene.Argument(graphene.ID, description="ID of a product image."),
         description="Get a single product image by ID.",
     )
-    variants = gql_optimizer.field(
-        graphene.List(ProductVariant, description="List of variants for the product."),
-        model_field="variants",
+    variants = graphene.List(
+        ProductVariant, description="List of variants for the product."
     )
-    images = gql_optimizer.field(
-        graphene.List(
-            lambda: ProductImage, description="List of images for the product."
-        ),
-        model_field="images",
+    images = graphene.List(
+        lambda: ProductImage, description="List of images for the product."
     )
-    collections = gql_optimizer.field(
-        graphene.List(
-            lambda: Collection, description="List of collections for the product."
-        ),
-        model_field="collections",
+    collections = graphene.List(
+        lambda: Collection, description="List of collections for the product."
     )
     translation = graphene.Field(
         ProductTranslation,
@@ -534,41 +552,68 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         return TaxType(tax_code=tax_data.code, description=tax_data.description)
 
     @staticmethod
-    @gql_optimizer.resolver_hints(prefetch_related="images")
-    def resolve_thumbnail(root: models.Product, info, *, size=255):
-        image = root.get_first_image()
-        if image:
-            url = get_product_image_thumbnail(image, size, method="thumbnail")
-            alt = image.alt
-            return Image(alt=alt, url=info.context.build_absolute_uri(url))
-        return None
+    def resolve_category(root: models.Product, info):
+        if root.category_id is None:
+            return None
+        return CategoryByIdLoader(info.context).load(root.category_id)
+
+    @staticmethod
+    def resolve_thumbnail(root: models.Product, info, *, size=255, format=None):
+        def return_first_thumbnail(images):
+            if images:
+                image = images[0]
+                url = get_product_image_thumbnail(
+                    image, size, method="thumbnail", image_format=format
+                )
+                alt = image.alt
+                return Image(alt=alt, url=info.context.build_absolute_uri(url))
+            return None
+
+        return (
+            ImagesByProductIdLoader(info.context)
+            .load(root.id)
+            .then(return_first_thumbnail)
+        )
 
     @staticmethod
     def resolve_url(root: models.Product, *_args):
         return root.get_absolute_url()
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=("variants", "collections"),
-        only=["publication_date", "charge_taxes", "price_amount", "currency", "meta"],
-    )
     def resolve_pricing(root: models.Product, info):
         context = info.context
-        availability = get_product_availability(
-            root,
-            context.discounts,
-            context.country,
-            context.currency,
-            context.extensions,
-        )
-        return ProductPricingInfo(**availability._asdict())
+
+        def calculate_pricing_info(variants_and_collections):
+            variants, collections = variants_and_collections
+            availability = get_product_availability(
+                root,
+                context.discounts,
+                context.country,
+                context.currency,
+                context.extensions,
+                variants=variants,
+                collections=collections,
+            )
+            return ProductPricingInfo(**availability._asdict())
+
+        variants = ProductVariantsByProductIdLoader(context).load(root.id)
+        collections = CollectionsByProductIdLoader(context).load(root.id)
+        return Promise.all([variants, collections]).then(calculate_pricing_info)
 
     resolve_availability = resolve_pricing
 
     @staticmethod
-    @gql_optimizer.resolver_hints(prefetch_related=("variants"))
-    def resolve_is_available(root: models.Product, _info):
-        return root.is_available
+    def resolve_is_available(root: models.Product, info):
+        def is_available(variants):
+            return root.is_visible and any(
+                variant.is_in_stock() for variant in variants
+            )
+
+        return (
+            ProductVariantsByProductIdLoader(info.context)
+            .load(root.id)
+            .then(is_available)
+        )
 
     @staticmethod
     @permission_required("product.manage_products")
@@ -576,16 +621,22 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         return root.price
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=("variants", "collections"),
-        only=["publication_date", "charge_taxes", "price_amount", "currency", "meta"],
-    )
     def resolve_price(root: models.Product, info):
-        price_range = root.get_price_range(info.context.discounts)
-        price = info.context.extensions.apply_taxes_to_product(
-            root, price_range.start, info.context.country
-        )
-        return price.net
+        context = info.context
+
+        def calculate_price(variants_and_collections):
+            variants, collections = variants_and_collections
+            price_range = root.get_price_range(
+                context.discounts, variants=variants, collections=collections
+            )
+            price = context.extensions.apply_taxes_to_product(
+                root, price_range.start, context.country
+            )
+            return price.net
+
+        variants = ProductVariantsByProductIdLoader(context).load(root.id)
+        collections = CollectionsByProductIdLoader(context).load(root.id)
+        return Promise.all([variants, collections]).then(calculate_price)
 
     @staticmethod
     @gql_optimizer.resolver_hints(
@@ -618,17 +669,16 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
             raise GraphQLError("Product image not found.")
 
     @staticmethod
-    @gql_optimizer.resolver_hints(model_field="images")
-    def resolve_images(root: models.Product, *_args, **_kwargs):
-        return root.images.all()
+    def resolve_images(root: models.Product, info, **_kwargs):
+        return ImagesByProductIdLoader(info.context).load(root.id)
 
     @staticmethod
-    def resolve_variants(root: models.Product, *_args, **_kwargs):
-        return root.variants.all()
+    def resolve_variants(root: models.Product, info, **_kwargs):
+        return ProductVariantsByProductIdLoader(info.context).load(root.id)
 
     @staticmethod
-    def resolve_collections(root: models.Product, *_args):
-        return root.collections.all()
+    def resolve_collections(root: models.Product, info):
+        return CollectionsByProductIdLoader(info.context).load(root.id)
 
     @classmethod
     def get_node(cls, info, pk):
@@ -898,15 +948,21 @@ class Category(CountableDjangoObjectType, MetadataObjectType):
         qs = root.children.all()
         return gql_optimizer.query(qs, info)
 
+    @staticmethod
+    def resolve_parent(root: models.Category, info):
+        if root.parent_id is None:
+            return None
+        return CategoryByIdLoader(info.context).load(root.parent_id)
+
     @staticmethod
     def resolve_url(root: models.Category, _info):
         return root.get_absolute_url()
 
     @staticmethod
     def resolve_products(root: models.Category, info, **_kwargs):
-        # If the category has no children, we use the prefetched data.
-        children = root.children.all()
-        if not children and hasattr(root, "prefetched_products"):
+        # If the category has no children, we use the prefetched data. The MPTT
+        # fields tell whether there are any children without querying them.
+        if root.is_leaf_node() and hasattr(root, "prefetched_products"):
             return root.prefetched_products
 
         # Otherwise we want to include products from child categories which
@@ -936,6 +992,13 @@ class ProductImage(CountableDjangoObjectType):
         required=True,
         description="The URL of the image.",
         size=graphene.Int(description="Size of the image."),
+        format=graphene.Argument(
+            ThumbnailFormatEnum,
+            description=(
+                "The format of the image thumbnail, used only with the size. The "
+                "original format is used if the given one is not available."
+            ),
+        ),
     )
 
     class Meta:
@@ -945,9 +1008,11 @@ class ProductImage(CountableDjangoObjectType):
         model = models.ProductImage
 
     @staticmethod
-    def resolve_url(root: models.ProductImage, info, *, size=None):
+    def resolve_url(root: models.ProductImage, info, *, size=None, format=None):
         if size:
-            url = get_thumbnail(root.image, size, method="thumbnail")
+            url = get_thumbnail(
+                root.image, size, method="thumbnail", image_format=format
+            )
         else:
             url = root.image.url
         return info.context.build_absolute_uri(url)
@@ -7,6 +7,7 @@ from ...account.models import Address
 from ...core.error_codes import ShopErrorCode
 from ...core.utils.url import validate_storefront_url
 from ...site import models as site_models
+from ...site.patch_sites import invalidate_site_cache
 from ..account.i18n import I18nMixin
 from ..account.types import AddressInput
 from ..core.enums import WeightUnitsEnum
@@ -129,6 +130,7 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
         else:
             if site_settings.company_address:
                 site_settings.company_address.delete()
+                invalidate_site_cache()
         return ShopAddressUpdate(shop=Shop())
 
 
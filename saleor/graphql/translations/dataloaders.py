@@ -0,0 +1,177 @@
+from typing import Iterable, List, Optional, Tuple
+
+from django.db.models import Model
+
+from ...discount import models as discount_models
+from ...menu import models as menu_models
+from ...page import models as page_models
+from ...product import models as product_models
+from ...shipping import models as shipping_models
+from ...site import models as site_models
+from ..core.dataloaders import DataLoader
+
+
+def get_language_codes_with_fallbacks(language_code: str) -> List[str]:
+    """Return language codes a translation is looked up by, in order.
+
+    Translations of a regional variant of a language fall back to
+    the translations of the language, e.g. `pt-br` falls back to `pt`.
+    """
+    language_codes = [language_code]
+    if "-" in language_code:
+        language_codes.append(language_code.split("-")[0])
+    return language_codes
+
+
+class BaseTranslationByIdAndLanguageCodeLoader(DataLoader):
+    """Load translations of objects by pairs of object IDs and language codes.
+
+    Translations of all the objects and languages requested at once are loaded
+    with a single query; fallbacks to other languages are resolved in memory.
+    """
+
+    model = None
+    related_field = None
+
+    def batch_load(self, keys: Iterable[Tuple[int, str]]) -> List[Optional[Model]]:
+        object_ids = {object_id for object_id, _ in keys}
+        language_codes = {
+            code
+            for _, language_code in keys
+            for code in get_language_codes_with_fallbacks(language_code)
+        }
+        lookup = {
+            "%s__in" % self.related_field: object_ids,
+            "language_code__in": language_codes,
+        }
+        translations_map = {
+            (getattr(translation, self.related_field), translation.language_code): (
+                translation
+            )
+            for translation in self.model.objects.filter(**lookup)
+        }
+
+        results = []
+        for object_id, language_code in keys:
+            translation = None
+            for code in get_language_codes_with_fallbacks(language_code):
+                translation = translations_map.get((object_id, code))
+                if translation is not None:
+                    break
+            results.append(translation)
+        return results
+
+
+class AttributeTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "attribute_translation_by_id_and_language_code"
+    model = product_models.AttributeTranslation
+    related_field = "attribute_id"
+
+
+class AttributeValueTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "attributevalue_translation_by_id_and_language_code"
+    model = product_models.AttributeValueTranslation
+    related_field = "attribute_value_id"
+
+
+class CategoryTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "category_translation_by_id_and_language_code"
+    model = product_models.CategoryTranslation
+    related_field = "category_id"
+
+
+class CollectionTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "collection_translation_by_id_and_language_code"
+    model = product_models.CollectionTranslation
+    related_field = "collection_id"
+
+
+class ProductTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "product_translation_by_id_and_language_code"
+    model = product_models.ProductTranslation
+    related_field = "product_id"
+
+
+class ProductVariantTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "productvariant_translation_by_id_and_language_code"
+    model = product_models.ProductVariantTranslation
+    related_field = "product_variant_id"
+
+
+class PageTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "page_translation_by_id_and_language_code"
+    model = page_models.PageTranslation
+    related_field = "page_id"
+
+
+class MenuItemTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "menuitem_translation_by_id_and_language_code"
+    model = menu_models.MenuItemTranslation
+    related_field = "menu_item_id"
+
+
+class ShippingMethodTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "shippingmethod_translation_by_id_and_language_code"
+    model = shipping_models.ShippingMethodTranslation
+    related_field = "shipping_method_id"
+
+
+class SiteSettingsTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "sitesettings_translation_by_id_and_language_code"
+    model = site_models.SiteSettingsTranslation
+    related_field = "site_settings_id"
+
+
+class SaleTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "sale_translation_by_id_and_language_code"
+    model = discount_models.SaleTranslation
+    related_field = "sale_id"
+
+
+class VoucherTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "voucher_translation_by_id_and_language_code"
+    model = discount_models.VoucherTranslation
+    related_field = "voucher_id"
+
+
+TRANSLATION_LOADERS = {
+    loader.model: loader
+    for loader in (
+        AttributeTranslationByIdAndLanguageCodeLoader,
+        AttributeValueTranslationByIdAndLanguageCodeLoader,
+        CategoryTranslationByIdAndLanguageCodeLoader,
+        CollectionTranslationByIdAndLanguageCodeLoader,
+        ProductTranslationByIdAndLanguageCodeLoader,
+        ProductVariantTranslationByIdAndLanguageCodeLoader,
+        PageTranslationByIdAndLanguageCodeLoader,
+        MenuItemTranslationByIdAndLanguageCodeLoader,
+        ShippingMethodTranslationByIdAndLanguageCodeLoader,
+        SiteSettingsTranslationByIdAndLanguageCodeLoader,
+        SaleTranslationByIdAndLanguageCodeLoader,
+        VoucherTranslationByIdAndLanguageCodeLoader,
+    )
+}
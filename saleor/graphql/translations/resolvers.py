@@ -2,11 +2,17 @@ import graphene_django_optimizer as gql_optimizer
 
 from ...product import models as product_models
 from ...shipping import models as shipping_models
+from .dataloaders import TRANSLATION_LOADERS
 
 
-def resolve_translation(instance, _info, language_code):
-    """Get translation object from instance based on language code."""
-    return instance.translations.filter(language_code=language_code).first()
+def resolve_translation(instance, info, language_code):
+    """Get translation object from instance based on language code.
+
+    Translations of all objects in the response are loaded in batches, see
+    `BaseTranslationByIdAndLanguageCodeLoader`.
+    """
+    loader = TRANSLATION_LOADERS[instance.translations.model]
+    return loader(info.context).load((instance.pk, language_code))
 
 
 def resolve_shipping_methods(info):
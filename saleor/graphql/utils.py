@@ -1,8 +1,11 @@
 from typing import Union
 
 import graphene
+from django.conf import settings
 from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
 from django.utils import timezone
+from django.utils.module_loading import import_string
 from graphene_django.registry import get_global_registry
 from graphql.error import GraphQLError
 from graphql_relay import from_global_id
@@ -102,9 +105,56 @@ def get_nodes(
     return nodes
 
 
+def search_by_icontains(queryset, query, search_fields):
+    """Filter queryset by objects containing the query in any of the fields.
+
+    Matching through relations may return the same object multiple times,
+    so the results are made distinct.
+    """
+    query_objects = Q()
+    for field in search_fields:
+        query_objects |= Q(**{"%s__icontains" % field: query})
+    return queryset.filter(query_objects).distinct()
+
+
+def _lookup_spans_multiple_objects(model, lookup):
+    """Return True if the lookup follows a relation to many objects."""
+    opts = model._meta
+    for name in lookup.split(LOOKUP_SEP)[:-1]:
+        field = opts.get_field(name)
+        if field.many_to_many or field.one_to_many:
+            return True
+        opts = field.related_model._meta
+    return False
+
+
+def search_by_trigram_indexes(queryset, query, search_fields):
+    """Filter queryset by objects containing the query in any of the fields.
+
+    Matches the same objects as `search_by_icontains`. The `icontains` lookups
+    of text fields are served by `pg_trgm` GIN indexes on `UPPER(field)`.
+    Fields of the model and of related single objects are matched in place, so
+    the query needs no DISTINCT; fields of related multiple objects are matched
+    in subqueries instead.
+    """
+    model = queryset.model
+    query_objects = Q()
+    for field in search_fields:
+        lookup = {"%s__icontains" % field: query}
+        if _lookup_spans_multiple_objects(model, field):
+            matching = model._base_manager.filter(**lookup).values("pk")
+            query_objects |= Q(pk__in=matching)
+        else:
+            query_objects |= Q(**lookup)
+    return queryset.filter(query_objects)
+
+
 def filter_by_query_param(queryset, query, search_fields):
     """Filter queryset according to given parameters.
 
+    The search is done by the strategy set in `QUERY_PARAM_SEARCH_STRATEGY`
+    setting.
+
     Keyword Arguments:
         queryset - queryset to be filtered
         query - search string
@@ -112,13 +162,8 @@ def filter_by_query_param(queryset, query, search_fields):
 
     """
     if query:
-        query_by = {
-            "{0}__{1}".format(field, "icontains"): query for field in search_fields
-        }
-        query_objects = Q()
-        for q in query_by:
-            query_objects |= Q(**{q: query_by[q]})
-        return queryset.filter(query_objects).distinct()
+        search = import_string(settings.QUERY_PARAM_SEARCH_STRATEGY)
+        return search(queryset, query, search_fields)
     return queryset
 
 
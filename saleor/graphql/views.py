@@ -15,8 +15,20 @@ from graphql.error import (
     format_error as format_graphql_error,
 )
 from graphql.execution import ExecutionResult
+from graphql.validation import validate
 from graphql_jwt.exceptions import PermissionDenied
 
+from .document_cache import (
+    PersistedQueryHashMismatch,
+    PersistedQueryNotFound,
+    PersistedQueryNotSupported,
+    document_cache,
+    get_persisted_query,
+    get_persisted_query_hash,
+    get_query_hash,
+    store_persisted_query,
+)
+
 unhandled_errors_logger = logging.getLogger("saleor.graphql.errors.unhandled")
 handled_errors_logger = logging.getLogger("saleor.graphql.errors.handled")
 
@@ -36,7 +48,13 @@ class GraphQLView(View):
     middleware = None
     root_value = None
 
-    HANDLED_EXCEPTIONS = (GraphQLError, PermissionDenied)
+    HANDLED_EXCEPTIONS = (
+        GraphQLError,
+        PermissionDenied,
+        PersistedQueryHashMismatch,
+        PersistedQueryNotFound,
+        PersistedQueryNotSupported,
+    )
 
     def __init__(
         self, schema=None, executor=None, middleware=None, root_value=None, backend=None
@@ -114,31 +132,68 @@ class GraphQLView(View):
     def get_root_value(self):
         return self.root_value
 
-    def parse_query(self, query: str) -> (GraphQLDocument, ExecutionResult):
+    def parse_query(
+        self, query: str, query_hash: str = None
+    ) -> (GraphQLDocument, ExecutionResult):
         """Attempt to parse a query (mandatory) to a gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed and validated gql document.
+
+        When `query_hash` is given the query is handled as an automatic persisted
+        query and its text can be omitted if it was registered before.
+        Documents are cached per worker, so repeated queries are neither parsed
+        nor validated again.
         """
-        if not query or not isinstance(query, str):
-            return (
-                None,
-                ExecutionResult(
-                    errors=[ValueError("Must provide a query string.")], invalid=True
-                ),
-            )
+        if (query and not isinstance(query, str)) or not (query or query_hash):
+            error = ValueError("Must provide a query string.")
+            return None, self.get_error_result(error)
+
+        is_persisted_query = bool(query_hash)
+        if is_persisted_query:
+            if not settings.GRAPHQL_PERSISTED_QUERIES:
+                return None, self.get_error_result(PersistedQueryNotSupported())
+            if query and get_query_hash(query) != query_hash:
+                return None, self.get_error_result(PersistedQueryHashMismatch())
+        else:
+            query_hash = get_query_hash(query)
+
+        document = document_cache.get(self.schema, query_hash)
+        if document is not None:
+            return document, None
+
+        is_registered_query = not query
+        if is_registered_query:
+            try:
+                query = get_persisted_query(query_hash)
+            except PersistedQueryNotFound as e:
+                return None, self.get_error_result(e)
 
         # Attempt to parse the query, if it fails, return the error
         try:
-            return self.backend.document_from_string(self.schema, query), None
+            document = self.backend.document_from_string(self.schema, query)
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
+        validation_errors = validate(self.schema, document.document_ast)
+        if validation_errors:
+            return None, ExecutionResult(errors=validation_errors, invalid=True)
+
+        if is_persisted_query and not is_registered_query:
+            store_persisted_query(query_hash, query)
+        document_cache.set(self.schema, query_hash, document)
+        return document, None
+
+    @staticmethod
+    def get_error_result(error: Exception) -> ExecutionResult:
+        return ExecutionResult(errors=[error], invalid=True)
+
     def execute_graphql_request(self, request: HttpRequest, data: dict):
         query, variables, operation_name = self.get_graphql_params(request, data)
+        query_hash = self.get_persisted_query_hash(data)
 
-        document, error = self.parse_query(query)
+        document, error = self.parse_query(query, query_hash)
         if error:
             return error
 
@@ -154,6 +209,8 @@ class GraphQLView(View):
                 operation_name=operation_name,
                 context=request,
                 middleware=self.middleware,
+                # Documents are validated once, when they are parsed
+                validate=False,
                 **extra_options,
             )
         except Exception as e:
@@ -171,6 +228,10 @@ class GraphQLView(View):
             return request.POST
         return {}
 
+    @staticmethod
+    def get_persisted_query_hash(data: dict):
+        return get_persisted_query_hash(data.get("extensions"))
+
     @staticmethod
     def get_graphql_params(request: HttpRequest, data: dict):
         query = data.get("query")
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ...webhook import models
 from ...webhook.error_codes import WebhookErrorCode
+from ...webhook.subscriptions import invalidate_webhook_subscriptions
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import WebhookError
 from .enums import WebhookEventTypeEnum
@@ -91,6 +92,7 @@ class WebhookCreate(ModelMutation):
                 for event in events
             ]
         )
+        invalidate_webhook_subscriptions()
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -143,6 +145,7 @@ class WebhookUpdate(ModelMutation):
                     for event in events
                 ]
             )
+            invalidate_webhook_subscriptions()
 
 
 class WebhookDelete(ModelDeleteMutation):
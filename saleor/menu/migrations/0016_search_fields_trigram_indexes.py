@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from saleor.core.db.operations import create_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("menu", "0015_auto_20190725_0811"),
+        # The trigram extension is enabled by the product app
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        create_trigram_indexes("menu_menu", ["name"]),
+        create_trigram_indexes("menu_menuitem", ["name"]),
+    ]
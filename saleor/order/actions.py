@@ -12,6 +12,7 @@ from ..product.utils import decrease_stock
 from . import FulfillmentStatus, OrderStatus, emails, events, utils
 from .emails import send_fulfillment_confirmation_to_customer, send_payment_confirmation
 from .models import Fulfillment, FulfillmentLine
+from .reports import add_order_to_daily_sales, remove_order_from_daily_sales
 from .utils import (
     order_line_needs_automatic_fulfillment,
     recalculate_order,
@@ -30,6 +31,7 @@ logger = logging.getLogger(__name__)
 
 def order_created(order: "Order", user: "User", from_draft: bool = False):
     events.order_created_event(order=order, user=user, from_draft=from_draft)
+    add_order_to_daily_sales(order)
     manager = get_extensions_manager()
     manager.order_created(order)
 
@@ -73,6 +75,7 @@ def cancel_order(order: "Order", user: "User", restock: bool):
         fulfillment.save(update_fields=["status"])
     order.status = OrderStatus.CANCELED
     order.save(update_fields=["status"])
+    remove_order_from_daily_sales(order)
 
     payments = order.payments.filter(is_active=True).exclude(
         charge_status=ChargeStatus.FULLY_REFUNDED
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ...reports import update_daily_sales
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily sales reports from all the orders."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding the daily sales reports.")
+        stats = update_daily_sales()
+        self.stdout.write(
+            "Stored sales of %(days)d days and %(variant_days)d daily sales of "
+            "variants." % stats
+        )
@@ -0,0 +1,102 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0112_assignedproductattribute_sort_key"),
+        ("order", "0077_auto_20191118_0606"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "currency",
+                    models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH),
+                ),
+                ("orders_count", models.IntegerField(default=0)),
+                (
+                    "total_net_amount",
+                    models.DecimalField(
+                        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+                        default=0,
+                        max_digits=settings.DEFAULT_MAX_DIGITS,
+                    ),
+                ),
+                (
+                    "total_gross_amount",
+                    models.DecimalField(
+                        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+                        default=0,
+                        max_digits=settings.DEFAULT_MAX_DIGITS,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("date", "currency"),
+                "unique_together": {("date", "currency")},
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyVariantSales",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "currency",
+                    models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH),
+                ),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "revenue_net_amount",
+                    models.DecimalField(
+                        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+                        default=0,
+                        max_digits=settings.DEFAULT_MAX_DIGITS,
+                    ),
+                ),
+                (
+                    "revenue_gross_amount",
+                    models.DecimalField(
+                        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+                        default=0,
+                        max_digits=settings.DEFAULT_MAX_DIGITS,
+                    ),
+                ),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_sales",
+                        to="product.ProductVariant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("date", "variant", "currency"),
+                "unique_together": {("date", "variant", "currency")},
+            },
+        ),
+    ]
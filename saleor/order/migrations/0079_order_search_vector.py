@@ -0,0 +1,35 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from saleor.search.vectors import prepare_order_search_vector, update_search_vectors
+
+
+def populate_search_vectors(apps, schema_editor):
+    Order = apps.get_model("order", "Order")
+    update_search_vectors(
+        Order.objects.select_related("user__default_shipping_address"),
+        lambda order: prepare_order_search_vector(order.user),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("order", "0078_daily_sales")]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="order_search_vector_gin"
+            ),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
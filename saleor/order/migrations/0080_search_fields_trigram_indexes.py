@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from saleor.core.db.operations import create_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0079_order_search_vector"),
+        # The trigram extension is enabled by the product app
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        create_trigram_indexes(
+            "order_order",
+            ["discount_name", "translated_discount_name", "token", "user_email"],
+        ),
+    ]
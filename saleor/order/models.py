@@ -4,6 +4,8 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import F, Max, Sum
@@ -23,6 +25,7 @@ from ..core.weight import WeightUnits, zero_weight
 from ..discount.models import Voucher
 from ..giftcard.models import GiftCard
 from ..payment import ChargeStatus, TransactionKind
+from ..search.vectors import prepare_order_search_vector
 from ..shipping.models import ShippingMethod
 from . import FulfillmentStatus, OrderEvents, OrderStatus
 
@@ -168,10 +171,12 @@ class Order(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
     objects = OrderQueryset.as_manager()
 
     class Meta:
         ordering = ("-pk",)
+        indexes = [GinIndex(fields=["search_vector"], name="order_search_vector_gin")]
         permissions = (
             (
                 "manage_orders",
@@ -182,7 +187,15 @@ class Order(ModelWithMetadata):
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = str(uuid4())
-        return super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "user" in update_fields:
+            self.update_search_vector()
+
+    def update_search_vector(self):
+        Order.objects.filter(pk=self.pk).update(
+            search_vector=prepare_order_search_vector(self.user)
+        )
 
     def is_fully_paid(self):
         total_paid = self._total_paid()
@@ -509,3 +522,74 @@ class OrderEvent(models.Model):
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
+
+
+class DailySales(models.Model):
+    """Totals of orders placed on a given day (UTC) in a given currency.
+
+    Rows are updated incrementally when orders are placed or canceled; the
+    `update_daily_sales` command rebuilds them from scratch.
+    """
+
+    date = models.DateField()
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    orders_count = models.IntegerField(default=0)
+    total_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_net = MoneyField(amount_field="total_net_amount", currency_field="currency")
+    total_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_gross = MoneyField(
+        amount_field="total_gross_amount", currency_field="currency"
+    )
+    total = TaxedMoneyField(
+        net_amount_field="total_net_amount",
+        gross_amount_field="total_gross_amount",
+        currency="currency",
+    )
+
+    class Meta:
+        ordering = ("date", "currency")
+        unique_together = (("date", "currency"),)
+
+
+class DailyVariantSales(models.Model):
+    """Quantity and revenue of a variant sold on a given day (UTC)."""
+
+    date = models.DateField()
+    variant = models.ForeignKey(
+        "product.ProductVariant", related_name="daily_sales", on_delete=models.CASCADE
+    )
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    quantity = models.IntegerField(default=0)
+    revenue_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    revenue_net = MoneyField(
+        amount_field="revenue_net_amount", currency_field="currency"
+    )
+    revenue_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    revenue_gross = MoneyField(
+        amount_field="revenue_gross_amount", currency_field="currency"
+    )
+    revenue = TaxedMoneyField(
+        net_amount_field="revenue_net_amount",
+        gross_amount_field="revenue_gross_amount",
+        currency="currency",
+    )
+
+    class Meta:
+        ordering = ("date", "variant", "currency")
+        unique_together = (("date", "variant", "currency"),)
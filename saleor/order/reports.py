@@ -0,0 +1,188 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from prices import Money, TaxedMoney
+
+from . import OrderStatus
+from .models import DailySales, DailyVariantSales, Order, OrderLine
+
+DAILY_SALES_BATCH_SIZE = 1000
+
+
+def get_sales_date(created: datetime) -> date:
+    """Return the day an order created at a given time is reported on.
+
+    Days are counted in UTC, the same as the reporting periods of the API.
+    """
+    return created.astimezone(timezone.utc).date()
+
+
+def _line_total(line: OrderLine, amount_field: str) -> Decimal:
+    return getattr(line, amount_field) * line.quantity
+
+
+@transaction.atomic
+def _update_daily_sales(order: Order, sign: int):
+    sales_date = get_sales_date(order.created)
+    daily_sales, _ = DailySales.objects.get_or_create(
+        date=sales_date, currency=order.currency
+    )
+    DailySales.objects.filter(pk=daily_sales.pk).update(
+        orders_count=F("orders_count") + sign,
+        total_net_amount=F("total_net_amount") + sign * order.total_net_amount,
+        total_gross_amount=F("total_gross_amount") + sign * order.total_gross_amount,
+    )
+
+    variants_sales: Dict[Tuple[int, str], Dict] = defaultdict(
+        lambda: {"quantity": 0, "net": Decimal(0), "gross": Decimal(0)}
+    )
+    for line in order.lines.all():
+        if line.variant_id is None:
+            continue
+        sales = variants_sales[(line.variant_id, line.currency)]
+        sales["quantity"] += line.quantity
+        sales["net"] += _line_total(line, "unit_price_net_amount")
+        sales["gross"] += _line_total(line, "unit_price_gross_amount")
+
+    for (variant_id, currency), sales in sorted(variants_sales.items()):
+        variant_sales, _ = DailyVariantSales.objects.get_or_create(
+            date=sales_date, variant_id=variant_id, currency=currency
+        )
+        DailyVariantSales.objects.filter(pk=variant_sales.pk).update(
+            quantity=F("quantity") + sign * sales["quantity"],
+            revenue_net_amount=F("revenue_net_amount") + sign * sales["net"],
+            revenue_gross_amount=F("revenue_gross_amount") + sign * sales["gross"],
+        )
+
+
+def add_order_to_daily_sales(order: Order):
+    """Add totals and lines of a placed order to the daily sales."""
+    _update_daily_sales(order, 1)
+
+
+def remove_order_from_daily_sales(order: Order):
+    """Subtract totals and lines of a canceled order from the daily sales."""
+    _update_daily_sales(order, -1)
+
+
+def _get_reported_orders():
+    return Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
+
+
+def _line_total_expression(amount_field: str) -> ExpressionWrapper:
+    return ExpressionWrapper(
+        F(amount_field) * F("quantity"),
+        output_field=DecimalField(
+            max_digits=settings.DEFAULT_MAX_DIGITS,
+            decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        ),
+    )
+
+
+@transaction.atomic
+def update_daily_sales() -> Dict[str, int]:
+    """Rebuild the daily sales of all orders from scratch.
+
+    Orders and lines are aggregated per day in the database, so the time it
+    takes depends on the number of days and variants rather than of orders.
+    """
+    # Truncate dates in UTC regardless of the configured time zone
+    with timezone.override(timezone.utc):
+        orders_totals = (
+            _get_reported_orders()
+            .annotate(sales_date=TruncDate("created"))
+            .order_by()
+            .values("sales_date", "currency")
+            .annotate(
+                orders_count=Count("id"),
+                total_net_amount=Sum("total_net_amount"),
+                total_gross_amount=Sum("total_gross_amount"),
+            )
+        )
+        lines_totals = (
+            OrderLine.objects.filter(
+                order__in=_get_reported_orders(), variant__isnull=False
+            )
+            .annotate(sales_date=TruncDate("order__created"))
+            .order_by()
+            .values("sales_date", "variant_id", "currency")
+            .annotate(
+                quantity_sum=Sum("quantity"),
+                revenue_net_amount=Sum(_line_total_expression("unit_price_net_amount")),
+                revenue_gross_amount=Sum(
+                    _line_total_expression("unit_price_gross_amount")
+                ),
+            )
+        )
+        daily_sales = [
+            DailySales(
+                date=totals["sales_date"],
+                currency=totals["currency"],
+                orders_count=totals["orders_count"],
+                total_net_amount=totals["total_net_amount"],
+                total_gross_amount=totals["total_gross_amount"],
+            )
+            for totals in orders_totals
+        ]
+        daily_variant_sales = [
+            DailyVariantSales(
+                date=totals["sales_date"],
+                variant_id=totals["variant_id"],
+                currency=totals["currency"],
+                quantity=totals["quantity_sum"],
+                revenue_net_amount=totals["revenue_net_amount"],
+                revenue_gross_amount=totals["revenue_gross_amount"],
+            )
+            for totals in lines_totals.iterator()
+        ]
+
+    DailySales.objects.all().delete()
+    DailyVariantSales.objects.all().delete()
+    DailySales.objects.bulk_create(daily_sales, batch_size=DAILY_SALES_BATCH_SIZE)
+    DailyVariantSales.objects.bulk_create(
+        daily_variant_sales, batch_size=DAILY_SALES_BATCH_SIZE
+    )
+    return {"days": len(daily_sales), "variant_days": len(daily_variant_sales)}
+
+
+def get_sales_total(start_date: datetime) -> TaxedMoney:
+    """Return the total of orders placed since the given day."""
+    currency = settings.DEFAULT_CURRENCY
+    totals = DailySales.objects.filter(
+        date__gte=get_sales_date(start_date), currency=currency
+    ).aggregate(net=Sum("total_net_amount"), gross=Sum("total_gross_amount"))
+    return TaxedMoney(
+        net=Money(totals["net"] or 0, currency),
+        gross=Money(totals["gross"] or 0, currency),
+    )
+
+
+def get_variants_revenue(
+    variant_ids: Iterable[int], start_date: datetime
+) -> Dict[int, TaxedMoney]:
+    """Return revenue generated by the variants since the given day."""
+    currency = settings.DEFAULT_CURRENCY
+    zero = Money(0, currency)
+    revenues = {variant_id: TaxedMoney(zero, zero) for variant_id in variant_ids}
+    totals = (
+        DailyVariantSales.objects.filter(
+            variant_id__in=list(revenues),
+            date__gte=get_sales_date(start_date),
+            currency=currency,
+        )
+        .order_by()
+        .values("variant_id")
+        .annotate(net=Sum("revenue_net_amount"), gross=Sum("revenue_gross_amount"))
+    )
+    for total in totals:
+        revenues[total["variant_id"]] = TaxedMoney(
+            net=Money(total["net"], currency), gross=Money(total["gross"], currency)
+        )
+    return revenues
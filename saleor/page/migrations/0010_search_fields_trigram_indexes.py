@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from saleor.core.db.operations import create_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("page", "0009_auto_20191108_0402"),
+        # The trigram extension is enabled by the product app
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        create_trigram_indexes("page_page", ["content", "slug", "title"]),
+    ]
@@ -29,14 +29,15 @@ T_PRODUCT_FILTER_QUERIES = Dict[int, Iterable[int]]
 
 def filter_products_by_attributes_values(qs, queries: T_PRODUCT_FILTER_QUERIES):
     # Combine filters of the same attribute with OR operator
-    # and then combine full query with AND operator.
+    # and then combine full query with AND operator. Values assigned to
+    # products and their variants are denormalized in `attribute_value_ids`,
+    # so every attribute is matched with a single GIN indexed overlap lookup.
     combine_and = [
-        Q(**{"attributes__values__pk__in": values_pk})
-        | Q(**{"variants__attributes__values__pk__in": values_pk})
+        Q(attribute_value_ids__overlap=[pk for pk in values_pk if pk is not None])
         for _, values_pk in queries.items()
     ]
     query = functools.reduce(operator.and_, combine_and)
-    qs = qs.filter(query).distinct()
+    qs = qs.filter(query)
     return qs
 
 
@@ -1,23 +1,38 @@
-import logging
-
 from django.core.management.base import BaseCommand
-from tqdm import tqdm
-
-from ....discount.utils import fetch_active_discounts
-from ...models import Product
-from ...utils.variant_prices import update_product_minimal_variant_price
 
-logger = logging.getLogger(__name__)
+from ...utils.variant_prices import (
+    MINIMAL_VARIANT_PRICES_CHUNK_SIZE,
+    update_products_minimal_variant_prices_in_chunks,
+)
 
 
 class Command(BaseCommand):
-    help = "Generate thumbnails for all images"
+    help = 'Update "minimal_variant_price" field of all the products.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=MINIMAL_VARIANT_PRICES_CHUNK_SIZE,
+            help="Number of products updated at once.",
+        )
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Schedule Celery tasks updating the chunks of products.",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write('Updating "minimal_variant_price" field of all the products.')
-        # Fetching the discounts just once and reusing them
-        discounts = fetch_active_discounts()
-        # Run the update on all the products with "progress bar" (tqdm)
-        qs = Product.objects.all()
-        for product in tqdm(qs.iterator(), total=qs.count()):
-            update_product_minimal_variant_price(product, discounts=discounts)
+        stats = update_products_minimal_variant_prices_in_chunks(
+            chunk_size=options["chunk_size"], parallel=options["parallel"]
+        )
+        if options["parallel"]:
+            self.stdout.write(
+                "Scheduled %(chunks)d tasks updating %(products)d products." % stats
+            )
+        else:
+            self.stdout.write(
+                "Updated %(updated_products)d of %(products)d products in "
+                "%(duration).3fs (%(products_per_second).1f products/s)." % stats
+            )
@@ -0,0 +1,42 @@
+import argparse
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ...utils.variant_prices import (
+    update_products_minimal_variant_prices_at_sale_boundaries,
+)
+
+
+def parse_date(value):
+    date = parse_datetime(value)
+    if date is None:
+        raise argparse.ArgumentTypeError("Invalid date: %s" % value)
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return date
+
+
+class Command(BaseCommand):
+    help = (
+        'Update "minimal_variant_price" field of products of sales that started '
+        "or ended since the previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=parse_date,
+            help="Check sales since the given ISO 8601 date instead of the last run.",
+        )
+
+    def handle(self, *args, **options):
+        stats = update_products_minimal_variant_prices_at_sale_boundaries(
+            since=options["since"]
+        )
+        self.stdout.write(
+            "Checked sales from %(since)s to %(until)s: %(sales)d sales crossed "
+            "their boundaries, updated %(updated_products)d of %(products)d "
+            "products in %(duration).3fs." % stats
+        )
@@ -0,0 +1,55 @@
+from collections import defaultdict
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def populate_attribute_value_ids(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    AssignedProductAttribute = apps.get_model("product", "AssignedProductAttribute")
+    AssignedVariantAttribute = apps.get_model("product", "AssignedVariantAttribute")
+
+    values_map = defaultdict(set)
+    product_values = AssignedProductAttribute.values.through.objects.values_list(
+        "assignedproductattribute__product_id", "attributevalue_id"
+    )
+    variant_values = AssignedVariantAttribute.values.through.objects.values_list(
+        "assignedvariantattribute__variant__product_id", "attributevalue_id"
+    )
+    for product_id, value_id in product_values.iterator():
+        values_map[product_id].add(value_id)
+    for product_id, value_id in variant_values.iterator():
+        values_map[product_id].add(value_id)
+
+    products = [
+        Product(pk=product_id, attribute_value_ids=sorted(value_ids))
+        for product_id, value_ids in values_map.items()
+    ]
+    Product.objects.bulk_update(products, ["attribute_value_ids"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0110_auto_20191108_0340")]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="attribute_value_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["attribute_value_ids"], name="product_attribute_values_gin"
+            ),
+        ),
+        migrations.RunPython(populate_attribute_value_ids, migrations.RunPython.noop),
+    ]
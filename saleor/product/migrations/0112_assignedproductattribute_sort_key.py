@@ -0,0 +1,41 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_sort_keys(apps, schema_editor):
+    AssignedProductAttribute = apps.get_model("product", "AssignedProductAttribute")
+    AttributeValue = apps.get_model("product", "AttributeValue")
+
+    values_names = (
+        AttributeValue.objects.filter(assignedproductattribute=OuterRef("pk"))
+        .order_by()
+        .values("assignedproductattribute")
+        .annotate(names=StringAgg("name", delimiter=",", ordering=("sort_order", "id")))
+        .values("names")
+    )
+    AssignedProductAttribute.objects.update(
+        sort_key=Coalesce(Subquery(values_names), Value(""))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0111_product_attribute_value_ids")]
+
+    operations = [
+        migrations.AddField(
+            model_name="assignedproductattribute",
+            name="sort_key",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="assignedproductattribute",
+            index=models.Index(
+                fields=["assignment", "sort_key", "product"],
+                name="assigned_attribute_sort_key",
+            ),
+        ),
+        migrations.RunPython(populate_sort_keys, migrations.RunPython.noop),
+    ]
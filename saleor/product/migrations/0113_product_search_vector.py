@@ -0,0 +1,32 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from saleor.search.vectors import prepare_product_search_vector, update_search_vectors
+
+
+def populate_search_vectors(apps, schema_editor):
+    Product = apps.get_model("product", "Product")
+    update_search_vectors(Product.objects.all(), prepare_product_search_vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0112_assignedproductattribute_sort_key")]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="product_search_vector_gin"
+            ),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
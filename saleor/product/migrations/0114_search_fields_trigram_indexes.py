@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from saleor.core.db.operations import create_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0113_product_search_vector")]
+
+    operations = [
+        create_trigram_indexes("product_product", ["name", "description"]),
+        create_trigram_indexes("product_category", ["name", "slug", "description"]),
+        create_trigram_indexes("product_collection", ["name", "slug"]),
+        create_trigram_indexes("product_producttype", ["name"]),
+        create_trigram_indexes("product_attribute", ["name", "slug"]),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0114_search_fields_trigram_indexes")]
+
+    operations = [
+        migrations.AddField(
+            model_name="productvariant",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, null=True),
+        )
+    ]
@@ -3,11 +3,13 @@ from typing import Iterable, Union
 from uuid import uuid4
 
 from django.conf import settings
-from django.contrib.postgres.aggregates import StringAgg
-from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields import ArrayField, JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models import Case, Count, F, FilteredRelation, Q, When
+from django.db.models import Case, F, FilteredRelation, Q, When
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.encoding import smart_text
 from django.utils.html import strip_tags
@@ -38,6 +40,7 @@ from ..core.utils.translations import TranslationProxy
 from ..core.weight import WeightUnits, zero_weight
 from ..discount import DiscountInfo
 from ..discount.utils import calculate_discounted_price
+from ..search.vectors import prepare_product_search_vector
 from ..seo.models import SeoModel, SeoModelTranslation
 from . import AttributeInputType
 
@@ -191,51 +194,29 @@ class ProductsQueryset(PublishedQuerySet):
                 relation_name="attributes",
                 condition=Q(attributes__assignment_id__in=attribute_associations),
             ),
-            # Implicit `GROUP BY` required for the `StringAgg` aggregation
-            grouped_ids=Count("id"),
-            # String aggregation of the attribute's values to efficiently sort them
-            concatenated_values=Case(
-                # If the product has no association data but has the given attribute
-                # associated to its product type, then consider the concatenated values
-                # as empty (non-null).
-                When(
-                    Q(product_type_id__in=product_types_associated_to_attribute)
-                    & Q(filtered_attribute=None),
-                    then=models.Value(""),
-                ),
-                default=StringAgg(
-                    F("filtered_attribute__values__name"),
-                    delimiter=",",
-                    ordering=(
-                        [
-                            f"filtered_attribute__values__{field_name}"
-                            for field_name in AttributeValue._meta.ordering
-                        ]
-                    ),
-                ),
-                output_field=models.CharField(),
+        )
+        qs = qs.annotate(
+            # Names of the attribute's values are denormalized in the `sort_key` of
+            # the attribute data, no aggregation is needed to sort by them.
+            attribute_sort_key=Coalesce(
+                F("filtered_attribute__sort_key"), models.Value("")
+            ),
+            attribute_sort_group=Case(
+                # Put the products having an attribute value to be always at the top
+                When(filtered_attribute__sort_key__gt="", then=0),
+                # Put the products having an empty attribute value at the bottom of
+                # the other products.
+                When(product_type_id__in=product_types_associated_to_attribute, then=1),
+                # Make the products having no such attribute be last in the sorting
+                default=2,
+                output_field=models.IntegerField(),
             ),
         )
 
-        qs = qs.extra(
-            order_by=[
-                Case(
-                    # Make the products having no such attribute be last in the sorting
-                    When(concatenated_values=None, then=2),
-                    # Put the products having an empty attribute value at the bottom of
-                    # the other products.
-                    When(concatenated_values="", then=1),
-                    # Put the products having an attribute value to be always at the top
-                    default=0,
-                    output_field=models.IntegerField(),
-                ),
-                # Sort each group of products (0, 1, 2, ...) per attribute values
-                "concatenated_values",
-                # Sort each group of products by name,
-                # if they have the same values or not values
-                "name",
-            ]
-        )
+        # Sort each group of products (0, 1, 2) per attribute values and then by
+        # name, if they have the same values or not values. The ordering consists
+        # of plain fields, thus it can be used by the keyset pagination.
+        qs = qs.order_by("attribute_sort_group", "attribute_sort_key", "name", "pk")
 
         # Descending sorting
         if not ascending:
@@ -283,12 +264,24 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    # Denormalized ids of the attribute values assigned to the product and its
+    # variants, used to filter products by attributes without joins.
+    attribute_value_ids = ArrayField(
+        models.IntegerField(), blank=True, default=list, editable=False
+    )
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
     objects = ProductsQueryset.as_manager()
     translated = TranslationProxy()
 
     class Meta:
         app_label = "product"
         ordering = ("name",)
+        indexes = [
+            GinIndex(
+                fields=["attribute_value_ids"], name="product_attribute_values_gin"
+            ),
+            GinIndex(fields=["search_vector"], name="product_search_vector_gin"),
+        ]
         permissions = (
             (
                 "manage_products",
@@ -320,7 +313,14 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
         if self.minimal_variant_price_amount is None:
             self.minimal_variant_price_amount = self.price_amount
 
-        return super().save(force_insert, force_update, using, update_fields)
+        super().save(force_insert, force_update, using, update_fields)
+        if update_fields is None or {"name", "description"} & set(update_fields):
+            self.update_search_vector()
+
+    def update_search_vector(self):
+        Product.objects.filter(pk=self.pk).update(
+            search_vector=prepare_product_search_vector(self)
+        )
 
     @property
     def plain_text_description(self):
@@ -347,11 +347,26 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
         images = list(self.images.all())
         return images[0] if images else None
 
-    def get_price_range(self, discounts: Iterable[DiscountInfo] = None):
-        if self.variants.all():
-            prices = [variant.get_price(discounts) for variant in self]
+    def get_price_range(
+        self,
+        discounts: Iterable[DiscountInfo] = None,
+        variants: Iterable["ProductVariant"] = None,
+        collections: Iterable["Collection"] = None,
+    ):
+        """Return the price range of the product's variants.
+
+        Already fetched `variants` and `collections` of the product can be passed
+        to avoid querying them again.
+        """
+        if variants is None:
+            variants = list(self)
+        if variants:
+            prices = [
+                variant.get_price(discounts, collections=collections, product=self)
+                for variant in variants
+            ]
             return MoneyRange(min(prices), max(prices))
-        price = calculate_discounted_price(self, self.price, discounts)
+        price = calculate_discounted_price(self, self.price, discounts, collections)
         return MoneyRange(start=price, stop=price)
 
 
@@ -455,6 +470,7 @@ class ProductVariant(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     objects = ProductVariantQueryset.as_manager()
     translated = TranslationProxy()
@@ -493,8 +509,17 @@ class ProductVariant(ModelWithMetadata):
             else self.product.price
         )
 
-    def get_price(self, discounts: Iterable[DiscountInfo] = None):
-        return calculate_discounted_price(self.product, self.base_price, discounts)
+    def get_price(
+        self,
+        discounts: Iterable[DiscountInfo] = None,
+        collections: Iterable["Collection"] = None,
+        product: Product = None,
+    ):
+        product = product or self.product
+        base_price = (
+            self.price_override if self.price_override is not None else product.price
+        )
+        return calculate_discounted_price(product, base_price, discounts, collections)
 
     def get_weight(self):
         return self.weight or self.product.weight or self.product.product_type.weight
@@ -647,9 +672,17 @@ class AssignedProductAttribute(BaseAssignedAttribute):
     assignment = models.ForeignKey(
         "AttributeProduct", on_delete=models.CASCADE, related_name="productassignments"
     )
+    # Denormalized names of the assigned values, used to sort products
+    sort_key = models.TextField(blank=True, default="", editable=False)
 
     class Meta:
         unique_together = (("product", "assignment"),)
+        indexes = [
+            models.Index(
+                fields=["assignment", "sort_key", "product"],
+                name="assigned_attribute_sort_key",
+            )
+        ]
 
 
 class AssignedVariantAttribute(BaseAssignedAttribute):
@@ -800,6 +833,18 @@ class Attribute(ModelWithMetadata):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .utils.attributes import invalidate_attribute_values_map
+
+        super().save(*args, **kwargs)
+        invalidate_attribute_values_map()
+
+    def delete(self, *args, **kwargs):
+        from .utils.attributes import invalidate_attribute_values_map
+
+        super().delete(*args, **kwargs)
+        invalidate_attribute_values_map()
+
     def get_formfield_name(self):
         return slugify("attribute-%s-%s" % (self.slug, self.pk), allow_unicode=True)
 
@@ -847,6 +892,38 @@ class AttributeValue(SortableModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .utils.attributes import (
+            invalidate_attribute_values_map,
+            update_assigned_product_attributes_sort_keys,
+        )
+
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        invalidate_attribute_values_map()
+        if not is_new:
+            # The name and the position of the value are used to sort products
+            update_assigned_product_attributes_sort_keys(
+                AssignedProductAttribute.objects.filter(values=self)
+            )
+
+    def delete(self, *args, **kwargs):
+        from .utils.attributes import (
+            invalidate_attribute_values_map,
+            update_assigned_product_attributes_sort_keys,
+        )
+
+        assignments_ids = list(
+            AssignedProductAttribute.objects.filter(values=self).values_list(
+                "pk", flat=True
+            )
+        )
+        super().delete(*args, **kwargs)
+        invalidate_attribute_values_map()
+        update_assigned_product_attributes_sort_keys(
+            AssignedProductAttribute.objects.filter(pk__in=assignments_ids)
+        )
+
     @property
     def input_type(self):
         return self.attribute.input_type
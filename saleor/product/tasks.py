@@ -1,10 +1,15 @@
 from ..celeryconf import app
 from ..discount.models import Sale
 from .models import Attribute, Product, ProductType, ProductVariant
-from .utils.attributes import generate_name_for_variant
+from .utils.attributes import (
+    generate_name_for_variant,
+    update_products_attribute_value_ids,
+)
 from .utils.variant_prices import (
     update_product_minimal_variant_price,
     update_products_minimal_variant_prices,
+    update_products_minimal_variant_prices_at_sale_boundaries,
+    update_products_minimal_variant_prices_in_chunks,
     update_products_minimal_variant_prices_of_catalogues,
     update_products_minimal_variant_prices_of_discount,
 )
@@ -39,6 +44,11 @@ def update_variants_names(product_type_pk, saved_attributes_ids):
     return _update_variants_names(instance, saved_attributes)
 
 
+@app.task
+def update_products_attribute_value_ids_task(product_ids):
+    update_products_attribute_value_ids(product_ids)
+
+
 @app.task
 def update_product_minimal_variant_price_task(product_pk):
     product = Product.objects.get(pk=product_pk)
@@ -68,5 +78,10 @@ def update_products_minimal_variant_prices_task(product_ids):
 
 @app.task
 def update_all_products_minimal_variant_prices_task():
-    products = Product.objects.iterator()
-    update_products_minimal_variant_prices(products)
+    # Chunks of products are processed by separate tasks
+    update_products_minimal_variant_prices_in_chunks(parallel=True)
+
+
+@app.task
+def update_products_minimal_variant_prices_at_sale_boundaries_task():
+    update_products_minimal_variant_prices_at_sale_boundaries()
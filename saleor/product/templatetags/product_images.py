@@ -6,6 +6,8 @@ from django import template
 from django.conf import settings
 from django.templatetags.static import static
 
+from ...core.utils.thumbnails import ThumbnailFormat, get_webp_thumbnail
+
 logger = logging.getLogger(__name__)
 register = template.Library()
 
@@ -83,11 +85,22 @@ def get_thumbnail_size(size, method, rendition_key_set):
 
 
 @register.simple_tag()
-def get_thumbnail(image_file, size, method, rendition_key_set="products"):
+def get_thumbnail(
+    image_file, size, method, rendition_key_set="products", image_format=None
+):
+    """Return URL of the thumbnail in the given format.
+
+    Fall back to the format of the image if the given one is not available.
+    """
     if image_file:
         used_size = get_thumbnail_size(size, method, rendition_key_set)
         try:
             thumbnail = getattr(image_file, method)[used_size]
+            if image_format == ThumbnailFormat.WEBP and settings.WEBP_THUMBNAILS:
+                on_demand = settings.VERSATILEIMAGEFIELD_SETTINGS[
+                    "create_images_on_demand"
+                ]
+                thumbnail = get_webp_thumbnail(thumbnail, on_demand)
         except Exception:
             logger.exception(
                 "Thumbnail fetch failed", extra={"image_file": image_file, "size": size}
@@ -98,6 +111,34 @@ def get_thumbnail(image_file, size, method, rendition_key_set="products"):
 
 
 @register.simple_tag()
-def get_product_image_thumbnail(instance, size, method):
+def get_product_image_thumbnail(instance, size, method, image_format=None):
+    image_file = instance.image if instance else None
+    return get_thumbnail(image_file, size, method, image_format=image_format)
+
+
+@register.simple_tag()
+def get_thumbnail_srcset(
+    image_file, size, method, rendition_key_set="products", image_format=None
+):
+    """Return `srcset` of the thumbnail for screens of 1x and 2x density.
+
+    Return an empty string if there is no image in the given format, so the
+    `<source>` of a `<picture>` using it is skipped.
+    """
+    if image_format == ThumbnailFormat.WEBP and not (
+        image_file and settings.WEBP_THUMBNAILS
+    ):
+        return ""
+    url_1x, url_2x = [
+        get_thumbnail(
+            image_file, size * density, method, rendition_key_set, image_format
+        )
+        for density in (1, 2)
+    ]
+    return "%s 1x, %s 2x" % (url_1x, url_2x)
+
+
+@register.simple_tag()
+def get_product_image_thumbnail_srcset(instance, size, method, image_format=None):
     image_file = instance.image if instance else None
-    return get_thumbnail(image_file, size, method)
+    return get_thumbnail_srcset(image_file, size, method, image_format=image_format)
@@ -4,9 +4,9 @@ from django.conf import settings
 from django.db import transaction
 from django.db.models import F
 
-from ...core.taxes import TaxedMoney, zero_taxed_money
 from ...core.utils import get_paginator_items
 from ...core.utils.filters import get_now_sorted_by
+from ...search.signals import enqueue_updated_objects
 from ..tasks import update_products_minimal_variant_prices_task
 from .availability import products_with_availability
 
@@ -80,24 +80,24 @@ def get_variant_url(variant):
 
 def allocate_stock(variant, quantity):
     variant.quantity_allocated = F("quantity_allocated") + quantity
-    variant.save(update_fields=["quantity_allocated"])
+    variant.save(update_fields=["quantity_allocated", "updated_at"])
 
 
 def deallocate_stock(variant, quantity):
     variant.quantity_allocated = F("quantity_allocated") - quantity
-    variant.save(update_fields=["quantity_allocated"])
+    variant.save(update_fields=["quantity_allocated", "updated_at"])
 
 
 def decrease_stock(variant, quantity):
     variant.quantity = F("quantity") - quantity
     variant.quantity_allocated = F("quantity_allocated") - quantity
-    variant.save(update_fields=["quantity", "quantity_allocated"])
+    variant.save(update_fields=["quantity", "quantity_allocated", "updated_at"])
 
 
 def increase_stock(variant, quantity, allocate=False):
     """Return given quantity of product to a stock."""
     variant.quantity = F("quantity") + quantity
-    update_fields = ["quantity"]
+    update_fields = ["quantity", "updated_at"]
     if allocate:
         variant.quantity_allocated = F("quantity_allocated") + quantity
         update_fields.append("quantity_allocated")
@@ -153,13 +153,10 @@ def collections_visible_to_user(user):
 
 def calculate_revenue_for_variant(variant, start_date):
     """Calculate total revenue generated by a product variant."""
-    revenue = zero_taxed_money()
-    for order_line in variant.order_lines.all():
-        if order_line.order.created >= start_date:
-            net = order_line.unit_price_net * order_line.quantity
-            gross = order_line.unit_price_gross * order_line.quantity
-            revenue += TaxedMoney(net, gross)
-    return revenue
+    # pylint: disable=cyclic-import
+    from ...order.reports import get_variants_revenue
+
+    return get_variants_revenue([variant.pk], start_date)[variant.pk]
 
 
 def collect_categories_tree_products(category):
@@ -189,5 +186,6 @@ def delete_categories(categories_ids):
 
     products.update(is_published=False, publication_date=None)
     product_ids = list(products.values_list("id", flat=True))
+    enqueue_updated_objects(Product, product_ids)
     categories.delete()
     update_products_minimal_variant_prices_task.delay(product_ids=product_ids)
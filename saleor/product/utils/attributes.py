@@ -1,5 +1,13 @@
-from typing import Set, Union
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Union
 
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.cache import cache
+from django.db.models import OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from ...core.cache import bump_cache_version, get_cache_version
+from ...search.signals import enqueue_updated_objects
 from ..models import (
     AssignedProductAttribute,
     AssignedVariantAttribute,
@@ -11,6 +19,9 @@ from ..models import (
 
 AttributeAssignmentType = Union[AssignedProductAttribute, AssignedVariantAttribute]
 
+ATTRIBUTE_VALUES_MAP_VERSION_KEY = "attribute-values-map-version"
+ATTRIBUTE_VALUES_MAP_CACHE_KEY = "attribute-values-map:{version}:{slug}"
+
 
 def generate_name_for_variant(variant: ProductVariant) -> str:
     """Generate ProductVariant's name based on its attributes."""
@@ -80,4 +91,108 @@ def associate_attribute_values_to_instance(
     # Associate the attribute and the passed values
     assignment = _associate_attribute_to_instance(instance, attribute.pk)
     assignment.values.set(values)
+
+    if isinstance(instance, Product):
+        update_assigned_product_attributes_sort_keys(
+            AssignedProductAttribute.objects.filter(pk=assignment.pk)
+        )
+    product_id = instance.pk if isinstance(instance, Product) else instance.product_id
+    update_products_attribute_value_ids([product_id])
     return assignment
+
+
+def update_products_attribute_value_ids(product_ids: Iterable[int]) -> None:
+    """Recalculate the denormalized attribute values of given products.
+
+    The ids of values assigned to the products and to their variants are
+    stored in ``Product.attribute_value_ids`` to filter products by attributes
+    with a single indexed lookup.
+    """
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+    values_map = defaultdict(set)  # type: Dict[int, Set[int]]
+    product_values = AssignedProductAttribute.values.through.objects.filter(
+        assignedproductattribute__product_id__in=product_ids
+    ).values_list("assignedproductattribute__product_id", "attributevalue_id")
+    variant_values = AssignedVariantAttribute.values.through.objects.filter(
+        assignedvariantattribute__variant__product_id__in=product_ids
+    ).values_list("assignedvariantattribute__variant__product_id", "attributevalue_id")
+    for product_id, value_id in list(product_values) + list(variant_values):
+        values_map[product_id].add(value_id)
+
+    products = [
+        Product(pk=product_id, attribute_value_ids=sorted(values_map[product_id]))
+        for product_id in product_ids
+    ]
+    Product.objects.bulk_update(products, ["attribute_value_ids"], batch_size=1000)
+    enqueue_updated_objects(Product, product_ids)
+
+
+def get_attribute_values_map_version() -> str:
+    return get_cache_version(ATTRIBUTE_VALUES_MAP_VERSION_KEY)
+
+
+def invalidate_attribute_values_map() -> None:
+    """Drop the cached slug to pk maps of attributes and their values."""
+    bump_cache_version(ATTRIBUTE_VALUES_MAP_VERSION_KEY)
+
+
+def get_attribute_values_map(
+    attribute_slugs: Iterable[str],
+) -> Dict[str, Optional[dict]]:
+    """Return maps of value slugs to value pks for attributes of given slugs.
+
+    The result contains a ``{"pk": attribute_pk, "values": {slug: pk}}`` entry
+    for every known attribute and None for slugs of unknown attributes. Maps
+    are cached per attribute until any attribute or value is changed.
+    """
+    attribute_slugs = set(attribute_slugs)
+    version = get_attribute_values_map_version()
+    keys = {
+        ATTRIBUTE_VALUES_MAP_CACHE_KEY.format(version=version, slug=slug): slug
+        for slug in attribute_slugs
+    }
+    cached = cache.get_many(keys.keys())
+    result = {keys[key]: value for key, value in cached.items()}
+
+    missing_slugs = attribute_slugs - result.keys()
+    if missing_slugs:
+        attributes = Attribute.objects.filter(slug__in=missing_slugs).values_list(
+            "slug", "pk", "values__slug", "values__pk"
+        )
+        missing = {}  # type: Dict[str, dict]
+        for slug, pk, value_slug, value_pk in attributes:
+            data = missing.setdefault(slug, {"pk": pk, "values": {}})
+            if value_pk is not None:
+                data["values"][value_slug] = value_pk
+        cache.set_many(
+            {
+                ATTRIBUTE_VALUES_MAP_CACHE_KEY.format(version=version, slug=slug): data
+                for slug, data in missing.items()
+            }
+        )
+        result.update(missing)
+
+    return {slug: result.get(slug) for slug in attribute_slugs}
+
+
+def update_assigned_product_attributes_sort_keys(assignments: QuerySet) -> int:
+    """Recalculate the sort keys of given product attribute assignments.
+
+    The sort key is made of the names of the assigned values, joined in the
+    order of the values; products are sorted by an attribute using it.
+    The keys are updated with a single query.
+    """
+    values_names = (
+        AttributeValue.objects.filter(assignedproductattribute=OuterRef("pk"))
+        .order_by()
+        .values("assignedproductattribute")
+        .annotate(
+            names=StringAgg(
+                "name", delimiter=",", ordering=AttributeValue._meta.ordering
+            )
+        )
+        .values("names")
+    )
+    return assignments.update(sort_key=Coalesce(Subquery(values_names), Value("")))
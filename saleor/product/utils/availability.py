@@ -5,7 +5,7 @@ from typing import Iterable, Union
 from prices import TaxedMoneyRange
 
 from saleor.graphql.core.types import MoneyRange
-from saleor.product.models import Product, ProductVariant
+from saleor.product.models import Collection, Product, ProductVariant
 
 from ...core.utils import to_local_currency
 from ...discount import DiscountInfo
@@ -121,12 +121,16 @@ def get_product_availability(
     country=None,
     local_currency=None,
     extensions=None,
+    variants: Iterable[ProductVariant] = None,
+    collections: Iterable[Collection] = None,
 ) -> ProductAvailability:
 
     if not extensions:
         extensions = get_extensions_manager()
-    discounted_net_range = product.get_price_range(discounts=discounts)
-    undiscounted_net_range = product.get_price_range()
+    discounted_net_range = product.get_price_range(
+        discounts=discounts, variants=variants, collections=collections
+    )
+    undiscounted_net_range = product.get_price_range(variants=variants)
     discounted = TaxedMoneyRange(
         start=extensions.apply_taxes_to_product(
             product, discounted_net_range.start, country
@@ -150,9 +154,15 @@ def get_product_availability(
     )
 
     is_on_sale = product.is_visible and discount is not None
+    if variants is None:
+        is_available = product.is_available
+    else:
+        is_available = product.is_visible and any(
+            variant.is_in_stock() for variant in variants
+        )
 
     return ProductAvailability(
-        available=product.is_available,
+        available=is_available,
         on_sale=is_on_sale,
         price_range=discounted,
         price_range_undiscounted=undiscounted,
@@ -168,15 +178,21 @@ def get_variant_availability(
     country=None,
     local_currency=None,
     extensions=None,
+    product: Product = None,
+    collections: Iterable[Collection] = None,
 ) -> VariantAvailability:
 
     if not extensions:
         extensions = get_extensions_manager()
+    if product is None:
+        product = variant.product
     discounted = extensions.apply_taxes_to_product(
-        variant.product, variant.get_price(discounts=discounts), country
+        product,
+        variant.get_price(discounts, collections=collections, product=product),
+        country,
     )
     undiscounted = extensions.apply_taxes_to_product(
-        variant.product, variant.get_price(), country
+        product, variant.get_price(product=product), country
     )
 
     discount = _get_total_discount(undiscounted, discounted)
@@ -188,10 +204,10 @@ def get_variant_availability(
         price_local_currency = None
         discount_local_currency = None
 
-    is_on_sale = variant.is_visible and discount is not None
+    is_on_sale = product.is_visible and discount is not None
 
     return VariantAvailability(
-        available=variant.is_available,
+        available=product.is_visible and variant.is_in_stock(),
         on_sale=is_on_sale,
         price=discounted,
         price_undiscounted=undiscounted,
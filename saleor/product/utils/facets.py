@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+from ..models import ProductsQueryset
+
+# Counts are computed in a single pass over the filtered products; every
+# facet is a separate group of rows tagged with its kind.
+PRODUCT_FACETS_SQL = """
+    WITH products AS ({products})
+    SELECT 'total', NULL, COUNT(*) FROM products
+    UNION ALL
+    SELECT 'attribute_value', value_id, COUNT(*)
+    FROM products, UNNEST(products.attribute_value_ids) AS value_id
+    GROUP BY value_id
+    UNION ALL
+    SELECT 'category', category_id, COUNT(*)
+    FROM products
+    WHERE category_id IS NOT NULL
+    GROUP BY category_id
+    UNION ALL
+    SELECT 'price', FLOOR(minimal_variant_price_amount / %s)::integer, COUNT(*)
+    FROM products
+    GROUP BY 2
+"""
+
+
+@dataclass
+class ProductFacetsCounts:
+    """Numbers of products per attribute value, category and price range.
+
+    Price ranges are keyed by the index of the range, i.e. the range of index
+    ``n`` contains prices from ``n * price_range_size`` (inclusive) to
+    ``(n + 1) * price_range_size`` (exclusive).
+    """
+
+    price_range_size: Decimal
+    total_count: int = 0
+    attribute_values: Dict[int, int] = field(default_factory=dict)
+    categories: Dict[int, int] = field(default_factory=dict)
+    price_ranges: Dict[int, int] = field(default_factory=dict)
+
+
+def get_product_facets_counts(
+    products: ProductsQueryset, price_range_size: Decimal
+) -> ProductFacetsCounts:
+    """Count products of the queryset per attribute value, category and price.
+
+    Prices are grouped by the minimal price of product's variants, the same
+    price the products are filtered by.
+    """
+    products = products.order_by().values(
+        "id", "category_id", "minimal_variant_price_amount", "attribute_value_ids"
+    )
+    counts = ProductFacetsCounts(price_range_size=price_range_size)
+    try:
+        products_sql, params = products.query.sql_with_params()
+    except EmptyResultSet:
+        # The filters can't match any product, e.g. `pk__in=[]`
+        return counts
+    sql = PRODUCT_FACETS_SQL.format(products=products_sql)
+
+    facets_maps = {
+        "attribute_value": counts.attribute_values,
+        "category": counts.categories,
+        "price": counts.price_ranges,
+    }
+    with connections[products.db].cursor() as cursor:
+        cursor.execute(sql, params + (price_range_size,))
+        for facet, key, count in cursor.fetchall():
+            if facet == "total":
+                counts.total_count = count
+            else:
+                facets_maps[facet][key] = count
+    return counts
@@ -1,18 +1,41 @@
+import datetime
+import logging
 import operator
+import time
 from functools import reduce
 
+from django.core.cache import cache
+from django.db.models import Prefetch, QuerySet
 from django.db.models.query_utils import Q
+from django.utils import timezone
 from prices import Money
 
-from ...discount.utils import fetch_active_discounts
-from ..models import Product
+from ...discount.models import Sale
+from ...discount.utils import (
+    fetch_active_discounts,
+    fetch_sales_catalogues,
+    invalidate_active_discounts,
+)
+from ...search.signals import enqueue_updated_objects
+from ..models import Collection, Product
+
+logger = logging.getLogger(__name__)
+
+SALE_BOUNDARIES_LAST_CHECK_CACHE_KEY = "sale-boundaries-last-check"
+
+# Number of products processed in a single chunk
+MINIMAL_VARIANT_PRICES_CHUNK_SIZE = 1000
 
 
 def _get_product_minimal_variant_price(product, discounts) -> Money:
+    # Collections are needed only to check if the product is discounted
+    collections = list(product.collections.all()) if discounts else []
     # Start with the product's price as the minimal one
     minimal_variant_price = product.price
     for variant in product.variants.all():
-        variant_price = variant.get_price(discounts=discounts)
+        variant_price = variant.get_price(
+            discounts=discounts, collections=collections, product=product
+        )
         minimal_variant_price = min(minimal_variant_price, variant_price)
     return minimal_variant_price
 
@@ -29,8 +52,17 @@ def update_product_minimal_variant_price(product, discounts=None, save=True):
 
 
 def update_products_minimal_variant_prices(products, discounts=None):
+    """Update minimal variant prices of products and return the number of changes.
+
+    Variants and collections of products given as a queryset are prefetched,
+    so the prices are computed in memory.
+    """
     if discounts is None:
         discounts = fetch_active_discounts()
+    if isinstance(products, QuerySet):
+        products = products.prefetch_related(
+            "variants", Prefetch("collections", queryset=Collection.objects.only("pk"))
+        )
     changed_products_to_update = []
     for product in products:
         old_minimal_variant_price = product.minimal_variant_price
@@ -42,11 +74,90 @@ def update_products_minimal_variant_prices(products, discounts=None):
             changed_products_to_update.append(updated_product)
     # Bulk update the changed products
     Product.objects.bulk_update(
-        changed_products_to_update, ["minimal_variant_price_amount"]
+        changed_products_to_update,
+        ["minimal_variant_price_amount"],
+        batch_size=MINIMAL_VARIANT_PRICES_CHUNK_SIZE,
+    )
+    enqueue_updated_objects(
+        Product, [product.pk for product in changed_products_to_update]
     )
+    return len(changed_products_to_update)
 
 
-def update_products_minimal_variant_prices_of_catalogues(
+def get_product_ids_chunks(products, chunk_size=MINIMAL_VARIANT_PRICES_CHUNK_SIZE):
+    """Yield lists of ids of the given products, in chunks ordered by id."""
+    product_ids = products.order_by("pk").values_list("pk", flat=True)
+    last_id = None
+    while True:
+        chunk_ids = product_ids
+        if last_id is not None:
+            chunk_ids = chunk_ids.filter(pk__gt=last_id)
+        chunk = list(chunk_ids[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def update_products_minimal_variant_prices_in_chunks(
+    products=None,
+    discounts=None,
+    chunk_size=MINIMAL_VARIANT_PRICES_CHUNK_SIZE,
+    parallel=False,
+) -> dict:
+    """Update minimal variant prices of products in chunks.
+
+    Every chunk is processed with a constant number of queries. If `parallel` is
+    set, chunks are processed by Celery workers and only their number is known
+    when the function returns. Returns statistics of the run, which are also
+    logged.
+    """
+    from ..tasks import update_products_minimal_variant_prices_task
+
+    start_time = time.monotonic()
+    if products is None:
+        products = Product.objects.all()
+    if discounts is None and not parallel:
+        discounts = fetch_active_discounts()
+
+    chunks_count = products_count = updated_products_count = 0
+    for chunk in get_product_ids_chunks(products, chunk_size):
+        chunks_count += 1
+        products_count += len(chunk)
+        if parallel:
+            update_products_minimal_variant_prices_task.delay(product_ids=chunk)
+        else:
+            updated_products_count += update_products_minimal_variant_prices(
+                Product.objects.filter(pk__in=chunk), discounts
+            )
+
+    duration = time.monotonic() - start_time
+    stats = {
+        "chunks": chunks_count,
+        "products": products_count,
+        "updated_products": updated_products_count,
+        "duration": duration,
+        "products_per_second": products_count / duration if duration else 0,
+    }
+    if parallel:
+        logger.info(
+            "Scheduled the update of minimal variant prices of %(products)d "
+            "products in %(chunks)d chunks.",
+            stats,
+            extra={"minimal_variant_prices_update": stats},
+        )
+    else:
+        logger.info(
+            "Updated minimal variant prices of %(updated_products)d of "
+            "%(products)d products in %(duration).3fs "
+            "(%(products_per_second).1f products/s).",
+            stats,
+            extra={"minimal_variant_prices_update": stats},
+        )
+    return stats
+
+
+def get_products_of_catalogues(
     product_ids=None, category_ids=None, collection_ids=None
 ):
     # Building the matching products query
@@ -67,9 +178,14 @@ def update_products_minimal_variant_prices_of_catalogues(
         )
     # Querying the products
     q_or = reduce(operator.or_, q_list)
-    products = Product.objects.filter(q_or).distinct()
+    return Product.objects.filter(q_or).distinct()
 
-    update_products_minimal_variant_prices(products)
+
+def update_products_minimal_variant_prices_of_catalogues(
+    product_ids=None, category_ids=None, collection_ids=None
+):
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    update_products_minimal_variant_prices_in_chunks(products)
 
 
 def update_products_minimal_variant_prices_of_discount(discount):
@@ -78,3 +194,65 @@ def update_products_minimal_variant_prices_of_discount(discount):
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
     )
+
+
+def get_sales_crossing_boundaries(since: datetime.datetime, until: datetime.datetime):
+    """Return sales which started or ended between the given dates."""
+    return Sale.objects.filter(
+        Q(start_date__gt=since, start_date__lte=until)
+        | Q(end_date__gte=since, end_date__lt=until)
+    )
+
+
+def update_products_minimal_variant_prices_at_sale_boundaries(
+    since: datetime.datetime = None, until: datetime.datetime = None
+) -> dict:
+    """Update minimal variant prices of products of sales that started or ended.
+
+    By default, sales are checked since the previous run, so every sale boundary
+    is processed once. Only products discounted by such sales are updated.
+    Returns statistics of the run, which are also logged.
+    """
+    start_time = time.monotonic()
+    if until is None:
+        until = timezone.now()
+    if since is None:
+        since = cache.get(SALE_BOUNDARIES_LAST_CHECK_CACHE_KEY)
+    if since is None:
+        since = until - datetime.timedelta(days=1)
+
+    sale_pks = list(
+        get_sales_crossing_boundaries(since, until).values_list("pk", flat=True)
+    )
+    products_count = updated_products_count = 0
+    if sale_pks:
+        product_ids, category_ids, collection_ids = fetch_sales_catalogues(sale_pks)
+        # The cached discounts could be computed just before the boundary
+        invalidate_active_discounts()
+        discounts = fetch_active_discounts()
+        if product_ids or category_ids or collection_ids:
+            products = get_products_of_catalogues(
+                product_ids, category_ids, collection_ids
+            )
+            update_stats = update_products_minimal_variant_prices_in_chunks(
+                products, discounts
+            )
+            products_count = update_stats["products"]
+            updated_products_count = update_stats["updated_products"]
+    cache.set(SALE_BOUNDARIES_LAST_CHECK_CACHE_KEY, until, None)
+
+    stats = {
+        "since": since,
+        "until": until,
+        "sales": len(sale_pks),
+        "products": products_count,
+        "updated_products": updated_products_count,
+        "duration": time.monotonic() - start_time,
+    }
+    logger.info(
+        "Updated minimal variant prices of %(updated_products)d of %(products)d "
+        "products of %(sales)d sales in %(duration).3fs.",
+        stats,
+        extra={"sale_boundaries_update": stats},
+    )
+    return stats
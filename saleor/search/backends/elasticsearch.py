@@ -7,3 +7,9 @@ def search_storefront(phrase):
 
 def search_dashboard(phrase):
     return elasticsearch_dashboard.search(phrase)
+
+
+def facets_storefront(phrase, price_range_size, **filters):
+    return elasticsearch_storefront.get_facets_counts(
+        phrase, price_range_size, **filters
+    )
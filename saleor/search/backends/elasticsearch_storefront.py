@@ -1,7 +1,14 @@
-from elasticsearch_dsl.query import MultiMatch
+import datetime
+from decimal import Decimal
 
+from elasticsearch_dsl.query import Bool, Exists, MultiMatch, Range, Terms
+
+from ...product.utils.facets import ProductFacetsCounts
 from ..documents import ProductDocument
 
+# Upper bound of the number of buckets returned by a terms aggregation
+FACETS_MAX_BUCKETS = 1000
+
 
 def get_search_query(phrase):
     """Return matching products for storefront views."""
@@ -16,3 +23,85 @@ def get_search_query(phrase):
 
 def search(phrase):
     return get_search_query(phrase).to_queryset()
+
+
+def get_published_filter(today=None):
+    """Return a filter of products published by today.
+
+    It matches the same products as `PublishedQuerySet.published`.
+    """
+    today = today or datetime.date.today()
+    return Bool(
+        should=[
+            Range(publication_date={"lte": today}),
+            Bool(must_not=[Exists(field="publication_date")]),
+        ]
+    )
+
+
+def get_facets_counts(
+    phrase,
+    price_range_size: Decimal,
+    attribute_values=None,
+    category_ids=None,
+    minimal_price_gte=None,
+    minimal_price_lte=None,
+) -> ProductFacetsCounts:
+    """Count matching products per attribute value, category and price range.
+
+    All facets are counted by a single aggregation query. Values of the same
+    attribute are combined with OR and attributes with AND, the same way
+    products are filtered in the database.
+    """
+    search_query = get_search_query(phrase).filter(get_published_filter())
+    search_query = search_query.extra(size=0)
+    for values_pk in (attribute_values or {}).values():
+        values_pk = [pk for pk in values_pk if pk is not None]
+        search_query = search_query.filter(Terms(attribute_value_ids=values_pk))
+    if category_ids is not None:
+        search_query = search_query.filter(Terms(category_id=list(category_ids)))
+    price_range = {}
+    if minimal_price_gte is not None:
+        price_range["gte"] = float(minimal_price_gte)
+    if minimal_price_lte is not None:
+        price_range["lte"] = float(minimal_price_lte)
+    if price_range:
+        search_query = search_query.filter(
+            Range(minimal_variant_price_amount=price_range)
+        )
+
+    search_query.aggs.bucket(
+        "attribute_values",
+        "terms",
+        field="attribute_value_ids",
+        size=FACETS_MAX_BUCKETS,
+    )
+    search_query.aggs.bucket(
+        "categories", "terms", field="category_id", size=FACETS_MAX_BUCKETS
+    )
+    search_query.aggs.bucket(
+        "price_ranges",
+        "histogram",
+        field="minimal_variant_price_amount",
+        interval=float(price_range_size),
+        min_doc_count=1,
+    )
+    response = search_query.execute()
+    aggregations = response.aggregations
+
+    return ProductFacetsCounts(
+        price_range_size=price_range_size,
+        total_count=response.hits.total,
+        attribute_values={
+            int(bucket.key): bucket.doc_count
+            for bucket in aggregations.attribute_values.buckets
+        },
+        categories={
+            int(bucket.key): bucket.doc_count
+            for bucket in aggregations.categories.buckets
+        },
+        price_ranges={
+            int(bucket.key // float(price_range_size)): bucket.doc_count
+            for bucket in aggregations.price_ranges.buckets
+        },
+    )
@@ -16,3 +16,12 @@ def pick_dashboard_backend():
     Returns a callable that accepts the search phrase.
     """
     return import_module(settings.SEARCH_BACKEND).search_dashboard
+
+
+def pick_facets_backend():
+    """Return the currently configured storefront facets function.
+
+    Returns a callable that accepts the search phrase and filters, or None if
+    the backend can't count facets and they should be counted in the database.
+    """
+    return getattr(import_module(settings.SEARCH_BACKEND), "facets_storefront", None)
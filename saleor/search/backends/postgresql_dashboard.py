@@ -1,15 +1,30 @@
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
 
 from ...account.models import User
 from ...order.models import Order
 from ...product.models import Product
 
 
+def search_by_vector(queryset, phrase):
+    """Return objects of the queryset matching the phrase, most relevant first.
+
+    Objects are matched by their stored search vectors, so the lookup can use
+    the search vector indexes.
+    """
+    query = SearchQuery(phrase)
+    rank = SearchRank(F("search_vector"), query)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=rank)
+        .filter(rank__gte=0.2)
+        .order_by("-rank")
+    )
+
+
 def search_products(phrase):
     """Return matching products for dashboard views."""
-    sv = SearchVector("name", weight="A") + SearchVector("description", weight="B")
-    rank = SearchRank(sv, SearchQuery(phrase))
-    return Product.objects.annotate(rank=rank).filter(rank__gte=0.2).order_by("-rank")
+    return search_by_vector(Product.objects.all(), phrase)
 
 
 def search_orders(phrase):
@@ -24,28 +39,12 @@ def search_orders(phrase):
     except ValueError:
         pass
 
-    sv = (
-        SearchVector("user__first_name", weight="B")
-        + SearchVector("user__last_name", weight="B")
-        + SearchVector("user__default_shipping_address__first_name", weight="B")
-        + SearchVector("user__default_shipping_address__last_name", weight="B")
-        + SearchVector("user__email", weight="A")
-    )
-    rank = SearchRank(sv, SearchQuery(phrase))
-    return Order.objects.annotate(rank=rank).filter(rank__gte=0.2).order_by("-rank")
+    return search_by_vector(Order.objects.all(), phrase)
 
 
 def search_users(phrase):
     """Return matching users for dashboard views."""
-    sv = (
-        SearchVector("email", weight="A")
-        + SearchVector("first_name", weight="B")
-        + SearchVector("last_name", weight="B")
-        + SearchVector("default_billing_address__first_name", weight="B")
-        + SearchVector("default_billing_address__last_name", weight="B")
-    )
-    rank = SearchRank(sv, SearchQuery(phrase))
-    return User.objects.annotate(rank=rank).filter(rank__gte=0.2).order_by("-rank")
+    return search_by_vector(User.objects.all(), phrase)
 
 
 def search(phrase):
@@ -1,3 +1,5 @@
+import datetime
+
 from . import elasticsearch_storefront
 
 PHRASE = "How fortunate man with none"
@@ -17,3 +19,16 @@ QUERY = {
 
 def test_storefront_product_search_query_syntax():
     assert QUERY == elasticsearch_storefront.get_search_query(PHRASE).to_dict()
+
+
+def test_storefront_product_published_filter_syntax():
+    today = datetime.date(2020, 1, 1)
+    published_filter = elasticsearch_storefront.get_published_filter(today)
+    assert published_filter.to_dict() == {
+        "bool": {
+            "should": [
+                {"range": {"publication_date": {"lte": today}}},
+                {"bool": {"must_not": [{"exists": {"field": "publication_date"}}]}},
+            ]
+        }
+    }
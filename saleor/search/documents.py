@@ -20,13 +20,26 @@ email_analyzer = analyzer("email_analyzer", tokenizer="uax_url_email")
 @storefront.doc_type
 class ProductDocument(DocType):
     title = fields.StringField(analyzer=title_analyzer)
+    # Fields used to count products in facets
+    category_id = fields.IntegerField()
+    attribute_value_ids = fields.IntegerField(multi=True)
+    minimal_variant_price_amount = fields.FloatField()
 
     def prepare_title(self, instance):
         return instance.name
 
+    def prepare_category_id(self, instance):
+        return instance.category_id
+
+    def prepare_attribute_value_ids(self, instance):
+        return instance.attribute_value_ids
+
+    def prepare_minimal_variant_price_amount(self, instance):
+        return float(instance.minimal_variant_price_amount)
+
     class Meta:
         model = Product
-        fields = ["name", "description", "is_published"]
+        fields = ["name", "description", "is_published", "publication_date"]
 
 
 users = Index("users")
@@ -0,0 +1,228 @@
+"""Updating search documents in batches through the indexing queue."""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from django_elasticsearch_dsl.registries import registry
+from elasticsearch_dsl.connections import connections
+
+from elasticsearch.helpers import bulk
+
+from .models import IndexingQueueEntry
+
+logger = logging.getLogger(__name__)
+
+# Indices being rebuilt by the reindex, keyed by the aliases they replace;
+# documents updated meanwhile are written to both the alias and the new index
+REINDEX_TARGETS_CACHE_KEY = "search-reindex-targets"
+
+
+def enqueue_for_indexing(model, object_ids: Iterable[int]):
+    """Add objects to the queue of objects to be indexed."""
+    label = model._meta.label
+    IndexingQueueEntry.objects.bulk_create(
+        [
+            IndexingQueueEntry(model=label, object_id=object_id)
+            for object_id in object_ids
+        ]
+    )
+
+
+def _get_write_index_names(document) -> List[str]:
+    alias = document._doc_type.index
+    index_names = [alias]
+    reindex_target = cache.get(REINDEX_TARGETS_CACHE_KEY, {}).get(alias)
+    if reindex_target:
+        index_names.append(reindex_target)
+    return index_names
+
+
+def _get_bulk_action(op_type, index_name, document, object_id, source=None):
+    action = {
+        "_op_type": op_type,
+        "_index": index_name,
+        "_type": document._doc_type.mapping.doc_type,
+        "_id": object_id,
+    }
+    if source is not None:
+        action["_source"] = source
+    return action
+
+
+def _is_ignored_error(error) -> bool:
+    ((op_type, item),) = error.items()
+    # Documents of the deleted objects might have never been indexed
+    if op_type == "delete":
+        return item.get("status") == 404
+    # Documents updated while reindexing are not replaced by the loaded ones
+    if op_type == "create":
+        return item.get("status") == 409
+    return False
+
+
+def _get_error_object_id(error) -> str:
+    ((_op_type, item),) = error.items()
+    return str(item.get("_id"))
+
+
+def _bulk(actions, **kwargs) -> Tuple[int, Set[str]]:
+    """Send the actions in bulk requests.
+
+    Return the number of successful actions and IDs of the objects whose
+    actions were rejected.
+    """
+    indexed, errors = bulk(
+        connections.get_connection(), actions, raise_on_error=False, **kwargs
+    )
+    errors = [error for error in errors if not _is_ignored_error(error)]
+    if errors:
+        logger.error("Indexing of %d documents failed: %r", len(errors), errors[:10])
+    return indexed, {_get_error_object_id(error) for error in errors}
+
+
+def update_documents(model, object_ids: Set[int]) -> Tuple[Dict[str, int], Set[int]]:
+    """Update search documents of the objects with a single bulk request.
+
+    Documents of the objects which do not exist anymore are deleted. Return
+    the stats and IDs of the objects whose documents were not updated.
+    """
+    actions = []
+    stats = {"indexed": 0, "deleted": 0}
+    for document_class in registry.get_documents(models=[model]):
+        document = document_class()
+        index_names = _get_write_index_names(document)
+        existing_ids = set()
+        for instance in document.get_queryset().filter(pk__in=object_ids):
+            existing_ids.add(instance.pk)
+            source = document.prepare(instance)
+            for index_name in index_names:
+                actions.append(
+                    _get_bulk_action("index", index_name, document, instance.pk, source)
+                )
+        for object_id in object_ids - existing_ids:
+            for index_name in index_names:
+                actions.append(
+                    _get_bulk_action("delete", index_name, document, object_id)
+                )
+        stats["indexed"] += len(existing_ids)
+        stats["deleted"] += len(object_ids - existing_ids)
+    failed_ids = set()
+    if actions:
+        _indexed, failed = _bulk(actions)
+        failed_ids = {object_id for object_id in object_ids if str(object_id) in failed}
+    return stats, failed_ids
+
+
+def process_indexing_queue(batch_size: int) -> Dict[str, int]:
+    """Update search documents of all the queued objects.
+
+    Entries are consumed in batches of `batch_size`; multiple entries of the same
+    object within a batch are coalesced into a single document update. Entries
+    locked by another consumer are skipped. Entries of a batch that failed, and
+    of objects whose documents were rejected by Elasticsearch, are left in the
+    queue to be retried by the next run.
+    """
+    stats = {"entries": 0, "indexed": 0, "deleted": 0, "failed": 0}
+    failed_entry_pks: Set[int] = set()
+    while True:
+        with transaction.atomic():
+            entries = list(
+                IndexingQueueEntry.objects.select_for_update(skip_locked=True).exclude(
+                    pk__in=failed_entry_pks
+                )[:batch_size]
+            )
+            if not entries:
+                return stats
+            object_ids_by_model = defaultdict(set)
+            for entry in entries:
+                object_ids_by_model[entry.model].add(entry.object_id)
+            failed_ids_by_model = {}
+            for label, object_ids in object_ids_by_model.items():
+                model_stats, failed_ids = update_documents(
+                    apps.get_model(label), object_ids
+                )
+                stats["indexed"] += model_stats["indexed"]
+                stats["deleted"] += model_stats["deleted"]
+                stats["failed"] += len(failed_ids)
+                failed_ids_by_model[label] = failed_ids
+            done_entry_pks = []
+            for entry in entries:
+                if entry.object_id in failed_ids_by_model[entry.model]:
+                    failed_entry_pks.add(entry.pk)
+                else:
+                    done_entry_pks.append(entry.pk)
+            IndexingQueueEntry.objects.filter(pk__in=done_entry_pks).delete()
+            stats["entries"] += len(done_entry_pks)
+
+
+def get_indexing_lag() -> Dict[str, float]:
+    """Return the number of queued entries and the age of the oldest one."""
+    queue = IndexingQueueEntry.objects.aggregate(
+        pending=Count("pk"), oldest=Min("created")
+    )
+    oldest = queue["oldest"]
+    lag = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    return {"pending_entries": queue["pending"], "lag_seconds": lag}
+
+
+def reindex_all(batch_size: int) -> Dict[str, str]:
+    """Rebuild all the search indices without downtime.
+
+    Each index is rebuilt under a new name, then the alias used by the
+    documents is atomically switched to it and the old index is dropped.
+    Documents updated while rebuilding are written to both the indices; loaded
+    documents never replace them, as they might be stale.
+    """
+    client = connections.get_connection()
+    suffix = timezone.now().strftime("%Y%m%d%H%M%S")
+    targets = {}
+    for index in registry.get_indices():
+        alias = index._name
+        targets[alias] = "%s-%s" % (alias, suffix)
+        index.clone(name=targets[alias]).create()
+    cache.set(REINDEX_TARGETS_CACHE_KEY, targets, None)
+
+    try:
+        for document_class in registry.get_documents():
+            document = document_class()
+            index_name = targets[document._doc_type.index]
+            instances = document.get_queryset().order_by("pk").iterator()
+            actions = (
+                _get_bulk_action(
+                    "create",
+                    index_name,
+                    document,
+                    instance.pk,
+                    document.prepare(instance),
+                )
+                for instance in instances
+            )
+            _bulk(actions, chunk_size=batch_size)
+
+        for alias, index_name in targets.items():
+            _switch_alias(client, alias, index_name)
+    finally:
+        cache.delete(REINDEX_TARGETS_CACHE_KEY)
+    return targets
+
+
+def _switch_alias(client, alias, index_name):
+    actions = [{"add": {"index": index_name, "alias": alias}}]
+    old_index_names = []
+    if client.indices.exists_alias(name=alias):
+        old_index_names = list(client.indices.get_alias(name=alias))
+        actions += [
+            {"remove": {"index": old_index_name, "alias": alias}}
+            for old_index_name in old_index_names
+        ]
+    elif client.indices.exists(index=alias):
+        # The index was created before aliases were used
+        actions.append({"remove_index": {"index": alias}})
+    client.indices.update_aliases(body={"actions": actions})
+    for old_index_name in old_index_names:
+        client.indices.delete(index=old_index_name)
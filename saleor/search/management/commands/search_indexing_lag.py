@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ...indexing import get_indexing_lag
+
+
+class Command(BaseCommand):
+    help = "Show the number and the age of objects waiting to be indexed."
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            "pending_entries %(pending_entries)d\nlag_seconds %(lag_seconds).1f"
+            % get_indexing_lag()
+        )
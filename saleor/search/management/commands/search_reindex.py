@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...indexing import reindex_all
+
+
+class Command(BaseCommand):
+    help = "Rebuild all the search indices without downtime."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.SEARCH_INDEXING_BATCH_SIZE,
+            help="Number of documents sent to the search engine at once.",
+        )
+
+    def handle(self, *args, **options):
+        indices = reindex_all(options["batch_size"])
+        for alias, index_name in indices.items():
+            self.stdout.write("Index %s now points to %s." % (alias, index_name))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from ....account.models import User
+from ....order.models import Order
+from ....product.models import Product
+from ...vectors import (
+    SEARCH_VECTORS_CHUNK_SIZE,
+    prepare_order_search_vector,
+    prepare_product_search_vector,
+    prepare_user_search_vector,
+    update_search_vectors,
+)
+
+
+class Command(BaseCommand):
+    help = "Update search vectors of all the products, orders and users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SEARCH_VECTORS_CHUNK_SIZE,
+            help="Number of objects updated at once.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        targets = [
+            ("products", Product.objects.all(), prepare_product_search_vector),
+            (
+                "orders",
+                Order.objects.select_related("user__default_shipping_address"),
+                lambda order: prepare_order_search_vector(order.user),
+            ),
+            (
+                "users",
+                User.objects.select_related("default_billing_address"),
+                prepare_user_search_vector,
+            ),
+        ]
+        for name, queryset, prepare_vector in targets:
+            updated = update_search_vectors(queryset, prepare_vector, chunk_size)
+            self.stdout.write("Updated search vectors of %d %s." % (updated, name))
@@ -0,0 +1,24 @@
+from django.db import models
+from django.utils.timezone import now
+
+
+class IndexingQueueEntry(models.Model):
+    """Object whose search documents are to be updated in the search engine.
+
+    Entries are added when the objects are saved or deleted and consumed in
+    batches; documents of the objects which no longer exist are deleted.
+    """
+
+    model = models.CharField(max_length=128)
+    object_id = models.IntegerField()
+    created = models.DateTimeField(default=now, editable=False, db_index=True)
+
+    class Meta:
+        ordering = ("pk",)
+
+    def __repr__(self):
+        return "%s(model=%r, object_id=%r)" % (
+            self.__class__.__name__,
+            self.model,
+            self.object_id,
+        )
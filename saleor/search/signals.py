@@ -0,0 +1,58 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django_elasticsearch_dsl.registries import registry
+from django_elasticsearch_dsl.signals import BaseSignalProcessor
+
+from .indexing import enqueue_for_indexing
+from .tasks import schedule_indexing_queue_processing
+
+
+def _enqueue(model, object_ids):
+    if not getattr(settings, "ELASTICSEARCH_DSL_AUTOSYNC", True):
+        return
+    object_ids = list(object_ids)
+    if object_ids and model in registry.get_models():
+        enqueue_for_indexing(model, object_ids)
+        transaction.on_commit(schedule_indexing_queue_processing)
+
+
+def enqueue_updated_objects(model, object_ids):
+    """Queue objects for indexing if the model has search documents.
+
+    Use it for objects updated without sending signals, e.g. by `bulk_update`.
+    Nothing is queued unless Elasticsearch is enabled.
+    """
+    if apps.is_installed("django_elasticsearch_dsl"):
+        _enqueue(model, object_ids)
+
+
+class IndexingQueueSignalProcessor(BaseSignalProcessor):
+    """Queue saved and deleted objects for indexing.
+
+    Unlike the default processor, which updates documents one by one when the
+    objects are saved, documents are updated in batches by a Celery task.
+    """
+
+    def setup(self):
+        models.signals.post_save.connect(self.handle_save)
+        models.signals.post_delete.connect(self.handle_delete)
+        models.signals.m2m_changed.connect(self.handle_m2m_changed)
+
+    def teardown(self):
+        models.signals.post_save.disconnect(self.handle_save)
+        models.signals.post_delete.disconnect(self.handle_delete)
+        models.signals.m2m_changed.disconnect(self.handle_m2m_changed)
+
+    def enqueue(self, instance):
+        # Instances are passed with the m2m through model as the sender
+        _enqueue(type(instance), [instance.pk])
+
+    def handle_save(self, sender, instance, **kwargs):
+        self.enqueue(instance)
+
+    def handle_pre_delete(self, sender, instance, **kwargs):
+        pass
+
+    def handle_delete(self, sender, instance, **kwargs):
+        self.enqueue(instance)
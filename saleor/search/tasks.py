@@ -0,0 +1,42 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..celeryconf import app
+from ..core.cache import schedule_once
+from .indexing import get_indexing_lag, process_indexing_queue
+
+logger = logging.getLogger(__name__)
+
+INDEXING_SCHEDULED_CACHE_KEY = "search-indexing-scheduled"
+# Time after which processing of the queue is scheduled again even if the
+# previously scheduled task did not start
+INDEXING_SCHEDULED_TIMEOUT = 60
+
+
+def schedule_indexing_queue_processing():
+    """Schedule processing of the indexing queue unless it is already scheduled.
+
+    Objects queued before the scheduled task starts are indexed together.
+    """
+    schedule_once(
+        INDEXING_SCHEDULED_CACHE_KEY,
+        INDEXING_SCHEDULED_TIMEOUT,
+        process_indexing_queue_task,
+    )
+
+
+@app.task
+def process_indexing_queue_task():
+    cache.delete(INDEXING_SCHEDULED_CACHE_KEY)
+    stats = process_indexing_queue(settings.SEARCH_INDEXING_BATCH_SIZE)
+    logger.info(
+        "Indexed %(indexed)d and deleted %(deleted)d documents "
+        "of %(entries)d queued objects, %(failed)d failed.",
+        stats,
+    )
+    logger.info(
+        "Search indexing lag: %(pending_entries)d entries, %(lag_seconds).1fs.",
+        get_indexing_lag(),
+    )
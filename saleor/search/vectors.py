@@ -0,0 +1,73 @@
+"""Search vectors stored on the models searched in the dashboard.
+
+Vectors are built from the values of the instances rather than from column
+references, so they can be saved along with the instance even if they use
+values of related objects.
+"""
+from django.contrib.postgres.search import CombinedSearchVector, SearchVector
+from django.db.models import TextField, Value
+
+SEARCH_VECTORS_CHUNK_SIZE = 1000
+
+
+def _search_vector(*weighted_values) -> CombinedSearchVector:
+    vectors = [
+        SearchVector(Value(value or "", output_field=TextField()), weight=weight)
+        for value, weight in weighted_values
+    ]
+    search_vector = vectors[0]
+    for vector in vectors[1:]:
+        search_vector = search_vector + vector
+    return search_vector
+
+
+def prepare_product_search_vector(product) -> CombinedSearchVector:
+    return _search_vector((product.name, "A"), (product.description, "B"))
+
+
+def prepare_user_search_vector(user) -> CombinedSearchVector:
+    address = user.default_billing_address
+    return _search_vector(
+        (user.email, "A"),
+        (user.first_name, "B"),
+        (user.last_name, "B"),
+        (address.first_name if address else None, "B"),
+        (address.last_name if address else None, "B"),
+    )
+
+
+def prepare_order_search_vector(customer) -> CombinedSearchVector:
+    """Return search vector of orders placed by the customer.
+
+    Orders are matched by the customer's data only, so all the orders of
+    a customer share the same vector and orders of guests match no phrase.
+    """
+    address = customer.default_shipping_address if customer else None
+    return _search_vector(
+        (customer.first_name if customer else None, "B"),
+        (customer.last_name if customer else None, "B"),
+        (address.first_name if address else None, "B"),
+        (address.last_name if address else None, "B"),
+        (customer.email if customer else None, "A"),
+    )
+
+
+def update_search_vectors(
+    queryset, prepare_vector, chunk_size=SEARCH_VECTORS_CHUNK_SIZE
+):
+    """Recompute search vectors of all the instances of the queryset.
+
+    Instances are processed in chunks ordered by the primary key; `prepare_vector`
+    is called with each instance and returns its search vector.
+    """
+    last_pk = 0
+    updated = 0
+    while True:
+        instances = list(queryset.filter(pk__gt=last_pk).order_by("pk")[:chunk_size])
+        if not instances:
+            return updated
+        for instance in instances:
+            instance.search_vector = prepare_vector(instance)
+        queryset.model.objects.bulk_update(instances, ["search_vector"])
+        updated += len(instances)
+        last_pk = instances[-1].pk
@@ -1,6 +1,7 @@
 import ast
 import os.path
 import warnings
+from datetime import timedelta
 
 import dj_database_url
 import dj_email_url
@@ -144,6 +145,10 @@ DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
 MEDIA_ROOT = os.path.join(PROJECT_ROOT, "media")
 MEDIA_URL = os.environ.get("MEDIA_URL", "/media/")
+# Files with customer data, e.g. invoices, which are never served publicly
+PRIVATE_MEDIA_ROOT = os.environ.get(
+    "PRIVATE_MEDIA_ROOT", os.path.join(PROJECT_ROOT, "private-media")
+)
 
 STATIC_ROOT = os.path.join(PROJECT_ROOT, "static")
 STATIC_URL = os.environ.get("STATIC_URL", "/static/")
@@ -377,6 +382,12 @@ DEFAULT_DECIMAL_PLACES = get_currency_fraction(DEFAULT_CURRENCY)
 DEFAULT_MAX_DIGITS = 12
 DEFAULT_CURRENCY_CODE_LENGTH = 3
 
+# Countries of the recently seen IP addresses kept by each process
+GEOIP_CACHE_SIZE = int(os.environ.get("GEOIP_CACHE_SIZE", 10000))
+# One of "auto", "mmap_ext", "mmap", "file" or "memory"; memory-mapped modes
+# let the forked workers share the pages of the GeoLite2 database
+GEOIP_READER_MODE = os.environ.get("GEOIP_READER_MODE", "auto")
+
 # The default max length for the display name of the
 # sender email address.
 # Following the recommendation of https://tools.ietf.org/html/rfc5322#section-2.1.1
@@ -435,6 +446,10 @@ MESSAGE_TAGS = {messages.ERROR: "danger"}
 LOW_STOCK_THRESHOLD = 10
 MAX_CHECKOUT_LINE_QUANTITY = int(os.environ.get("MAX_CHECKOUT_LINE_QUANTITY", 50))
 
+# Upper bound of the lifetime of the cached active discounts; the cache is also
+# invalidated when sales change and expires when any sale starts or ends
+DISCOUNTS_CACHE_TIMEOUT = int(os.environ.get("DISCOUNTS_CACHE_TIMEOUT", 60 * 60))
+
 PAGINATE_BY = 16
 DASHBOARD_PAGINATE_BY = 30
 DASHBOARD_SEARCH_LIMIT = 5
@@ -458,6 +473,7 @@ AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_LOCATION = os.environ.get("AWS_LOCATION", "")
 AWS_MEDIA_BUCKET_NAME = os.environ.get("AWS_MEDIA_BUCKET_NAME")
 AWS_MEDIA_CUSTOM_DOMAIN = os.environ.get("AWS_MEDIA_CUSTOM_DOMAIN")
+AWS_PRIVATE_BUCKET_NAME = os.environ.get("AWS_PRIVATE_BUCKET_NAME")
 AWS_QUERYSTRING_AUTH = get_bool_from_env("AWS_QUERYSTRING_AUTH", False)
 AWS_S3_CUSTOM_DOMAIN = os.environ.get("AWS_STATIC_CUSTOM_DOMAIN")
 AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL", None)
@@ -469,6 +485,7 @@ AWS_DEFAULT_ACL = os.environ.get("AWS_DEFAULT_ACL", None)
 GS_PROJECT_ID = os.environ.get("GS_PROJECT_ID")
 GS_STORAGE_BUCKET_NAME = os.environ.get("GS_STORAGE_BUCKET_NAME")
 GS_MEDIA_BUCKET_NAME = os.environ.get("GS_MEDIA_BUCKET_NAME")
+GS_PRIVATE_BUCKET_NAME = os.environ.get("GS_PRIVATE_BUCKET_NAME")
 GS_AUTO_CREATE_BUCKET = get_bool_from_env("GS_AUTO_CREATE_BUCKET", False)
 
 # If GOOGLE_APPLICATION_CREDENTIALS is set there is no need to load OAuth token
@@ -488,6 +505,13 @@ elif GS_MEDIA_BUCKET_NAME:
     DEFAULT_FILE_STORAGE = "saleor.core.storages.GCSMediaStorage"
     THUMBNAIL_DEFAULT_STORAGE = DEFAULT_FILE_STORAGE
 
+if AWS_PRIVATE_BUCKET_NAME:
+    PRIVATE_FILE_STORAGE = "saleor.core.storages.S3PrivateStorage"
+elif GS_PRIVATE_BUCKET_NAME:
+    PRIVATE_FILE_STORAGE = "saleor.core.storages.GCSPrivateStorage"
+else:
+    PRIVATE_FILE_STORAGE = "saleor.core.storages.PrivateFileSystemStorage"
+
 MESSAGE_STORAGE = "django.contrib.messages.storage.session.SessionStorage"
 
 VERSATILEIMAGEFIELD_RENDITION_KEY_SETS = {
@@ -508,6 +532,10 @@ VERSATILEIMAGEFIELD_SETTINGS = {
     "create_images_on_demand": get_bool_from_env("CREATE_IMAGES_ON_DEMAND", DEBUG)
 }
 
+# Create WebP copies of all the thumbnails
+WEBP_THUMBNAILS = get_bool_from_env("WEBP_THUMBNAILS", False)
+WEBP_THUMBNAIL_QUALITY = int(os.environ.get("WEBP_THUMBNAIL_QUALITY", 80))
+
 PLACEHOLDER_IMAGES = {
     60: "images/placeholder60x60.png",
     120: "images/placeholder120x120.png",
@@ -549,6 +577,19 @@ if ES_URL:
     SEARCH_BACKEND = "saleor.search.backends.elasticsearch"
     INSTALLED_APPS.append("django_elasticsearch_dsl")
     ELASTICSEARCH_DSL = {"default": {"hosts": ES_URL}}
+    # Update documents in batches instead of one by one on every save
+    ELASTICSEARCH_DSL_SIGNAL_PROCESSOR = (
+        "saleor.search.signals.IndexingQueueSignalProcessor"
+    )
+
+# Number of queued objects updated in the search engine with a single request
+SEARCH_INDEXING_BATCH_SIZE = int(os.environ.get("SEARCH_INDEXING_BATCH_SIZE", 500))
+
+# Strategy of filtering by the `query` arguments of the API; set it to
+# "saleor.graphql.utils.search_by_icontains" to match with DISTINCT queries
+QUERY_PARAM_SEARCH_STRATEGY = os.environ.get(
+    "QUERY_PARAM_SEARCH_STRATEGY", "saleor.graphql.utils.search_by_trigram_indexes"
+)
 
 AUTHENTICATION_BACKENDS = [
     "saleor.account.backends.facebook.CustomFacebookOAuth2",
@@ -586,6 +627,55 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", None)
 
+# How often (in seconds) minimal variant prices of products are updated for sales
+# that started or ended since the previous check
+SALE_BOUNDARIES_CHECK_INTERVAL = int(
+    os.environ.get("SALE_BOUNDARIES_CHECK_INTERVAL", 60)
+)
+CELERY_BEAT_SCHEDULE = {
+    "update-minimal-variant-prices-at-sale-boundaries": {
+        "task": (
+            "saleor.product.tasks"
+            ".update_products_minimal_variant_prices_at_sale_boundaries_task"
+        ),
+        "schedule": SALE_BOUNDARIES_CHECK_INTERVAL,
+    },
+    # Sends payloads due for retry, e.g. after their target was unavailable
+    "retry-webhook-deliveries": {
+        "task": "saleor.extensions.plugins.webhook.tasks.retry_webhook_deliveries_task",
+        "schedule": 60,
+    },
+    "delete-old-pdfs": {
+        "task": "saleor.dashboard.order.tasks.delete_old_pdfs_task",
+        "schedule": 60 * 60,
+    },
+}
+if ES_URL:
+    # Objects left in the indexing queue, e.g. after a failed batch, are
+    # processed even if no other objects are changed
+    CELERY_BEAT_SCHEDULE["process-search-indexing-queue"] = {
+        "task": "saleor.search.tasks.process_indexing_queue_task",
+        "schedule": 60,
+    }
+
+# Number of payloads sent to a webhook by a single task
+WEBHOOK_DELIVERY_BATCH_SIZE = int(os.environ.get("WEBHOOK_DELIVERY_BATCH_SIZE", 100))
+# Number of workers allowed to send payloads to the same host at once
+WEBHOOK_TARGET_CONCURRENCY = int(os.environ.get("WEBHOOK_TARGET_CONCURRENCY", 4))
+# Number of failed attempts after which a payload is not retried anymore
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", 16))
+# Time for which successful deliveries are kept in the delivery log
+WEBHOOK_DELIVERIES_RETENTION = timedelta(
+    days=int(os.environ.get("WEBHOOK_DELIVERIES_RETENTION_DAYS", 7))
+)
+
+# Number of processes creating PDFs of packing slips in bulk
+PDF_RENDERING_PROCESSES = int(
+    os.environ.get("PDF_RENDERING_PROCESSES", os.cpu_count() or 1)
+)
+# Time for which created invoices, packing slips and their archives are kept
+PDF_RETENTION = timedelta(hours=int(os.environ.get("PDF_RETENTION_HOURS", 24)))
+
 # Impersonate module settings
 IMPERSONATE = {
     "URI_EXCLUSIONS": [r"^dashboard/"],
@@ -639,6 +729,17 @@ GRAPHENE = {
     "RELAY_CONNECTION_MAX_LIMIT": 100,
 }
 
+# Number of parsed and validated GraphQL documents kept in memory by every worker;
+# set to 0 to disable the cache
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 500))
+
+# Allow clients to send only the sha256 hash of a previously registered query
+# (Automatic Persisted Queries)
+GRAPHQL_PERSISTED_QUERIES = get_bool_from_env("GRAPHQL_PERSISTED_QUERIES", False)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", 60 * 60 * 24)
+)
+
 EXTENSIONS_MANAGER = "saleor.extensions.manager.ExtensionsManager"
 
 PLUGINS = [
@@ -1,11 +1,12 @@
 import django.http.request
 from django.contrib.sites.shortcuts import get_current_site
-from django.db.models import prefetch_related_objects
 
 
 def site(request):
     # type: (django.http.request.HttpRequest) -> dict
-    """Add site settings to the context under the 'site' key."""
+    """Add site settings to the context under the 'site' key.
+
+    Translations of the settings are fetched along with the cached site.
+    """
     site = get_current_site(request)
-    prefetch_related_objects([site], "settings__translations")
     return {"site": site}
@@ -7,13 +7,15 @@ from django.contrib.sites.models import Site
 from django.core.exceptions import ImproperlyConfigured
 from django.core.validators import MaxLengthValidator, RegexValidator
 from django.db import models
+from django.db.models import Q
+from django.db.models.signals import post_delete, pre_delete
 from django.utils.translation import pgettext_lazy
 
 from ..core.utils.translations import TranslationProxy
 from ..core.weight import WeightUnits
 from . import AuthenticationBackends
 from .error_codes import SiteErrorCode
-from .patch_sites import patch_contrib_sites
+from .patch_sites import invalidate_site_cache, patch_contrib_sites
 
 patch_contrib_sites()
 
@@ -86,6 +88,15 @@ class SiteSettings(models.Model):
     def __str__(self):
         return self.site.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_site_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_site_cache()
+        return result
+
     @property
     def default_from_email(self) -> str:
         sender_name: str = self.default_mail_sender_name
@@ -133,6 +144,15 @@ class SiteSettingsTranslation(models.Model):
     def __str__(self):
         return self.site_settings.site.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_site_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_site_cache()
+        return result
+
 
 class AuthorizationKey(models.Model):
     site_settings = models.ForeignKey(SiteSettings, on_delete=models.CASCADE)
@@ -148,3 +168,38 @@ class AuthorizationKey(models.Model):
 
     def key_and_secret(self):
         return self.key, self.password
+
+
+# Objects referenced by site settings, which set the references to null when
+# deleted without saving the settings
+SITE_SETTINGS_REFERENCES = {
+    "menu.Menu": ["top_menu", "bottom_menu"],
+    "product.Collection": ["homepage_collection"],
+    "account.Address": ["company_address"],
+}
+
+
+def check_site_settings_reference(sender, instance, **_kwargs):
+    fields = SITE_SETTINGS_REFERENCES[sender._meta.label]
+    lookup = Q()
+    for field in fields:
+        lookup |= Q(**{field: instance})
+    instance._is_site_settings_reference = SiteSettings.objects.filter(lookup).exists()
+
+
+def invalidate_site_cache_of_reference(sender, instance, **_kwargs):
+    if getattr(instance, "_is_site_settings_reference", False):
+        invalidate_site_cache()
+
+
+for model in SITE_SETTINGS_REFERENCES:
+    pre_delete.connect(
+        check_site_settings_reference,
+        sender=model,
+        dispatch_uid="check_site_settings_reference_%s" % model,
+    )
+    post_delete.connect(
+        invalidate_site_cache_of_reference,
+        sender=model,
+        dispatch_uid="invalidate_site_cache_of_reference_%s" % model,
+    )
@@ -1,18 +1,71 @@
-"""A hack to allow safe clearing of the cache in django.contrib.sites.
+"""A hack to allow safe caching of sites in django.contrib.sites.
 
 Since django.contrib.sites may not be thread-safe when there are
 multiple instances of the application server, we're patching it with
 a thread-safe structure and methods that use it underneath.
+
+Sites, along with their settings and translations of the settings, are
+cached by each process and shared between the processes through the cache.
+Cached sites are valid as long as the version of the sites cache does not
+change; processes check it at the beginning of each request and task.
 """
 import threading
 
+from celery.signals import task_prerun
 from django.contrib.sites.models import Site, SiteManager
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 from django.http.request import split_domain_port
 
+from ..core.cache import bump_cache_version, get_cache_version
+
+SITE_CACHE_VERSION_KEY = "site-cache-version"
+SITE_CACHE_TIMEOUT = 60 * 60 * 24
+SITE_PREFETCH = ["settings__translations", "settings__company_address"]
+
 lock = threading.Lock()
 with lock:
     THREADED_SITE_CACHE = {}
+    # Version of the sites cache the sites cached by the process belong to
+    THREADED_SITE_CACHE_VERSION = None
+
+
+def get_site_cache_version() -> str:
+    return get_cache_version(SITE_CACHE_VERSION_KEY)
+
+
+def invalidate_site_cache(**_kwargs):
+    """Mark the sites cached by all the processes as outdated.
+
+    Called whenever a site, its settings or their translations are changed.
+    """
+    bump_cache_version(SITE_CACHE_VERSION_KEY)
+    new_clear_cache(None)
+
+
+def refresh_site_cache(**_kwargs):
+    """Drop the sites cached by the process if they are outdated."""
+    global THREADED_SITE_CACHE, THREADED_SITE_CACHE_VERSION
+    version = get_site_cache_version()
+    if version != THREADED_SITE_CACHE_VERSION:
+        with lock:
+            THREADED_SITE_CACHE = {}
+            THREADED_SITE_CACHE_VERSION = version
+
+
+def _get_cached_site(manager, key, **lookup):
+    if THREADED_SITE_CACHE_VERSION is None:
+        refresh_site_cache()
+    if key not in THREADED_SITE_CACHE:
+        with lock:
+            cache_key = "site-%s-%s" % (key, THREADED_SITE_CACHE_VERSION)
+            site = cache.get(cache_key)
+            if site is None:
+                site = manager.prefetch_related(*SITE_PREFETCH).filter(**lookup)[0]
+                cache.set(cache_key, site, SITE_CACHE_TIMEOUT)
+            THREADED_SITE_CACHE[key] = site
+    return THREADED_SITE_CACHE[key]
 
 
 def new_get_current(self, request=None):
@@ -20,32 +73,16 @@ def new_get_current(self, request=None):
 
     if getattr(settings, "SITE_ID", ""):
         site_id = settings.SITE_ID
-        if site_id not in THREADED_SITE_CACHE:
-            with lock:
-                site = self.prefetch_related("settings").filter(pk=site_id)[0]
-                THREADED_SITE_CACHE[site_id] = site
-        return THREADED_SITE_CACHE[site_id]
+        return _get_cached_site(self, site_id, pk=site_id)
     elif request:
         host = request.get_host()
         try:
             # First attempt to look up the site by host with or without port.
-            if host not in THREADED_SITE_CACHE:
-                with lock:
-                    site = self.prefetch_related("settings").filter(
-                        domain__iexact=host
-                    )[0]
-                    THREADED_SITE_CACHE[host] = site
-            return THREADED_SITE_CACHE[host]
+            return _get_cached_site(self, host.lower(), domain__iexact=host)
         except Site.DoesNotExist:
             # Fallback to looking up site after stripping port from the host.
             domain, dummy_port = split_domain_port(host)
-            if domain not in THREADED_SITE_CACHE:
-                with lock:
-                    site = self.prefetch_related("settings").filter(
-                        domain__iexact=domain
-                    )[0]
-                    THREADED_SITE_CACHE[domain] = site
-        return THREADED_SITE_CACHE[domain]
+        return _get_cached_site(self, domain, domain__iexact=domain)
 
     raise ImproperlyConfigured(
         "You're using the Django sites framework without having"
@@ -56,9 +93,10 @@ def new_get_current(self, request=None):
 
 
 def new_clear_cache(self):
-    global THREADED_SITE_CACHE
+    global THREADED_SITE_CACHE, THREADED_SITE_CACHE_VERSION
     with lock:
         THREADED_SITE_CACHE = {}
+        THREADED_SITE_CACHE_VERSION = None
 
 
 def new_get_by_natural_key(self, domain):
@@ -69,3 +107,6 @@ def patch_contrib_sites():
     SiteManager.get_current = new_get_current
     SiteManager.clear_cache = new_clear_cache
     SiteManager.get_by_natural_key = new_get_by_natural_key
+    post_save.connect(invalidate_site_cache, sender=Site)
+    post_delete.connect(invalidate_site_cache, sender=Site)
+    task_prerun.connect(refresh_site_cache)
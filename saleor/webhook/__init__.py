@@ -69,3 +69,31 @@ class WebhookEventType:
         CUSTOMER_CREATED: "account.manage_users",
         PRODUCT_CREATED: "product.manage_products",
     }
+
+
+class WebhookDeliveryStatus:
+    PENDING = "pending"
+    SUCCESS = "success"
+    DEAD = "dead"
+
+    CHOICES = [
+        (
+            PENDING,
+            pgettext_lazy(
+                "Status of a webhook payload waiting to be sent or retried", "Pending"
+            ),
+        ),
+        (
+            SUCCESS,
+            pgettext_lazy(
+                "Status of a webhook payload accepted by the target", "Delivered"
+            ),
+        ),
+        (
+            DEAD,
+            pgettext_lazy(
+                "Status of a webhook payload not delivered in any of the attempts",
+                "Dead",
+            ),
+        ),
+    ]
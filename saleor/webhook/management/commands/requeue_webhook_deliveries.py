@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from ....extensions.plugins.webhook.delivery import requeue_dead_deliveries
+from ....extensions.plugins.webhook.tasks import schedule_webhook_deliveries
+from ...models import WebhookDelivery
+
+
+class Command(BaseCommand):
+    help = "Send again the payloads which were not delivered in any attempt."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--webhook", type=int, help="Requeue deliveries of the webhook only."
+        )
+
+    def handle(self, *args, **options):
+        deliveries = WebhookDelivery.objects.all()
+        if options["webhook"]:
+            deliveries = deliveries.filter(webhook_id=options["webhook"])
+        webhook_ids = requeue_dead_deliveries(deliveries)
+        schedule_webhook_deliveries(webhook_ids)
+        self.stdout.write("Requeued deliveries of %d webhooks." % len(webhook_ids))
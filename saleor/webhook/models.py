@@ -1,7 +1,10 @@
 from django.db import models
+from django.utils.timezone import now
 from django.utils.translation import pgettext_lazy
 
 from ..account.models import ServiceAccount
+from . import WebhookDeliveryStatus
+from .subscriptions import invalidate_webhook_subscriptions
 
 
 class Webhook(models.Model):
@@ -21,6 +24,15 @@ class Webhook(models.Model):
             ),
         )
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+        return result
+
 
 class WebhookEvent(models.Model):
     webhook = models.ForeignKey(
@@ -30,3 +42,59 @@ class WebhookEvent(models.Model):
 
     def __repr__(self):
         return self.event_type
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_webhook_subscriptions()
+        return result
+
+
+class WebhookPayload(models.Model):
+    """Payload of an event, stored once for all the webhooks it is sent to."""
+
+    event_type = models.CharField(max_length=128)
+    payload = models.TextField()
+    created = models.DateTimeField(default=now, editable=False)
+
+
+class WebhookDelivery(models.Model):
+    webhook = models.ForeignKey(
+        Webhook, related_name="deliveries", on_delete=models.CASCADE
+    )
+    payload = models.ForeignKey(
+        WebhookPayload, related_name="deliveries", on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=32,
+        choices=WebhookDeliveryStatus.CHOICES,
+        default=WebhookDeliveryStatus.PENDING,
+    )
+    attempt_count = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=now)
+    created = models.DateTimeField(default=now, editable=False)
+
+    class Meta:
+        ordering = ("pk",)
+        indexes = [
+            models.Index(
+                fields=["webhook", "status", "next_attempt"],
+                name="webhook_delivery_due_idx",
+            )
+        ]
+
+
+class WebhookDeliveryAttempt(models.Model):
+    delivery = models.ForeignKey(
+        WebhookDelivery, related_name="attempts", on_delete=models.CASCADE
+    )
+    created = models.DateTimeField(default=now, editable=False)
+    duration = models.DurationField()
+    response_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ("pk",)
@@ -165,6 +165,46 @@ def generate_product_payload(product: "Product"):
     return product_payload
 
 
+def _get_order_queryset():
+    return Order.objects.select_related(
+        "shipping_method", "shipping_address", "billing_address"
+    ).prefetch_related("lines", "payments", "fulfillments")
+
+
+def _get_customer_queryset():
+    return User.objects.select_related(
+        "default_billing_address", "default_shipping_address"
+    )
+
+
+def _get_product_queryset():
+    return Product.objects.select_related("category").prefetch_related(
+        "collections", "variants"
+    )
+
+
+# Querysets of the objects of events and the functions generating their payloads
+EVENT_PAYLOAD_GENERATORS = {
+    WebhookEventType.ORDER_CREATED: (_get_order_queryset, generate_order_payload),
+    WebhookEventType.ORDER_FULLY_PAID: (_get_order_queryset, generate_order_payload),
+    WebhookEventType.ORDER_UPDATED: (_get_order_queryset, generate_order_payload),
+    WebhookEventType.ORDER_CANCELLED: (_get_order_queryset, generate_order_payload),
+    WebhookEventType.ORDER_FULFILLED: (_get_order_queryset, generate_order_payload),
+    WebhookEventType.CUSTOMER_CREATED: (
+        _get_customer_queryset,
+        generate_customer_payload,
+    ),
+    WebhookEventType.PRODUCT_CREATED: (_get_product_queryset, generate_product_payload),
+}
+
+
+def generate_event_payload(event_type: str, object_id: int) -> Optional[str]:
+    """Return payload of the event of the object or None if it does not exist."""
+    get_queryset, generate_payload = EVENT_PAYLOAD_GENERATORS[event_type]
+    instance = get_queryset().filter(pk=object_id).first()
+    return generate_payload(instance) if instance else None
+
+
 def _get_sample_object(qs: QuerySet) -> Optional[Model]:
     """Return random object from query."""
     random_object = qs.order_by("?").first()
@@ -0,0 +1,48 @@
+"""Events subscribed by any webhook, cached in the memory of each process.
+
+The processes share only the version of the subscriptions through the cache,
+so checking if an event has subscribers costs a single cache lookup.
+"""
+from typing import FrozenSet
+
+from ..core.cache import bump_cache_version, get_cache_version
+from . import WebhookEventType
+
+SUBSCRIPTIONS_VERSION_CACHE_KEY = "webhook-subscriptions-version"
+
+_subscriptions = {"version": None, "event_types": frozenset()}
+
+
+def get_subscriptions_version() -> str:
+    return get_cache_version(SUBSCRIPTIONS_VERSION_CACHE_KEY)
+
+
+def invalidate_webhook_subscriptions():
+    """Mark the subscribed events cached by all the processes as outdated.
+
+    Call it whenever webhooks or their events change.
+    """
+    bump_cache_version(SUBSCRIPTIONS_VERSION_CACHE_KEY)
+
+
+def get_subscribed_event_types() -> FrozenSet[str]:
+    from .models import WebhookEvent
+
+    version = get_subscriptions_version()
+    if _subscriptions["version"] != version:
+        event_types = WebhookEvent.objects.filter(webhook__is_active=True)
+        _subscriptions["event_types"] = frozenset(
+            event_types.order_by().values_list("event_type", flat=True).distinct()
+        )
+        _subscriptions["version"] = version
+    return _subscriptions["event_types"]
+
+
+def is_event_subscribed(event_type: str) -> bool:
+    """Return whether any active webhook might be interested in the event.
+
+    Permissions of the service accounts are not checked, they are verified
+    when the webhooks are triggered.
+    """
+    event_types = get_subscribed_event_types()
+    return event_type in event_types or WebhookEventType.ANY in event_types
@@ -2763,6 +2763,28 @@ def test_query_customers_with_filter_placed_orders(
     assert len(users) == count
 
 
+def test_query_customers_with_filter_placed_orders_returns_distinct_users(
+    query_customer_with_filter,
+    staff_api_client,
+    permission_manage_users,
+    customer_user,
+):
+    Order.objects.bulk_create(
+        [
+            Order(user=customer_user, token=str(uuid.uuid4())),
+            Order(user=customer_user, token=str(uuid.uuid4())),
+        ]
+    )
+    variables = {"filter": {"placedOrders": {"gte": "2012-01-14"}}}
+    response = staff_api_client.post_graphql(
+        query_customer_with_filter, variables, permissions=[permission_manage_users]
+    )
+    content = get_graphql_content(response)
+    users = content["data"]["customers"]["edges"]
+
+    assert len(users) == 1
+
+
 @pytest.mark.parametrize(
     "customer_filter, count",
     [
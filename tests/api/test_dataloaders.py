@@ -0,0 +1,151 @@
+from unittest.mock import Mock
+
+import pytest
+from prices import Money
+
+from saleor.graphql.core.dataloaders import DataLoader
+from saleor.graphql.product.dataloaders import (
+    CollectionsByProductIdLoader,
+    ProductByIdLoader,
+    ProductVariantsByProductIdLoader,
+)
+from saleor.product.models import Product, ProductVariant
+from tests.api.utils import get_graphql_content
+
+
+class DummyLoader(DataLoader):
+    context_key = "dummy"
+
+    def batch_load(self, keys):
+        return [key * 2 for key in keys]
+
+
+class LoaderWithoutContextKey(DataLoader):
+    def batch_load(self, keys):
+        return keys
+
+
+def test_data_loader_is_cached_on_context():
+    context = Mock(spec=[])
+    loader = DummyLoader(context)
+
+    assert DummyLoader(context) is loader
+    assert context.dataloaders == {"dummy": loader}
+    assert DummyLoader(Mock(spec=[])) is not loader
+
+
+def test_data_loader_requires_context_key():
+    with pytest.raises(TypeError):
+        LoaderWithoutContextKey(Mock(spec=[]))
+
+
+def test_data_loader_batches_loads():
+    loader = DummyLoader(Mock(spec=[]))
+    batch_load = Mock(wraps=loader.batch_load)
+    loader.batch_load = batch_load
+
+    result = loader.load_many([1, 2, 3]).get()
+
+    assert result == [2, 4, 6]
+    batch_load.assert_called_once_with([1, 2, 3])
+
+
+def test_product_by_id_loader(product_list, assert_num_queries):
+    loader = ProductByIdLoader(Mock(spec=[]))
+    keys = [product.pk for product in product_list] + [-1]
+
+    with assert_num_queries(1):
+        products = loader.load_many(keys).get()
+
+    assert products == product_list + [None]
+
+
+def test_objects_by_related_id_loaders(product, collection, assert_num_queries):
+    collection.products.add(product)
+    context = Mock(spec=[])
+
+    with assert_num_queries(2):
+        variants = ProductVariantsByProductIdLoader(context).load(product.pk).get()
+        collections = CollectionsByProductIdLoader(context).load(product.pk).get()
+
+    assert variants == list(product.variants.all())
+    assert collections == [collection]
+
+
+QUERY_PRODUCTS_WITH_RELATIONS = """
+    query {
+        products(first: 20) {
+            edges {
+                node {
+                    name
+                    isAvailable
+                    category {
+                        name
+                    }
+                    thumbnail {
+                        url
+                    }
+                    pricing {
+                        onSale
+                        priceRange {
+                            start {
+                                gross {
+                                    amount
+                                }
+                            }
+                        }
+                    }
+                    collections {
+                        name
+                    }
+                    images {
+                        url
+                    }
+                    variants {
+                        sku
+                        product {
+                            name
+                        }
+                        images {
+                            url
+                        }
+                        pricing {
+                            onSale
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_products_query_number_is_constant(
+    api_client, product, collection, capture_queries
+):
+    collection.products.add(product)
+
+    # warm up caches which are filled on the first request
+    get_graphql_content(api_client.post_graphql(QUERY_PRODUCTS_WITH_RELATIONS))
+    with capture_queries() as ctx:
+        get_graphql_content(api_client.post_graphql(QUERY_PRODUCTS_WITH_RELATIONS))
+    queries_for_one_product = len(ctx.captured_queries)
+
+    for i in range(5):
+        new_product = Product.objects.create(
+            name=f"Product {i}",
+            price=Money("10.00", "USD"),
+            product_type=product.product_type,
+            category=product.category,
+            is_published=True,
+        )
+        ProductVariant.objects.create(product=new_product, sku=f"SKU-{i}")
+        collection.products.add(new_product)
+
+    with capture_queries() as ctx:
+        content = get_graphql_content(
+            api_client.post_graphql(QUERY_PRODUCTS_WITH_RELATIONS)
+        )
+
+    assert len(content["data"]["products"]["edges"]) == 6
+    assert len(ctx.captured_queries) == queries_for_one_product
@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+import pytest
+
+from saleor.graphql.document_cache import DocumentCache, get_query_hash
+from tests.api.utils import get_graphql_content
+
+QUERY_SHOP = """
+    query {
+        shop {
+            name
+        }
+    }
+"""
+
+
+@pytest.fixture
+def document_cache():
+    cache = DocumentCache(max_size=2)
+    with patch("saleor.graphql.views.document_cache", cache):
+        yield cache
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(max_size=2)
+    schema = object()
+    cache.set(schema, "a", "document-a")
+    cache.set(schema, "b", "document-b")
+    assert cache.get(schema, "a") == "document-a"
+
+    cache.set(schema, "c", "document-c")
+
+    assert cache.get(schema, "b") is None
+    assert cache.get(schema, "a") == "document-a"
+    assert cache.get(schema, "c") == "document-c"
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "max_size": 2}
+
+
+def test_document_cache_disabled():
+    cache = DocumentCache(max_size=0)
+    schema = object()
+    cache.set(schema, "a", "document-a")
+    assert cache.get(schema, "a") is None
+
+
+def test_query_document_is_parsed_once(api_client, site_settings, document_cache):
+    with patch("saleor.graphql.views.validate", return_value=[]) as mocked_validate:
+        get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+        content = get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    assert mocked_validate.call_count == 1
+    assert document_cache.stats()["hits"] == 1
+    assert document_cache.stats()["misses"] == 1
+
+
+def test_invalid_query_document_is_not_cached(api_client, document_cache):
+    query = "query { shop { nonExistingField } }"
+    response = api_client.post_graphql(query)
+    assert response.status_code == 400
+    assert document_cache.stats()["size"] == 0
+
+
+def test_persisted_query_not_supported(api_client, settings):
+    settings.GRAPHQL_PERSISTED_QUERIES = False
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": "abc"}}
+    response = api_client.post(data={"extensions": extensions})
+    content = response.json()
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+def test_persisted_query_not_found(api_client, settings, document_cache):
+    settings.GRAPHQL_PERSISTED_QUERIES = True
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": "not-registered"}}
+    response = api_client.post(data={"extensions": extensions})
+    content = response.json()
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_hash_mismatch(api_client, settings, document_cache):
+    settings.GRAPHQL_PERSISTED_QUERIES = True
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": "invalid"}}
+    response = api_client.post(data={"query": QUERY_SHOP, "extensions": extensions})
+    content = response.json()
+    assert "does not match" in content["errors"][0]["message"]
+
+
+def test_persisted_query_registered_and_executed_by_hash(
+    api_client, settings, site_settings, document_cache
+):
+    settings.GRAPHQL_PERSISTED_QUERIES = True
+    query_hash = get_query_hash(QUERY_SHOP)
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+    # register the query
+    response = api_client.post(data={"query": QUERY_SHOP, "extensions": extensions})
+    get_graphql_content(response)
+
+    # execute the query by its hash in a worker with an empty document cache
+    document_cache.clear()
+    response = api_client.post(data={"extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
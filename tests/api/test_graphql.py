@@ -13,7 +13,10 @@ from saleor.graphql.utils import (
     filter_by_query_param,
     generate_query_argument_description,
     get_nodes,
+    search_by_icontains,
+    search_by_trigram_indexes,
 )
+from saleor.product.models import Category
 from tests.api.utils import get_graphql_content
 
 
@@ -287,6 +290,53 @@ def test_filter_by_query_param(qs):
     qs.filter.call_count == 1
 
 
+def test_search_by_trigram_indexes_without_distinct(categories_tree):
+    child = categories_tree.children.get()
+    qs = Category.objects.all()
+
+    qs = search_by_trigram_indexes(qs, "PARENT", ("name", "parent__name"))
+
+    assert not qs.query.distinct
+    assert set(qs) == {categories_tree, child}
+
+
+def test_search_by_trigram_indexes_through_multiple_objects(categories_tree):
+    categories_tree.children.create(name="Second child", slug="second-child")
+    qs = Category.objects.all()
+
+    qs = search_by_trigram_indexes(qs, "child", ("name", "children__name"))
+
+    assert not qs.query.distinct
+    assert sorted(category.slug for category in qs) == [
+        "child",
+        "parent",
+        "second-child",
+    ]
+
+
+def test_search_by_icontains_through_multiple_objects(categories_tree):
+    categories_tree.children.create(name="Second child", slug="second-child")
+    qs = Category.objects.filter(level=0)
+
+    qs = search_by_icontains(qs, "child", ("children__name",))
+
+    assert qs.query.distinct
+    assert list(qs) == [categories_tree]
+
+
+def test_filter_by_query_param_uses_search_strategy(settings, categories_tree):
+    settings.QUERY_PARAM_SEARCH_STRATEGY = "saleor.graphql.utils.search_by_icontains"
+    qs = filter_by_query_param(Category.objects.all(), "parent", ("name",))
+    assert qs.query.distinct
+
+    settings.QUERY_PARAM_SEARCH_STRATEGY = (
+        "saleor.graphql.utils.search_by_trigram_indexes"
+    )
+    qs = filter_by_query_param(Category.objects.all(), "parent", ("name",))
+    assert not qs.query.distinct
+    assert list(qs) == [categories_tree]
+
+
 def test_generate_query_argument_description():
     expected = (
         "DEPRECATED: Will be removed in Saleor 2.10,"
@@ -23,6 +23,7 @@ from saleor.graphql.payment.types import PaymentChargeStatusEnum
 from saleor.order import OrderStatus, events as order_events
 from saleor.order.error_codes import OrderErrorCode
 from saleor.order.models import Order, OrderEvent
+from saleor.order.reports import add_order_to_daily_sales
 from saleor.payment import ChargeStatus, CustomPaymentChoices, PaymentError
 from saleor.payment.models import Payment
 from saleor.shipping.models import ShippingMethod
@@ -1894,6 +1895,7 @@ def test_draft_order_clear_shipping_method(
 
 
 def test_orders_total(staff_api_client, permission_manage_orders, order_with_lines):
+    add_order_to_daily_sales(order_with_lines)
     query = """
     query Orders($period: ReportingPeriod) {
         ordersTotal(period: $period) {
@@ -0,0 +1,189 @@
+import pytest
+from graphql.error import GraphQLError
+
+from saleor.graphql.core.pagination import (
+    connection_from_queryset_keyset,
+    decode_cursor,
+    encode_cursor,
+    get_keyset_ordering,
+)
+from saleor.graphql.product.types import Product as ProductType
+from saleor.order.models import Order
+from saleor.product.models import Product
+from tests.api.utils import get_graphql_content
+
+
+def test_get_keyset_ordering_appends_pk():
+    queryset = Product.objects.order_by("-price_amount", "name")
+    assert get_keyset_ordering(queryset) == [
+        ("price_amount", True),
+        ("name", False),
+        ("pk", False),
+    ]
+
+
+def test_get_keyset_ordering_uses_model_ordering():
+    assert get_keyset_ordering(Order.objects.all()) == [("pk", True)]
+
+
+def test_get_keyset_ordering_reversed_queryset():
+    queryset = Product.objects.order_by("name").reverse()
+    assert get_keyset_ordering(queryset) == [("name", True), ("pk", True)]
+
+
+def test_keyset_pagination_of_reversed_queryset(product_list):
+    queryset = Product.objects.order_by("name").reverse()
+    ordering = get_keyset_ordering(queryset)
+    connection_type = ProductType._meta.connection
+
+    connection = connection_from_queryset_keyset(
+        queryset, {"first": 2}, ordering, connection_type
+    )
+    names = [edge.node.name for edge in connection.edges]
+    assert connection.page_info.has_next_page
+
+    after = connection.page_info.end_cursor
+    connection = connection_from_queryset_keyset(
+        queryset, {"first": 2, "after": after}, ordering, connection_type
+    )
+    names += [edge.node.name for edge in connection.edges]
+    assert not connection.page_info.has_next_page
+
+    assert names == ["Test product 3", "Test product 2", "Test product 1"]
+
+
+@pytest.mark.parametrize(
+    "queryset",
+    [
+        Product.objects.order_by("?"),
+        Product.objects.order_by("category"),
+        Product.objects.extra(order_by=["name"]),
+    ],
+)
+def test_get_keyset_ordering_unsupported_ordering(queryset):
+    assert get_keyset_ordering(queryset) is None
+
+
+def test_decode_cursor():
+    ordering = [("name", False), ("pk", False)]
+    cursor = encode_cursor(["Test product", 1])
+    assert decode_cursor(cursor, ordering) == ["Test product", 1]
+
+
+@pytest.mark.parametrize("cursor", ["invalid", encode_cursor([1])])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(GraphQLError):
+        decode_cursor(cursor, [("name", False), ("pk", False)])
+
+
+QUERY_PRODUCTS_PAGE = """
+    query ($first: Int, $last: Int, $after: String, $before: String) {
+        products(
+            first: $first, last: $last, after: $after, before: $before,
+            sortBy: {field: PRICE, direction: DESC}
+        ) {
+            edges {
+                node {
+                    name
+                }
+            }
+            pageInfo {
+                hasNextPage
+                hasPreviousPage
+                startCursor
+                endCursor
+            }
+        }
+    }
+"""
+
+
+def test_products_keyset_pagination(
+    staff_api_client, product_list, permission_manage_products
+):
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, {"first": 2})
+    data = get_graphql_content(response)["data"]["products"]
+    assert [edge["node"]["name"] for edge in data["edges"]] == [
+        "Test product 2",
+        "Test product 3",
+    ]
+    assert data["pageInfo"]["hasNextPage"]
+    assert not data["pageInfo"]["hasPreviousPage"]
+
+    variables = {"first": 2, "after": data["pageInfo"]["endCursor"]}
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+    data = get_graphql_content(response)["data"]["products"]
+    assert [edge["node"]["name"] for edge in data["edges"]] == ["Test product 1"]
+    assert not data["pageInfo"]["hasNextPage"]
+    assert data["pageInfo"]["hasPreviousPage"]
+
+    variables = {"last": 2, "before": data["pageInfo"]["startCursor"]}
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+    data = get_graphql_content(response)["data"]["products"]
+    assert [edge["node"]["name"] for edge in data["edges"]] == [
+        "Test product 2",
+        "Test product 3",
+    ]
+    assert not data["pageInfo"]["hasPreviousPage"]
+
+
+QUERY_ORDERS_PAGE = """
+    query ($first: Int, $after: String) {
+        orders(first: $first, after: $after) {
+            totalCount
+            edges {
+                node {
+                    number
+                }
+            }
+            pageInfo {
+                endCursor
+            }
+        }
+    }
+"""
+
+
+def test_orders_keyset_pagination(
+    staff_api_client, order_list, permission_manage_orders
+):
+    staff_api_client.user.user_permissions.add(permission_manage_orders)
+    expected_numbers = [str(order.pk) for order in order_list[::-1]]
+
+    response = staff_api_client.post_graphql(QUERY_ORDERS_PAGE, {"first": 2})
+    data = get_graphql_content(response)["data"]["orders"]
+    assert data["totalCount"] == 3
+    numbers = [edge["node"]["number"] for edge in data["edges"]]
+
+    variables = {"first": 2, "after": data["pageInfo"]["endCursor"]}
+    response = staff_api_client.post_graphql(QUERY_ORDERS_PAGE, variables)
+    data = get_graphql_content(response)["data"]["orders"]
+    numbers += [edge["node"]["number"] for edge in data["edges"]]
+
+    assert numbers == expected_numbers
+
+
+QUERY_ORDERS_WITHOUT_COUNT = """
+    query {
+        orders(first: 2) {
+            edges {
+                node {
+                    id
+                }
+            }
+        }
+    }
+"""
+
+
+def test_orders_keyset_pagination_skips_count(
+    staff_api_client, order_list, permission_manage_orders, capture_queries
+):
+    staff_api_client.user.user_permissions.add(permission_manage_orders)
+    with capture_queries() as ctx:
+        response = staff_api_client.post_graphql(QUERY_ORDERS_WITHOUT_COUNT)
+    content = get_graphql_content(response)
+    assert len(content["data"]["orders"]["edges"]) == 2
+    assert not any("COUNT(" in query["sql"] for query in ctx.captured_queries)
@@ -14,6 +14,7 @@ from saleor.core.taxes import TaxType
 from saleor.extensions.manager import ExtensionsManager
 from saleor.graphql.core.enums import ReportingPeriod
 from saleor.graphql.product.enums import StockAvailability
+from saleor.order.reports import add_order_to_daily_sales
 from saleor.product import AttributeInputType
 from saleor.product.error_codes import ProductErrorCode
 from saleor.product.models import (
@@ -487,6 +488,49 @@ def test_query_product_image_by_id(user_api_client, product_with_image):
     get_graphql_content(response)
 
 
+QUERY_PRODUCT_WEBP_THUMBNAILS = """
+    query productThumbnails($productId: ID!, $format: ThumbnailFormatEnum) {
+        product(id: $productId) {
+            thumbnail(size: 255, format: $format) {
+                url
+            }
+            images {
+                url(size: 255, format: $format)
+            }
+        }
+    }
+"""
+
+
+def test_query_product_webp_thumbnails(user_api_client, product_with_image, settings):
+    settings.WEBP_THUMBNAILS = True
+    variables = {
+        "productId": graphene.Node.to_global_id("Product", product_with_image.pk),
+        "format": "WEBP",
+    }
+
+    response = user_api_client.post_graphql(QUERY_PRODUCT_WEBP_THUMBNAILS, variables)
+
+    data = get_graphql_content(response)["data"]["product"]
+    assert data["thumbnail"]["url"].endswith("-thumbnail-255x255.jpg.webp")
+    assert data["images"][0]["url"].endswith("-thumbnail-255x255.jpg.webp")
+
+
+def test_query_product_webp_thumbnails_disabled(
+    user_api_client, product_with_image, settings
+):
+    settings.WEBP_THUMBNAILS = False
+    variables = {
+        "productId": graphene.Node.to_global_id("Product", product_with_image.pk),
+        "format": "WEBP",
+    }
+
+    response = user_api_client.post_graphql(QUERY_PRODUCT_WEBP_THUMBNAILS, variables)
+
+    data = get_graphql_content(response)["data"]["product"]
+    assert data["thumbnail"]["url"].endswith("-thumbnail-255x255.jpg")
+
+
 def test_product_with_collections(
     staff_api_client, product, collection, permission_manage_products
 ):
@@ -2403,6 +2447,7 @@ def test_report_product_sales(
     permission_manage_products,
     permission_manage_orders,
 ):
+    add_order_to_daily_sales(order_with_lines)
     query = """
     query TopProducts($period: ReportingPeriod!) {
         reportProductSales(period: $period, first: 20) {
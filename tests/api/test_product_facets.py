@@ -0,0 +1,160 @@
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from saleor.product.models import Product
+from saleor.product.utils.facets import ProductFacetsCounts, get_product_facets_counts
+from tests.api.utils import get_graphql_content
+
+QUERY_PRODUCT_FACETS = """
+    query ($filter: ProductFilterInput, $priceRangeSize: Float) {
+        productFacets(filter: $filter, priceRangeSize: $priceRangeSize) {
+            totalCount
+            attributes {
+                attribute {
+                    slug
+                }
+                value {
+                    slug
+                }
+                count
+            }
+            categories {
+                category {
+                    name
+                }
+                count
+            }
+            priceRanges {
+                gte
+                lt
+                count
+            }
+        }
+    }
+"""
+
+
+def test_product_facets(user_api_client, product_list, category):
+    variables = {"priceRangeSize": 10}
+    response = user_api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["productFacets"]
+
+    # Only published products are counted
+    assert data["totalCount"] == 2
+    assert data["attributes"] == [
+        {"attribute": {"slug": "color"}, "value": {"slug": "red"}, "count": 2}
+    ]
+    assert data["categories"] == [{"category": {"name": category.name}, "count": 2}]
+    assert data["priceRanges"] == [
+        {"gte": 10.0, "lt": 20.0, "count": 1},
+        {"gte": 20.0, "lt": 30.0, "count": 1},
+    ]
+
+
+def test_product_facets_with_filter(
+    staff_api_client, product_list, permission_manage_products
+):
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+    variables = {"filter": {"minimalPrice": {"gte": 15}}, "priceRangeSize": 100}
+    response = staff_api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["productFacets"]
+
+    assert data["totalCount"] == 2
+    assert data["attributes"][0]["count"] == 2
+    assert data["priceRanges"] == [{"gte": 0.0, "lt": 100.0, "count": 2}]
+
+
+def test_product_facets_counted_in_single_query(
+    user_api_client, product_list, capture_queries
+):
+    with capture_queries() as ctx:
+        response = user_api_client.post_graphql(
+            """
+            query {
+                productFacets {
+                    totalCount
+                    priceRanges {
+                        count
+                    }
+                }
+            }
+            """
+        )
+    content = get_graphql_content(response)
+    assert content["data"]["productFacets"]["totalCount"] == 2
+    facets_queries = [
+        query for query in ctx.captured_queries if "product_product" in query["sql"]
+    ]
+    assert len(facets_queries) == 1
+
+
+def test_product_facets_invalid_price_range_size(user_api_client):
+    variables = {"priceRangeSize": 0}
+    response = user_api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    content = get_graphql_content(response, ignore_errors=True)
+    assert content["errors"][0]["message"] == (
+        "Price range size must be greater than 0."
+    )
+
+
+@patch("saleor.graphql.product.resolvers.picker.pick_facets_backend")
+def test_product_facets_counted_by_search_backend(
+    mocked_pick_facets_backend, user_api_client, product
+):
+    attribute_value = product.attributes.get().values.get()
+    facets_backend = Mock(
+        return_value=ProductFacetsCounts(
+            price_range_size=Decimal(50),
+            total_count=1,
+            attribute_values={attribute_value.pk: 1},
+            price_ranges={0: 1},
+        )
+    )
+    mocked_pick_facets_backend.return_value = facets_backend
+
+    variables = {"filter": {"search": "test"}}
+    response = user_api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["productFacets"]
+
+    facets_backend.assert_called_once_with(
+        "test", Decimal(50), minimal_price_gte=None, minimal_price_lte=None
+    )
+    assert data["totalCount"] == 1
+    assert data["attributes"][0]["count"] == 1
+    assert data["priceRanges"] == [{"gte": 0.0, "lt": 50.0, "count": 1}]
+
+
+@patch("saleor.graphql.product.resolvers.picker.pick_facets_backend")
+def test_product_facets_unsupported_filter_counted_in_database(
+    mocked_pick_facets_backend, user_api_client, product
+):
+    facets_backend = Mock()
+    mocked_pick_facets_backend.return_value = facets_backend
+
+    variables = {"filter": {"search": "test", "stockAvailability": "IN_STOCK"}}
+    response = user_api_client.post_graphql(QUERY_PRODUCT_FACETS, variables)
+    get_graphql_content(response)
+
+    facets_backend.assert_not_called()
+
+
+def test_product_facets_without_visible_products(user_api_client, product):
+    Product.objects.update(is_published=False)
+    response = user_api_client.post_graphql(QUERY_PRODUCT_FACETS)
+    content = get_graphql_content(response)
+    data = content["data"]["productFacets"]
+    assert data["totalCount"] == 0
+    assert data["attributes"] == []
+    assert data["categories"] == []
+    assert data["priceRanges"] == []
+
+
+def test_get_product_facets_counts_of_empty_result(product):
+    products = Product.objects.filter(pk__in=[])
+
+    counts = get_product_facets_counts(products, Decimal(50))
+
+    assert counts == ProductFacetsCounts(price_range_size=Decimal(50))
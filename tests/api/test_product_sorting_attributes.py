@@ -557,3 +557,89 @@ def test_sort_product_by_attribute_using_attribute_having_no_products(
 
     assert len(products) == product_models.Product.objects.count()
     assert products[0]["node"]["name"] == expected_first_product.name
+
+
+def test_sort_product_by_attribute_after_value_update(category):
+    product_create_kwargs = {
+        "category": category,
+        "price": zero_money(),
+        "is_published": True,
+    }
+    product_type = product_models.ProductType.objects.create(name="Apples")
+    attribute = product_models.Attribute.objects.create(name="Kind", slug="kind")
+    value_a = product_models.AttributeValue.objects.create(
+        name="A", slug="a", attribute=attribute
+    )
+    value_b = product_models.AttributeValue.objects.create(
+        name="B", slug="b", attribute=attribute
+    )
+    product_type.product_attributes.add(attribute)
+    for name, value in (("First", value_a), ("Second", value_b)):
+        product = product_models.Product.objects.create(
+            name=name, product_type=product_type, **product_create_kwargs
+        )
+        associate_attribute_values_to_instance(product, attribute, value)
+
+    qs = product_models.Product.objects.sort_by_attribute(attribute_pk=attribute.pk)
+    assert list(qs.values_list("name", flat=True)) == ["First", "Second"]
+
+    # Renaming the value changes the sort key of the products having it
+    value_a.name = "C"
+    value_a.save()
+    assert list(qs.values_list("name", flat=True)) == ["Second", "First"]
+
+    # Products of deleted values are sorted as not having any value
+    value_b.delete()
+    assert list(qs.values_list("name", flat=True)) == ["First", "Second"]
+
+
+QUERY_SORT_PRODUCTS_BY_ATTRIBUTE_PAGE = """
+query products($attributeId: ID, $direction: OrderDirection!, $after: String) {
+  products(
+    first: 4
+    after: $after
+    sortBy: { attributeId: $attributeId, direction: $direction }
+  ) {
+    edges {
+      node {
+        name
+      }
+    }
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
+  }
+}
+"""
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_product_by_attribute_keyset_pagination(
+    api_client, products_structures, ascending
+):
+    _, attribute, _ = products_structures
+    attribute_id = graphene.Node.to_global_id("Attribute", attribute.pk)
+    direction = "ASC" if ascending else "DESC"
+    variables = {"attributeId": attribute_id, "direction": direction, "after": None}
+
+    names = []
+    pages = 0
+    has_next_page = True
+    while has_next_page:
+        pages += 1
+        response = api_client.post_graphql(
+            QUERY_SORT_PRODUCTS_BY_ATTRIBUTE_PAGE, variables
+        )
+        data = get_graphql_content(response)["data"]["products"]
+        names += [edge["node"]["name"] for edge in data["edges"]]
+        has_next_page = data["pageInfo"]["hasNextPage"]
+        variables["after"] = data["pageInfo"]["endCursor"]
+
+    expected_names = [
+        edge["node"]["name"] for edge in EXPECTED_SORTED_DATA_SINGLE_VALUE_ASC
+    ]
+    if not ascending:
+        expected_names.reverse()
+    assert pages > 1
+    assert names == expected_names
@@ -586,6 +586,75 @@ def test_shop_no_translation(user_api_client, site_settings):
     assert data["shop"]["translation"] is None
 
 
+QUERY_PRODUCTS_TRANSLATIONS = """
+    query ($languageCode: LanguageCodeEnum!) {
+        products(first: 10) {
+            edges {
+                node {
+                    translation(languageCode: $languageCode) {
+                        name
+                        language {
+                            code
+                        }
+                    }
+                    variants {
+                        translation(languageCode: $languageCode) {
+                            name
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_products_translations_loaded_in_batches(
+    user_api_client, product_list, capture_queries
+):
+    for product in product_list:
+        product.translations.create(language_code="pl", name=f"{product.name} PL")
+        product.variants.get().translations.create(language_code="pl", name="PL")
+
+    variables = {"languageCode": "PL"}
+    with capture_queries() as ctx:
+        response = user_api_client.post_graphql(QUERY_PRODUCTS_TRANSLATIONS, variables)
+    edges = get_graphql_content(response)["data"]["products"]["edges"]
+
+    assert [edge["node"]["translation"]["name"] for edge in edges] == [
+        "Test product 1 PL",
+        "Test product 3 PL",
+    ]
+    translations_queries = [
+        query for query in ctx.captured_queries if "translation" in query["sql"]
+    ]
+    # One query for products' translations and one for variants' translations
+    assert len(translations_queries) == 2
+
+
+def test_product_translation_language_fallback(user_api_client, product):
+    product.translations.create(language_code="pt", name="Produto")
+
+    variables = {"languageCode": "PT_BR"}
+    response = user_api_client.post_graphql(QUERY_PRODUCTS_TRANSLATIONS, variables)
+    edges = get_graphql_content(response)["data"]["products"]["edges"]
+
+    translation = edges[0]["node"]["translation"]
+    assert translation["name"] == "Produto"
+    assert translation["language"]["code"] == "PT"
+
+
+def test_product_translation_prefers_exact_language(user_api_client, product):
+    product.translations.create(language_code="pt", name="Produto")
+    product.translations.create(language_code="pt-br", name="Produto BR")
+
+    variables = {"languageCode": "PT_BR"}
+    response = user_api_client.post_graphql(QUERY_PRODUCTS_TRANSLATIONS, variables)
+    edges = get_graphql_content(response)["data"]["products"]["edges"]
+
+    assert edges[0]["node"]["translation"]["name"] == "Produto BR"
+
+
 def test_product_create_translation(
     staff_api_client, product, permission_manage_translations
 ):
@@ -35,6 +35,8 @@ from saleor.discount.models import (
     VoucherCustomer,
     VoucherTranslation,
 )
+from saleor.discount.utils import invalidate_active_discounts
+from saleor.extensions.manager import invalidate_extensions_managers
 from saleor.giftcard.models import GiftCard
 from saleor.menu.models import Menu, MenuItem, MenuItemTranslation
 from saleor.menu.utils import update_menu
@@ -65,7 +67,10 @@ from saleor.product.models import (
     ProductVariant,
     ProductVariantTranslation,
 )
-from saleor.product.utils.attributes import associate_attribute_values_to_instance
+from saleor.product.utils.attributes import (
+    associate_attribute_values_to_instance,
+    invalidate_attribute_values_map,
+)
 from saleor.shipping.models import (
     ShippingMethod,
     ShippingMethodTranslation,
@@ -170,6 +175,24 @@ def setup_dummy_gateway(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_extensions_managers():
+    # Managers are cached per process, don't share them between tests
+    invalidate_extensions_managers()
+
+
+@pytest.fixture(autouse=True)
+def clear_active_discounts():
+    # Active discounts are cached, don't share them between tests
+    invalidate_active_discounts()
+
+
+@pytest.fixture(autouse=True)
+def clear_attribute_values_map():
+    # Maps of attribute values are cached, don't share them between tests
+    invalidate_attribute_values_map()
+
+
 @pytest.fixture(autouse=True)
 def site_settings(db, settings) -> SiteSettings:
     """Create a site and matching site settings.
@@ -1580,6 +1603,11 @@ def media_root(tmpdir, settings):
     settings.MEDIA_ROOT = str(tmpdir.mkdir("media"))
 
 
+@pytest.fixture
+def private_media_root(tmpdir, settings):
+    settings.PRIVATE_MEDIA_ROOT = str(tmpdir.mkdir("private-media"))
+
+
 @pytest.fixture
 def description_json():
     return {
@@ -1,16 +1,33 @@
 import json
+import os
+import zipfile
+from datetime import timedelta
 from decimal import Decimal
+from io import BytesIO
 from unittest.mock import patch
 
 import pytest
+from django.core.files.base import ContentFile
 from django.urls import reverse
+from django.utils import timezone
 from phonenumber_field.phonenumber import PhoneNumber
 from prices import Money, TaxedMoney
 
 from saleor.checkout import AddressType
+from saleor.core.storages import get_private_storage
 from saleor.core.taxes import zero_money, zero_taxed_money
 from saleor.dashboard.order.forms import ChangeQuantityForm
+from saleor.dashboard.order.tasks import (
+    ArchiveJobStatus,
+    create_packing_slips_archive_task,
+    get_packing_slips_archive_status,
+    schedule_packing_slips_archive_creation,
+    schedule_pdf_creation,
+)
 from saleor.dashboard.order.utils import (
+    create_packing_slips_archive,
+    delete_old_pdfs,
+    get_packing_slips_archive_path,
     remove_customer_from_order,
     save_address_in_order,
     update_order_with_user_addresses,
@@ -462,7 +479,7 @@ def test_ordered_item_change_quantity(transactional_db, order_with_lines):
 
 
 @pytest.mark.integration
-def test_view_order_invoice(admin_client, order_with_lines):
+def test_view_order_invoice(admin_client, order_with_lines, private_media_root):
     url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
     response = admin_client.get(url)
     assert response.status_code == 200
@@ -472,7 +489,9 @@ def test_view_order_invoice(admin_client, order_with_lines):
 
 
 @pytest.mark.integration
-def test_view_order_invoice_without_shipping(admin_client, order_with_lines):
+def test_view_order_invoice_without_shipping(
+    admin_client, order_with_lines, private_media_root
+):
     order_with_lines.shipping_address.delete()
     # Regression test for #1536:
     url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
@@ -482,7 +501,9 @@ def test_view_order_invoice_without_shipping(admin_client, order_with_lines):
 
 
 @pytest.mark.integration
-def test_view_fulfillment_packing_slips(admin_client, fulfilled_order):
+def test_view_fulfillment_packing_slips(
+    admin_client, fulfilled_order, private_media_root
+):
     fulfillment = fulfilled_order.fulfillments.first()
     url = reverse(
         "dashboard:fulfillment-packing-slips",
@@ -496,7 +517,9 @@ def test_view_fulfillment_packing_slips(admin_client, fulfilled_order):
 
 
 @pytest.mark.integration
-def test_view_fulfillment_packing_slips_without_shipping(admin_client, fulfilled_order):
+def test_view_fulfillment_packing_slips_without_shipping(
+    admin_client, fulfilled_order, private_media_root
+):
     # Regression test for #1536
     fulfilled_order.shipping_address.delete()
     fulfillment = fulfilled_order.fulfillments.first()
@@ -509,6 +532,223 @@ def test_view_fulfillment_packing_slips_without_shipping(admin_client, fulfilled
     assert response["content-type"] == "application/pdf"
 
 
+@patch("saleor.dashboard.order.utils._create_pdf", return_value=b"%PDF-invoice")
+def test_view_order_invoice_stored(
+    mocked_create_pdf, admin_client, order_with_lines, private_media_root
+):
+    url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
+
+    response = admin_client.get(url)
+    response_again = admin_client.get(url)
+
+    assert b"".join(response.streaming_content) == b"%PDF-invoice"
+    assert b"".join(response_again.streaming_content) == b"%PDF-invoice"
+    mocked_create_pdf.assert_called_once()
+
+
+@patch("saleor.dashboard.order.utils._create_pdf", return_value=b"%PDF-invoice")
+def test_view_order_invoice_created_again_after_change(
+    mocked_create_pdf, admin_client, order_with_lines, private_media_root
+):
+    url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
+    admin_client.get(url)
+
+    order_with_lines.shipping_address.city = "Krakow"
+    order_with_lines.shipping_address.save()
+    admin_client.get(url)
+
+    assert mocked_create_pdf.call_count == 2
+
+
+@patch("saleor.dashboard.order.utils._create_pdf", return_value=b"%PDF-invoice")
+def test_view_order_invoice_stored_privately(
+    mocked_create_pdf,
+    admin_client,
+    order_with_lines,
+    private_media_root,
+    media_root,
+    settings,
+):
+    url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
+
+    admin_client.get(url)
+
+    assert os.listdir(os.path.join(settings.PRIVATE_MEDIA_ROOT, "pdf"))
+    assert not os.listdir(settings.MEDIA_ROOT)
+
+
+@patch("saleor.dashboard.order.views.schedule_pdf_creation")
+def test_view_order_invoice_pending(
+    mocked_schedule_pdf_creation, admin_client, order_with_lines, private_media_root
+):
+    url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
+
+    response = admin_client.get(url)
+
+    assert response.status_code == 202
+    assert response.templates[0].name == "dashboard/order/pdf/pending.html"
+    mocked_schedule_pdf_creation.assert_called_once()
+
+
+@patch("saleor.dashboard.order.tasks.create_pdf_task.apply_async")
+def test_schedule_pdf_creation_once(mocked_task):
+    schedule_pdf_creation("pdf/invoice-1-version.pdf", "<html></html>", "/static/")
+    schedule_pdf_creation("pdf/invoice-1-version.pdf", "<html></html>", "/static/")
+
+    mocked_task.assert_called_once_with(
+        ("pdf/invoice-1-version.pdf", "<html></html>", "/static/"), countdown=None
+    )
+
+
+@patch("saleor.dashboard.order.utils._create_pdf", return_value=b"%PDF-slip")
+def test_create_packing_slips_archive(
+    mocked_create_pdf, fulfilled_order, private_media_root
+):
+    fulfillment = fulfilled_order.fulfillments.get()
+    path = get_packing_slips_archive_path("job")
+
+    create_packing_slips_archive(path, [fulfillment.pk], "/static/", processes=1)
+
+    with get_private_storage().open(path) as archive_file:
+        archive = zipfile.ZipFile(archive_file)
+        name = "packing-slip-%s-%s.pdf" % (fulfilled_order.pk, fulfillment.pk)
+        assert archive.namelist() == [name]
+        assert archive.read(name) == b"%PDF-slip"
+
+
+def test_delete_old_pdfs(private_media_root):
+    storage = get_private_storage()
+    old_path = storage.save("pdf/invoice-1-old.pdf", ContentFile(b"%PDF-old"))
+    new_path = storage.save("pdf/invoice-1-new.pdf", ContentFile(b"%PDF-new"))
+    created = (timezone.now() - timedelta(days=2)).timestamp()
+    os.utime(storage.path(old_path), (created, created))
+
+    deleted = delete_old_pdfs(timedelta(days=1))
+
+    assert deleted == 1
+    assert not storage.exists(old_path)
+    assert storage.exists(new_path)
+
+
+def test_delete_old_pdfs_without_stored_pdfs(private_media_root):
+    assert delete_old_pdfs(timedelta(days=1)) == 0
+
+
+@patch("saleor.dashboard.order.utils._create_pdf", return_value=b"%PDF-slip")
+def test_view_fulfillments_packing_slips_bulk(
+    mocked_create_pdf, admin_client, fulfilled_order, private_media_root, settings
+):
+    settings.PDF_RENDERING_PROCESSES = 1
+    fulfillment = fulfilled_order.fulfillments.get()
+    url = reverse("dashboard:fulfillments-packing-slips-bulk")
+
+    response = admin_client.post(url, {"fulfillments": [fulfillment.pk]})
+    archive_response = admin_client.get(get_redirect_location(response))
+
+    assert archive_response.status_code == 200
+    assert archive_response["content-type"] == "application/zip"
+    content = BytesIO(b"".join(archive_response.streaming_content))
+    assert len(zipfile.ZipFile(content).namelist()) == 1
+
+
+@patch("saleor.dashboard.order.views.schedule_packing_slips_archive_creation")
+def test_view_fulfillments_packing_slips_bulk_by_orders(
+    mocked_schedule, admin_client, fulfilled_order, order_with_lines
+):
+    fulfillment = fulfilled_order.fulfillments.get()
+    url = reverse("dashboard:fulfillments-packing-slips-bulk")
+    data = {"orders": [fulfilled_order.pk, order_with_lines.pk]}
+
+    admin_client.post(url, data)
+
+    mocked_schedule.assert_called_once()
+    _, fulfillment_pks, _ = mocked_schedule.call_args[0]
+    assert fulfillment_pks == [fulfillment.pk]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [{}, {"fulfillments": ["not-an-id"]}, {"fulfillments": ["0"]}, {"orders": ["x"]}],
+)
+@patch("saleor.dashboard.order.views.schedule_packing_slips_archive_creation")
+def test_view_fulfillments_packing_slips_bulk_invalid_selection(
+    mocked_schedule, admin_client, data
+):
+    url = reverse("dashboard:fulfillments-packing-slips-bulk")
+
+    response = admin_client.post(url, data)
+
+    assert get_redirect_location(response) == reverse("dashboard:orders")
+    mocked_schedule.assert_not_called()
+
+
+def test_view_fulfillments_packing_slips_archive_pending(
+    admin_client, private_media_root
+):
+    job_id = "a" * 32
+    with patch("saleor.dashboard.order.tasks.create_packing_slips_archive_task.delay"):
+        schedule_packing_slips_archive_creation(job_id, [], "/static/")
+    url = reverse(
+        "dashboard:fulfillments-packing-slips-archive", kwargs={"job_id": job_id}
+    )
+
+    response = admin_client.get(url)
+
+    assert response.status_code == 202
+    assert response.templates[0].name == "dashboard/order/pdf/pending.html"
+
+
+@patch(
+    "saleor.dashboard.order.tasks.create_packing_slips_archive",
+    side_effect=OSError("Disk full"),
+)
+def test_view_fulfillments_packing_slips_archive_failed(
+    mocked_create_archive, admin_client, private_media_root
+):
+    job_id = "a" * 32
+    schedule_packing_slips_archive_creation(job_id, [], "/static/")
+    url = reverse(
+        "dashboard:fulfillments-packing-slips-archive", kwargs={"job_id": job_id}
+    )
+
+    response = admin_client.get(url)
+
+    assert get_packing_slips_archive_status(job_id) == ArchiveJobStatus.FAILED
+    assert response.status_code == 500
+    assert response.templates[0].name == "dashboard/order/pdf/failed.html"
+
+
+def test_view_fulfillments_packing_slips_archive_unknown_job(
+    admin_client, private_media_root
+):
+    url = reverse(
+        "dashboard:fulfillments-packing-slips-archive", kwargs={"job_id": "b" * 32}
+    )
+
+    response = admin_client.get(url)
+
+    assert response.status_code == 500
+
+
+@patch(
+    "saleor.dashboard.order.tasks.create_packing_slips_archive",
+    side_effect=OSError("Disk full"),
+)
+def test_create_packing_slips_archive_task_records_failure(mocked_create_archive):
+    with pytest.raises(OSError):
+        create_packing_slips_archive_task("c" * 32, [], "/static/")
+
+    assert get_packing_slips_archive_status("c" * 32) == ArchiveJobStatus.FAILED
+
+
+def test_view_order_list_with_packing_slips_bulk_action(admin_client, order):
+    response = admin_client.get(reverse("dashboard:orders"))
+
+    bulk_url = reverse("dashboard:fulfillments-packing-slips-bulk")
+    assert bulk_url.encode() in response.content
+    assert b'name="orders"' in response.content
+
+
 def test_view_add_variant_to_order(admin_client, order_with_lines, admin_user):
     order_with_lines.status = OrderStatus.DRAFT
     order_with_lines.save()
@@ -1,6 +1,10 @@
-from unittest.mock import Mock
+import copy
+from decimal import Decimal
+from unittest.mock import Mock, patch
 
 import pytest
+import requests
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from prices import Money, TaxedMoney
 
@@ -9,12 +13,34 @@ from saleor.core.taxes import TaxError, quantize_price
 from saleor.extensions.manager import get_extensions_manager
 from saleor.extensions.models import PluginConfiguration
 from saleor.extensions.plugins.avatax import (
+    CIRCUIT_BREAKER_FAILURES_CACHE_KEY,
+    CIRCUIT_BREAKER_OPEN_CACHE_KEY,
+    CIRCUIT_BREAKER_THRESHOLD,
     AvataxConfiguration,
-    checkout_needs_new_fetch,
+    AvataxUnavailableError,
+    TransactionType,
+    api_post_request,
+    cache_tax_rates,
     generate_request_data_from_checkout,
     get_cached_tax_codes_or_fetch,
+    get_checkout_tax_data,
+    get_data_fingerprint,
+    get_response_from_cached_rates,
+    get_session,
+    is_circuit_open,
+    taxes_need_new_fetch,
 )
 from saleor.extensions.plugins.avatax.plugin import AvataxPlugin
+from saleor.extensions.plugins.avatax.tasks import api_post_request_task
+
+
+@pytest.fixture(autouse=True)
+def reset_avatax_client():
+    # Connections kept alive between tests would bypass the cassettes
+    get_session.cache_clear()
+    cache.delete_many(
+        [CIRCUIT_BREAKER_FAILURES_CACHE_KEY, CIRCUIT_BREAKER_OPEN_CACHE_KEY]
+    )
 
 
 @pytest.fixture
@@ -354,14 +380,153 @@ def test_get_cached_tax_codes_or_fetch_wrong_response(monkeypatch):
     assert len(tax_codes) == 0
 
 
-def test_checkout_needs_new_fetch(monkeypatch, checkout_with_item, address):
+def test_taxes_need_new_fetch(monkeypatch, checkout_with_item, address):
     monkeypatch.setattr("saleor.extensions.plugins.avatax.cache.get", lambda x: None)
     checkout_with_item.shipping_address = address
     config = AvataxConfiguration(
         username_or_account="wrong_data", password_or_license="wrong_data"
     )
     checkout_data = generate_request_data_from_checkout(checkout_with_item, config)
-    assert checkout_needs_new_fetch(checkout_data, str(checkout_with_item.token))
+    assert taxes_need_new_fetch(checkout_data)
+
+
+@pytest.fixture
+def avatax_config():
+    return AvataxConfiguration(username_or_account="test", password_or_license="test")
+
+
+@pytest.fixture
+def checkout_tax_data(checkout_with_item, address, shipping_method, avatax_config):
+    checkout_with_item.shipping_address = address
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    return generate_request_data_from_checkout(checkout_with_item, avatax_config)
+
+
+def test_get_data_fingerprint_ignores_codes_of_sales_orders(checkout_tax_data):
+    other_checkout_data = copy.deepcopy(checkout_tax_data)
+    other_checkout_data["createTransactionModel"]["code"] = "other-token"
+    assert get_data_fingerprint(checkout_tax_data) == get_data_fingerprint(
+        other_checkout_data
+    )
+
+    for data in checkout_tax_data, other_checkout_data:
+        data["createTransactionModel"]["type"] = TransactionType.INVOICE
+    assert get_data_fingerprint(checkout_tax_data) != get_data_fingerprint(
+        other_checkout_data
+    )
+
+
+@patch("saleor.extensions.plugins.avatax.requests.Session.request")
+def test_circuit_breaker_opens_after_failures(mocked_request, avatax_config):
+    mocked_request.side_effect = requests.exceptions.Timeout()
+
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+        assert api_post_request("https://example.com", {}, avatax_config) == {}
+
+    assert is_circuit_open()
+    mocked_request.reset_mock()
+    assert api_post_request("https://example.com", {}, avatax_config) == {}
+    mocked_request.assert_not_called()
+
+
+@patch("saleor.extensions.plugins.avatax.requests.Session.request")
+def test_circuit_breaker_counts_failures_in_a_row(mocked_request, avatax_config):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"{}"
+    mocked_request.side_effect = [requests.exceptions.Timeout(), response] * (
+        CIRCUIT_BREAKER_THRESHOLD
+    )
+
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD * 2):
+        api_post_request("https://example.com", {}, avatax_config)
+
+    assert not is_circuit_open()
+
+
+@patch("saleor.extensions.plugins.avatax.requests.Session.request")
+def test_api_post_request_raise_unavailable_ignores_circuit_breaker(
+    mocked_request, avatax_config
+):
+    cache.set(CIRCUIT_BREAKER_OPEN_CACHE_KEY, True)
+    mocked_request.side_effect = requests.exceptions.Timeout()
+
+    with pytest.raises(AvataxUnavailableError):
+        api_post_request(
+            "https://example.com", {}, avatax_config, raise_unavailable=True
+        )
+
+    mocked_request.assert_called_once()
+
+
+@patch("saleor.extensions.plugins.avatax.requests.Session.request")
+def test_api_post_request_raise_unavailable_on_server_error(
+    mocked_request, avatax_config
+):
+    response = requests.Response()
+    response.status_code = 503
+    response._content = b"{}"
+    mocked_request.return_value = response
+
+    with pytest.raises(AvataxUnavailableError):
+        api_post_request(
+            "https://example.com", {}, avatax_config, raise_unavailable=True
+        )
+
+
+def test_get_response_from_cached_rates(checkout_tax_data):
+    transaction = checkout_tax_data["createTransactionModel"]
+    for line in transaction["lines"]:
+        line["taxIncluded"] = False
+    response = {
+        "lines": [
+            {"taxCode": line["taxCode"], "lineAmount": 10.0, "tax": 2.3}
+            for line in transaction["lines"]
+        ]
+    }
+    cache_tax_rates(checkout_tax_data, response)
+
+    estimated_response = get_response_from_cached_rates(checkout_tax_data)
+
+    for line, estimated_line in zip(transaction["lines"], estimated_response["lines"]):
+        assert Decimal(estimated_line["lineAmount"]) == Decimal(line["amount"])
+        assert Decimal(estimated_line["tax"]) == Decimal(line["amount"]) * Decimal(
+            "0.23"
+        )
+
+
+def test_get_response_from_cached_rates_unknown_rate(checkout_tax_data):
+    transaction = checkout_tax_data["createTransactionModel"]
+    transaction["addresses"]["shipTo"]["postalCode"] = "00-000"
+
+    assert get_response_from_cached_rates(checkout_tax_data) == {}
+
+
+@patch("saleor.extensions.plugins.avatax.get_cached_response_or_fetch")
+def test_get_checkout_tax_data_memoized(
+    mocked_fetch, checkout_with_item, checkout_tax_data, avatax_config
+):
+    mocked_fetch.return_value = {"totalTax": 1.0}
+
+    for _ in range(3):
+        response = get_checkout_tax_data(checkout_with_item, None, avatax_config)
+
+    assert response == {"totalTax": 1.0}
+    mocked_fetch.assert_called_once()
+
+
+@patch("saleor.extensions.plugins.avatax.get_response_from_cached_rates")
+@patch("saleor.extensions.plugins.avatax.get_cached_response_or_fetch")
+def test_get_checkout_tax_data_estimated_when_avatax_unavailable(
+    mocked_fetch, mocked_estimate, checkout_with_item, checkout_tax_data, avatax_config,
+):
+    mocked_fetch.return_value = {}
+
+    response = get_checkout_tax_data(checkout_with_item, None, avatax_config)
+
+    assert response == mocked_estimate.return_value
+    mocked_estimate.assert_called_once()
 
 
 def test_get_plugin_configuration(settings):
@@ -443,7 +608,24 @@ def test_order_created(settings, order, monkeypatch):
 
     manager.order_created(order)
 
-    assert mocked_task.called
+    # Credentials are not sent to the broker
+    args, kwargs = mocked_task.call_args
+    assert len(args) == 2
+    assert not kwargs
+
+
+@patch("saleor.extensions.plugins.avatax.tasks.api_post_request")
+def test_api_post_request_task_uses_plugin_configuration(
+    mocked_api_post_request, settings, plugin_configuration
+):
+    settings.PLUGINS = ["saleor.extensions.plugins.avatax.plugin.AvataxPlugin"]
+
+    api_post_request_task("https://example.com", {})
+
+    (_url, _data, config), kwargs = mocked_api_post_request.call_args
+    assert config.username_or_account == "2000134479"
+    assert config.password_or_license == "697932CFCBDE505B"
+    assert kwargs == {"raise_unavailable": True}
 
 
 @pytest.mark.vcr
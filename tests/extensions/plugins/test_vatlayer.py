@@ -68,6 +68,19 @@ def test_get_tax_rate_by_name_empty_taxes(product):
     assert tax_rate == 0
 
 
+def test_saving_tax_rates_drops_cached_taxes(vatlayer, tax_rates):
+    manager = get_extensions_manager()
+    plugin = manager.plugins[0]
+    plugin._get_taxes_for_country(Country("PL"))
+    assert "PL" in plugin._cached_taxes
+
+    VAT.objects.filter(country_code="PL").get().save()
+
+    new_manager = get_extensions_manager()
+    assert new_manager is not manager
+    assert not new_manager.plugins[0]._cached_taxes
+
+
 def test_view_checkout_with_taxes(
     settings, client, request_checkout_with_item, vatlayer, address
 ):
@@ -1,24 +1,48 @@
+from datetime import timedelta
 from unittest import mock
 
 import pytest
 import requests
+from django.core.cache import cache
 from django.core.serializers import serialize
+from django.utils import timezone
 
 from saleor.account.models import ServiceAccount
 from saleor.extensions.manager import get_extensions_manager
-from saleor.extensions.plugins.webhook import create_hmac_signature
-from saleor.extensions.plugins.webhook.tasks import trigger_webhooks_for_event
-from saleor.webhook import WebhookEventType
-from saleor.webhook.payloads import (
-    generate_customer_payload,
-    generate_order_payload,
-    generate_product_payload,
+from saleor.extensions.plugins.webhook import create_hmac_signature, delivery
+from saleor.extensions.plugins.webhook.delivery import (
+    acquire_concurrency_slot,
+    claim_due_deliveries,
+    deliver_pending_payloads,
+    enqueue_deliveries,
+    get_retry_delay,
+    get_session,
+    get_target_origin,
+    requeue_dead_deliveries,
 )
+from saleor.extensions.plugins.webhook.tasks import (
+    deliver_webhook_payloads,
+    retry_webhook_deliveries_task,
+    trigger_webhooks_for_event,
+    trigger_webhooks_for_object,
+)
+from saleor.webhook import WebhookDeliveryStatus, WebhookEventType
+from saleor.webhook.models import WebhookDelivery, WebhookPayload
+from saleor.webhook.payloads import generate_event_payload, generate_order_payload
+from saleor.webhook.subscriptions import is_event_subscribed
+
+
+@pytest.fixture(autouse=True)
+def clear_webhook_sessions():
+    # Connections kept alive between tests would bypass the cassettes
+    delivery._sessions.clear()
 
 
 @pytest.mark.vcr
 @mock.patch(
-    "saleor.extensions.plugins.webhook.tasks.requests.post", wraps=requests.post
+    "saleor.extensions.plugins.webhook.delivery.requests.Session.post",
+    autospec=True,
+    side_effect=requests.Session.post,
 )
 def test_trigger_webhooks_for_event(
     mock_request,
@@ -42,7 +66,11 @@ def test_trigger_webhooks_for_event(
     }
 
     mock_request.assert_called_once_with(
-        webhook.target_url, data=expected_data, headers=expected_headers, timeout=10
+        mock.ANY,
+        webhook.target_url,
+        data=expected_data,
+        headers=expected_headers,
+        timeout=10,
     )
 
 
@@ -62,9 +90,11 @@ third_url = "http://www.example.com/third/"
         (WebhookEventType.CUSTOMER_CREATED, 0, set()),
     ],
 )
-@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch(
+    "saleor.extensions.plugins.webhook.tasks.deliver_webhook_payloads.apply_async"
+)
 def test_trigger_webhooks_for_event_calls_expected_events(
-    mock_request,
+    mock_deliver,
     event_name,
     total_webhook_calls,
     expected_target_urls,
@@ -102,15 +132,18 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     third_webhook.events.create(event_type=WebhookEventType.ANY)
 
     trigger_webhooks_for_event(event_name, data="")
-    assert mock_request.call_count == total_webhook_calls
+    assert mock_deliver.call_count == total_webhook_calls
 
-    target_url_calls = {call[0][1] for call in mock_request.call_args_list}
-    assert target_url_calls == expected_target_urls
+    deliveries = WebhookDelivery.objects.filter(payload__event_type=event_name)
+    target_urls = {delivery.webhook.target_url for delivery in deliveries}
+    assert target_urls == expected_target_urls
 
 
 @pytest.mark.vcr
 @mock.patch(
-    "saleor.extensions.plugins.webhook.tasks.requests.post", wraps=requests.post
+    "saleor.extensions.plugins.webhook.delivery.requests.Session.post",
+    autospec=True,
+    side_effect=requests.Session.post,
 )
 def test_trigger_webhooks_for_event_with_secret_key(
     mock_request, webhook, order_with_lines, permission_manage_orders
@@ -133,77 +166,398 @@ def test_trigger_webhooks_for_event_with_secret_key(
     }
 
     mock_request.assert_called_once_with(
-        webhook.target_url, data=expected_data, headers=expected_headers, timeout=10
+        mock.ANY,
+        webhook.target_url,
+        data=expected_data,
+        headers=expected_headers,
+        timeout=10,
+    )
+
+
+@pytest.fixture
+def on_commit(mocker):
+    return mocker.patch(
+        "saleor.extensions.plugins.webhook.plugin.transaction.on_commit",
+        side_effect=lambda callback: callback(),
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_order_created(
+    mocked_webhook_trigger, settings, webhook, on_commit, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.ORDER_CREATED)
     manager = get_extensions_manager()
     manager.order_created(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CREATED, expected_data
+        WebhookEventType.ORDER_CREATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_customer_created(
+    mocked_webhook_trigger, settings, webhook, on_commit, customer_user
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.CUSTOMER_CREATED)
     manager = get_extensions_manager()
     manager.customer_created(customer_user)
 
-    expected_data = generate_customer_payload(customer_user)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.CUSTOMER_CREATED, expected_data
+        WebhookEventType.CUSTOMER_CREATED, customer_user.pk
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_order_fully_paid(
+    mocked_webhook_trigger, settings, webhook, on_commit, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.ORDER_FULLY_PAID)
     manager = get_extensions_manager()
     manager.order_fully_paid(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_FULLY_PAID, expected_data
+        WebhookEventType.ORDER_FULLY_PAID, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_product_created(mocked_webhook_trigger, settings, webhook, on_commit, product):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.PRODUCT_CREATED)
     manager = get_extensions_manager()
     manager.product_created(product)
 
-    expected_data = generate_product_payload(product)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.PRODUCT_CREATED, expected_data
+        WebhookEventType.PRODUCT_CREATED, product.pk
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_order_updated(
+    mocked_webhook_trigger, settings, webhook, on_commit, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.ORDER_UPDATED)
     manager = get_extensions_manager()
     manager.order_updated(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_UPDATED, expected_data
+        WebhookEventType.ORDER_UPDATED, order_with_lines.pk
     )
 
 
-@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_order_cancelled(
+    mocked_webhook_trigger, settings, webhook, on_commit, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    webhook.events.create(event_type=WebhookEventType.ORDER_CANCELLED)
     manager = get_extensions_manager()
     manager.order_cancelled(order_with_lines)
 
-    expected_data = generate_order_payload(order_with_lines)
     mocked_webhook_trigger.assert_called_once_with(
-        WebhookEventType.ORDER_CANCELLED, expected_data
+        WebhookEventType.ORDER_CANCELLED, order_with_lines.pk
     )
+
+
+@mock.patch(
+    "saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_object.delay"
+)
+def test_event_without_subscribers(
+    mocked_webhook_trigger, settings, webhook, on_commit, product
+):
+    settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_extensions_manager()
+    manager.product_created(product)
+
+    mocked_webhook_trigger.assert_not_called()
+
+
+def test_is_event_subscribed(webhook):
+    assert is_event_subscribed(WebhookEventType.ORDER_CREATED)
+    assert not is_event_subscribed(WebhookEventType.PRODUCT_CREATED)
+
+    webhook.events.create(event_type=WebhookEventType.ANY)
+
+    assert is_event_subscribed(WebhookEventType.PRODUCT_CREATED)
+
+    webhook.is_active = False
+    webhook.save()
+
+    assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+
+@mock.patch(
+    "saleor.extensions.plugins.webhook.tasks.deliver_webhook_payloads.apply_async"
+)
+def test_trigger_webhooks_for_object(
+    mock_deliver, webhook, order_with_lines, permission_manage_orders
+):
+    webhook.service_account.permissions.add(permission_manage_orders)
+
+    trigger_webhooks_for_object(WebhookEventType.ORDER_CREATED, order_with_lines.pk)
+
+    webhook_delivery = webhook.deliveries.get()
+    assert webhook_delivery.payload.payload == generate_order_payload(order_with_lines)
+    mock_deliver.assert_called_once_with((webhook.pk,), countdown=None)
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.generate_event_payload")
+def test_trigger_webhooks_for_object_without_webhooks(
+    mock_generate_payload, webhook, order_with_lines
+):
+    # The service account lacks the permission to receive orders
+    trigger_webhooks_for_object(WebhookEventType.ORDER_CREATED, order_with_lines.pk)
+
+    mock_generate_payload.assert_not_called()
+    assert not webhook.deliveries.exists()
+
+
+def test_generate_event_payload_of_deleted_object(product):
+    product_id = product.pk
+    product.delete()
+
+    assert generate_event_payload(WebhookEventType.PRODUCT_CREATED, product_id) is None
+
+
+@pytest.fixture
+def webhook_session(mocker):
+    session = mocker.Mock(spec=requests.Session)
+    mocker.patch(
+        "saleor.extensions.plugins.webhook.delivery.get_session", return_value=session
+    )
+    return session
+
+
+def get_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
+def test_deliver_pending_payloads(webhook, webhook_session):
+    webhook_session.post.return_value = get_response(200)
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "first")
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "second")
+
+    stats = deliver_pending_payloads(webhook, 10)
+
+    assert stats == {"delivered": 2, "failed": 0, "dead": 0, "left": 0}
+    sent_data = [call[1]["data"] for call in webhook_session.post.call_args_list]
+    assert sent_data == ["first", "second"]
+    for webhook_delivery in webhook.deliveries.all():
+        assert webhook_delivery.status == WebhookDeliveryStatus.SUCCESS
+        assert webhook_delivery.attempt_count == 1
+        attempt = webhook_delivery.attempts.get()
+        assert attempt.response_status_code == 200
+        assert attempt.error == ""
+        assert attempt.duration >= timedelta(0)
+
+
+def test_deliver_pending_payloads_failed(webhook, webhook_session):
+    webhook_session.post.return_value = get_response(500)
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "first")
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "second")
+
+    stats = deliver_pending_payloads(webhook, 10)
+
+    # The rest of the batch is not sent to a failing target
+    assert stats == {"delivered": 0, "failed": 1, "dead": 0, "left": 1}
+    assert webhook_session.post.call_count == 1
+    failed, left = webhook.deliveries.all()
+    assert failed.status == WebhookDeliveryStatus.PENDING
+    assert failed.attempt_count == 1
+    assert failed.next_attempt > timezone.now()
+    attempt = failed.attempts.get()
+    assert attempt.response_status_code == 500
+    assert attempt.error
+    assert left.attempt_count == 0
+    assert not left.attempts.exists()
+    # The delivery left unsent waits for the retry of the failed one
+    assert left.next_attempt == failed.next_attempt
+
+
+def test_deliver_pending_payloads_failed_delays_unclaimed_deliveries(
+    webhook, webhook_session
+):
+    webhook_session.post.return_value = get_response(500)
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "first")
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "second")
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "third")
+
+    deliver_pending_payloads(webhook, 1)
+
+    # Payloads outside of the batch are not sent before the failed one either
+    failed, *waiting = webhook.deliveries.all()
+    assert [delivery.next_attempt for delivery in waiting] == [failed.next_attempt] * 2
+    assert not claim_due_deliveries(webhook, 10)
+
+
+def test_deliver_pending_payloads_time_limit_releases_deliveries(
+    webhook, webhook_session, mocker
+):
+    webhook_session.post.return_value = get_response(200)
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "first")
+    mocker.patch("saleor.extensions.plugins.webhook.delivery.DELIVERY_TIME_LIMIT", -1)
+
+    stats = deliver_pending_payloads(webhook, 10)
+
+    # The lease of the delivery left unsent is released
+    assert stats["left"] == 1
+    assert webhook.deliveries.get().next_attempt <= timezone.now()
+
+
+def test_deliver_pending_payloads_connection_error(webhook, webhook_session):
+    webhook_session.post.side_effect = requests.ConnectionError("Refused")
+    (webhook_delivery,) = enqueue_deliveries(
+        [webhook.pk], WebhookEventType.ORDER_CREATED, "{}"
+    )
+
+    deliver_pending_payloads(webhook, 10)
+
+    attempt = webhook_delivery.attempts.get()
+    assert attempt.response_status_code is None
+    assert attempt.error == "Refused"
+
+
+def test_deliver_pending_payloads_dead_after_max_attempts(
+    webhook, webhook_session, settings
+):
+    settings.WEBHOOK_MAX_ATTEMPTS = 2
+    webhook_session.post.return_value = get_response(500)
+    (webhook_delivery,) = enqueue_deliveries(
+        [webhook.pk], WebhookEventType.ORDER_CREATED, "{}"
+    )
+    WebhookDelivery.objects.update(attempt_count=1)
+
+    stats = deliver_pending_payloads(webhook, 10)
+
+    assert stats["dead"] == 1
+    webhook_delivery.refresh_from_db()
+    assert webhook_delivery.status == WebhookDeliveryStatus.DEAD
+    assert webhook_delivery.attempt_count == 2
+
+
+def test_deliver_pending_payloads_skips_deliveries_not_due(webhook, webhook_session):
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "{}")
+    WebhookDelivery.objects.update(next_attempt=timezone.now() + timedelta(minutes=1))
+
+    stats = deliver_pending_payloads(webhook, 10)
+
+    assert stats == {"delivered": 0, "failed": 0, "dead": 0, "left": 0}
+    webhook_session.post.assert_not_called()
+
+
+def test_claim_due_deliveries(webhook):
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "{}")
+
+    (claimed,) = claim_due_deliveries(webhook, 10)
+
+    # Claimed deliveries are not due until the lease expires
+    assert not claim_due_deliveries(webhook, 10)
+    claimed.refresh_from_db()
+    assert claimed.next_attempt > timezone.now()
+    assert claimed.status == WebhookDeliveryStatus.PENDING
+
+
+def test_deliver_pending_payloads_leases_deliveries_while_sending(
+    webhook, webhook_session
+):
+    def post(*args, **kwargs):
+        # Other workers do not send the delivery meanwhile
+        assert WebhookDelivery.objects.get().next_attempt > timezone.now()
+        return get_response(200)
+
+    webhook_session.post.side_effect = post
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "{}")
+
+    stats = deliver_pending_payloads(webhook, 10)
+
+    assert stats["delivered"] == 1
+
+
+@pytest.mark.parametrize(
+    "attempt_count, delay", [(1, 60), (2, 120), (4, 480), (5, 600), (15, 600)]
+)
+def test_get_retry_delay(attempt_count, delay):
+    assert get_retry_delay(attempt_count) == timedelta(seconds=delay)
+
+
+def test_get_session_reused_for_origin():
+    session = get_session("https://example.com")
+
+    assert get_session("https://example.com") is session
+    assert get_session("https://example.org") is not session
+
+
+@mock.patch(
+    "saleor.extensions.plugins.webhook.tasks.deliver_webhook_payloads.apply_async"
+)
+def test_deliver_webhook_payloads_waits_for_concurrency_slot(
+    mock_deliver, webhook, webhook_session, settings
+):
+    settings.WEBHOOK_TARGET_CONCURRENCY = 1
+    enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "{}")
+    slot = acquire_concurrency_slot(get_target_origin(webhook.target_url))
+
+    try:
+        deliver_webhook_payloads(webhook.pk)
+    finally:
+        cache.delete(slot)
+
+    webhook_session.post.assert_not_called()
+    mock_deliver.assert_called_once_with((webhook.pk,), countdown=5)
+
+
+@mock.patch(
+    "saleor.extensions.plugins.webhook.tasks.deliver_webhook_payloads.apply_async"
+)
+def test_retry_webhook_deliveries_task(mock_deliver, webhook):
+    due, delivered, dead = [
+        enqueue_deliveries([webhook.pk], WebhookEventType.ORDER_CREATED, "{}")[0]
+        for _ in range(3)
+    ]
+    old_date = timezone.now() - timedelta(days=30)
+    WebhookDelivery.objects.filter(pk=delivered.pk).update(
+        status=WebhookDeliveryStatus.SUCCESS, created=old_date
+    )
+    WebhookDelivery.objects.filter(pk=dead.pk).update(
+        status=WebhookDeliveryStatus.DEAD, created=old_date
+    )
+    WebhookPayload.objects.filter(pk=delivered.payload_id).update(created=old_date)
+
+    retry_webhook_deliveries_task()
+
+    mock_deliver.assert_called_once_with((webhook.pk,), countdown=None)
+    assert set(webhook.deliveries.all()) == {due, dead}
+    assert not WebhookPayload.objects.filter(pk=delivered.payload_id).exists()
+
+
+def test_requeue_dead_deliveries(webhook):
+    (webhook_delivery,) = enqueue_deliveries(
+        [webhook.pk], WebhookEventType.ORDER_CREATED, "{}"
+    )
+    WebhookDelivery.objects.update(status=WebhookDeliveryStatus.DEAD, attempt_count=16)
+
+    webhook_ids = requeue_dead_deliveries(WebhookDelivery.objects.all())
+
+    assert webhook_ids == [webhook.pk]
+    webhook_delivery.refresh_from_db()
+    assert webhook_delivery.status == WebhookDeliveryStatus.PENDING
+    assert webhook_delivery.attempt_count == 0
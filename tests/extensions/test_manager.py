@@ -23,6 +23,36 @@ def test_get_extensions_manager():
     assert len(manager.plugins) == 1
 
 
+def test_get_extensions_manager_is_cached():
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = get_extensions_manager(plugins=plugins)
+    assert get_extensions_manager(plugins=plugins) is manager
+    assert get_extensions_manager(plugins=[]) is not manager
+
+
+def test_get_extensions_manager_invalidated_on_configuration_save(
+    plugin_configuration,
+):
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = get_extensions_manager(plugins=plugins)
+    assert manager.get_plugin_configuration("PluginSample").active
+
+    manager.save_plugin_configuration("PluginSample", {"active": False})
+
+    new_manager = get_extensions_manager(plugins=plugins)
+    assert new_manager is not manager
+    assert not new_manager.get_plugin_configuration("PluginSample").active
+
+
+def test_manager_caches_plugin_configuration(plugin_configuration, assert_num_queries):
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = ExtensionsManager(plugins=plugins)
+    manager.get_plugin_configuration("PluginSample")
+    with assert_num_queries(0):
+        manager.get_plugin_configuration("PluginSample")
+        manager.get_active_plugins()
+
+
 @pytest.mark.parametrize(
     "plugins, total_amount",
     [(["tests.extensions.sample_plugins.PluginSample"], "1.0"), ([], "15.0")],
@@ -54,6 +54,7 @@ if "sqlite" in DATABASES["default"]["ENGINE"]:  # noqa
 COUNTRIES_ONLY = None
 
 MEDIA_ROOT = None
+PRIVATE_MEDIA_ROOT = None
 MAX_CHECKOUT_LINE_QUANTITY = 50
 
 USE_JSON_CONTENT = False
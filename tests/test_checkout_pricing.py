@@ -0,0 +1,162 @@
+from unittest.mock import Mock
+
+from django.test import RequestFactory
+from prices import Money, TaxedMoney
+
+from saleor.checkout.models import Checkout, CheckoutLine
+from saleor.checkout.pricing import (
+    CheckoutPricing,
+    get_checkout_line_total,
+    get_checkout_pricing,
+)
+from saleor.core.taxes import zero_taxed_money
+from saleor.extensions.manager import ExtensionsManager, get_extensions_manager
+
+PLUGIN_SAMPLE = "tests.extensions.sample_plugins.PluginSample"
+
+
+def _get_request():
+    request = RequestFactory().get("/")
+    request.discounts = []
+    return request
+
+
+def test_checkout_pricing(checkout_with_item, shipping_method):
+    checkout = checkout_with_item
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    manager = get_extensions_manager()
+    line = checkout.lines.get()
+
+    pricing = CheckoutPricing(checkout, [])
+
+    assert pricing.lines == [line]
+    assert pricing.get_line_total(line) == manager.calculate_checkout_line_total(
+        line, []
+    )
+    assert pricing.subtotal == manager.calculate_checkout_subtotal(checkout, [])
+    assert pricing.shipping_price == manager.calculate_checkout_shipping(checkout, [])
+    assert pricing.total == manager.calculate_checkout_total(checkout, [])
+    assert pricing.total_price == pricing.total
+    assert pricing.discount == checkout.discount
+
+
+def test_checkout_pricing_fetches_lines_once(
+    checkout_with_item, discount_info, django_assert_num_queries
+):
+    pricing = CheckoutPricing(checkout_with_item, [discount_info])
+
+    with django_assert_num_queries(0):
+        for line in pricing.lines:
+            pricing.get_line_total(line)
+        pricing.subtotal
+
+
+def test_checkout_pricing_calculates_prices_once(checkout_with_item, monkeypatch):
+    subtotal = TaxedMoney(net=Money(10, "USD"), gross=Money(12, "USD"))
+    calculate_subtotal = Mock(return_value=subtotal)
+    monkeypatch.setattr(
+        ExtensionsManager, "calculate_checkout_subtotal", calculate_subtotal
+    )
+    manager = ExtensionsManager(plugins=[PLUGIN_SAMPLE])
+
+    pricing = CheckoutPricing(checkout_with_item, [], manager)
+
+    assert pricing.subtotal == subtotal
+    assert pricing.subtotal == subtotal
+    calculate_subtotal.assert_called_once()
+
+
+def test_checkout_pricing_without_plugins_sums_line_totals(
+    checkout_with_item, shipping_method, monkeypatch
+):
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    manager = get_extensions_manager()
+    subtotal = manager.calculate_checkout_subtotal(checkout_with_item, [])
+    total = manager.calculate_checkout_total(checkout_with_item, [])
+    calculate_line_total = Mock(wraps=manager.calculate_checkout_line_total)
+    monkeypatch.setattr(manager, "calculate_checkout_line_total", calculate_line_total)
+    monkeypatch.setattr(manager, "calculate_checkout_subtotal", Mock())
+    monkeypatch.setattr(manager, "calculate_checkout_total", Mock())
+
+    pricing = CheckoutPricing(checkout_with_item, [], manager)
+
+    assert pricing.subtotal == subtotal
+    assert pricing.total == total
+    assert calculate_line_total.call_count == len(pricing.lines)
+    manager.calculate_checkout_subtotal.assert_not_called()
+    manager.calculate_checkout_total.assert_not_called()
+
+
+def test_checkout_pricing_with_plugins(checkout_with_item, shipping_method):
+    checkout_with_item.shipping_method = shipping_method
+    checkout_with_item.save()
+    manager = ExtensionsManager(plugins=[PLUGIN_SAMPLE])
+
+    pricing = CheckoutPricing(checkout_with_item, [], manager)
+
+    assert pricing.subtotal == manager.calculate_checkout_subtotal(
+        checkout_with_item, []
+    )
+    assert pricing.total == manager.calculate_checkout_total(checkout_with_item, [])
+
+
+def test_checkout_pricing_total_price_with_gift_card(checkout_with_gift_card):
+    pricing = CheckoutPricing(checkout_with_gift_card, [])
+    balance = checkout_with_gift_card.get_total_gift_cards_balance()
+
+    assert pricing.total_price == pricing.total - balance
+
+
+def test_checkout_pricing_total_price_not_below_zero(
+    checkout_with_gift_card, gift_card
+):
+    gift_card.current_balance = Money(1000, "USD")
+    gift_card.save()
+
+    pricing = CheckoutPricing(checkout_with_gift_card, [])
+
+    assert pricing.total_price == zero_taxed_money()
+
+
+def test_get_checkout_pricing_reused_for_same_checkout(checkout_with_item):
+    request = _get_request()
+
+    pricing = get_checkout_pricing(request, checkout_with_item)
+
+    assert get_checkout_pricing(request, checkout_with_item) is pricing
+
+
+def test_get_checkout_pricing_for_checkout_fetched_again(checkout_with_item):
+    request = _get_request()
+    pricing = get_checkout_pricing(request, checkout_with_item)
+    checkout = Checkout.objects.get(pk=checkout_with_item.pk)
+
+    new_pricing = get_checkout_pricing(request, checkout)
+
+    assert new_pricing is not pricing
+    assert new_pricing.checkout is checkout
+
+
+def test_get_checkout_line_total_reuses_checkout_pricing(
+    checkout_with_item, django_assert_num_queries
+):
+    request = _get_request()
+    pricing = get_checkout_pricing(request, checkout_with_item)
+    line = pricing.lines[0]
+    total = pricing.get_line_total(line)
+
+    with django_assert_num_queries(0):
+        assert get_checkout_line_total(request, line) == total
+
+
+def test_get_checkout_line_total_without_fetched_checkout(checkout_with_item):
+    request = _get_request()
+    line = CheckoutLine.objects.get(checkout=checkout_with_item)
+    manager = get_extensions_manager()
+
+    total = get_checkout_line_total(request, line)
+
+    assert total == manager.calculate_checkout_line_total(line, [])
+    assert not hasattr(request, "checkout_pricing")
@@ -13,7 +13,18 @@ from prices import Money
 
 from saleor.account.models import Address, User
 from saleor.account.utils import create_superuser
-from saleor.core.storages import S3MediaStorage
+from saleor.core.cache import bump_cache_version, get_cache_version, schedule_once
+from saleor.core.middleware import (
+    country as country_middleware,
+    currency as currency_middleware,
+)
+from saleor.core.processes import map_in_processes
+from saleor.core.storages import (
+    PrivateFileSystemStorage,
+    S3MediaStorage,
+    S3PrivateStorage,
+    get_private_storage,
+)
 from saleor.core.utils import (
     Country,
     build_absolute_uri,
@@ -21,6 +32,7 @@ from saleor.core.utils import (
     format_money,
     get_client_ip,
     get_country_by_ip,
+    get_country_code_by_ip,
     get_country_name_by_code,
     get_currency_for_country,
     random_data,
@@ -63,11 +75,26 @@ def test_format_money():
     ],
 )
 def test_get_country_by_ip(ip_data, expected_country, monkeypatch):
-    monkeypatch.setattr("saleor.core.utils.georeader.get", Mock(return_value=ip_data))
+    get_country_code_by_ip.cache_clear()
+    monkeypatch.setattr(
+        "saleor.core.utils.get_geo_reader",
+        Mock(return_value=Mock(get=Mock(return_value=ip_data))),
+    )
     country = get_country_by_ip("127.0.0.1")
     assert country == expected_country
 
 
+def test_get_country_by_ip_cached(monkeypatch):
+    get_country_code_by_ip.cache_clear()
+    reader = Mock(get=Mock(return_value={"country": {"iso_code": "PL"}}))
+    monkeypatch.setattr("saleor.core.utils.get_geo_reader", Mock(return_value=reader))
+
+    assert get_country_by_ip("83.0.0.1") == Country("PL")
+    assert get_country_by_ip("83.0.0.1") == Country("PL")
+
+    reader.get.assert_called_once_with("83.0.0.1")
+
+
 @pytest.mark.parametrize(
     "ip_address, expected_ip",
     [
@@ -98,6 +125,47 @@ def test_get_currency_for_country(country, expected_currency, monkeypatch):
     assert currency == expected_currency
 
 
+def test_country_and_currency_middleware_detect_country_lazily(rf, monkeypatch):
+    get_country_by_ip = Mock(return_value=Country("PL"))
+    monkeypatch.setattr("saleor.core.middleware.get_country_by_ip", get_country_by_ip)
+    request = rf.get("/", REMOTE_ADDR="83.0.0.1")
+
+    country_middleware(currency_middleware(Mock()))(request)
+
+    get_country_by_ip.assert_not_called()
+    assert request.currency == "PLN"
+    assert request.country == Country("PL")
+    get_country_by_ip.assert_called_once_with("83.0.0.1")
+
+
+def test_currency_middleware_computes_currency_once(rf, monkeypatch):
+    get_currency_for_country = Mock(return_value="PLN")
+    monkeypatch.setattr(
+        "saleor.core.middleware.get_currency_for_country", get_currency_for_country
+    )
+    request = rf.get("/")
+    request.country = Country("PL")
+
+    currency_middleware(Mock())(request)
+
+    assert request.currency == "PLN"
+    assert isinstance(request.currency, str)
+    assert request.currency.upper() == "PLN"
+    get_currency_for_country.assert_called_once_with(Country("PL"))
+
+
+def test_country_middleware_default_country(rf, monkeypatch, settings):
+    settings.DEFAULT_COUNTRY = "DE"
+    monkeypatch.setattr(
+        "saleor.core.middleware.get_country_by_ip", Mock(return_value=None)
+    )
+    request = rf.get("/")
+
+    country_middleware(Mock())(request)
+
+    assert request.country == Country("DE")
+
+
 def test_create_superuser(db, client, media_root):
     credentials = {"email": "admin@example.com", "password": "admin"}
     # Test admin creation
@@ -252,6 +320,22 @@ def test_storages_not_setting_s3_bucket_domain(storage, settings):
     assert storage.custom_domain is None
 
 
+@patch("storages.backends.s3boto3.S3Boto3Storage")
+def test_storages_set_s3_private_bucket(storage, settings):
+    settings.AWS_PRIVATE_BUCKET_NAME = "private-bucket"
+    storage = S3PrivateStorage()
+    assert storage.bucket_name == "private-bucket"
+    assert storage.default_acl == "private"
+    assert storage.querystring_auth
+
+
+def test_private_storage_is_outside_of_media_root(private_media_root, settings):
+    storage = get_private_storage()
+    assert isinstance(storage, PrivateFileSystemStorage)
+    assert storage.location == settings.PRIVATE_MEDIA_ROOT
+    assert storage.location != settings.MEDIA_ROOT
+
+
 def test_set_language_redirects_to_current_endpoint(client):
     user_language_point = "en"
     new_user_language = "fr"
@@ -330,3 +414,43 @@ def test_csrf_middleware_is_enabled():
 def test_get_country_name_by_code():
     country_name = get_country_name_by_code("PL")
     assert country_name == "Poland"
+
+
+def test_get_cache_version_is_stable():
+    assert get_cache_version("test-version") == get_cache_version("test-version")
+
+
+def test_bump_cache_version():
+    version = get_cache_version("test-version")
+
+    bump_cache_version("test-version")
+
+    assert get_cache_version("test-version") != version
+
+
+def test_schedule_once():
+    task = Mock()
+
+    assert schedule_once("test-scheduled", 60, task, (1,))
+    assert not schedule_once("test-scheduled", 60, task, (1,))
+
+    task.apply_async.assert_called_once_with((1,), countdown=None)
+
+
+def test_map_in_processes_single_process():
+    assert list(map_in_processes(str, [1, 2], processes=1)) == ["1", "2"]
+
+
+@patch("saleor.core.processes.connections")
+@patch("saleor.core.processes.Pool")
+def test_map_in_processes_pool(mocked_pool, mocked_connections):
+    pool = mocked_pool.return_value
+    pool.imap_unordered.return_value = iter(["2", "1"])
+
+    results = list(map_in_processes(str, [1, 2], processes=2, ordered=False))
+
+    assert results == ["2", "1"]
+    mocked_pool.assert_called_once_with(2)
+    mocked_connections.close_all.assert_called_once_with()
+    pool.close.assert_called_once_with()
+    pool.join.assert_called_once_with()
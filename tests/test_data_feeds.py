@@ -1,16 +1,32 @@
 import csv
+import gzip
+from datetime import timedelta
 from io import StringIO
 from unittest.mock import Mock, patch
 
-from django.utils.encoding import smart_text
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
 
 from saleor.data_feeds.google_merchant import (
+    get_feed_file_path,
     get_feed_items,
+    get_feed_items_chunks,
     item_attributes,
+    item_brand,
     item_google_product_category,
+    update_feed,
     write_feed,
 )
-from saleor.product.models import AttributeValue, Category
+from saleor.product.models import (
+    Attribute,
+    AttributeValue,
+    Category,
+    Product,
+    ProductVariant,
+)
+from saleor.product.utils.attributes import associate_attribute_values_to_instance
 
 
 def test_saleor_feed_items(product, site_settings):
@@ -20,19 +36,9 @@ def test_saleor_feed_items(product, site_settings):
     categories = Category.objects.all()
     discounts = []
     category_paths = {}
-    attributes_dict = {}
     current_site = site_settings.site
-    attribute_values_dict = {
-        smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
-    }
     attributes = item_attributes(
-        items[0],
-        categories,
-        category_paths,
-        current_site,
-        discounts,
-        attributes_dict,
-        attribute_values_dict,
+        items[0], categories, category_paths, current_site, discounts
     )
     assert attributes.get("mpn") == valid_variant.sku
     assert attributes.get("availability") == "in stock"
@@ -80,3 +86,150 @@ def test_feed_contains_site_settings_domain(mocked_item_link, product, site_sett
     mocked_item_link.assert_called_once_with(
         product.variants.first(), site_settings.site
     )
+
+
+def test_get_feed_file_path():
+    assert get_feed_file_path() == "google-feed.csv.gz"
+    assert get_feed_file_path(delta=True) == "google-feed-delta.csv.gz"
+    assert get_feed_file_path(shard=1, shards=4) == "google-feed-2-of-4.csv.gz"
+
+
+def test_get_feed_items_chunks(product_list):
+    pks = sorted(ProductVariant.objects.values_list("pk", flat=True))
+
+    chunks = list(get_feed_items_chunks(chunk_size=2))
+
+    assert [[item.pk for item in items] for items in chunks] == [pks[:2], pks[2:]]
+
+
+def test_get_feed_items_chunks_sharded(product_list):
+    pks = set(ProductVariant.objects.values_list("pk", flat=True))
+
+    shards = [
+        {
+            item.pk
+            for items in get_feed_items_chunks(shard=shard, shards=2)
+            for item in items
+        }
+        for shard in range(2)
+    ]
+
+    assert shards[0] | shards[1] == pks
+    assert not shards[0] & shards[1]
+    assert all(pk % 2 == 0 for pk in shards[0])
+
+
+def test_get_feed_items_chunks_changed_since(product_list):
+    changed_since = timezone.now() - timedelta(hours=1)
+    Product.objects.update(updated_at=changed_since)
+    ProductVariant.objects.update(updated_at=changed_since)
+    product_list[0].save()
+    variant = product_list[1].variants.get()
+    variant.save()
+
+    items = [
+        item
+        for items in get_feed_items_chunks(changed_since=changed_since)
+        for item in items
+    ]
+
+    assert {item.product_id for item in items} == {
+        product_list[0].pk,
+        product_list[1].pk,
+    }
+
+
+def test_item_brand(product, product_type):
+    brand = Attribute.objects.create(slug="brand", name="Brand")
+    value = AttributeValue.objects.create(attribute=brand, name="Saleor", slug="saleor")
+    product_type.product_attributes.add(brand)
+    associate_attribute_values_to_instance(product, brand, value)
+
+    item = get_feed_items().get(product=product)
+
+    assert item_brand(item) == "Saleor"
+
+
+def test_item_brand_missing(product):
+    item = get_feed_items().get(product=product)
+
+    assert item_brand(item) is None
+
+
+def test_write_feed_stats(product_list):
+    stats = write_feed(StringIO(), chunk_size=2)
+
+    assert stats["rows"] == 3
+    assert stats["rows_per_second"] > 0
+    assert stats["peak_memory_kb"] > 0
+
+
+def test_update_feed(product, site_settings, media_root):
+    stats = update_feed()
+
+    assert stats["rows"] == 1
+    with default_storage.open(get_feed_file_path()) as feed_file:
+        lines = gzip.decompress(feed_file.read()).decode().splitlines()
+    assert len(lines) == 2
+
+
+def test_update_feed_delta(product_list, site_settings, media_root):
+    update_feed(delta=True)
+    product_list[0].save()
+
+    stats = update_feed(delta=True)
+
+    assert stats["rows"] == 1
+
+
+def test_update_feeds_command(product_list, site_settings, media_root):
+    out = StringIO()
+
+    call_command("update_feeds", "--shards", "2", stdout=out)
+
+    assert "Shard 1 of 2" in out.getvalue()
+    assert "Shard 2 of 2" in out.getvalue()
+    assert default_storage.exists(get_feed_file_path(shard=1, shards=2))
+    assert "/feeds/google/2-of-2/" in out.getvalue()
+
+
+def test_google_feed_url(client, site_settings, media_root):
+    response = client.get(reverse("data_feeds:google-feed"))
+
+    assert response.status_code == 301
+    assert response["Location"].endswith(get_feed_file_path())
+
+
+def test_google_feed_shard_url(client, site_settings, media_root):
+    url = reverse("data_feeds:google-feed-shard", kwargs={"shard": 2, "shards": 4})
+
+    response = client.get(url)
+
+    assert response["Location"].endswith(get_feed_file_path(shard=1, shards=4))
+
+
+def test_google_feed_delta_shard_url(client, site_settings, media_root):
+    url = reverse(
+        "data_feeds:google-feed-delta-shard", kwargs={"shard": 1, "shards": 2}
+    )
+
+    response = client.get(url)
+
+    expected_path = get_feed_file_path(delta=True, shard=0, shards=2)
+    assert response["Location"].endswith(expected_path)
+
+
+def test_google_feed_shard_url_out_of_range(client, site_settings, media_root):
+    url = reverse("data_feeds:google-feed-shard", kwargs={"shard": 5, "shards": 4})
+
+    response = client.get(url)
+
+    assert response.status_code == 404
+
+
+@patch("saleor.data_feeds.management.commands.update_feeds.update_feed_task.delay")
+def test_update_feeds_command_celery(mocked_task, db):
+    call_command("update_feeds", "--shards", "2", "--celery", stdout=StringIO())
+
+    mocked_task.assert_any_call(shard=1, shards=2, delta=False, chunk_size=1000)
+    assert mocked_task.call_count == 2
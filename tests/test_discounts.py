@@ -10,8 +10,11 @@ from saleor.discount.models import NotApplicable, Sale, Voucher, VoucherCustomer
 from saleor.discount.utils import (
     add_voucher_usage_by_customer,
     decrease_voucher_usage,
+    fetch_active_discounts,
     get_product_discount_on_sale,
+    get_product_discounts,
     increase_voucher_usage,
+    invalidate_active_discounts,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -119,6 +122,24 @@ def test_specific_products_voucher_checkout_discount(
     assert discount == Money(expected_value, "USD")
 
 
+def test_get_product_discounts_uses_prefetched_collections(
+    product, collection, sale, django_assert_num_queries
+):
+    collection.products.add(product)
+    discount = DiscountInfo(
+        sale=sale,
+        product_ids=set(),
+        category_ids=set(),
+        collection_ids={collection.id},
+    )
+    product = Product.objects.prefetch_related("collections").get(pk=product.pk)
+
+    with django_assert_num_queries(0):
+        discounts = list(get_product_discounts(product, [discount]))
+
+    assert len(discounts) == 1
+
+
 def test_sale_applies_to_correct_products(product_type, category):
     product = Product.objects.create(
         name="Test Product",
@@ -307,3 +328,36 @@ def test_sale_active(current_date, start_date, end_date, is_active):
     )
     sale_is_active = Sale.objects.active(date=current_date).exists()
     assert is_active == sale_is_active
+
+
+def test_fetch_active_discounts_is_cached(sale, assert_num_queries):
+    discounts = fetch_active_discounts()
+    assert [discount.sale for discount in discounts] == [sale]
+
+    with assert_num_queries(0):
+        cached_discounts = fetch_active_discounts()
+    assert cached_discounts == discounts
+
+
+def test_fetch_active_discounts_invalidated(sale):
+    assert len(fetch_active_discounts()) == 1
+
+    sale.delete()
+    assert len(fetch_active_discounts()) == 1
+
+    invalidate_active_discounts()
+    assert fetch_active_discounts() == []
+
+
+def test_fetch_active_discounts_expires_at_sale_boundary(sale, monkeypatch):
+    now = timezone.now()
+    sale.end_date = now + timedelta(days=1)
+    sale.save()
+    upcoming_sale = Sale.objects.create(
+        type=DiscountValueType.FIXED, value=5, start_date=now + timedelta(hours=1)
+    )
+    assert [discount.sale for discount in fetch_active_discounts()] == [sale]
+
+    monkeypatch.setattr("django.utils.timezone.now", lambda: now + timedelta(hours=2))
+    sales = {discount.sale for discount in fetch_active_discounts()}
+    assert sales == {sale, upcoming_sale}
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from prices import Money, TaxedMoney
+
+from saleor.order import OrderStatus
+from saleor.order.actions import cancel_order, order_created
+from saleor.order.models import DailySales, DailyVariantSales
+from saleor.order.reports import (
+    add_order_to_daily_sales,
+    get_sales_date,
+    get_sales_total,
+    get_variants_revenue,
+    update_daily_sales,
+)
+
+
+def test_order_created_adds_order_to_daily_sales(order_with_lines, staff_user):
+    order_created(order_with_lines, user=staff_user)
+
+    daily_sales = DailySales.objects.get()
+    assert daily_sales.date == get_sales_date(order_with_lines.created)
+    assert daily_sales.orders_count == 1
+    assert daily_sales.total == order_with_lines.total
+
+    line = order_with_lines.lines.first()
+    variant_sales = DailyVariantSales.objects.get(variant=line.variant)
+    assert variant_sales.quantity == line.quantity
+    assert variant_sales.revenue == line.get_total()
+
+
+def test_cancel_order_removes_order_from_daily_sales(order_with_lines, staff_user):
+    order_created(order_with_lines, user=staff_user)
+
+    cancel_order(order_with_lines, user=staff_user, restock=False)
+
+    daily_sales = DailySales.objects.get()
+    assert daily_sales.orders_count == 0
+    assert daily_sales.total_gross_amount == 0
+    assert not DailyVariantSales.objects.exclude(quantity=0).exists()
+
+
+def test_add_order_to_daily_sales_skips_lines_of_deleted_variants(order_with_lines):
+    line = order_with_lines.lines.first()
+    line.variant.delete()
+
+    add_order_to_daily_sales(order_with_lines)
+
+    assert DailySales.objects.get().orders_count == 1
+    assert DailyVariantSales.objects.count() == order_with_lines.lines.count() - 1
+
+
+def test_update_daily_sales(order_with_lines):
+    DailySales.objects.create(date=timezone.now().date(), currency="USD")
+
+    call_command("update_daily_sales")
+
+    daily_sales = DailySales.objects.get()
+    assert daily_sales.orders_count == 1
+    assert daily_sales.total == order_with_lines.total
+    for line in order_with_lines.lines.all():
+        variant_sales = DailyVariantSales.objects.get(variant=line.variant)
+        assert variant_sales.quantity == line.quantity
+        assert variant_sales.revenue == line.get_total()
+
+
+@pytest.mark.parametrize("status", [OrderStatus.DRAFT, OrderStatus.CANCELED])
+def test_update_daily_sales_skips_orders_not_placed(status, order_with_lines):
+    order_with_lines.status = status
+    order_with_lines.save(update_fields=["status"])
+
+    assert update_daily_sales() == {"days": 0, "variant_days": 0}
+    assert not DailySales.objects.exists()
+
+
+def test_get_sales_total_of_period(order_with_lines):
+    add_order_to_daily_sales(order_with_lines)
+    now = timezone.now()
+
+    assert get_sales_total(now) == order_with_lines.total
+    zero = Money(0, "USD")
+    assert get_sales_total(now + timedelta(days=1)) == TaxedMoney(zero, zero)
+
+
+def test_get_variants_revenue(order_with_lines, variant):
+    add_order_to_daily_sales(order_with_lines)
+    line = order_with_lines.lines.first()
+
+    revenues = get_variants_revenue([line.variant_id, variant.pk], timezone.now())
+
+    assert revenues[line.variant_id] == line.get_total()
+    zero = Money(0, "USD")
+    assert revenues[variant.pk] == TaxedMoney(zero, zero)
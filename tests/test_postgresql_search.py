@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from prices import Money
 
@@ -318,3 +319,54 @@ def test_show_users_search_result_when_access_granted(
     staff_user.user_permissions.add(permission_manage_users)
     _, _, users = search_dashboard(staff_client, USER_PHRASE_WITH_RESULT)
     assert 1 == len(users)
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_product_search_vector_updated_on_save(admin_client, named_products):
+    product = named_products[0]
+    product.name = "Robusta Coffee"
+    product.save(update_fields=["name"])
+
+    products, _, _ = search_dashboard(admin_client, "robusta")
+    assert list(products) == [product]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_order_search_vector_updated_on_user_address_change(
+    admin_client, orders_with_addresses
+):
+    address = orders_with_addresses[0].user.default_shipping_address
+    address.last_name = "Kowalski"
+    address.save()
+
+    _, orders, _ = search_dashboard(admin_client, "kowalski")
+    assert list(orders) == [orders_with_addresses[0]]
+    _, orders, _ = search_dashboard(admin_client, "knop")
+    assert not orders
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_user_search_vector_updated_on_save(admin_client, users_with_names):
+    user = users_with_names[2]
+    user.last_name = "Smith"
+    user.save(update_fields=["last_name"])
+
+    _, _, users = search_dashboard(admin_client, "smith")
+    assert list(users) == [user]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_update_search_vectors_command(admin_client, named_products, users_with_names):
+    Product.objects.update(search_vector=None)
+    User.objects.update(search_vector=None)
+
+    call_command("update_search_vectors")
+
+    products, _, _ = search_dashboard(admin_client, "coffee")
+    assert list(products) == [named_products[0]]
+    _, _, users = search_dashboard(admin_client, "doe")
+    assert list(users) == [users_with_names[2]]
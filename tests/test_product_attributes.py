@@ -9,6 +9,8 @@ from saleor.product.tasks import _update_variants_names
 from saleor.product.utils.attributes import (
     associate_attribute_values_to_instance,
     generate_name_for_variant,
+    get_attribute_values_map,
+    update_products_attribute_value_ids,
 )
 
 
@@ -136,3 +138,55 @@ def test_associate_attribute_to_product_instance_without_values(product):
     # Ensure the values were cleared and no new assignment entry was created
     assert new_assignment.pk == old_assignment.pk
     assert new_assignment.values.count() == 0
+
+
+def test_associate_attribute_values_updates_product_attribute_value_ids(
+    product, color_attribute
+):
+    variant = product.variants.get()
+    product_value_ids = set(product.attributes.values_list("values__pk", flat=True))
+    variant_value_ids = set(variant.attributes.values_list("values__pk", flat=True))
+    product.refresh_from_db()
+    assert set(product.attribute_value_ids) == product_value_ids | variant_value_ids
+
+    # Clear the values of the product's attribute
+    attribute = product.attributes.first().attribute
+    associate_attribute_values_to_instance(product, attribute)
+    product.refresh_from_db()
+    assert set(product.attribute_value_ids) == variant_value_ids
+
+
+def test_update_products_attribute_value_ids_after_variant_delete(product):
+    product_value_ids = set(product.attributes.values_list("values__pk", flat=True))
+    product.variants.all().delete()
+
+    update_products_attribute_value_ids([product.pk])
+
+    product.refresh_from_db()
+    assert set(product.attribute_value_ids) == product_value_ids
+
+
+def test_get_attribute_values_map(color_attribute, assert_num_queries):
+    expected_values = {value.slug: value.pk for value in color_attribute.values.all()}
+
+    with assert_num_queries(1):
+        attributes_map = get_attribute_values_map([color_attribute.slug, "unknown"])
+    assert attributes_map == {
+        color_attribute.slug: {"pk": color_attribute.pk, "values": expected_values},
+        "unknown": None,
+    }
+
+    # The map of known attributes is cached
+    with assert_num_queries(0):
+        get_attribute_values_map([color_attribute.slug])
+
+
+def test_get_attribute_values_map_invalidated_on_value_change(color_attribute):
+    get_attribute_values_map([color_attribute.slug])
+    value = AttributeValue.objects.create(
+        attribute=color_attribute, name="Purple", slug="purple"
+    )
+
+    attributes_map = get_attribute_values_map([color_attribute.slug])
+
+    assert attributes_map[color_attribute.slug]["values"]["purple"] == value.pk
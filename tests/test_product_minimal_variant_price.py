@@ -1,18 +1,28 @@
+from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch
 
 from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 from prices import Money
 
 from saleor.discount import DiscountValueType
+from saleor.discount.models import Sale
+from saleor.discount.utils import fetch_active_discounts
 from saleor.product.models import Product, ProductVariant
 from saleor.product.tasks import (
     update_all_products_minimal_variant_prices_task,
     update_products_minimal_variant_prices_of_catalogues,
     update_products_minimal_variant_prices_task,
 )
-from saleor.product.utils.variant_prices import update_product_minimal_variant_price
+from saleor.product.utils.variant_prices import (
+    get_product_ids_chunks,
+    get_sales_crossing_boundaries,
+    update_product_minimal_variant_price,
+    update_products_minimal_variant_prices_at_sale_boundaries,
+    update_products_minimal_variant_prices_in_chunks,
+)
 
 
 def test_update_product_minimal_variant_price(product):
@@ -325,15 +335,138 @@ def test_dashboard_sale_of_collection_create_view_updates_minimal_variant_price(
     assert product.minimal_variant_price == Decimal("0.5") * old_minimal_variant_price
 
 
+def test_management_commmand_update_all_products_minimal_variant_price(product_list):
+    price_override = Money("0.01", "USD")
+    for product in product_list:
+        variant = product.variants.first()
+        variant.price_override = price_override
+        variant.save()
+
+    call_command("update_all_products_minimal_variant_prices", chunk_size=2)
+
+    for product in product_list:
+        product.refresh_from_db()
+        assert product.minimal_variant_price == price_override
+
+
+def test_get_product_ids_chunks(product_list):
+    chunks = list(get_product_ids_chunks(Product.objects.all(), chunk_size=2))
+    assert chunks == [
+        [product_list[0].pk, product_list[1].pk],
+        [product_list[2].pk],
+    ]
+
+
+def test_update_products_minimal_variant_prices_in_chunks(product_list, sale):
+    discounts = fetch_active_discounts()
+    stats = update_products_minimal_variant_prices_in_chunks(
+        Product.objects.all(), chunk_size=2
+    )
+    # The products of the list and the discounted product of the sale
+    assert stats["chunks"] == 2
+    assert stats["products"] == 4
+    for product in product_list:
+        product.refresh_from_db()
+        variant_prices = [
+            variant.get_price(discounts=discounts) for variant in product.variants.all()
+        ]
+        assert product.minimal_variant_price == min([product.price] + variant_prices)
+
+
+def test_update_products_minimal_variant_prices_in_chunks_num_queries(
+    product_list, sale, capture_queries
+):
+    discounts = fetch_active_discounts()
+    update_products_minimal_variant_prices_in_chunks(Product.objects.all(), discounts)
+
+    with capture_queries() as single_product_ctx:
+        update_products_minimal_variant_prices_in_chunks(
+            Product.objects.filter(pk=product_list[0].pk), discounts
+        )
+    with capture_queries() as all_products_ctx:
+        update_products_minimal_variant_prices_in_chunks(
+            Product.objects.all(), discounts
+        )
+    assert len(all_products_ctx.captured_queries) == len(
+        single_product_ctx.captured_queries
+    )
+
+
+@patch("saleor.product.tasks.update_products_minimal_variant_prices_task.delay")
+def test_update_products_minimal_variant_prices_in_chunks_parallel(
+    mock_task_delay, product_list
+):
+    stats = update_products_minimal_variant_prices_in_chunks(
+        Product.objects.all(), chunk_size=2, parallel=True
+    )
+    assert stats["chunks"] == 2
+    assert mock_task_delay.call_count == 2
+    mock_task_delay.assert_any_call(product_ids=[product_list[2].pk])
+
+
+def test_get_sales_crossing_boundaries():
+    now = timezone.now()
+    since = now - timedelta(hours=1)
+    started_sale = Sale.objects.create(value=5, start_date=now - timedelta(minutes=5))
+    ended_sale = Sale.objects.create(
+        value=5,
+        start_date=now - timedelta(days=2),
+        end_date=now - timedelta(minutes=5),
+    )
+    Sale.objects.create(value=5, start_date=now - timedelta(days=2))
+    Sale.objects.create(value=5, start_date=now + timedelta(minutes=5))
+
+    sales = get_sales_crossing_boundaries(since, now)
+    assert set(sales) == {started_sale, ended_sale}
+
+
+def test_update_minimal_variant_prices_at_sale_boundaries(product, category):
+    now = timezone.now()
+    old_minimal_variant_price = product.minimal_variant_price
+    sale = Sale.objects.create(
+        type=DiscountValueType.PERCENTAGE,
+        value=50,
+        start_date=now + timedelta(hours=1),
+        end_date=now + timedelta(hours=2),
+    )
+    sale.categories.add(category)
+    # The sale didn't start yet
+    product.refresh_from_db()
+    assert product.minimal_variant_price == old_minimal_variant_price
+
+    with patch("django.utils.timezone.now", return_value=now + timedelta(minutes=90)):
+        stats = update_products_minimal_variant_prices_at_sale_boundaries(since=now)
+    assert stats["sales"] == 1
+    assert stats["updated_products"] == 1
+    product.refresh_from_db()
+    assert product.minimal_variant_price == Decimal("0.5") * old_minimal_variant_price
+
+    with patch("django.utils.timezone.now", return_value=now + timedelta(hours=3)):
+        stats = update_products_minimal_variant_prices_at_sale_boundaries()
+    assert stats["since"] == now + timedelta(minutes=90)
+    assert stats["updated_products"] == 1
+    product.refresh_from_db()
+    assert product.minimal_variant_price == old_minimal_variant_price
+
+
 @patch(
     "saleor.product.management.commands"
-    ".update_all_products_minimal_variant_prices"
-    ".update_product_minimal_variant_price"
+    ".update_sale_boundaries_minimal_variant_prices"
+    ".update_products_minimal_variant_prices_at_sale_boundaries"
 )
-def test_management_commmand_update_all_products_minimal_variant_price(
-    mock_update_product_minimal_variant_price, product_list
+def test_management_command_update_sale_boundaries_minimal_variant_prices(
+    mock_update_prices,
 ):
-    call_command("update_all_products_minimal_variant_prices")
-    call_args_list = mock_update_product_minimal_variant_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+    mock_update_prices.return_value = {
+        "since": None,
+        "until": None,
+        "sales": 0,
+        "products": 0,
+        "updated_products": 0,
+        "duration": 0,
+    }
+    call_command(
+        "update_sale_boundaries_minimal_variant_prices", since="2019-12-01T10:00:00Z"
+    )
+    since = mock_update_prices.call_args[1]["since"]
+    assert since.isoformat() == "2019-12-01T10:00:00+00:00"
@@ -4,10 +4,12 @@ import pytest
 from django.templatetags.static import static
 from django.test import override_settings
 
+from saleor.core.utils.thumbnails import Thumbnail
 from saleor.product.templatetags.product_images import (
     choose_placeholder,
     get_product_image_thumbnail,
     get_thumbnail,
+    get_thumbnail_srcset,
 )
 
 
@@ -24,6 +26,59 @@ def test_get_thumbnail():
     assert thumb == thumbnail_value.url
 
 
+@override_settings(
+    VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": True},
+    WEBP_THUMBNAILS=True,
+)
+@patch("saleor.product.templatetags.product_images.get_webp_thumbnail")
+def test_get_thumbnail_webp(mocked_get_webp_thumbnail):
+    instance = Mock()
+    thumbnail_value = Mock(url="thumb.jpg")
+    instance.thumbnail = {"10x10": thumbnail_value}
+    mocked_get_webp_thumbnail.return_value = Thumbnail("thumb.webp", "thumb.webp")
+
+    thumb = get_thumbnail(instance, 10, method="thumbnail", image_format="webp")
+
+    assert thumb == "thumb.webp"
+    mocked_get_webp_thumbnail.assert_called_once_with(thumbnail_value, True)
+
+
+@override_settings(
+    VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": True},
+    WEBP_THUMBNAILS=False,
+)
+def test_get_thumbnail_webp_disabled():
+    instance = Mock()
+    thumbnail_value = Mock(url="thumb.jpg")
+    instance.thumbnail = {"10x10": thumbnail_value}
+
+    thumb = get_thumbnail(instance, 10, method="thumbnail", image_format="webp")
+
+    assert thumb == thumbnail_value.url
+
+
+@override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": True})
+def test_get_thumbnail_srcset():
+    instance = Mock()
+    instance.thumbnail = {
+        "10x10": Mock(url="thumb.jpg"),
+        "20x20": Mock(url="thumb_2x.jpg"),
+    }
+
+    srcset = get_thumbnail_srcset(instance, 10, method="thumbnail")
+
+    assert srcset == "thumb.jpg 1x, thumb_2x.jpg 2x"
+
+
+@override_settings(WEBP_THUMBNAILS=False)
+def test_get_thumbnail_srcset_webp_disabled():
+    instance = Mock()
+
+    srcset = get_thumbnail_srcset(instance, 10, "thumbnail", image_format="webp")
+
+    assert srcset == ""
+
+
 def test_get_thumbnail_no_instance(monkeypatch):
     monkeypatch.setattr(
         "saleor.product.templatetags.product_images.choose_placeholder",
@@ -0,0 +1,236 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from django.utils import timezone
+from elasticsearch_dsl.connections import connections
+
+from saleor.product.utils.attributes import update_products_attribute_value_ids
+from saleor.product.utils.variant_prices import update_products_minimal_variant_prices
+from saleor.search import documents  # noqa: F401, registers the documents
+from saleor.search.indexing import (
+    REINDEX_TARGETS_CACHE_KEY,
+    _switch_alias,
+    get_indexing_lag,
+    process_indexing_queue,
+)
+from saleor.search.models import IndexingQueueEntry
+from saleor.search.signals import IndexingQueueSignalProcessor, enqueue_updated_objects
+
+
+@pytest.fixture
+def signal_processor():
+    processor = IndexingQueueSignalProcessor(connections)
+    yield processor
+    processor.teardown()
+
+
+@pytest.fixture
+def mocked_bulk():
+    with patch("saleor.search.indexing.bulk", return_value=(0, [])) as mocked:
+        yield mocked
+
+
+def get_bulk_actions(mocked_bulk):
+    return [
+        action for call in mocked_bulk.call_args_list for action in list(call[0][1])
+    ]
+
+
+@patch("saleor.search.signals.schedule_indexing_queue_processing")
+def test_saved_objects_are_queued_for_indexing(
+    mocked_schedule, product, category, signal_processor
+):
+    product.save()
+    category.save()
+
+    entry = IndexingQueueEntry.objects.get()
+    assert entry.model == "product.Product"
+    assert entry.object_id == product.pk
+
+
+@patch("saleor.search.signals.schedule_indexing_queue_processing")
+def test_queued_objects_indexing_disabled(
+    mocked_schedule, settings, product, signal_processor
+):
+    settings.ELASTICSEARCH_DSL_AUTOSYNC = False
+    product.save()
+    assert not IndexingQueueEntry.objects.exists()
+
+
+@pytest.fixture
+def elasticsearch_installed():
+    with patch("saleor.search.signals.apps.is_installed", return_value=True):
+        yield
+
+
+@patch("saleor.search.signals.schedule_indexing_queue_processing")
+def test_enqueue_updated_objects(mocked_schedule, product, elasticsearch_installed):
+    enqueue_updated_objects(type(product), [product.pk])
+
+    entry = IndexingQueueEntry.objects.get()
+    assert entry.object_id == product.pk
+
+
+def test_enqueue_updated_objects_without_elasticsearch(product):
+    enqueue_updated_objects(type(product), [product.pk])
+
+    assert not IndexingQueueEntry.objects.exists()
+
+
+@patch("saleor.search.signals.schedule_indexing_queue_processing")
+def test_bulk_updated_attribute_values_are_queued(
+    mocked_schedule, product, elasticsearch_installed
+):
+    update_products_attribute_value_ids([product.pk])
+
+    assert IndexingQueueEntry.objects.filter(object_id=product.pk).exists()
+
+
+@patch("saleor.search.signals.schedule_indexing_queue_processing")
+def test_bulk_updated_minimal_variant_prices_are_queued(
+    mocked_schedule, product, elasticsearch_installed
+):
+    product.minimal_variant_price_amount = 0
+    product.save(update_fields=["minimal_variant_price_amount"])
+
+    update_products_minimal_variant_prices([product], discounts=[])
+
+    assert IndexingQueueEntry.objects.filter(object_id=product.pk).exists()
+
+
+def test_process_indexing_queue(product, mocked_bulk):
+    deleted_product_id = product.pk + 1
+    for object_id in [product.pk, product.pk, deleted_product_id]:
+        IndexingQueueEntry.objects.create(model="product.Product", object_id=object_id)
+
+    stats = process_indexing_queue(batch_size=10)
+
+    assert stats == {"entries": 3, "indexed": 1, "deleted": 1, "failed": 0}
+    assert not IndexingQueueEntry.objects.exists()
+    mocked_bulk.assert_called_once()
+    actions = get_bulk_actions(mocked_bulk)
+    assert [(action["_op_type"], action["_id"]) for action in actions] == [
+        ("index", product.pk),
+        ("delete", deleted_product_id),
+    ]
+    assert actions[0]["_index"] == "storefront"
+    assert actions[0]["_source"]["title"] == product.name
+
+
+def test_process_indexing_queue_in_batches(product_list, mocked_bulk):
+    for product in product_list:
+        IndexingQueueEntry.objects.create(model="product.Product", object_id=product.pk)
+
+    stats = process_indexing_queue(batch_size=2)
+
+    assert stats["entries"] == len(product_list)
+    assert mocked_bulk.call_count == 2
+
+
+def test_process_indexing_queue_failed_batch_is_kept(product):
+    IndexingQueueEntry.objects.create(model="product.Product", object_id=product.pk)
+
+    with patch("saleor.search.indexing.bulk", side_effect=ConnectionError):
+        with pytest.raises(ConnectionError):
+            process_indexing_queue(batch_size=10)
+
+    assert IndexingQueueEntry.objects.count() == 1
+
+
+def test_process_indexing_queue_rejected_documents_are_kept(product_list):
+    for product in product_list:
+        IndexingQueueEntry.objects.create(model="product.Product", object_id=product.pk)
+    rejected_id = product_list[0].pk
+    errors = [{"index": {"_id": str(rejected_id), "status": 429}}]
+
+    with patch("saleor.search.indexing.bulk", return_value=(2, errors)) as mocked:
+        stats = process_indexing_queue(batch_size=10)
+
+    assert stats["entries"] == len(product_list) - 1
+    assert stats["failed"] == 1
+    # The rejected entry is not retried by the same run
+    mocked.assert_called_once()
+    entry = IndexingQueueEntry.objects.get()
+    assert entry.object_id == rejected_id
+
+
+def test_process_indexing_queue_ignores_missing_deleted_documents(product):
+    deleted_product_id = product.pk + 1
+    IndexingQueueEntry.objects.create(
+        model="product.Product", object_id=deleted_product_id
+    )
+    errors = [{"delete": {"_id": str(deleted_product_id), "status": 404}}]
+
+    with patch("saleor.search.indexing.bulk", return_value=(0, errors)):
+        stats = process_indexing_queue(batch_size=10)
+
+    assert stats["failed"] == 0
+    assert not IndexingQueueEntry.objects.exists()
+
+
+def test_process_indexing_queue_writes_to_rebuilt_index(product, mocked_bulk):
+    IndexingQueueEntry.objects.create(model="product.Product", object_id=product.pk)
+
+    with patch(
+        "saleor.search.indexing.cache.get",
+        return_value={"storefront": "storefront-new"},
+    ) as mocked_cache_get:
+        process_indexing_queue(batch_size=10)
+
+    mocked_cache_get.assert_called_with(REINDEX_TARGETS_CACHE_KEY, {})
+    actions = get_bulk_actions(mocked_bulk)
+    assert [action["_index"] for action in actions] == [
+        "storefront",
+        "storefront-new",
+    ]
+
+
+def test_get_indexing_lag(product):
+    assert get_indexing_lag() == {"pending_entries": 0, "lag_seconds": 0.0}
+
+    IndexingQueueEntry.objects.create(
+        model="product.Product",
+        object_id=product.pk,
+        created=timezone.now() - timedelta(minutes=1),
+    )
+
+    lag = get_indexing_lag()
+    assert lag["pending_entries"] == 1
+    assert lag["lag_seconds"] >= 60
+
+
+def test_switch_alias():
+    client = Mock()
+    client.indices.exists_alias.return_value = True
+    client.indices.get_alias.return_value = {"storefront-old": {}}
+
+    _switch_alias(client, "storefront", "storefront-new")
+
+    client.indices.update_aliases.assert_called_once_with(
+        body={
+            "actions": [
+                {"add": {"index": "storefront-new", "alias": "storefront"}},
+                {"remove": {"index": "storefront-old", "alias": "storefront"}},
+            ]
+        }
+    )
+    client.indices.delete.assert_called_once_with(index="storefront-old")
+
+
+def test_switch_alias_replacing_index():
+    client = Mock()
+    client.indices.exists_alias.return_value = False
+    client.indices.exists.return_value = True
+
+    _switch_alias(client, "storefront", "storefront-new")
+
+    client.indices.update_aliases.assert_called_once_with(
+        body={
+            "actions": [
+                {"add": {"index": "storefront-new", "alias": "storefront"}},
+                {"remove_index": {"index": "storefront"}},
+            ]
+        }
+    )
+    client.indices.delete.assert_not_called()
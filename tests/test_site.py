@@ -0,0 +1,134 @@
+from unittest.mock import Mock
+
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+
+from saleor.core.middleware import site as site_middleware
+from saleor.site import patch_sites
+from saleor.site.models import SiteSettingsTranslation
+from saleor.site.patch_sites import (
+    SITE_CACHE_VERSION_KEY,
+    get_site_cache_version,
+    refresh_site_cache,
+)
+
+
+def test_get_current_site_cached(site_settings, django_assert_num_queries):
+    Site.objects.get_current()
+
+    with django_assert_num_queries(0):
+        site = Site.objects.get_current()
+        assert site.settings == site_settings
+        list(site.settings.translations.all())
+
+
+def test_get_current_site_shared_through_cache(
+    site_settings, django_assert_num_queries
+):
+    Site.objects.get_current()
+    # Another process has no sites cached
+    Site.objects.clear_cache()
+
+    with django_assert_num_queries(0):
+        site = Site.objects.get_current()
+
+    assert site.settings == site_settings
+
+
+def test_site_settings_save_invalidates_site_cache(site_settings):
+    version = get_site_cache_version()
+    Site.objects.get_current()
+
+    site_settings.header_text = "New header"
+    site_settings.save()
+
+    assert get_site_cache_version() != version
+    assert Site.objects.get_current().settings.header_text == "New header"
+
+
+def test_site_save_invalidates_site_cache(site_settings):
+    Site.objects.get_current()
+
+    site = Site.objects.get(pk=site_settings.site_id)
+    site.name = "New name"
+    site.save()
+
+    assert Site.objects.get_current().name == "New name"
+
+
+def test_site_settings_translation_save_invalidates_site_cache(site_settings):
+    Site.objects.get_current()
+
+    SiteSettingsTranslation.objects.create(
+        site_settings=site_settings, language_code="pl", header_text="Nagłówek"
+    )
+
+    translations = Site.objects.get_current().settings.translations.all()
+    assert [translation.header_text for translation in translations] == ["Nagłówek"]
+
+
+def test_refresh_site_cache_drops_outdated_sites(site_settings):
+    Site.objects.get_current()
+    assert patch_sites.THREADED_SITE_CACHE
+
+    # Another process changed the site
+    cache.set(SITE_CACHE_VERSION_KEY, "new-version", None)
+    refresh_site_cache()
+
+    assert not patch_sites.THREADED_SITE_CACHE
+
+
+def test_refresh_site_cache_keeps_valid_sites(site_settings):
+    Site.objects.get_current()
+
+    refresh_site_cache()
+
+    assert patch_sites.THREADED_SITE_CACHE
+
+
+def test_site_middleware_assigns_copy_of_site(rf, site_settings):
+    request = rf.get("/")
+
+    site_middleware(Mock())(request)
+    request.site.settings.header_text = "Not saved"
+
+    assert request.site.pk == Site.objects.get_current().pk
+    assert Site.objects.get_current().settings.header_text != "Not saved"
+
+
+def test_deleting_top_menu_invalidates_site_cache(rf, site_settings):
+    Site.objects.get_current()
+
+    site_settings.top_menu.delete()
+
+    request = rf.get("/")
+    site_middleware(Mock())(request)
+    assert request.site.settings.top_menu is None
+
+
+def test_deleting_homepage_collection_invalidates_site_cache(site_settings, collection):
+    site_settings.homepage_collection = collection
+    site_settings.save()
+    Site.objects.get_current()
+
+    collection.delete()
+
+    assert Site.objects.get_current().settings.homepage_collection is None
+
+
+def test_deleting_company_address_invalidates_site_cache(site_settings, address):
+    site_settings.company_address = address
+    site_settings.save()
+    Site.objects.get_current()
+
+    address.delete()
+
+    assert Site.objects.get_current().settings.company_address is None
+
+
+def test_deleting_unrelated_address_keeps_site_cache(site_settings, address):
+    version = get_site_cache_version()
+
+    address.delete()
+
+    assert get_site_cache_version() == version
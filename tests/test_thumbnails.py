@@ -0,0 +1,229 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+
+from saleor.core.models import WarmedImage
+from saleor.core.tasks import schedule_thumbnails_warming
+from saleor.core.thumbnails import iter_chunks, warm_all_thumbnails, warm_thumbnails
+from saleor.core.utils import create_thumbnails
+from saleor.core.utils.thumbnails import (
+    get_rendition,
+    get_renditions,
+    get_webp_path,
+    get_webp_thumbnail,
+)
+from saleor.product.models import ProductImage
+
+PRODUCT_RENDITIONS = [
+    "thumbnail__1080x1080",
+    "thumbnail__120x120",
+    "thumbnail__255x255",
+    "thumbnail__510x510",
+    "thumbnail__540x540",
+    "thumbnail__60x60",
+]
+
+
+def _get_rendition_path(image_file, rendition):
+    image_file.create_on_demand = False
+    return get_rendition(image_file, rendition).name
+
+
+def test_get_renditions():
+    assert get_renditions("products") == PRODUCT_RENDITIONS
+
+
+def test_get_renditions_with_webp(settings):
+    settings.WEBP_THUMBNAILS = True
+
+    renditions = get_renditions("background_images")
+
+    assert renditions == ["thumbnail__1080x440", "thumbnail__1080x440__webp"]
+
+
+def test_get_webp_path():
+    path = "__sized__/products/image-thumbnail-255x255.jpg"
+
+    assert get_webp_path(path) == "__sized__/products/image-thumbnail-255x255.jpg.webp"
+
+
+def test_get_webp_path_keeps_source_extension():
+    jpg_path = "__sized__/products/image-thumbnail-255x255.jpg"
+    png_path = "__sized__/products/image-thumbnail-255x255.png"
+
+    assert get_webp_path(jpg_path) != get_webp_path(png_path)
+
+
+def test_get_webp_thumbnail(product_with_image):
+    image_file = product_with_image.images.get().image
+    image_file.create_on_demand = True
+    thumbnail = image_file.thumbnail["255x255"]
+
+    webp_thumbnail = get_webp_thumbnail(thumbnail, create_on_demand=True)
+
+    assert webp_thumbnail.name == get_webp_path(thumbnail.name)
+    with default_storage.open(webp_thumbnail.name) as webp_file:
+        assert Image.open(webp_file).format == "WEBP"
+
+
+def test_get_webp_thumbnail_not_created_on_demand(product_with_image):
+    image_file = product_with_image.images.get().image
+    image_file.create_on_demand = False
+    thumbnail = image_file.thumbnail["255x255"]
+
+    webp_thumbnail = get_webp_thumbnail(thumbnail, create_on_demand=False)
+
+    assert not default_storage.exists(webp_thumbnail.name)
+
+
+def test_create_thumbnails_with_webp(product_with_image, settings):
+    settings.WEBP_THUMBNAILS = True
+    product_image = product_with_image.images.get()
+
+    create_thumbnails(product_image.pk, ProductImage, "products")
+
+    path = _get_rendition_path(product_image.image, "thumbnail__540x540__webp")
+    assert default_storage.exists(path)
+
+
+def test_warm_thumbnails(product_with_image):
+    product_image = product_with_image.images.get()
+
+    stats = warm_thumbnails("products", [product_image.pk])
+
+    assert stats == {"images": 1, "created": 6, "failed": 0}
+    for rendition in PRODUCT_RENDITIONS:
+        path = _get_rendition_path(product_image.image, rendition)
+        assert default_storage.exists(path)
+    record = WarmedImage.objects.get(source="products", object_id=product_image.pk)
+    assert record.image == product_image.image.name
+    assert record.renditions == PRODUCT_RENDITIONS
+
+
+@patch("saleor.core.thumbnails.get_existing_paths")
+def test_warm_thumbnails_skips_recorded_renditions(
+    mocked_get_existing_paths, product_with_image
+):
+    product_image = product_with_image.images.get()
+    WarmedImage.objects.create(
+        source="products",
+        object_id=product_image.pk,
+        image=product_image.image.name,
+        renditions=PRODUCT_RENDITIONS,
+    )
+
+    stats = warm_thumbnails("products", [product_image.pk])
+
+    assert stats == {"images": 1, "created": 0, "failed": 0}
+    mocked_get_existing_paths.assert_not_called()
+
+
+def test_warm_thumbnails_creates_missing_renditions(product_with_image, settings):
+    product_image = product_with_image.images.get()
+    warm_thumbnails("products", [product_image.pk])
+    key_sets = settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS
+    settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS = {
+        **key_sets,
+        "products": key_sets["products"] + [("product_huge", "thumbnail__2000x2000")],
+    }
+
+    stats = warm_thumbnails("products", [product_image.pk])
+
+    assert stats == {"images": 1, "created": 1, "failed": 0}
+    record = WarmedImage.objects.get(source="products", object_id=product_image.pk)
+    assert "thumbnail__2000x2000" in record.renditions
+
+
+def test_warm_thumbnails_records_existing_renditions(product_with_image):
+    product_image = product_with_image.images.get()
+    warm_thumbnails("products", [product_image.pk])
+    WarmedImage.objects.all().delete()
+
+    stats = warm_thumbnails("products", [product_image.pk])
+
+    assert stats == {"images": 1, "created": 0, "failed": 0}
+    record = WarmedImage.objects.get(source="products", object_id=product_image.pk)
+    assert record.renditions == PRODUCT_RENDITIONS
+
+
+def test_warm_thumbnails_of_changed_image(product_with_image, image):
+    product_image = product_with_image.images.get()
+    warm_thumbnails("products", [product_image.pk])
+    product_image.image = image
+    product_image.save()
+
+    stats = warm_thumbnails("products", [product_image.pk])
+
+    assert stats == {"images": 1, "created": 6, "failed": 0}
+    record = WarmedImage.objects.get(source="products", object_id=product_image.pk)
+    assert record.image == product_image.image.name
+
+
+def test_warm_thumbnails_failed(product_with_image):
+    product_image = product_with_image.images.get()
+
+    with patch(
+        "versatileimagefield.datastructures.sizedimage.SizedImage."
+        "create_resized_image",
+        side_effect=OSError,
+    ):
+        stats = warm_thumbnails("products", [product_image.pk])
+
+    assert stats == {"images": 1, "created": 0, "failed": 6}
+    record = WarmedImage.objects.get(source="products", object_id=product_image.pk)
+    assert record.renditions == []
+
+
+def test_warm_thumbnails_of_other_sources(
+    category_with_image, collection_with_image, category
+):
+    assert warm_thumbnails("categories", [category_with_image.pk, category.pk]) == {
+        "images": 1,
+        "created": 1,
+        "failed": 0,
+    }
+    assert warm_thumbnails("collections", [collection_with_image.pk]) == {
+        "images": 1,
+        "created": 1,
+        "failed": 0,
+    }
+
+
+def test_iter_chunks(product_with_images):
+    pks = list(product_with_images.images.order_by("pk").values_list("pk", flat=True))
+
+    assert list(iter_chunks("products", 1)) == [[pk] for pk in pks]
+
+
+def test_warm_all_thumbnails(product_with_image):
+    progress = []
+
+    totals = warm_all_thumbnails("products", 1, 10, progress=progress.append)
+
+    assert totals["images"] == 1
+    assert totals["created"] == 6
+    assert totals["images_per_second"] > 0
+    assert progress[-1]["images"] == 1
+
+
+def test_create_thumbnails_command(product_with_image):
+    out = StringIO()
+
+    call_command(
+        "create_thumbnails", "--source", "products", "--processes", "1", stdout=out
+    )
+
+    assert "1 images" in out.getvalue()
+    assert "6 thumbnails created" in out.getvalue()
+
+
+@patch("saleor.core.tasks.warm_thumbnails_task.delay")
+def test_schedule_thumbnails_warming(mocked_task, product_with_images):
+    pks = list(product_with_images.images.order_by("pk").values_list("pk", flat=True))
+
+    assert schedule_thumbnails_warming("products", 1) == len(pks)
+
+    mocked_task.assert_any_call("products", [pks[0]])